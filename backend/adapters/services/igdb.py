@@ -17,6 +17,7 @@ from handler.metadata.base_handler import UniversalPlatformSlug as UPS
 from logger.logger import log
 from utils import get_version
 from utils.context import ctx_aiohttp_session
+from utils.metrics import HTTP_CLIENT_RETRIES
 from utils.rate_limiter import RateLimiter
 
 if TYPE_CHECKING:
@@ -112,6 +113,7 @@ class IGDBService:
         except aiohttp.ServerTimeoutError:
             # Retry the request once if it times out
             log.debug("Request to URL=%s timed out. Retrying...", url)
+            HTTP_CLIENT_RETRIES.inc(provider="igdb", reason="timeout")
         except IGDBInvalidCredentialsException as exc:
             log.critical("IGDB Error: Invalid IGDB_CLIENT_ID or IGDB_CLIENT_SECRET")
             raise HTTPException(
@@ -128,9 +130,11 @@ class IGDBService:
             if exc.status == http.HTTPStatus.UNAUTHORIZED:
                 # Refresh the token and retry if the auth token is invalid
                 log.info("Twitch token invalid: fetching a new one...")
+                HTTP_CLIENT_RETRIES.inc(provider="igdb", reason="unauthorized")
                 await self.twitch_auth._update_twitch_token()
             elif exc.status == http.HTTPStatus.TOO_MANY_REQUESTS:
                 # Retry after 2 seconds if rate limit hit
+                HTTP_CLIENT_RETRIES.inc(provider="igdb", reason="rate_limited")
                 await asyncio.sleep(2)
             else:
                 # Log the error and return an empty list if the request fails with a different code
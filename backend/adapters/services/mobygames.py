@@ -14,6 +14,7 @@ from config import MOBYGAMES_API_KEY
 from logger.logger import log
 from utils import get_version
 from utils.context import ctx_aiohttp_session
+from utils.metrics import HTTP_CLIENT_RETRIES
 from utils.rate_limiter import RateLimiter
 
 # MobyGames caps the free/non-commercial tier at 1 request per second.
@@ -62,6 +63,7 @@ class MobyGamesService:
         except aiohttp.ServerTimeoutError:
             # Retry the request once if it times out
             log.debug("Request to URL=%s timed out. Retrying...", url)
+            HTTP_CLIENT_RETRIES.inc(provider="mobygames", reason="timeout")
         except aiohttp.ClientConnectionError as exc:
             log.critical("Connection error: can't connect to MobyGames", exc_info=True)
             raise HTTPException(
@@ -75,6 +77,7 @@ class MobyGamesService:
                 return {}
             elif exc.status == http.HTTPStatus.TOO_MANY_REQUESTS:
                 # Retry after 2 seconds if rate limit hit
+                HTTP_CLIENT_RETRIES.inc(provider="mobygames", reason="rate_limited")
                 await asyncio.sleep(2)
             else:
                 # Log the error and return an empty dict if the request fails with a different code
@@ -20,6 +20,7 @@ from config import RETROACHIEVEMENTS_API_KEY
 from logger.logger import log
 from utils import get_version
 from utils.context import ctx_aiohttp_session
+from utils.metrics import HTTP_CLIENT_RETRIES
 from utils.rate_limiter import RateLimiter
 
 # RetroAchievements does not publish a fixed limit, try to stay
@@ -70,7 +71,7 @@ class RetroAchievementsService:
             return await res.json()
         except aiohttp.ServerTimeoutError:
             # Retry the request once if it times out
-            pass
+            HTTP_CLIENT_RETRIES.inc(provider="retroachievements", reason="timeout")
         except aiohttp.ClientConnectionError as exc:
             log.critical(
                 "Connection error: can't connect to RetroAchievements", exc_info=True
@@ -82,6 +83,9 @@ class RetroAchievementsService:
         except aiohttp.ClientResponseError as err:
             if err.status == http.HTTPStatus.TOO_MANY_REQUESTS:
                 # Retry after 2 seconds if rate limit hit
+                HTTP_CLIENT_RETRIES.inc(
+                    provider="retroachievements", reason="rate_limited"
+                )
                 await asyncio.sleep(2)
             else:
                 # Log the error and return an empty dict if the request fails with a different code
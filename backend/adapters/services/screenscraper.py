@@ -27,6 +27,7 @@ from logger.formatter import redact_sensitive
 from logger.logger import log
 from utils import get_version
 from utils.context import ctx_aiohttp_session
+from utils.metrics import HTTP_CLIENT_RETRIES
 from utils.rate_limiter import ConcurrencyLimiter, RateLimiter
 
 # ScreenScraper answers a refused credential set with a 200 and this marker in the
@@ -657,7 +658,7 @@ class ScreenScraperService:
             return await self._attempt_request(url, request_timeout)
         except aiohttp.ServerTimeoutError:
             # Retry the request once if it times out
-            pass
+            HTTP_CLIENT_RETRIES.inc(provider="screenscraper", reason="timeout")
         except aiohttp.ClientConnectionError as exc:
             log.critical(
                 "Connection error: can't connect to ScreenScraper", exc_info=True
@@ -671,6 +672,7 @@ class ScreenScraperService:
                 return _handle_client_error(url, err)
 
             log.warning("ScreenScraper: rate limit hit, retrying after 2s")
+            HTTP_CLIENT_RETRIES.inc(provider="screenscraper", reason="rate_limited")
             await asyncio.sleep(2)
         except json.JSONDecodeError as exc:
             log.error("Error decoding JSON response from ScreenScraper: %s", exc)
@@ -11,8 +11,8 @@ from models.base import BaseModel
 from models.collection import VirtualCollection
 from models.firmware import Firmware  # noqa
 from models.music import MusicFavoriteTrack, MusicPlaylist, MusicPlaylistTrack  # noqa
-from models.platform import Platform  # noqa
-from models.rom import Rom, RomFacets, RomMetadata, SiblingRom  # noqa
+from models.platform import Platform, PlatformStats  # noqa
+from models.rom import Rom, RomFacets, RomMetadata, RomSiblingGroup, SiblingRom  # noqa
 from models.user import User  # noqa
 
 # this is the Alembic Config object, which provides
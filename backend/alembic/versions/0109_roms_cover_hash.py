@@ -0,0 +1,42 @@
+"""Add cover_hash and cover_width columns keying content-addressed cover derivatives
+
+Responsive cover renditions are stored once per distinct artwork under
+`resources/covers/<hash>/`, so each rom records the SHA-256 of its large cover
+to build `srcset` URLs without touching the filesystem. Siblings and regional
+variants sharing artwork share the hash. A cover narrower than a responsive
+width has no rendition at that width, so the source width is kept next to it.
+
+Existing rows are filled in by the "Build cover derivatives" task.
+
+Revision ID: 0109_roms_cover_hash
+Revises: 0108_roms_primary_region
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "0109_roms_cover_hash"
+down_revision = "0108_roms_primary_region"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("roms", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("cover_hash", sa.String(length=64), nullable=True),
+            if_not_exists=True,
+        )
+        batch_op.add_column(
+            sa.Column("cover_width", sa.Integer(), nullable=True),
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("roms", schema=None) as batch_op:
+        batch_op.drop_column("cover_width", if_exists=True)
+        batch_op.drop_column("cover_hash", if_exists=True)
@@ -0,0 +1,36 @@
+"""Add an index on roms_facets.updated_at
+
+The gallery's facet index is kept in memory and caught up by reading the
+``roms_facets`` rows changed since the last refresh, on every filtered request.
+Without an index on ``updated_at`` each catch-up scanned the whole table.
+
+Revision ID: 0110_roms_facets_updated_at_index
+Revises: 0109_roms_cover_hash
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0110_roms_facets_updated_at_index"
+down_revision = "0109_roms_cover_hash"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "idx_roms_facets_updated_at"
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("roms_facets", schema=None) as batch_op:
+        batch_op.create_index(
+            INDEX_NAME,
+            ["updated_at"],
+            unique=False,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("roms_facets", schema=None) as batch_op:
+        batch_op.drop_index(INDEX_NAME, if_exists=True)
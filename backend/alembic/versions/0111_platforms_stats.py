@@ -0,0 +1,140 @@
+"""Add the platforms_stats rollup table
+
+The Server Stats page aggregated the whole library on every request: ROM
+counts, total file size, metadata coverage and region breakdowns. This table
+keeps those per platform, moved by the ROM write paths as they go, so the page
+reads one row per platform. It's filled here from the current library.
+
+Revision ID: 0111_platforms_stats
+Revises: 0110_roms_facets_updated_at_index
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+
+from utils.database import CustomJSON
+
+# revision identifiers, used by Alembic.
+revision = "0111_platforms_stats"
+down_revision = "0110_roms_facets_updated_at_index"
+branch_labels = None
+depends_on = None
+
+# Metadata source -> its match id column on roms_facets
+METADATA_SOURCE_COLUMNS = {
+    "igdb": "igdb_id",
+    "ss": "ss_id",
+    "moby": "moby_id",
+    "launchbox": "launchbox_id",
+    "ra": "ra_id",
+    "hasheous": "hasheous_id",
+    "tgdb": "tgdb_id",
+    "flashpoint": "flashpoint_id",
+    "hltb": "hltb_id",
+    "gamelist": "gamelist_id",
+    "libretro": "libretro_id",
+}
+
+
+def _backfill(connection: sa.Connection) -> None:
+    rom_counts = dict(
+        connection.execute(
+            sa.text("SELECT platform_id, COUNT(*) FROM roms GROUP BY platform_id")
+        ).all()
+    )
+    filesizes = dict(
+        connection.execute(
+            sa.text(
+                "SELECT r.platform_id, SUM(f.file_size_bytes) FROM rom_files f "
+                "JOIN roms r ON r.id = f.rom_id GROUP BY r.platform_id"
+            )
+        ).all()
+    )
+
+    coverage: dict[int, dict[str, int]] = {}
+    for platform_id, *counts in connection.execute(
+        sa.text(
+            "SELECT platform_id, "
+            + ", ".join(f"COUNT({c})" for c in METADATA_SOURCE_COLUMNS.values())
+            + " FROM roms_facets GROUP BY platform_id"
+        )  # nosec B608
+    ):
+        coverage[platform_id] = {
+            source: count
+            for source, count in zip(METADATA_SOURCE_COLUMNS, counts, strict=True)
+            if count
+        }
+
+    regions: dict[int, dict[str, int]] = {}
+    for platform_id, regions_list in connection.execute(
+        sa.text(
+            "SELECT platform_id, regions FROM roms_facets WHERE regions IS NOT NULL"
+        )
+    ):
+        # MariaDB hands JSON back as text
+        if isinstance(regions_list, str):
+            regions_list = json.loads(regions_list)
+        if regions_list:
+            counter = regions.setdefault(platform_id, {})
+            for region in regions_list:
+                counter[region] = counter.get(region, 0) + 1
+
+    stats_table = sa.table(
+        "platforms_stats",
+        sa.column("platform_id", sa.Integer),
+        sa.column("rom_count", sa.Integer),
+        sa.column("filesize_bytes", sa.BigInteger),
+        sa.column("metadata_coverage", CustomJSON),
+        sa.column("region_counts", CustomJSON),
+    )
+    values = [
+        {
+            "platform_id": platform_id,
+            "rom_count": rom_count,
+            "filesize_bytes": int(filesizes.get(platform_id) or 0),
+            "metadata_coverage": coverage.get(platform_id, {}),
+            "region_counts": regions.get(platform_id, {}),
+        }
+        for platform_id, rom_count in rom_counts.items()
+    ]
+    for i in range(0, len(values), 1000):
+        connection.execute(sa.insert(stats_table), values[i : i + 1000])
+
+
+def upgrade() -> None:
+    op.create_table(
+        "platforms_stats",
+        sa.Column(
+            "platform_id",
+            sa.Integer(),
+            sa.ForeignKey("platforms.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("rom_count", sa.Integer(), nullable=False),
+        sa.Column("filesize_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("metadata_coverage", CustomJSON(), nullable=True),
+        sa.Column("region_counts", CustomJSON(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        if_not_exists=True,
+    )
+
+    _backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_table("platforms_stats", if_exists=True)
@@ -0,0 +1,172 @@
+"""Materialize sibling groups and rebuild the sibling_roms view on them
+
+The sibling_roms view self-joined roms on platform_id plus a 7-way OR over the
+provider id columns. Every gallery page loads siblings through it, and the OR
+can't be index-driven because the compared values come from the joined row.
+
+``rom_sibling_groups`` assigns each ROM with a provider id to a group: the
+connected component of ROMs on its platform linked by shared ids, keyed by the
+smallest ROM id in it. The view becomes an equality self-join on the indexed
+group id. Siblings are now transitive: two ROMs that each share an id with a
+third are siblings of each other too, which the pairwise view missed.
+
+Revision ID: 0112_rom_sibling_groups
+Revises: 0111_platforms_stats
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from utils.database import is_postgresql
+from utils.sibling_groups import assign_sibling_groups
+
+# revision identifiers, used by Alembic.
+revision = "0112_rom_sibling_groups"
+down_revision = "0111_platforms_stats"
+branch_labels = None
+depends_on = None
+
+PROVIDER_ID_COLUMNS = [
+    "igdb_id",
+    "moby_id",
+    "ss_id",
+    "launchbox_id",
+    "ra_id",
+    "hasheous_id",
+    "tgdb_id",
+]
+
+
+def _backfill(connection: sa.Connection) -> None:
+    rows = connection.execute(
+        sa.text(
+            f"SELECT id, platform_id, {', '.join(PROVIDER_ID_COLUMNS)} FROM roms "
+            f"WHERE {' OR '.join(f'{c} IS NOT NULL' for c in PROVIDER_ID_COLUMNS)}"
+        )  # nosec B608
+    ).all()
+    platform_ids = {row[0]: row[1] for row in rows}
+    values = [
+        {"rom_id": rom_id, "platform_id": platform_ids[rom_id], "group_id": group_id}
+        for rom_id, group_id in assign_sibling_groups(rows).items()
+    ]
+
+    groups_table = sa.table(
+        "rom_sibling_groups",
+        sa.column("rom_id", sa.Integer),
+        sa.column("platform_id", sa.Integer),
+        sa.column("group_id", sa.Integer),
+    )
+    for i in range(0, len(values), 1000):
+        connection.execute(sa.insert(groups_table), values[i : i + 1000])
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rom_sibling_groups",
+        sa.Column(
+            "rom_id",
+            sa.Integer(),
+            sa.ForeignKey("roms.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("platform_id", sa.Integer(), nullable=False),
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        if_not_exists=True,
+    )
+    with op.batch_alter_table("rom_sibling_groups", schema=None) as batch_op:
+        batch_op.create_index(
+            "idx_rom_sibling_groups_group_id",
+            ["group_id", "rom_id"],
+            unique=False,
+            if_not_exists=True,
+        )
+
+    connection = op.get_bind()
+    _backfill(connection)
+
+    # The view's columns change, which CREATE OR REPLACE can't do on PostgreSQL
+    connection.execute(sa.text("DROP VIEW IF EXISTS sibling_roms"))
+    connection.execute(
+        sa.text("""
+            CREATE VIEW sibling_roms AS
+            SELECT
+                g1.rom_id AS rom_id,
+                g2.rom_id AS sibling_rom_id,
+                g1.platform_id AS platform_id,
+                NOW() AS created_at,
+                NOW() AS updated_at
+            FROM
+                rom_sibling_groups g1
+            JOIN
+                rom_sibling_groups g2
+            ON
+                g1.group_id = g2.group_id
+                AND g1.rom_id != g2.rom_id;
+            """),
+    )
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    null_safe_equal_operator = (
+        "IS NOT DISTINCT FROM" if is_postgresql(connection) else "<=>"
+    )
+
+    # Restore the self-join view from 0073
+    connection.execute(sa.text("DROP VIEW IF EXISTS sibling_roms"))
+    connection.execute(
+        sa.text(f"""
+            CREATE VIEW sibling_roms AS
+            SELECT
+                r1.id AS rom_id,
+                r2.id AS sibling_rom_id,
+                r1.platform_id AS platform_id,
+                NOW() AS created_at,
+                NOW() AS updated_at,
+                CASE WHEN r1.igdb_id {null_safe_equal_operator} r2.igdb_id THEN r1.igdb_id END AS igdb_id,
+                CASE WHEN r1.moby_id {null_safe_equal_operator} r2.moby_id THEN r1.moby_id END AS moby_id,
+                CASE WHEN r1.ss_id {null_safe_equal_operator} r2.ss_id THEN r1.ss_id END AS ss_id,
+                CASE WHEN r1.launchbox_id {null_safe_equal_operator} r2.launchbox_id THEN r1.launchbox_id END AS launchbox_id,
+                CASE WHEN r1.ra_id {null_safe_equal_operator} r2.ra_id THEN r1.ra_id END AS ra_id,
+                CASE WHEN r1.hasheous_id {null_safe_equal_operator} r2.hasheous_id THEN r1.hasheous_id END AS hasheous_id,
+                CASE WHEN r1.tgdb_id {null_safe_equal_operator} r2.tgdb_id THEN r1.tgdb_id END AS tgdb_id
+            FROM
+                roms r1
+            JOIN
+                roms r2
+            ON
+                r1.platform_id = r2.platform_id
+                AND r1.id != r2.id
+                AND (
+                    (r1.igdb_id = r2.igdb_id AND r1.igdb_id IS NOT NULL)
+                    OR
+                    (r1.moby_id = r2.moby_id AND r1.moby_id IS NOT NULL)
+                    OR
+                    (r1.ss_id = r2.ss_id AND r1.ss_id IS NOT NULL)
+                    OR
+                    (r1.launchbox_id = r2.launchbox_id AND r1.launchbox_id IS NOT NULL)
+                    OR
+                    (r1.ra_id = r2.ra_id AND r1.ra_id IS NOT NULL)
+                    OR
+                    (r1.hasheous_id = r2.hasheous_id AND r1.hasheous_id IS NOT NULL)
+                    OR
+                    (r1.tgdb_id = r2.tgdb_id AND r1.tgdb_id IS NOT NULL)
+                );
+            """),  # nosec B608
+    )
+
+    op.drop_table("rom_sibling_groups", if_exists=True)
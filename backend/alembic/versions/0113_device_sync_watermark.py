@@ -0,0 +1,55 @@
+"""Add a per-device sync watermark for delta negotiation
+
+Delta sync negotiation only revisits saves changed since the device's last
+clean sync, so the device remembers when that was. The saves and
+device_save_sync indexes let the changed-since lookups seek instead of
+walking the user's whole save history.
+
+Revision ID: 0113_device_sync_watermark
+Revises: 0112_rom_sibling_groups
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0113_device_sync_watermark"
+down_revision = "0112_rom_sibling_groups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("devices", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("sync_watermark", sa.TIMESTAMP(timezone=True), nullable=True)
+        )
+
+    with op.batch_alter_table("saves", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_saves_user_updated_at",
+            ["user_id", "updated_at"],
+            unique=False,
+            if_not_exists=True,
+        )
+
+    with op.batch_alter_table("device_save_sync", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_device_save_sync_device_updated_at",
+            ["device_id", "updated_at"],
+            unique=False,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("device_save_sync", schema=None) as batch_op:
+        batch_op.drop_index("ix_device_save_sync_device_updated_at", if_exists=True)
+
+    with op.batch_alter_table("saves", schema=None) as batch_op:
+        batch_op.drop_index("ix_saves_user_updated_at", if_exists=True)
+
+    with op.batch_alter_table("devices", schema=None) as batch_op:
+        batch_op.drop_column("sync_watermark")
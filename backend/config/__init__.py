@@ -38,6 +38,9 @@ LIBRARY_BASE_PATH: Final[str] = f"{ROMM_BASE_PATH}/library"
 RESOURCES_BASE_PATH: Final[str] = f"{ROMM_BASE_PATH}/resources"
 ASSETS_BASE_PATH: Final[str] = f"{ROMM_BASE_PATH}/assets"
 ZIP_CACHE_PATH: Final[str] = f"{ROMM_BASE_PATH}/cache/zips"
+WEBP_MANIFEST_PATH: Final[str] = f"{ROMM_BASE_PATH}/cache/webp_manifest.json"
+FACET_INDEX_PATH: Final[str] = f"{ROMM_BASE_PATH}/cache/facet_index.json"
+EXPORT_MANIFEST_PATH: Final[str] = f"{ROMM_BASE_PATH}/cache/exports"
 FRONTEND_RESOURCES_PATH: Final[str] = "/assets/romm/resources"
 
 # ROM UPLOADS
@@ -204,6 +207,10 @@ OIDC_END_SESSION_ENDPOINT: Final[str] = _get_env("OIDC_END_SESSION_ENDPOINT", ""
 # SCANS
 SCAN_TIMEOUT: Final[int] = safe_int(_get_env("SCAN_TIMEOUT"), 60 * 60 * 4)  # 4 hours
 SCAN_WORKERS: Final[int] = max(1, safe_int(_get_env("SCAN_WORKERS"), 1))
+SCAN_MEDIA_WORKERS: Final[int] = max(1, safe_int(_get_env("SCAN_MEDIA_WORKERS"), 4))
+MEDIA_DOWNLOAD_HOST_CONCURRENCY: Final[int] = max(
+    1, safe_int(_get_env("MEDIA_DOWNLOAD_HOST_CONCURRENCY"), 4)
+)
 
 # TASKS
 TASK_TIMEOUT: Final[int] = safe_int(_get_env("TASK_TIMEOUT"), 60 * 5)  # 5 minutes
@@ -245,6 +252,9 @@ SCHEDULED_CONVERT_IMAGES_TO_WEBP_CRON: Final[str] = _get_env(
     "SCHEDULED_CONVERT_IMAGES_TO_WEBP_CRON",
     "0 4 * * *",  # At 4:00 AM every day
 )
+ENABLE_COVER_DERIVATIVES: Final[bool] = safe_str_to_bool(
+    _get_env("ENABLE_COVER_DERIVATIVES")
+)
 ENABLE_SCHEDULED_CLEANUP_ORPHANED_RESOURCES: Final[bool] = safe_str_to_bool(
     _get_env("ENABLE_SCHEDULED_CLEANUP_ORPHANED_RESOURCES")
 )
@@ -273,6 +283,9 @@ SYNC_PUSH_PULL_CRON: Final[str] = _get_env(
     "SYNC_PUSH_PULL_CRON",
     "*/30 * * * *",  # Every 30 minutes
 )
+SYNC_PUSH_PULL_WORKERS: Final[int] = max(
+    1, safe_int(_get_env("SYNC_PUSH_PULL_WORKERS"), 4)
+)
 SYNC_SSH_KEYS_PATH: Final[str] = _get_env(
     "SYNC_SSH_KEYS_PATH", f"{SYNC_BASE_PATH}/keys"
 )
@@ -295,6 +308,9 @@ MAX_ASSET_UPLOAD_SIZE_BYTES: Final[int] = safe_int(
 MAX_AUTOCLEANUP_LIMIT: Final[int] = max(
     1, safe_int(_get_env("MAX_AUTOCLEANUP_LIMIT"), 100)
 )
+ENABLE_ASSET_DEDUPLICATION: Final[bool] = safe_str_to_bool(
+    _get_env("ENABLE_ASSET_DEDUPLICATION")
+)
 
 # LOGGING
 LOGLEVEL: Final[str] = _get_env("LOGLEVEL", "INFO").upper()
@@ -27,6 +27,7 @@ from exceptions.config_exceptions import ConfigNotWritableException
 from logger.formatter import BLUE
 from logger.formatter import highlight as hl
 from logger.logger import log
+from utils.cache import invalidate_heartbeat_cache
 
 ROMM_USER_CONFIG_PATH: Final = f"{ROMM_BASE_PATH}/config"
 ROMM_USER_CONFIG_FILE: Final = f"{ROMM_USER_CONFIG_PATH}/config.yml"
@@ -938,6 +939,8 @@ class ConfigManager:
             log.critical("Config file not writable, skipping config file update")
             raise ConfigNotWritableException from exc
 
+        invalidate_heartbeat_cache()
+
     def add_platform_binding(self, fs_slug: str, slug: str) -> None:
         platform_bindings = self.config.PLATFORMS_BINDING
         if fs_slug in platform_bindings:
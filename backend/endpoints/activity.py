@@ -36,6 +36,16 @@ def _visible_activity(
     return [ActivityEntrySchema(**e) for e in entries]
 
 
+async def _broadcast_update(user_id: int, entry: ActivityEntry) -> None:
+    # Broadcast to all connected sockets. The REST app shares this process with
+    # the Socket.IO server, so emit through the already-initialised, Redis-backed
+    # server (it fans out across workers) rather than opening a manager per call.
+    try:
+        await socket_handler.socket_server.emit("activity:update", dict(entry))
+    except Exception as e:  # noqa: BLE001
+        log.warning(f"Failed to broadcast activity:update for user {user_id}: {e}")
+
+
 class DeviceHeartbeatPayload(BaseModel):
     rom_id: int = Field(ge=1)
     device_id: str = Field(min_length=1, max_length=255)
@@ -63,8 +73,18 @@ async def device_heartbeat(
 
     Called periodically by devices while the user is playing a game. Writes
     activity state to Redis and broadcasts an ``activity:update`` event over
-    the main Socket.IO namespace.
+    the main Socket.IO namespace. Heartbeats for a session that is already
+    running only refresh it; the ROM and device are looked up, and the
+    device's last_seen updated, when a session starts.
     """
+    # Fast path: a session already running this ROM on this device was
+    # validated when it started, so refreshing it needs no DB round trips.
+    existing = await activity_handler.get_active(request.user.id, payload.device_id)
+    if existing and existing["rom_id"] == payload.rom_id:
+        await activity_handler.set_active(existing)
+        await _broadcast_update(request.user.id, existing)
+        return ActivityEntrySchema(**existing)
+
     rom = db_rom_handler.get_rom(payload.rom_id)
     if rom is None:
         raise HTTPException(
@@ -81,11 +101,8 @@ async def device_heartbeat(
             detail=f"Device {payload.device_id} not found for this user",
         )
 
-    # Preserve the started_at from the existing entry if we are refreshing.
-    existing = await activity_handler.get_active(request.user.id, device.id)
-    started_at = (
-        existing["started_at"] if existing else datetime.now(timezone.utc).isoformat()
-    )
+    # A device switching games starts a new session.
+    started_at = datetime.now(timezone.utc).isoformat()
 
     latest_save = db_save_handler.get_latest_saves_for_roms(
         user_id=request.user.id, rom_ids=[rom.id]
@@ -113,15 +130,7 @@ async def device_heartbeat(
     # Update the device last_seen as a side-effect (mirrors play session ingest).
     db_device_handler.update_last_seen(device_id=device.id, user_id=request.user.id)
 
-    # Broadcast to all connected sockets. The REST app shares this process with
-    # the Socket.IO server, so emit through the already-initialised, Redis-backed
-    # server (it fans out across workers) rather than opening a manager per call.
-    try:
-        await socket_handler.socket_server.emit("activity:update", dict(entry))
-    except Exception as e:  # noqa: BLE001
-        log.warning(
-            f"Failed to broadcast activity:update for user {request.user.id}: {e}"
-        )
+    await _broadcast_update(request.user.id, entry)
 
     return ActivityEntrySchema(**entry)
 
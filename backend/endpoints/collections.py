@@ -23,6 +23,7 @@ from exceptions.endpoint_exceptions import (
 from handler.auth.constants import Scope
 from handler.auth.dependencies import get_permissions
 from handler.database import db_collection_handler, db_rom_handler
+from handler.database.collections_handler import SmartCollectionFact
 from handler.filesystem import fs_resource_handler
 from handler.filesystem.assets_handler import validate_image_upload
 from handler.filesystem.base_handler import CoverSize
@@ -560,7 +561,9 @@ async def add_roms_to_collection(
     updated_collection = db_collection_handler.add_roms_to_collection(
         id, payload.rom_ids
     )
-    refresh_affected_smart_collections(payload.rom_ids, membership_only=True)
+    refresh_affected_smart_collections(
+        payload.rom_ids, facts={SmartCollectionFact.COLLECTIONS}
+    )
     return CollectionSchema.model_validate(updated_collection)
 
 
@@ -590,7 +593,9 @@ async def remove_roms_from_collection(
     updated_collection = db_collection_handler.remove_roms_from_collection(
         id, payload.rom_ids
     )
-    refresh_affected_smart_collections(payload.rom_ids, membership_only=True)
+    refresh_affected_smart_collections(
+        payload.rom_ids, facts={SmartCollectionFact.COLLECTIONS}
+    )
     return CollectionSchema.model_validate(updated_collection)
 
 
@@ -1,15 +1,19 @@
+from datetime import datetime, timezone
 from typing import Annotated, List
 
 from fastapi import HTTPException, Query, Request, status
-from fastapi.responses import Response
+from rq.job import JobStatus
 
+from config import TASK_RESULT_TTL
 from decorators.auth import protected_route
+from endpoints.responses import TaskExecutionResponse
 from handler.auth.constants import Scope
+from handler.database import db_platform_handler
+from handler.redis_handler import low_prio_queue
 from logger.formatter import BLUE
 from logger.formatter import highlight as hl
 from logger.logger import log
-from utils.gamelist_exporter import GamelistExporter
-from utils.pegasus_exporter import PegasusExporter
+from tasks.manual.export_platforms import ExportFormat, export_platforms_task
 from utils.router import APIRouter
 
 router = APIRouter(
@@ -18,61 +22,64 @@ router = APIRouter(
 )
 
 
-@protected_route(router.post, "/gamelist-xml", [Scope.ROMS_READ])
-async def export_gamelist_xml(
+def _enqueue_export(
     request: Request,
-    platform_ids: Annotated[
-        List[int], Query(description="List of platform IDs to export")
-    ],
-    local_export: Annotated[
-        bool, Query(description="Use local paths instead of URLs")
-    ] = False,
-) -> Response:
-    """Export platforms/ROMs to gamelist.xml format and write to platform directories"""
+    export_format: ExportFormat,
+    platform_ids: list[int],
+    local_export: bool,
+    full: bool,
+) -> TaskExecutionResponse:
+    """Validate the platforms and queue their export as a background task."""
     if not platform_ids:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="At least one platform ID must be provided",
         )
 
-    try:
-        exporter = GamelistExporter(local_export=local_export)
-        files_written = []
-
-        for platform_id in platform_ids:
-            success = await exporter.export_platform_to_file(
-                platform_id,
-                request,
-            )
-            if success:
-                files_written.append(f"gamelist_{platform_id}.xml")
-            else:
-                log.warning(f"Failed to write gamelist for platform {platform_id}")
-
-        if not files_written:
+    for platform_id in platform_ids:
+        if not db_platform_handler.get_platform(platform_id):
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to write any gamelist files",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Platform with ID {platform_id} not found",
             )
 
-        log.info(
-            f"Exported gamelist for {hl(str(len(files_written)), color=BLUE)} platform(s):"
-        )
-        for file in files_written:
-            log.info(f"\t• {file}")
-        return Response(status_code=status.HTTP_200_OK)
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
-    except Exception as e:
-        log.error(f"Failed to export gamelist: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to export gamelist",
-        ) from e
+    job = low_prio_queue.enqueue(
+        export_platforms_task.run,
+        kwargs={
+            "export_format": export_format.value,
+            "platform_ids": platform_ids,
+            "local_export": local_export,
+            # The worker has no request to build ROM and asset URLs from
+            "base_url": str(request.base_url),
+            "full": full,
+        },
+        job_timeout=export_platforms_task.timeout,
+        result_ttl=TASK_RESULT_TTL,
+        meta={
+            "task_name": export_platforms_task.title,
+            "task_type": export_platforms_task.task_type.value,
+        },
+    )
 
+    log.info(
+        f"Queued {export_format} export for {hl(str(len(platform_ids)), color=BLUE)} platform(s)"
+    )
 
-@protected_route(router.post, "/pegasus", [Scope.ROMS_READ])
-async def export_pegasus(
+    return {
+        "task_name": export_platforms_task.title,
+        "task_id": job.id,
+        "status": job.get_status() or JobStatus.QUEUED,
+        "created_at": (
+            job.created_at.isoformat()
+            if job.created_at
+            else datetime.now(timezone.utc).isoformat()
+        ),
+        "enqueued_at": job.enqueued_at.isoformat() if job.enqueued_at else None,
+    }
+
+
+@protected_route(router.post, "/gamelist-xml", [Scope.ROMS_READ])
+async def export_gamelist_xml(
     request: Request,
     platform_ids: Annotated[
         List[int], Query(description="List of platform IDs to export")
@@ -80,47 +87,32 @@ async def export_pegasus(
     local_export: Annotated[
         bool, Query(description="Use local paths instead of URLs")
     ] = False,
-) -> Response:
-    """Export platforms/ROMs to Pegasus metadata.pegasus.txt format and write to platform directories"""
-    if not platform_ids:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least one platform ID must be provided",
-        )
-
-    try:
-        exporter = PegasusExporter(local_export=local_export)
-        files_written = []
-
-        for platform_id in platform_ids:
-            success = await exporter.export_platform_to_file(
-                platform_id,
-                request,
-            )
-            if success:
-                files_written.append(f"metadata_pegasus_{platform_id}.txt")
-            else:
-                log.warning(
-                    f"Failed to write Pegasus metadata for platform {platform_id}"
-                )
+    full: Annotated[
+        bool,
+        Query(description="Re-render every ROM instead of only the changed ones"),
+    ] = False,
+) -> TaskExecutionResponse:
+    """Queue an export of platforms/ROMs to gamelist.xml files in the platform directories"""
+    return _enqueue_export(
+        request, ExportFormat.GAMELIST, platform_ids, local_export, full
+    )
 
-        if not files_written:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to write any Pegasus metadata files",
-            )
 
-        log.info(
-            f"Exported Pegasus metadata for {hl(str(len(files_written)), color=BLUE)} platform(s):"
-        )
-        for file in files_written:
-            log.info(f"\t• {file}")
-        return Response(status_code=status.HTTP_200_OK)
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
-    except Exception as e:
-        log.error(f"Failed to export Pegasus metadata: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to export Pegasus metadata",
-        ) from e
+@protected_route(router.post, "/pegasus", [Scope.ROMS_READ])
+async def export_pegasus(
+    request: Request,
+    platform_ids: Annotated[
+        List[int], Query(description="List of platform IDs to export")
+    ],
+    local_export: Annotated[
+        bool, Query(description="Use local paths instead of URLs")
+    ] = False,
+    full: Annotated[
+        bool,
+        Query(description="Re-render every ROM instead of only the changed ones"),
+    ] = False,
+) -> TaskExecutionResponse:
+    """Queue an export of platforms/ROMs to metadata.pegasus.txt files in the platform directories"""
+    return _enqueue_export(
+        request, ExportFormat.PEGASUS, platform_ids, local_export, full
+    )
@@ -64,6 +64,7 @@ async def add_firmware(
     )
 
     uploaded_firmware = []
+    scanned: list[tuple[Firmware, Firmware | None]] = []
     firmware_path = fs_firmware_handler.get_firmware_fs_structure(db_platform.fs_slug)
 
     for file in files:
@@ -86,16 +87,15 @@ async def add_firmware(
             file_name=file.filename,
             firmware=db_firmware,
         )
+        scanned.append((scanned_firmware, db_firmware))
 
-        is_verified = Firmware.verify_file_hashes(
-            platform_slug=db_platform.slug,
-            file_name=file.filename,
-            file_size_bytes=scanned_firmware.file_size_bytes,
-            md5_hash=scanned_firmware.md5_hash,
-            sha1_hash=scanned_firmware.sha1_hash,
-            crc_hash=scanned_firmware.crc_hash,
-        )
+    verified = await Firmware.verify_firmware(
+        db_platform.slug, [scanned_firmware for scanned_firmware, _ in scanned]
+    )
 
+    for (scanned_firmware, db_firmware), is_verified in zip(
+        scanned, verified, strict=True
+    ):
         if db_firmware:
             db_firmware_handler.update_firmware(
                 db_firmware.id,
@@ -1,3 +1,4 @@
+import json
 import os
 
 from anyio import Path as AnyioPath
@@ -47,9 +48,11 @@ from handler.metadata import (
     meta_ss_handler,
     meta_tgdb_handler,
 )
+from handler.redis_handler import sync_cache
 from handler.scan_handler import MetadataSource
 from logger.logger import log
 from utils import get_version
+from utils.cache import HEARTBEAT_CACHE_KEY, HEARTBEAT_CACHE_TTL
 from utils.platforms import get_supported_platforms
 from utils.router import APIRouter
 
@@ -62,9 +65,22 @@ router = APIRouter(
 async def heartbeat() -> HeartbeatResponse:
     """Endpoint to set the CSRF token in cache and return all the basic RomM config
 
+    The payload is the same for every caller, so it is built once and cached;
+    see `HEARTBEAT_CACHE_KEY` for what drops it.
+
     Returns:
         HeartbeatReturn: TypedDict structure with all the defined values in the HeartbeatReturn class.
     """
+    cached = sync_cache.get(HEARTBEAT_CACHE_KEY)
+    if cached is not None:
+        return json.loads(cached)
+
+    payload = await _build_heartbeat()
+    sync_cache.set(HEARTBEAT_CACHE_KEY, json.dumps(payload), ex=HEARTBEAT_CACHE_TTL)
+    return payload
+
+
+async def _build_heartbeat() -> HeartbeatResponse:
     igdb_enabled = meta_igdb_handler.is_enabled()
     flashpoint_enabled = meta_flashpoint_handler.is_enabled()
     ss_enabled = meta_ss_handler.is_enabled()
@@ -0,0 +1,30 @@
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+
+from decorators.auth import protected_route
+from handler.auth.constants import Scope
+from utils.metrics import metrics
+from utils.router import APIRouter
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@protected_route(router.get, "", [Scope.LOGS_READ])
+def get_metrics(request: Request) -> PlainTextResponse:
+    """Return scan and API metrics in the Prometheus text format (admin only).
+
+    Numbers are summed over every RomM process, including the workers that
+    run scans, and count up from when the Redis data was last cleared.
+
+    Args:
+        request (Request): FastAPI Request object.
+
+    Returns:
+        PlainTextResponse: Metrics in the Prometheus exposition format.
+    """
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -31,10 +31,8 @@ def _get_owner_player_name(room: NetplayRoom) -> str:
     )
 
 
-def _is_room_open(room: NetplayRoom, game_id: str) -> bool:
-    if len(room["players"]) >= room["max_players"]:
-        return False
-    return str(room["game_id"]) == str(game_id)
+def _is_room_open(room: NetplayRoom) -> bool:
+    return len(room["players"]) < room["max_players"]
 
 
 class RoomsResponse(TypedDict):
@@ -47,7 +45,7 @@ class RoomsResponse(TypedDict):
 
 @protected_route(router.get, "/list", [Scope.ASSETS_READ])
 async def get_rooms(request: Request, game_id: str) -> Dict[str, RoomsResponse]:
-    netplay_rooms = await netplay_handler.get_all()
+    netplay_rooms = await netplay_handler.get_game_rooms(game_id)
 
     open_rooms: Dict[str, RoomsResponse] = {
         session_id: RoomsResponse(
@@ -58,7 +56,7 @@ async def get_rooms(request: Request, game_id: str) -> Dict[str, RoomsResponse]:
             hasPassword=bool(room["password"]),
         )
         for session_id, room in netplay_rooms.items()
-        if _is_room_open(room, game_id)
+        if _is_room_open(room)
     }
 
     return open_rooms
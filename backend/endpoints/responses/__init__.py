@@ -26,6 +26,8 @@ class ConversionStats(TypedDict):
     processed: int
     errors: int
     total: int
+    skipped_dirs: int
+    images_per_second: float
 
 
 class ConversionTaskMeta(TypedDict):
@@ -48,6 +50,8 @@ class OrphanedResourcesCleanupStats(TypedDict):
     roms_in_fs: int
     removed_fs_platforms: int
     removed_fs_roms: int
+    removed_cover_derivatives: int
+    removed_asset_blobs: int
 
 
 class MissingRomsCleanupStats(TypedDict):
@@ -64,6 +68,18 @@ class CleanupTaskMeta(TypedDict):
     cleanup_stats: CleanupStats | None
 
 
+class ExportStats(TypedDict):
+    total_platforms: int
+    exported_platforms: int
+    failed_platforms: int
+    processed_roms: int
+    total_roms: int
+
+
+class ExportTaskMeta(TypedDict):
+    export_stats: ExportStats | None
+
+
 class SyncTaskMeta(TypedDict):
     pass
 
@@ -82,6 +98,7 @@ TaskMeta = Union[
     ConversionTaskMeta,
     UpdateTaskMeta,
     CleanupTaskMeta,
+    ExportTaskMeta,
     SyncTaskMeta,
     WatcherTaskMeta,
     GenericTaskMeta,
@@ -121,6 +138,11 @@ class CleanupTaskStatusResponse(BaseTaskStatusResponse):
     meta: CleanupTaskMeta
 
 
+class ExportTaskStatusResponse(BaseTaskStatusResponse):
+    task_type: Literal[TaskType.EXPORT]
+    meta: ExportTaskMeta
+
+
 class SyncTaskStatusResponse(BaseTaskStatusResponse):
     task_type: Literal[TaskType.SYNC]
     meta: SyncTaskMeta
@@ -141,6 +163,7 @@ TaskStatusResponse = Union[
     ConversionTaskStatusResponse,
     UpdateTaskStatusResponse,
     CleanupTaskStatusResponse,
+    ExportTaskStatusResponse,
     SyncTaskStatusResponse,
     WatcherTaskStatusResponse,
     GenericTaskStatusResponse,
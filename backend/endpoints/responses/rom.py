@@ -309,6 +309,7 @@ class RomSchema(BaseModel):
 
     path_cover_small: str | None
     path_cover_large: str | None
+    path_cover_srcset: dict[str, str]
     url_cover: str | None
 
     has_manual: bool
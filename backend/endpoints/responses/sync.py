@@ -52,6 +52,13 @@ class SyncNegotiateResponse(BaseModel):
     total_download: int
     total_conflict: int
     total_no_op: int
+    delta: bool = Field(
+        default=False,
+        description=(
+            "True when only saves changed since the device's last completed "
+            "sync were considered; false for a full negotiation."
+        ),
+    )
 
 
 class SyncSessionSchema(BaseModel):
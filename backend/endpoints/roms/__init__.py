@@ -4,7 +4,7 @@ from base64 import b64encode
 from datetime import datetime, timezone
 from io import BytesIO
 from stat import S_IFREG
-from typing import Annotated, Any, Sequence
+from typing import Annotated, Any, Collection, Sequence
 from urllib.parse import quote
 from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
 
@@ -18,12 +18,7 @@ from fastapi import (
     HTTPException,
 )
 from fastapi import Path as PathVar
-from fastapi import (
-    Query,
-    Request,
-    UploadFile,
-    status,
-)
+from fastapi import Query, Request, UploadFile, status
 from fastapi.responses import Response
 from fastapi_pagination import resolve_params
 from fastapi_pagination.limit_offset import LimitOffsetPage, LimitOffsetParams
@@ -53,8 +48,13 @@ from handler.auth.dependencies import (
     assert_rom_visible,
     get_permissions,
 )
-from handler.database import db_collection_handler, db_rom_handler, db_save_handler
+from handler.database import (
+    db_collection_handler,
+    db_rom_handler,
+    db_save_handler,
+)
 from handler.database.base_handler import sync_session
+from handler.database.collections_handler import SmartCollectionFact
 from handler.filesystem import fs_resource_handler, fs_rom_handler
 from handler.filesystem.assets_handler import validate_image_upload
 from handler.metadata import (
@@ -126,16 +126,20 @@ def safe_int_or_none(value: Any) -> int | None:
 
 
 def refresh_affected_smart_collections(
-    rom_ids: Sequence[int], membership_only: bool = False
+    rom_ids: Sequence[int],
+    facts: Collection[SmartCollectionFact] | None = None,
 ) -> None:
     """Follow a change into the cached smart collection membership.
 
+    `facts` marks a change that left the ROM rows alone, naming the per-user
+    state it touched, so only the collections that read it are evaluated.
+
     The write has already been committed, so a stale count is the worst this
     can cost, and reporting it back as a failed write would be a lie.
     """
     try:
         db_collection_handler.refresh_smart_collections_for_roms(
-            rom_ids, membership_only=membership_only
+            rom_ids, membership_only=facts is not None, facts=facts
         )
     except Exception as e:
         log.error(f"Couldn't refresh smart collections for {rom_ids}: {e}")
@@ -1622,6 +1626,8 @@ async def update_rom(
                 "path_screenshots": [],
                 "path_cover_s": "",
                 "path_cover_l": "",
+                "cover_hash": None,
+                "cover_width": None,
                 "url_cover": "",
                 "url_manual": "",
                 "slug": "",
@@ -1855,7 +1861,9 @@ async def update_rom(
 
     if remove_cover:
         cleaned_data.update(await fs_resource_handler.remove_cover(rom))
-        cleaned_data.update({"url_cover": ""})
+        cleaned_data.update(
+            {"url_cover": "", "cover_hash": None, "cover_width": None}
+        )
     else:
         if artwork is not None and artwork.filename is not None:
             file_ext = validate_image_upload(artwork, label="Artwork")
@@ -1870,6 +1878,7 @@ async def update_rom(
                     "url_cover": "",
                     "path_cover_s": path_cover_s,
                     "path_cover_l": path_cover_l,
+                    **await fs_resource_handler.store_cover_derivatives(rom),
                 }
             )
         else:
@@ -1887,6 +1896,7 @@ async def update_rom(
                         "url_cover": url_cover,
                         "path_cover_s": path_cover_s,
                         "path_cover_l": path_cover_l,
+                        **await fs_resource_handler.store_cover_derivatives(rom),
                     }
                 )
             except ValidationError as e:
@@ -2208,6 +2218,9 @@ async def update_rom_user(
     # The statuses filter reads all four of these, and `hidden` also drops the
     # ROM from every user-scoped query, so any of them can move membership.
     if STATUS_MEMBERSHIP_FIELDS & cleaned_data.keys():
-        refresh_affected_smart_collections([id], membership_only=True)
+        facts = {SmartCollectionFact.STATUSES}
+        if "hidden" in cleaned_data:
+            facts.add(SmartCollectionFact.HIDDEN)
+        refresh_affected_smart_collections([id], facts=facts)
 
     return RomUserSchema.model_validate(rom_user)
@@ -1,6 +1,12 @@
+import asyncio
+import binascii
+import hashlib
 import json
 import shutil
-from typing import Annotated
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Annotated, Any
 from uuid import UUID, uuid4
 
 from anyio import open_file
@@ -14,6 +20,7 @@ from handler.database import db_platform_handler
 from handler.filesystem import fs_rom_handler
 from handler.redis_handler import async_cache
 from logger.logger import log
+from utils.filesystem import concatenate_files
 from utils.router import APIRouter
 
 router = APIRouter(
@@ -21,8 +28,50 @@ router = APIRouter(
     tags=["upload"],
 )
 
-ROM_ASSEMBLY_CHUNK_SIZE = 8192  # 8KB read buffer during assembly
 ROM_UPLOAD_MAX_CHUNK_SIZE = 64 * 1024 * 1024  # 64MB hard cap per chunk
+ROM_CHUNK_HASH_READ_SIZE = 1024 * 1024  # 1MB per hashing pass over chunk bytes
+
+
+@dataclass
+class _UploadDigests:
+    """Running CRC/MD5/SHA1 over the chunks of an upload, folded in index order."""
+
+    next_index: int = 0
+    crc_c: int = 0
+    md5_h: Any = field(default_factory=lambda: hashlib.md5(usedforsecurity=False))
+    sha1_h: Any = field(default_factory=lambda: hashlib.sha1(usedforsecurity=False))
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Monotonic time the upload session expires at, as its Redis key does
+    expires_at: float = field(default_factory=lambda: time.monotonic() + ROM_UPLOAD_TTL)
+
+    def fork(self) -> "_UploadDigests":
+        return _UploadDigests(
+            next_index=self.next_index,
+            crc_c=self.crc_c,
+            md5_h=self.md5_h.copy(),
+            sha1_h=self.sha1_h.copy(),
+            expires_at=self.expires_at,
+        )
+
+    def update(self, data: bytes) -> None:
+        self.crc_c = binascii.crc32(data, self.crc_c)
+        self.md5_h.update(data)
+        self.sha1_h.update(data)
+
+
+# Digests live in the worker that started the upload. Chunks that land on
+# another worker, or arrive ahead of the next expected index, are read back
+# from their staged file once the gap before them closes; if the digests are
+# gone by /complete, the scan hashes the file itself as before. Digests of
+# abandoned uploads are evicted once their session has expired.
+_upload_digests: dict[str, _UploadDigests] = {}
+
+
+def _evict_expired_digests() -> None:
+    now = time.monotonic()
+    for upload_id, digests in list(_upload_digests.items()):
+        if digests.expires_at <= now:
+            del _upload_digests[upload_id]
 
 
 def _session_key(upload_id: str) -> str:
@@ -81,7 +130,44 @@ def _validate_session_owner(session: dict, user_id: int) -> None:
         )
 
 
+def _chunk_path(upload_id: str, chunk_index: int) -> Path:
+    return ROM_UPLOAD_TMP_BASE / upload_id / f"{chunk_index:05d}"
+
+
+def _hash_chunk_file(digests: _UploadDigests, chunk_path: Path) -> None:
+    with open(chunk_path, "rb") as f:
+        while buf := f.read(ROM_CHUNK_HASH_READ_SIZE):
+            digests.update(buf)
+
+
+async def _fold_chunks(
+    upload_id: str,
+    digests: _UploadDigests,
+    streamed: _UploadDigests | None = None,
+) -> None:
+    """Advance `digests` past every contiguous chunk received so far.
+
+    `streamed` carries a chunk hashed while it was written, adopted as-is if
+    it is still the next one expected.
+    """
+    async with digests.lock:
+        if streamed is not None and streamed.next_index == digests.next_index + 1:
+            digests.next_index = streamed.next_index
+            digests.crc_c = streamed.crc_c
+            digests.md5_h = streamed.md5_h
+            digests.sha1_h = streamed.sha1_h
+
+        while await async_cache.sismember(
+            _chunks_key(upload_id), str(digests.next_index)
+        ):
+            await asyncio.to_thread(
+                _hash_chunk_file, digests, _chunk_path(upload_id, digests.next_index)
+            )
+            digests.next_index += 1
+
+
 async def _cleanup_upload_state(upload_id: str) -> None:
+    _upload_digests.pop(upload_id, None)
     _cleanup_tmp(upload_id)
     await async_cache.delete(_chunks_key(upload_id))
 
@@ -143,6 +229,8 @@ async def start_chunked_upload(
         "user_id": request.user.id,
     }
     await _save_session(upload_id, session)
+    _evict_expired_digests()
+    _upload_digests[upload_id] = _UploadDigests()
 
     log.info(
         f"Started chunked upload session {upload_id} for {filename} "
@@ -203,9 +291,25 @@ async def upload_chunk(
                 detail="Chunk exceeds maximum allowed size",
             )
 
-    chunk_path = ROM_UPLOAD_TMP_BASE / upload_id / f"{chunk_index:05d}"
+    chunk_path = _chunk_path(upload_id, chunk_index)
     chunk_bytes_written = 0
 
+    # Hash the chunk on its way to disk when it is the next one the digests
+    # expect; anything else is folded in from its file once its turn comes.
+    digests = _upload_digests.get(upload_id)
+    streamed = None
+    if digests is not None:
+        if chunk_index < digests.next_index:
+            # A rewrite of a chunk already folded in; its bytes may differ
+            _upload_digests.pop(upload_id, None)
+            digests = None
+        elif chunk_index == digests.next_index:
+            streamed = digests.fork()
+
+    # Request bodies arrive in pieces of a few KB; hashing each in its own
+    # thread would cost more in handoffs than the hashing itself.
+    unhashed: list[bytes] = []
+    unhashed_size = 0
     try:
         async with await open_file(chunk_path, "wb") as f:
             async for body_chunk in request.stream():
@@ -215,7 +319,16 @@ async def upload_chunk(
                         status_code=status.HTTP_413_CONTENT_TOO_LARGE,
                         detail="Chunk exceeds maximum allowed size",
                     )
+                if streamed is not None:
+                    unhashed.append(body_chunk)
+                    unhashed_size += len(body_chunk)
+                    if unhashed_size >= ROM_CHUNK_HASH_READ_SIZE:
+                        await asyncio.to_thread(streamed.update, b"".join(unhashed))
+                        unhashed.clear()
+                        unhashed_size = 0
                 await f.write(body_chunk)
+        if streamed is not None and unhashed:
+            await asyncio.to_thread(streamed.update, b"".join(unhashed))
     except Exception as exc:
         if chunk_path.exists():
             chunk_path.unlink()
@@ -233,6 +346,11 @@ async def upload_chunk(
     await async_cache.sadd(_chunks_key(upload_id), chunk_index)
     await async_cache.expire(_chunks_key(upload_id), ROM_UPLOAD_TTL)
 
+    if digests is not None:
+        if streamed is not None:
+            streamed.next_index += 1
+        await _fold_chunks(upload_id, digests, streamed)
+
     # Get current chunk count
     received_count = await async_cache.scard(_chunks_key(upload_id))
 
@@ -300,19 +418,13 @@ async def complete_chunked_upload(
     temp_location = file_location.with_name(
         f".{file_location.name}.{uuid4().hex}.assembling"
     )
-    assembled_bytes = 0
 
     try:
-        async with await open_file(temp_location, "wb") as dest:
-            for i in range(total_chunks):
-                chunk_path = ROM_UPLOAD_TMP_BASE / upload_id / f"{i:05d}"
-                async with await open_file(chunk_path, "rb") as src:
-                    while True:
-                        buf = await src.read(ROM_ASSEMBLY_CHUNK_SIZE)
-                        if not buf:
-                            break
-                        assembled_bytes += len(buf)
-                        await dest.write(buf)
+        assembled_bytes = await asyncio.to_thread(
+            concatenate_files,
+            (_chunk_path(upload_id, i) for i in range(total_chunks)),
+            temp_location,
+        )
         if assembled_bytes != session["total_size"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -335,6 +447,18 @@ async def complete_chunked_upload(
             detail="Error assembling file chunks",
         ) from exc
 
+    digests = _upload_digests.get(upload_id)
+    if digests is not None:
+        try:
+            await _fold_chunks(upload_id, digests)
+            if digests.next_index == total_chunks:
+                await fs_rom_handler.record_file_hashes(
+                    file_location, digests.crc_c, digests.md5_h, digests.sha1_h
+                )
+        except Exception as exc:
+            # The file is in place; the scan will just hash it itself
+            log.warning(f"Could not record hashes for upload {upload_id}: {exc}")
+
     await _cleanup_upload_state(upload_id)
 
     log.info(f"Chunked upload complete: {file_location}")
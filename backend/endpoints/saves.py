@@ -23,6 +23,7 @@ from handler.database import (
     db_screenshot_handler,
     db_sync_session_handler,
 )
+from handler.database.collections_handler import SmartCollectionFact
 from handler.filesystem import fs_asset_handler
 from handler.scan_handler import scan_save, scan_screenshot
 from logger.formatter import BLUE
@@ -248,9 +249,27 @@ async def add_save(
         f"Uploading save {hl(actual_filename)} for {hl(str(rom.name), color=BLUE)}"
     )
 
-    await fs_asset_handler.write_file(
+    # Hash while writing, so an upload identical to a save already in this
+    # slot is dropped before it replaces anything on disk.
+    existing_by_hash = None
+    async with fs_asset_handler.stage_file(
         file=saveFile, path=saves_path, filename=actual_filename
-    )
+    ) as staged:
+        content_hash = await fs_asset_handler.compute_staged_content_hash(staged)
+        if slot and content_hash and not overwrite:
+            existing_by_hash = db_save_handler.get_save_by_content_hash(
+                user_id=request.user.id,
+                rom_id=rom.id,
+                content_hash=content_hash,
+                slot=slot,
+            )
+            if existing_by_hash:
+                staged.discard()
+
+    if existing_by_hash:
+        return _build_save_schema(
+            existing_by_hash, _syncs_for_save(existing_by_hash.id, device), device
+        )
 
     scanned_save = await scan_save(
         file_name=actual_filename,
@@ -258,24 +277,9 @@ async def add_save(
         platform_fs_slug=rom.platform.fs_slug,
         rom_id=rom_id,
         emulator=emulator,
+        content_hash=content_hash,
     )
 
-    if slot and scanned_save.content_hash and not overwrite:
-        existing_by_hash = db_save_handler.get_save_by_content_hash(
-            user_id=request.user.id,
-            rom_id=rom.id,
-            content_hash=scanned_save.content_hash,
-            slot=slot,
-        )
-        if existing_by_hash:
-            try:
-                await fs_asset_handler.remove_file(f"{saves_path}/{actual_filename}")
-            except FileNotFoundError:
-                pass
-            return _build_save_schema(
-                existing_by_hash, _syncs_for_save(existing_by_hash.id, device), device
-            )
-
     if db_save is None:
         # Refresh hash if the file already exists to avoid mismatched metadata.
         colliding_save = db_save_handler.get_save_by_path(
@@ -392,7 +396,7 @@ async def add_save(
         rom_user.id, {"last_played": datetime.now(timezone.utc)}
     )
 
-    refresh_affected_smart_collections([rom.id], membership_only=True)
+    refresh_affected_smart_collections([rom.id], facts={SmartCollectionFact.SAVES})
 
     return _build_save_schema(db_save, _syncs_for_save(db_save.id, device), device)
 
@@ -581,15 +585,17 @@ async def update_save(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error)
 
     if saveFile:
-        await fs_asset_handler.write_file(
+        async with fs_asset_handler.stage_file(
             file=saveFile, path=db_save.file_path, filename=db_save.file_name
-        )
+        ) as staged:
+            content_hash = await fs_asset_handler.compute_staged_content_hash(staged)
         scanned_save = await scan_save(
             file_name=db_save.file_name,
             user=request.user,
             platform_fs_slug=db_save.rom.platform_fs_slug,
             rom_id=db_save.rom_id,
             emulator=db_save.emulator,
+            content_hash=content_hash,
         )
         db_save = db_save_handler.update_save(
             db_save.id,
@@ -688,7 +694,7 @@ def update_save_visibility(
         )
 
     # Sharing a save exposes it to every other user's `has_saves` filter.
-    refresh_affected_smart_collections([save.rom_id], membership_only=True)
+    refresh_affected_smart_collections([save.rom_id], facts={SmartCollectionFact.SAVES})
 
     return _build_save_schema(updated)
 
@@ -750,7 +756,9 @@ async def delete_saves(
                 error = f"Screenshot file {hl(save.screenshot.file_name)} not found for save {hl(save.file_name)}[{hl(save.rom.platform_slug)}]"
                 log.error(error)
 
-    refresh_affected_smart_collections(list(affected_rom_ids), membership_only=True)
+    refresh_affected_smart_collections(
+        list(affected_rom_ids), facts={SmartCollectionFact.SAVES}
+    )
 
     return saves
 
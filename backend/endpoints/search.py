@@ -1,6 +1,11 @@
 import asyncio
+import hashlib
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
 
 from fastapi import HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 
 from decorators.auth import protected_route
 from endpoints.responses.search import SearchCoverSchema, SearchRomSchema
@@ -17,13 +22,7 @@ from handler.metadata import (
     meta_sgdb_handler,
     meta_ss_handler,
 )
-from handler.metadata.flashpoint_handler import FlashpointRom
-from handler.metadata.igdb_handler import IGDBRom
-from handler.metadata.launchbox_handler.types import LaunchboxRom
-from handler.metadata.libretro_handler import LibretroRom
-from handler.metadata.moby_handler import MobyGamesRom
-from handler.metadata.sgdb_handler import SGDBRom
-from handler.metadata.ss_handler import SSRom
+from handler.redis_handler import async_cache
 from handler.scan_handler import (
     MetadataSource,
     get_main_platform_igdb_id,
@@ -32,6 +31,7 @@ from handler.scan_handler import (
 from logger.formatter import BLUE, CYAN
 from logger.formatter import highlight as hl
 from logger.logger import log
+from models.rom import Rom
 from utils import emoji
 from utils.router import APIRouter
 
@@ -41,27 +41,36 @@ router = APIRouter(
 )
 
 
-@protected_route(router.get, "/roms", [Scope.ROMS_READ])
-async def search_rom(
-    request: Request,
-    rom_id: int,
-    search_term: str | None = None,
-    search_by: str = "name",
-) -> list[SearchRomSchema]:
-    """Search for rom in metadata providers
+# Provider candidates for a (provider, platform, term) lookup, and the
+# SteamGridDB/libretro covers for a merged name. Re-running a search (or
+# switching between the dialog's search modes) is answered from here instead of
+# calling every provider again.
+SEARCH_RESULTS_CACHE_TTL = 60 * 30  # 30 minutes
 
-    Args:
-        request (Request): FastAPI request
-        rom_id (int): Rom ID
-        source (str): Source of the rom
-        search_term (str, optional): Search term. Defaults to None.
-        search_by (str, optional): Search by name or ID. Defaults to "name".
-        search_extended (bool, optional): Search extended info. Defaults to False.
 
-    Returns:
-        list[SearchRomSchema]: List of matched roms
-    """
+def _source_configs() -> dict[MetadataSource, tuple[Any, str, str]]:
+    """Handler, id key and cover key of every searchable provider."""
+    return {
+        MetadataSource.IGDB: (meta_igdb_handler, "igdb_id", "igdb_url_cover"),
+        MetadataSource.MOBY: (meta_moby_handler, "moby_id", "moby_url_cover"),
+        MetadataSource.FLASHPOINT: (
+            meta_flashpoint_handler,
+            "flashpoint_id",
+            "flashpoint_url_cover",
+        ),
+        MetadataSource.LAUNCHBOX: (
+            meta_launchbox_handler,
+            "launchbox_id",
+            "launchbox_url_cover",
+        ),
+        MetadataSource.SS: (meta_ss_handler, "ss_id", "ss_url_cover"),
+    }
+
 
+def _resolve_search(
+    request: Request, rom_id: int, search_term: str | None, search_by: str
+) -> tuple[Rom, str] | None:
+    """The ROM and term to search for, or None if there is nothing to search."""
     if (
         not meta_igdb_handler.is_enabled()
         and not meta_ss_handler.is_enabled()
@@ -77,17 +86,27 @@ async def search_rom(
 
     rom = db_rom_handler.get_rom(rom_id)
     if not rom:
-        return []
+        return None
 
     # Treat a rom hidden from the caller as non-existent.
     if request.user.is_authenticated and not get_permissions(request).can_see_rom(
         rom.id, rom.platform_id
     ):
-        return []
+        return None
 
     search_term = search_term or rom.fs_name_no_tags
     if not search_term:
-        return []
+        return None
+
+    if search_by.lower() == "id":
+        try:
+            int(search_term)
+        except ValueError as exc:
+            log.error(f"Search error: invalid ID '{search_term}'")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Tried searching by ID, but '{search_term}' is not a valid ID",
+            ) from exc
 
     log.info(
         f"{emoji.EMOJI_MAGNIFYING_GLASS_TILTED_RIGHT} Searching metadata providers..."
@@ -98,95 +117,141 @@ async def search_rom(
         f"{emoji.EMOJI_VIDEO_GAME} {hl(rom.platform_display_name, color=BLUE)} [{rom.platform_fs_slug}]: {hl(search_term)}[{rom.fs_name}]"
     )
 
-    igdb_matched_roms: list[IGDBRom] = []
-    moby_matched_roms: list[MobyGamesRom] = []
-    ss_matched_roms: list[SSRom] = []
-    flashpoint_matched_roms: list[FlashpointRom] = []
-    launchbox_matched_roms: list[LaunchboxRom] = []
+    return rom, search_term
 
+
+def _provider_searches(
+    rom: Rom, search_term: str, search_by: str
+) -> dict[MetadataSource, Callable[[], Awaitable[list]]]:
+    """One lookup per provider; a provider missing here is not searched."""
     if search_by.lower() == "id":
-        try:
-            igdb_rom, moby_rom, ss_rom, lb_rom = await asyncio.gather(
-                meta_igdb_handler.get_matched_rom_by_id(rom, int(search_term)),
-                meta_moby_handler.get_matched_rom_by_id(int(search_term)),
-                meta_ss_handler.get_matched_rom_by_id(rom, int(search_term)),
-                meta_launchbox_handler.get_matched_rom_by_id(int(search_term)),
-            )
-        except ValueError as exc:
-            log.error(f"Search error: invalid ID '{search_term}'")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Tried searching by ID, but '{search_term}' is not a valid ID",
-            ) from exc
-        else:
-            igdb_matched_roms = [igdb_rom] if igdb_rom else []
-            moby_matched_roms = [moby_rom] if moby_rom else []
-            ss_matched_roms = [ss_rom] if ss_rom else []
-            launchbox_matched_roms = [lb_rom] if lb_rom else []
-    elif search_by.lower() == "name":
-        (
-            igdb_matched_roms,
-            moby_matched_roms,
-            ss_matched_roms,
-            flashpoint_matched_roms,
-            launchbox_matched_roms,
-        ) = await asyncio.gather(
-            meta_igdb_handler.get_matched_roms_by_name(
+        search_id = int(search_term)
+
+        async def by_id(lookup: Awaitable[Any]) -> list:
+            match = await lookup
+            return [match] if match else []
+
+        return {
+            MetadataSource.IGDB: lambda: by_id(
+                meta_igdb_handler.get_matched_rom_by_id(rom, search_id)
+            ),
+            MetadataSource.MOBY: lambda: by_id(
+                meta_moby_handler.get_matched_rom_by_id(search_id)
+            ),
+            MetadataSource.SS: lambda: by_id(
+                meta_ss_handler.get_matched_rom_by_id(rom, search_id)
+            ),
+            MetadataSource.LAUNCHBOX: lambda: by_id(
+                meta_launchbox_handler.get_matched_rom_by_id(search_id)
+            ),
+        }
+
+    if search_by.lower() == "name":
+        return {
+            MetadataSource.IGDB: lambda: meta_igdb_handler.get_matched_roms_by_name(
                 rom, search_term, get_main_platform_igdb_id(rom.platform)
             ),
-            meta_moby_handler.get_matched_roms_by_name(
+            MetadataSource.MOBY: lambda: meta_moby_handler.get_matched_roms_by_name(
                 search_term, rom.platform.moby_id
             ),
-            meta_ss_handler.get_matched_roms_by_name(
+            MetadataSource.SS: lambda: meta_ss_handler.get_matched_roms_by_name(
                 rom, search_term, rom.platform.ss_id
             ),
-            meta_flashpoint_handler.get_matched_roms_by_name(
+            MetadataSource.FLASHPOINT: lambda: meta_flashpoint_handler.get_matched_roms_by_name(
                 search_term, rom.platform.slug
             ),
-            meta_launchbox_handler.get_matched_roms_by_name(
+            MetadataSource.LAUNCHBOX: lambda: meta_launchbox_handler.get_matched_roms_by_name(
                 search_term, rom.platform.slug
             ),
+        }
+
+    return {}
+
+
+def _search_cache_key(kind: str, scope: str, *parts: Any) -> str:
+    digest = hashlib.sha1(
+        json.dumps(parts, default=str).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"romm:search:{kind}:{scope}:{digest}"
+
+
+async def _cached(key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached value for ``key``, or fetch and cache it.
+
+    Empty results are not cached, so a provider that was down or disabled is
+    asked again on the next search.
+    """
+    cached = await async_cache.get(key)
+    if cached:
+        try:
+            return json.loads(cached)
+        except json.JSONDecodeError:
+            pass
+
+    value = await fetch()
+    if value:
+        await async_cache.set(key, json.dumps(value), ex=SEARCH_RESULTS_CACHE_TTL)
+    return value
+
+
+async def _search_provider(
+    source: MetadataSource,
+    rom: Rom,
+    search_term: str,
+    search_by: str,
+    fetch: Callable[[], Awaitable[list]],
+) -> list[dict]:
+    # IGDB and ScreenScraper localize names and covers by the ROM's regions
+    key = _search_cache_key(
+        source.value,
+        str(rom.platform_id),
+        search_by.lower(),
+        search_term,
+        sorted(rom.regions or []),
+    )
+    return await _cached(key, fetch)
+
+
+async def _get_enrichment(name: str, platform_slug: str) -> dict[str, Any]:
+    """SteamGridDB and libretro ids and covers for a merged match name."""
+
+    async def fetch() -> dict[str, Any]:
+        sgdb_rom, libretro_rom = await asyncio.gather(
+            meta_sgdb_handler.get_details_by_names([name]),
+            meta_libretro_handler.get_rom(name, platform_slug),
         )
+        fields: dict[str, Any] = {}
+        if sgdb_rom["sgdb_id"]:
+            fields["sgdb_id"] = sgdb_rom.get("sgdb_id", "")
+            fields["sgdb_url_cover"] = sgdb_rom.get("url_cover", "")
+        if libretro_rom["libretro_id"]:
+            fields["libretro_id"] = libretro_rom.get("libretro_id", "")
+            fields["libretro_url_cover"] = libretro_rom.get("url_cover", "")
+        return fields
 
-    merged_dict: dict[str, dict] = {}
+    return await _cached(_search_cache_key("covers", platform_slug, name), fetch)
 
-    source_configs = {
-        MetadataSource.IGDB: (
-            igdb_matched_roms,
-            meta_igdb_handler,
-            "igdb_id",
-            "igdb_url_cover",
-        ),
-        MetadataSource.MOBY: (
-            moby_matched_roms,
-            meta_moby_handler,
-            "moby_id",
-            "moby_url_cover",
-        ),
-        MetadataSource.FLASHPOINT: (
-            flashpoint_matched_roms,
-            meta_flashpoint_handler,
-            "flashpoint_id",
-            "flashpoint_url_cover",
-        ),
-        MetadataSource.LAUNCHBOX: (
-            launchbox_matched_roms,
-            meta_launchbox_handler,
-            "launchbox_id",
-            "launchbox_url_cover",
-        ),
-        MetadataSource.SS: (ss_matched_roms, meta_ss_handler, "ss_id", "ss_url_cover"),
-    }
+
+def _merge_matches(
+    rom: Rom,
+    matches: dict[MetadataSource, list[dict]],
+    enrichments: dict[str, dict[str, Any]],
+) -> dict[str, dict]:
+    """Merge provider candidates by normalized name, keyed by that name.
+
+    Higher-priority providers win on conflicting fields, regardless of which
+    provider answered first, so partial merges are stable as results arrive.
+    """
+    merged_dict: dict[str, dict] = {}
+    source_configs = _source_configs()
 
     ordered_sources = get_priority_ordered_metadata_sources(
         metadata_sources=list(source_configs.keys()), priority_type="metadata"
     )
 
     for meta_source in ordered_sources:
-        source_matched_roms, meta_handler, id_key, cover_key = source_configs[
-            meta_source
-        ]
-        for source_rom in source_matched_roms:  # trunk-ignore(mypy/attr-defined)
+        meta_handler, id_key, cover_key = source_configs[meta_source]
+        for source_rom in matches.get(meta_source, []):
             if source_rom[id_key]:
                 normalized_name = meta_handler.normalize_search_term(
                     source_rom.get("name", ""),
@@ -201,33 +266,53 @@ async def search_rom(
                     **merged_dict.get(normalized_name, {}),
                 }
 
-    async def get_sgdb_rom(name: str) -> tuple[str, SGDBRom]:
-        return name, await meta_sgdb_handler.get_details_by_names([name])
+    for name, fields in enrichments.items():
+        if name in merged_dict:
+            merged_dict[name] = {**merged_dict[name], **fields}
 
-    async def get_libretro_rom(name: str) -> tuple[str, LibretroRom]:
-        return name, await meta_libretro_handler.get_rom(name, rom.platform.slug)
+    return merged_dict
 
-    merged_names = list(merged_dict.keys())
-    sgdb_roms, libretro_roms = await asyncio.gather(
-        asyncio.gather(*[get_sgdb_rom(name) for name in merged_names]),
-        asyncio.gather(*[get_libretro_rom(name) for name in merged_names]),
-    )
 
-    for name, sgdb_rom in sgdb_roms:
-        if sgdb_rom["sgdb_id"]:
-            merged_dict[name] = {
-                **merged_dict[name],
-                "sgdb_id": sgdb_rom.get("sgdb_id", ""),
-                "sgdb_url_cover": sgdb_rom.get("url_cover", ""),
-            }
+@protected_route(router.get, "/roms", [Scope.ROMS_READ])
+async def search_rom(
+    request: Request,
+    rom_id: int,
+    search_term: str | None = None,
+    search_by: str = "name",
+) -> list[SearchRomSchema]:
+    """Search for rom in metadata providers
 
-    for name, libretro_rom in libretro_roms:
-        if libretro_rom["libretro_id"]:
-            merged_dict[name] = {
-                **merged_dict[name],
-                "libretro_id": libretro_rom.get("libretro_id", ""),
-                "libretro_url_cover": libretro_rom.get("url_cover", ""),
-            }
+    Args:
+        request (Request): FastAPI request
+        rom_id (int): Rom ID
+        search_term (str, optional): Search term. Defaults to None.
+        search_by (str, optional): Search by name or ID. Defaults to "name".
+
+    Returns:
+        list[SearchRomSchema]: List of matched roms
+    """
+
+    resolved = _resolve_search(request, rom_id, search_term, search_by)
+    if not resolved:
+        return []
+    rom, search_term = resolved
+
+    searches = _provider_searches(rom, search_term, search_by)
+    results = await asyncio.gather(
+        *(
+            _search_provider(source, rom, search_term, search_by, fetch)
+            for source, fetch in searches.items()
+        )
+    )
+    matches = dict(zip(searches.keys(), results, strict=True))
+
+    merged_names = list(_merge_matches(rom, matches, {}).keys())
+    enrichments = await asyncio.gather(
+        *(_get_enrichment(name, rom.platform.slug) for name in merged_names)
+    )
+    merged_dict = _merge_matches(
+        rom, matches, dict(zip(merged_names, enrichments, strict=True))
+    )
 
     matched_roms: list = list(merged_dict.values())
 
@@ -238,6 +323,125 @@ async def search_rom(
     return matched_roms
 
 
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_search(
+    rom: Rom, search_term: str, search_by: str
+) -> AsyncIterator[str]:
+    """Yield a `results` event with the merged matches every time a provider
+    or cover lookup adds to them, then a final `done` event.
+
+    Lookups that finish together are folded into a single event. Each merged
+    name gets its cover lookup as soon as it first appears, so covers fill in
+    while slower providers are still searching.
+    """
+    matches: dict[MetadataSource, list[dict]] = {}
+    enrichments: dict[str, dict[str, Any]] = {}
+    queue: asyncio.Queue[tuple[MetadataSource | str, Any]] = asyncio.Queue()
+    tasks: set[asyncio.Task] = set()
+
+    def spawn(key: MetadataSource | str, lookup: Awaitable[Any]) -> None:
+        async def run() -> None:
+            try:
+                result = await lookup
+            except Exception as exc:
+                log.error(f"Search error: lookup for {key} failed: {str(exc)}")
+                result = None
+            queue.put_nowait((key, result))
+
+        tasks.add(asyncio.create_task(run()))
+
+    def snapshot(merged_dict: dict[str, dict]) -> list[dict]:
+        return [
+            SearchRomSchema.model_validate(match).model_dump()
+            for match in merged_dict.values()
+        ]
+
+    for source, fetch in _provider_searches(rom, search_term, search_by).items():
+        spawn(source, _search_provider(source, rom, search_term, search_by, fetch))
+
+    merged_dict: dict[str, dict] = {}
+    pending = len(tasks)
+    try:
+        while pending:
+            changed = False
+            key, result = await queue.get()
+            while True:
+                pending -= 1
+                if isinstance(key, MetadataSource):
+                    matches[key] = result or []
+                    changed = changed or bool(result)
+                elif result:
+                    enrichments[key] = result
+                    changed = True
+                if queue.empty():
+                    break
+                key, result = queue.get_nowait()
+
+            if not changed:
+                continue
+
+            merged_dict = _merge_matches(rom, matches, enrichments)
+            for name in merged_dict.keys() - enrichments.keys():
+                # Placeholder so the name is only looked up once
+                enrichments[name] = {}
+                spawn(name, _get_enrichment(name, rom.platform.slug))
+                pending += 1
+
+            yield _sse_event("results", snapshot(merged_dict))
+
+        log.info("Results:")
+        for m_rom in merged_dict.values():
+            log.info(f"\t - {m_rom['name']}")
+
+        yield _sse_event("done", snapshot(merged_dict))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@protected_route(router.get, "/roms/stream", [Scope.ROMS_READ])
+async def search_rom_stream(
+    request: Request,
+    rom_id: int,
+    search_term: str | None = None,
+    search_by: str = "name",
+) -> StreamingResponse:
+    """Search for rom in metadata providers, streaming results as they arrive
+
+    Same search as `GET /search/roms`, sent as Server-Sent Events: a `results`
+    event carrying the full merged list each time it grows (new provider
+    candidates or covers), then a `done` event with the final list.
+
+    Args:
+        request (Request): FastAPI request
+        rom_id (int): Rom ID
+        search_term (str, optional): Search term. Defaults to None.
+        search_by (str, optional): Search by name or ID. Defaults to "name".
+
+    Returns:
+        StreamingResponse: text/event-stream of matched roms
+    """
+
+    resolved = _resolve_search(request, rom_id, search_term, search_by)
+
+    async def events() -> AsyncIterator[str]:
+        if not resolved:
+            yield _sse_event("done", [])
+            return
+        async for event in _stream_search(*resolved, search_by):
+            yield event
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream until it ends
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @protected_route(router.get, "/cover", [Scope.ROMS_READ])
 async def search_cover(
     request: Request,
@@ -184,12 +184,16 @@ async def activity_heartbeat(sid: str, data: ActivityEventPayload) -> None:
     if user_id is None or device_id is None or rom_id is None:
         return
 
-    entry = await _build_entry(
-        user_id=user_id,
-        device_id=device_id,
-        rom_id=rom_id,
-        preserve_started_at=True,
-    )
+    # A session already running this ROM was built when it started; refresh
+    # it as is rather than looking the user, ROM and device up again.
+    entry = await activity_handler.get_active(user_id, device_id)
+    if entry is None or entry["rom_id"] != rom_id:
+        entry = await _build_entry(
+            user_id=user_id,
+            device_id=device_id,
+            rom_id=rom_id,
+            preserve_started_at=True,
+        )
     if entry is None:
         return
 
@@ -31,9 +31,6 @@ async def open_room(sid: str, data: RoomData):
     if not session_id or not player_id:
         return "Invalid data: sessionId and playerId required"
 
-    if await netplay_handler.get(session_id):
-        return "Room already exists"
-
     new_room = NetplayRoom(
         owner=sid,
         players={
@@ -51,9 +48,11 @@ async def open_room(sid: str, data: RoomData):
         password=extra_data.get("room_password", None),
         max_players=data.get("maxPlayers") or DEFAULT_MAX_PLAYERS,
     )
-    await netplay_handler.set(session_id, new_room)
+    if not await netplay_handler.create(session_id, new_room):
+        return "Room already exists"
 
     await netplay_socket_handler.socket_server.enter_room(sid, session_id)
+    await netplay_handler.attach_socket(sid, session_id, _host_id())
     await netplay_socket_handler.socket_server.save_session(
         sid,
         {
@@ -85,18 +84,22 @@ async def join_room(sid: str, data: RoomData):
     ):
         return "Incorrect password"
 
-    if len(current_room["players"].keys()) >= current_room["max_players"]:
-        return "Room is full"
-
-    current_room["players"][player_id] = NetplayPlayerInfo(
-        socketId=sid,
-        player_name=extra_data.get("player_name") or f"Player {player_id}",
-        userid=extra_data.get("userid"),
-        playerId=extra_data.get("playerId"),
+    players = await netplay_handler.add_player(
+        session_id,
+        player_id,
+        NetplayPlayerInfo(
+            socketId=sid,
+            player_name=extra_data.get("player_name") or f"Player {player_id}",
+            userid=extra_data.get("userid"),
+            playerId=extra_data.get("playerId"),
+        ),
+        max_players=current_room["max_players"],
     )
-    await netplay_handler.set(session_id, current_room)
+    if players is None:
+        return "Room is full"
 
     await netplay_socket_handler.socket_server.enter_room(sid, session_id)
+    await netplay_handler.attach_socket(sid, session_id, _host_id())
     await netplay_socket_handler.socket_server.save_session(
         sid,
         {
@@ -105,19 +108,19 @@ async def join_room(sid: str, data: RoomData):
         },
     )
     await netplay_socket_handler.socket_server.emit(
-        "users-updated", current_room["players"], room=session_id
+        "users-updated", players, room=session_id
     )
 
-    return None, current_room["players"]
+    return None, players
 
 
 async def _handle_leave(sid: str, session_id: str, player_id: str):
-    current_room = await netplay_handler.get(session_id)
+    await netplay_handler.detach_socket(sid)
+
+    current_room = await netplay_handler.remove_player(session_id, player_id)
     if not current_room:
         return
 
-    current_room["players"].pop(player_id, None)
-
     if not current_room["players"]:
         await netplay_handler.delete([session_id])
         # Notify clients that the room is now empty
@@ -130,9 +133,10 @@ async def _handle_leave(sid: str, session_id: str, player_id: str):
         # Owner left, assign a new one
         remaining_players = list(current_room["players"].values())
         if remaining_players:
-            current_room["owner"] = remaining_players[0]["socketId"]
+            await netplay_handler.set_owner(
+                session_id, remaining_players[0]["socketId"]
+            )
 
-    await netplay_handler.set(session_id, current_room)
     await netplay_socket_handler.socket_server.emit(
         "users-updated", current_room["players"], room=session_id
     )
@@ -200,12 +204,23 @@ async def disconnect(sid: str):
         await _handle_leave(sid, session_id, player_id)
 
 
+def _host_id() -> str:
+    """Identifies this worker among the ones sharing the Redis manager."""
+    return netplay_socket_handler.socket_server.manager.host_id
+
+
 async def _broadcast_to_room(sid: str, event: str, data: Any):
-    stored_session = await netplay_socket_handler.socket_server.get_session(sid)
-    session_id = stored_session.get("session_id")
+    # Routing state lives in worker memory, so relaying a frame costs no
+    # Redis round trip; frames only go through Redis when a player of the
+    # room is connected to another worker.
+    session_id = netplay_handler.get_socket_room(sid)
     if session_id:
         await netplay_socket_handler.socket_server.emit(
-            event, data, room=session_id, skip_sid=sid
+            event,
+            data,
+            room=session_id,
+            skip_sid=sid,
+            ignore_queue=await netplay_handler.is_local_room(session_id, _host_id()),
         )
 
 
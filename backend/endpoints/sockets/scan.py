@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass
 from itertools import batched, chain
 from typing import Any, Final
@@ -11,7 +12,14 @@ from rq import Worker, get_current_job
 from rq.job import Job, JobStatus
 from sqlalchemy.exc import IntegrityError
 
-from config import DEV_MODE, REDIS_URL, SCAN_TIMEOUT, SCAN_WORKERS, TASK_RESULT_TTL
+from config import (
+    DEV_MODE,
+    REDIS_URL,
+    SCAN_MEDIA_WORKERS,
+    SCAN_TIMEOUT,
+    SCAN_WORKERS,
+    TASK_RESULT_TTL,
+)
 from config.config_manager import MetadataMediaType
 from config.config_manager import config_manager as cm
 from endpoints.responses import TaskType
@@ -76,9 +84,15 @@ from utils import emoji
 from utils.audio_tags import remove_persisted_cover
 from utils.context import initialize_context
 from utils.gamelist_exporter import GamelistExporter
+from utils.media_fetch_queue import MediaFetchQueue
+from utils.metrics import scan_stage, timed_scan_stage
 from utils.pegasus_exporter import PegasusExporter
+from utils.socket_batcher import SocketEventBatcher
 
 STOP_SCAN_FLAG: Final = "scan:stop"
+# Per-ROM events and stats are sent at most once per interval, as a batch.
+SCAN_PROGRESS_INTERVAL: Final = 0.25  # seconds
+SCAN_JOB_META_INTERVAL: Final = 2.0  # seconds
 
 
 def _scan_platforms_func_name() -> str:
@@ -157,27 +171,33 @@ class ScanStats:
     new_firmware: int = 0
 
     def __post_init__(self):
-        # Lock for thread-safe updates
-        self._lock = asyncio.Lock()
+        self._job_meta_saved_at = 0.0
 
     async def update(self, socket_manager: socketio.AsyncRedisManager, **kwargs):
-        async with self._lock:
-            for key, value in kwargs.items():
-                if hasattr(self, key):
-                    setattr(self, key, value)
+        for key, value in kwargs.items():
+            if hasattr(self, key):
+                setattr(self, key, value)
 
-            update_job_meta({"scan_stats": self.to_dict()})
-            await socket_manager.emit("scan:update_stats", self.to_dict())
+        await self._publish(socket_manager)
 
     async def increment(self, socket_manager: socketio.AsyncRedisManager, **kwargs):
-        async with self._lock:
-            for key, value in kwargs.items():
-                if hasattr(self, key):
-                    current_value = getattr(self, key)
-                    setattr(self, key, current_value + value)
+        for key, value in kwargs.items():
+            if hasattr(self, key):
+                current_value = getattr(self, key)
+                setattr(self, key, current_value + value)
+
+        await self._publish(socket_manager)
+
+    async def _publish(self, socket_manager: socketio.AsyncRedisManager):
+        # Saving job meta is a blocking Redis round-trip, so it runs on a timer;
+        # the socket manager a scan uses coalesces the emit on its own.
+        if time.monotonic() - self._job_meta_saved_at >= SCAN_JOB_META_INTERVAL:
+            self.save_job_meta()
+        await socket_manager.emit("scan:update_stats", self.to_dict())
 
-            update_job_meta({"scan_stats": self.to_dict()})
-            await socket_manager.emit("scan:update_stats", self.to_dict())
+    def save_job_meta(self):
+        update_job_meta({"scan_stats": self.to_dict()})
+        self._job_meta_saved_at = time.monotonic()
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -201,55 +221,65 @@ def _get_socket_manager() -> socketio.AsyncRedisManager:
 
 async def _identify_firmware(
     platform: Platform,
-    fs_fw: str,
+    fs_firmware: list[str],
     scan_type: ScanType,
 ) -> int:
-    # Break early if the flag is set
-    if redis_client.get(STOP_SCAN_FLAG):
-        return 0
-
-    firmware = db_firmware_handler.get_firmware_by_filename(platform.id, fs_fw)
-
-    # The row is consulted before the filesystem, so an entry that could never
-    # be skipped costs no stat.
-    if firmware and not _should_hash_firmware(scan_type, firmware):
-        # The file is stat'd where it was just enumerated, never at the path the
-        # row recorded. A row whose path predates a change in the library layout
-        # is rebuilt below instead, which is what refreshes it.
-        firmware_path = fs_firmware_handler.get_firmware_fs_structure(platform.fs_slug)
-        if firmware.file_path == firmware_path:
-            file_size = await fs_firmware_handler.get_file_size(
-                f"{firmware_path}/{fs_fw}"
-            )
-            if file_size == firmware.file_size_bytes:
-                # Only written when it actually flips, keeping `updated_at`
-                # usable as an incremental signal.
-                if firmware.missing_from_fs:
-                    db_firmware_handler.update_firmware(
-                        firmware.id, {"missing_from_fs": False}
-                    )
-                return 0
+    """Scan a platform's firmware files, returning how many were new.
 
-    scanned_firmware = await scan_firmware(
-        platform=platform,
-        file_name=fs_fw,
-        firmware=firmware,
-    )
+    Only new or changed files are read, and all of them are verified against
+    the known BIOS files in one index lookup.
+    """
+    firmware_path = fs_firmware_handler.get_firmware_fs_structure(platform.fs_slug)
+    scanned: list[tuple[Firmware, Firmware | None]] = []
 
-    is_verified = Firmware.verify_file_hashes(
-        platform_slug=platform.slug,
-        file_name=fs_fw,
-        file_size_bytes=scanned_firmware.file_size_bytes,
-        md5_hash=scanned_firmware.md5_hash,
-        sha1_hash=scanned_firmware.sha1_hash,
-        crc_hash=scanned_firmware.crc_hash,
+    for fs_fw in fs_firmware:
+        # Break early if the flag is set
+        if redis_client.get(STOP_SCAN_FLAG):
+            break
+
+        firmware = db_firmware_handler.get_firmware_by_filename(platform.id, fs_fw)
+
+        # The row is consulted before the filesystem, so an entry that could never
+        # be skipped costs no stat.
+        if firmware and not _should_hash_firmware(scan_type, firmware):
+            # The file is stat'd where it was just enumerated, never at the path the
+            # row recorded. A row whose path predates a change in the library layout
+            # is rebuilt below instead, which is what refreshes it.
+            if firmware.file_path == firmware_path:
+                file_size = await fs_firmware_handler.get_file_size(
+                    f"{firmware_path}/{fs_fw}"
+                )
+                if file_size == firmware.file_size_bytes:
+                    # Only written when it actually flips, keeping `updated_at`
+                    # usable as an incremental signal.
+                    if firmware.missing_from_fs:
+                        db_firmware_handler.update_firmware(
+                            firmware.id, {"missing_from_fs": False}
+                        )
+                    continue
+
+        scanned_firmware = await scan_firmware(
+            platform=platform,
+            file_name=fs_fw,
+            firmware=firmware,
+        )
+        scanned.append((scanned_firmware, firmware))
+
+    verified = await Firmware.verify_firmware(
+        platform.slug, [scanned_firmware for scanned_firmware, _ in scanned]
     )
 
-    scanned_firmware.missing_from_fs = False
-    scanned_firmware.is_verified = is_verified
-    db_firmware_handler.add_firmware(scanned_firmware)
+    new_firmware = 0
+    for (scanned_firmware, firmware), is_verified in zip(
+        scanned, verified, strict=True
+    ):
+        scanned_firmware.missing_from_fs = False
+        scanned_firmware.is_verified = is_verified
+        db_firmware_handler.add_firmware(scanned_firmware)
+        if not firmware:
+            new_firmware += 1
 
-    return 1 if not firmware else 0
+    return new_firmware
 
 
 def should_scan_rom(
@@ -391,6 +421,7 @@ async def _identify_rom(
     playmatch_enabled: bool,
     socket_manager: socketio.AsyncRedisManager,
     scan_stats: ScanStats,
+    media_queue: MediaFetchQueue | None = None,
 ) -> None:
     # Break early if the flag is set
     if redis_client.get(STOP_SCAN_FLAG):
@@ -426,13 +457,14 @@ async def _identify_rom(
         # the files and check whether they belong to an existing entry that went
         # missing (a renamed or moved ROM), so its collections, notes, and
         # uploaded assets carry over instead of being orphaned on a duplicate.
-        parsed_rom_files = await fs_rom_handler.get_rom_files(
-            Rom(
-                **rom_attrs,
-                platform=platform,
-            ),
-            calculate_hashes=calculate_hashes,
-        )
+        with scan_stage("files"):
+            parsed_rom_files = await fs_rom_handler.get_rom_files(
+                Rom(
+                    **rom_attrs,
+                    platform=platform,
+                ),
+                calculate_hashes=calculate_hashes,
+            )
         fs_rom.update(
             {
                 "files": parsed_rom_files.rom_files,
@@ -505,9 +537,10 @@ async def _identify_rom(
         if calculate_hashes:
             log.debug(f"Calculating file hashes for {rom.fs_name}...")
 
-        parsed_rom_files = await fs_rom_handler.get_rom_files(
-            rom, calculate_hashes=calculate_hashes
-        )
+        with scan_stage("files"):
+            parsed_rom_files = await fs_rom_handler.get_rom_files(
+                rom, calculate_hashes=calculate_hashes
+            )
         fs_rom.update(
             {
                 "files": parsed_rom_files.rom_files,
@@ -549,17 +582,18 @@ async def _identify_rom(
                 pass
 
     log.debug(f"Scanning {rom.fs_name}...")
-    scanned_rom = await scan_rom(
-        scan_type=scan_type,
-        platform=platform,
-        rom=rom,
-        fs_rom=fs_rom,
-        metadata_sources=metadata_sources,
-        newly_added=newly_added,
-        launchbox_remote_enabled=launchbox_remote_enabled,
-        playmatch_enabled=playmatch_enabled,
-        socket_manager=socket_manager,
-    )
+    with scan_stage("identify"):
+        scanned_rom = await scan_rom(
+            scan_type=scan_type,
+            platform=platform,
+            rom=rom,
+            fs_rom=fs_rom,
+            metadata_sources=metadata_sources,
+            newly_added=newly_added,
+            launchbox_remote_enabled=launchbox_remote_enabled,
+            playmatch_enabled=playmatch_enabled,
+            socket_manager=socket_manager,
+        )
 
     await scan_stats.increment(
         socket_manager=socket_manager,
@@ -568,7 +602,8 @@ async def _identify_rom(
         identified_roms=1 if scanned_rom.is_identified else 0,
     )
 
-    _added_rom = db_rom_handler.add_rom(scanned_rom)
+    with scan_stage("db_write"):
+        _added_rom = db_rom_handler.add_rom(scanned_rom)
 
     if _added_rom.is_identified:
         await socket_manager.emit(
@@ -589,7 +624,8 @@ async def _identify_rom(
         # Reconcile against the existing rows instead of replacing them, so file
         # ids survive a rescan and anything keyed on them (track metadata,
         # persisted soundtrack covers) stays valid.
-        synced = db_rom_handler.sync_rom_files(_added_rom.id, fs_rom["files"])
+        with scan_stage("db_files"):
+            synced = db_rom_handler.sync_rom_files(_added_rom.id, fs_rom["files"])
         for cover_path in synced.orphaned_cover_paths:
             remove_persisted_cover(cover_path)
         for saved in synced.files:
@@ -599,88 +635,140 @@ async def _identify_rom(
     if scan_type == ScanType.HASHES:
         return
 
-    path_cover_s, path_cover_l = await fs_resource_handler.get_cover(
-        entity=_added_rom,
-        overwrite=_added_rom.url_cover != rom.url_cover,
-        url_cover=add_ss_auth_to_url(_added_rom.url_cover),
+    media_job = timed_scan_stage(
+        "media",
+        _fetch_rom_media(
+            rom=rom,
+            scanned_rom=_added_rom,
+            metadata_sources=metadata_sources,
+            socket_manager=socket_manager,
+        ),
     )
+    if media_queue is None:
+        await media_job
+    else:
+        # Hand the downloads off so this scan slot can identify the next ROM.
+        await media_queue.submit(media_job, name=_added_rom.fs_name)
 
-    path_manual = await fs_resource_handler.get_manual(
-        rom=_added_rom,
-        overwrite=_added_rom.url_manual != rom.url_manual,
-        url_manual=add_ss_auth_to_url(_added_rom.url_manual),
-    )
 
-    screenshots_changed = pydash.xor(
-        _added_rom.url_screenshots or [], rom.url_screenshots or []
-    )
-    url_screenshots = _added_rom.url_screenshots or []
-    path_screenshots = await fs_resource_handler.get_rom_screenshots(
-        rom=_added_rom,
-        overwrite=bool(screenshots_changed),
-        url_screenshots=[add_ss_auth_to_url(u) for u in url_screenshots],
-    )
+async def _fetch_rom_media(
+    rom: Rom,
+    scanned_rom: Rom,
+    metadata_sources: list[str],
+    socket_manager: socketio.AsyncRedisManager,
+) -> None:
+    """Download a scanned ROM's artwork, manual, screenshots and badges.
 
-    _added_rom.path_cover_s = path_cover_s
-    _added_rom.path_cover_l = path_cover_l
-    _added_rom.path_screenshots = path_screenshots
-    _added_rom.path_manual = path_manual
+    Each asset is a separate file, so they are fetched concurrently; per-host
+    limits in the resources handler keep that from flooding any one provider.
+    `rom` is the entry as it was before the scan, used to tell which URLs changed.
+    """
 
-    # Update the scanned rom with the cover and screenshots paths and update database
-    db_rom_handler.update_rom(
-        _added_rom.id,
-        {
-            "path_cover_s": path_cover_s,
-            "path_cover_l": path_cover_l,
-            "path_screenshots": path_screenshots,
-            "path_manual": path_manual,
-        },
+    async def fetch_cover() -> tuple[str | None, str | None, dict[str, Any]]:
+        path_cover_s, path_cover_l = await fs_resource_handler.get_cover(
+            entity=scanned_rom,
+            overwrite=scanned_rom.url_cover != rom.url_cover,
+            url_cover=add_ss_auth_to_url(scanned_rom.url_cover),
+        )
+        cover_derivatives = await fs_resource_handler.store_cover_derivatives(
+            scanned_rom
+        )
+        return path_cover_s, path_cover_l, cover_derivatives
+
+    screenshots_changed = pydash.xor(
+        scanned_rom.url_screenshots or [], rom.url_screenshots or []
     )
+    url_screenshots = scanned_rom.url_screenshots or []
 
     # Handle special media files from Screenscraper, ES-DE gamelist.xml and
     # LaunchBox. Media that didn't land on disk has its recorded path cleared, so
     # write those dicts back when that happens.
     preferred_media_types = get_preferred_media_types()
-    media_updates: dict[str, Any] = {}
-
-    if _added_rom.ss_metadata and MetadataSource.SS in metadata_sources:
-        if await fs_resource_handler.store_metadata_media(
-            _added_rom.ss_metadata, preferred_media_types, add_ss_auth_to_url
-        ):
-            media_updates["ss_metadata"] = _added_rom.ss_metadata
+    media_sources: list[tuple[str, dict[str, Any], Any]] = []
+    if scanned_rom.ss_metadata and MetadataSource.SS in metadata_sources:
+        media_sources.append(
+            ("ss_metadata", scanned_rom.ss_metadata, add_ss_auth_to_url)
+        )
+    if scanned_rom.gamelist_metadata and MetadataSource.GAMELIST in metadata_sources:
+        media_sources.append(("gamelist_metadata", scanned_rom.gamelist_metadata, None))
+    if scanned_rom.launchbox_metadata and MetadataSource.LAUNCHBOX in metadata_sources:
+        media_sources.append(
+            ("launchbox_metadata", scanned_rom.launchbox_metadata, None)
+        )
 
-    if _added_rom.gamelist_metadata and MetadataSource.GAMELIST in metadata_sources:
-        if await fs_resource_handler.store_metadata_media(
-            _added_rom.gamelist_metadata, preferred_media_types
-        ):
-            media_updates["gamelist_metadata"] = _added_rom.gamelist_metadata
+    # Store normal and locked badges
+    badges: list[tuple[str, str]] = []
+    if scanned_rom.ra_metadata and MetadataSource.RA in metadata_sources:
+        for ach in scanned_rom.ra_metadata.get("achievements", []):
+            for url_key, path_key in (
+                ("badge_url_lock", "badge_path_lock"),
+                ("badge_url", "badge_path"),
+            ):
+                badge_url = ach.get(url_key, None)
+                badge_path = ach.get(path_key, None)
+                if badge_url and badge_path:
+                    badges.append((badge_url, badge_path))
+
+    (
+        (path_cover_s, path_cover_l, cover_derivatives),
+        path_manual,
+        path_screenshots,
+        media_changed,
+        _,
+    ) = await asyncio.gather(
+        fetch_cover(),
+        fs_resource_handler.get_manual(
+            rom=scanned_rom,
+            overwrite=scanned_rom.url_manual != rom.url_manual,
+            url_manual=add_ss_auth_to_url(scanned_rom.url_manual),
+        ),
+        fs_resource_handler.get_rom_screenshots(
+            rom=scanned_rom,
+            overwrite=bool(screenshots_changed),
+            url_screenshots=[add_ss_auth_to_url(u) for u in url_screenshots],
+        ),
+        asyncio.gather(
+            *(
+                fs_resource_handler.store_metadata_media(
+                    metadata, preferred_media_types, url_transform
+                )
+                for _, metadata, url_transform in media_sources
+            )
+        ),
+        asyncio.gather(
+            *(
+                fs_resource_handler.store_ra_badge(badge_url, badge_path)
+                for badge_url, badge_path in badges
+            )
+        ),
+    )
 
-    if _added_rom.launchbox_metadata and MetadataSource.LAUNCHBOX in metadata_sources:
-        if await fs_resource_handler.store_metadata_media(
-            _added_rom.launchbox_metadata, preferred_media_types
-        ):
-            media_updates["launchbox_metadata"] = _added_rom.launchbox_metadata
+    scanned_rom.path_cover_s = path_cover_s
+    scanned_rom.path_cover_l = path_cover_l
+    scanned_rom.cover_hash = cover_derivatives["cover_hash"]
+    scanned_rom.cover_width = cover_derivatives["cover_width"]
+    scanned_rom.path_screenshots = path_screenshots
+    scanned_rom.path_manual = path_manual
 
-    if media_updates:
-        db_rom_handler.update_rom(_added_rom.id, media_updates)
+    # Update the scanned rom with the cover and screenshots paths and update database
+    updates: dict[str, Any] = {
+        "path_cover_s": path_cover_s,
+        "path_cover_l": path_cover_l,
+        **cover_derivatives,
+        "path_screenshots": path_screenshots,
+        "path_manual": path_manual,
+    }
+    for (column, metadata, _), changed in zip(
+        media_sources, media_changed, strict=True
+    ):
+        if changed:
+            updates[column] = metadata
 
-    # Store normal and locked badges
-    if _added_rom.ra_metadata and MetadataSource.RA in metadata_sources:
-        for ach in _added_rom.ra_metadata.get("achievements", []):
-            badge_url_lock = ach.get("badge_url_lock", None)
-            badge_path_lock = ach.get("badge_path_lock", None)
-            if badge_url_lock and badge_path_lock:
-                await fs_resource_handler.store_ra_badge(
-                    badge_url_lock, badge_path_lock
-                )
-            badge_url = ach.get("badge_url", None)
-            badge_path = ach.get("badge_path", None)
-            if badge_url and badge_path:
-                await fs_resource_handler.store_ra_badge(badge_url, badge_path)
+    db_rom_handler.update_rom(scanned_rom.id, updates)
 
     await socket_manager.emit(
         "scan:scanning_rom",
-        SimpleRomSchema.from_orm_with_factory(_added_rom).model_dump(
+        SimpleRomSchema.from_orm_with_factory(scanned_rom).model_dump(
             exclude={
                 "created_at",
                 "updated_at",
@@ -703,6 +791,7 @@ async def _scan_selected_roms(
     playmatch_enabled: bool,
     socket_manager: socketio.AsyncRedisManager,
     scan_stats: ScanStats,
+    media_queue: MediaFetchQueue | None = None,
 ) -> ScanStats:
     """Scan a hand-picked set of ROMs without touching the rest of their platform.
 
@@ -766,6 +855,7 @@ async def _scan_selected_roms(
                 playmatch_enabled=playmatch_enabled,
                 socket_manager=socket_manager,
                 scan_stats=scan_stats,
+                media_queue=media_queue,
             )
 
     results = await asyncio.gather(
@@ -797,6 +887,7 @@ async def _identify_platform(
     playmatch_enabled: bool,
     socket_manager: socketio.AsyncRedisManager,
     scan_stats: ScanStats,
+    media_queue: MediaFetchQueue | None = None,
 ) -> ScanStats:
     # Stop the scan if the flag is set
     if redis_client.get(STOP_SCAN_FLAG):
@@ -836,13 +927,11 @@ async def _identify_platform(
     else:
         log.info(f"{hl(str(len(fs_firmware)))} firmware files found")
 
-    new_firmware = 0
-    for fs_fw in fs_firmware:
-        new_firmware += await _identify_firmware(
-            platform=platform,
-            fs_fw=fs_fw,
-            scan_type=scan_type,
-        )
+    new_firmware = await _identify_firmware(
+        platform=platform,
+        fs_firmware=fs_firmware,
+        scan_type=scan_type,
+    )
 
     # `new_firmware_count` is scoped to this scan: the client reports what the
     # scan discovered, not the platform's total firmware library.
@@ -910,6 +999,7 @@ async def _identify_platform(
                 playmatch_enabled=playmatch_enabled,
                 socket_manager=socket_manager,
                 scan_stats=scan_stats,
+                media_queue=media_queue,
             )
 
     for fs_roms_batch in batched(fs_roms, 200, strict=False):
@@ -1041,7 +1131,13 @@ async def scan_platforms(
     if not platform_fs_slugs:
         platform_fs_slugs = []
 
-    socket_manager = _get_socket_manager()
+    # Clients get every ROM and the latest stats, just not one message each.
+    socket_manager = SocketEventBatcher(
+        _get_socket_manager(),
+        batched={"scan:scanning_rom": "scan:scanning_roms"},
+        coalesced={"scan:update_stats"},
+        interval=SCAN_PROGRESS_INTERVAL,
+    )
     scan_stats = ScanStats()
 
     # A ROM-id-scoped scan resolves its work from the database, so it neither
@@ -1167,8 +1263,14 @@ async def scan_platforms(
         total_roms=total_roms,
     )
 
+    # Artwork for identified ROMs downloads in the background while the scan
+    # identifies the rest; it's drained before the post-scan steps below.
+    media_queue = MediaFetchQueue(max_pending=SCAN_MEDIA_WORKERS)
+
     async def stop_scan():
+        await media_queue.cancel()
         log.info(f"{emoji.EMOJI_STOP_SIGN} Scan stopped manually")
+        scan_stats.save_job_meta()
         await socket_manager.emit("scan:done", scan_stats.to_dict())
         redis_client.delete(STOP_SCAN_FLAG)
 
@@ -1187,6 +1289,7 @@ async def scan_platforms(
                     playmatch_enabled=playmatch_enabled,
                     socket_manager=socket_manager,
                     scan_stats=scan_stats,
+                    media_queue=media_queue,
                 )
         else:
             if len(platform_list) == 0:
@@ -1210,6 +1313,7 @@ async def scan_platforms(
                     playmatch_enabled=playmatch_enabled,
                     socket_manager=socket_manager,
                     scan_stats=scan_stats,
+                    media_queue=media_queue,
                 )
 
             missed_platforms = db_platform_handler.mark_missing_platforms(fs_platforms)
@@ -1218,6 +1322,8 @@ async def scan_platforms(
                 for p in missed_platforms:
                     log.warning(f" - {p.slug} ({p.fs_slug})")
 
+        await media_queue.drain()
+
         if MetadataSource.SS in metadata_sources:
             log_ss_scan_summary()
 
@@ -1285,10 +1391,12 @@ async def scan_platforms(
                         )
             log.info("Pegasus metadata auto-export completed.")
 
+        scan_stats.save_job_meta()
         await socket_manager.emit("scan:done", scan_stats.to_dict())
     except ScanStoppedException:
         await stop_scan()
     except Exception as e:
+        await media_queue.cancel()
         log.error(f"Error in scan_platform: {e}")
         # Catch all exceptions and emit error to the client
         await socket_manager.emit("scan:done_ko", str(e))
@@ -11,6 +11,7 @@ from exceptions.endpoint_exceptions import RomNotFoundInDatabaseException
 from handler.auth.constants import Scope
 from handler.auth.dependencies import assert_rom_visible
 from handler.database import db_rom_handler, db_screenshot_handler, db_state_handler
+from handler.database.collections_handler import SmartCollectionFact
 from handler.filesystem import fs_asset_handler
 from handler.filesystem.assets_handler import build_asset_file_response
 from handler.scan_handler import scan_screenshot, scan_state
@@ -173,7 +174,7 @@ async def add_state(
     if not rom:
         raise RomNotFoundInDatabaseException(rom_id)
 
-    refresh_affected_smart_collections([rom.id], membership_only=True)
+    refresh_affected_smart_collections([rom.id], facts={SmartCollectionFact.STATES})
 
     return StateSchema.model_validate(db_state)
 
@@ -364,7 +365,9 @@ def update_state_visibility(
         )
 
     # Sharing a state exposes it to every other user's `has_states` filter.
-    refresh_affected_smart_collections([state.rom_id], membership_only=True)
+    refresh_affected_smart_collections(
+        [state.rom_id], facts={SmartCollectionFact.STATES}
+    )
 
     return StateSchema.model_validate(updated)
 
@@ -426,6 +429,8 @@ async def delete_states(
                 error = f"Screenshot file {hl(state.screenshot.file_name)} not found for state {hl(state.file_name)}[{hl(state.rom.platform_slug)}]"
                 log.error(error)
 
-    refresh_affected_smart_collections(list(affected_rom_ids), membership_only=True)
+    refresh_affected_smart_collections(
+        list(affected_rom_ids), facts={SmartCollectionFact.STATES}
+    )
 
     return states
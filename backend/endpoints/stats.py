@@ -3,6 +3,7 @@ from fastapi import Request
 from endpoints.responses.stats import StatsReturn
 from handler.auth.dependencies import get_permissions
 from handler.database import db_stats_handler
+from handler.database.stats_handler import coverage_items, region_items
 from utils.router import APIRouter
 
 router = APIRouter(
@@ -27,6 +28,41 @@ def stats(request: Request, include_platform_stats: bool = False) -> StatsReturn
         hidden_platform_ids = list(perms.hidden_platform_ids)
         hidden_rom_ids = list(perms.hidden_rom_ids)
 
+    if hidden_rom_ids:
+        # Per-user hidden ROMs cut across the per-platform rollups, so this
+        # caller's totals are aggregated live instead.
+        return _live_stats(hidden_platform_ids, hidden_rom_ids, include_platform_stats)
+
+    platform_stats = db_stats_handler.get_platform_stats(hidden_platform_ids)
+    result: StatsReturn = {
+        "PLATFORMS": len(platform_stats),
+        "ROMS": sum(row.rom_count for row in platform_stats),
+        "SAVES": db_stats_handler.get_saves_count(),
+        "STATES": db_stats_handler.get_states_count(),
+        "SCREENSHOTS": db_stats_handler.get_screenshots_count(),
+        "TOTAL_FILESIZE_BYTES": sum(row.filesize_bytes for row in platform_stats),
+    }
+
+    if include_platform_stats:
+        result["METADATA_COVERAGE"] = {
+            row.platform_id: coverage_items(row.metadata_coverage or {})
+            for row in platform_stats
+            if row.metadata_coverage
+        }
+        result["REGION_BREAKDOWN"] = {
+            row.platform_id: region_items(row.region_counts or {})
+            for row in platform_stats
+            if row.region_counts
+        }
+
+    return result
+
+
+def _live_stats(
+    hidden_platform_ids: list[int],
+    hidden_rom_ids: list[int],
+    include_platform_stats: bool,
+) -> StatsReturn:
     result: StatsReturn = {
         "PLATFORMS": db_stats_handler.get_platforms_count(
             hidden_platform_ids, hidden_rom_ids
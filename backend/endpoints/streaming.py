@@ -1,17 +1,21 @@
 import asyncio
 import json
 import logging
-import urllib.error
-import urllib.request
 from datetime import datetime, timezone
 from typing import Annotated, Any, TypedDict
 from urllib.parse import urlparse, urlunparse
 
+import httpx
 from fastapi import Body, HTTPException, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
-from config import LIBRARY_BASE_PATH, STREAMING_BROKER_SECRET, STREAMING_SAVE_TIMEOUT
+from config import (
+    LIBRARY_BASE_PATH,
+    STREAMING_BROKER_SECRET,
+    STREAMING_SAVE_TIMEOUT,
+    has_proxy_env,
+)
 from config.config_manager import config_manager as cm
 from decorators.auth import protected_route
 from handler.auth.constants import Scope
@@ -46,6 +50,13 @@ SESSION_TTL_SECONDS = 6 * 60 * 60
 # expires on its own; no explicit DELETE.
 SESSION_DRAIN_SECONDS = 5
 
+# Broker availability shown in /config is probed at most once per window per
+# container and shared across workers, so listing containers neither waits on
+# every broker nor hammers them on each page load.
+_HEALTH_KEY_PREFIX = "romm:streaming:health:"
+HEALTH_TTL_SECONDS = 30
+HEALTH_PROBE_TIMEOUT = 2
+
 
 def _session_redis_key(session_key: str) -> str:
     return f"{_SESSION_KEY_PREFIX}{session_key}"
@@ -299,42 +310,72 @@ def _broker_secret(container: dict[str, Any]) -> str:
     return STREAMING_BROKER_SECRET or container.get("broker_secret", "")
 
 
-def _broker_request(
+# One client for every broker. httpx pools connections per origin, so each
+# container keeps its own warm keep-alive connections instead of paying a TCP
+# (and TLS) handshake per control call. Brokers sit on the LAN, so this client
+# deliberately skips the SSRF guard of the shared outbound client: broker URLs
+# only ever come from the admin's config.
+_BROKER_POOL_LIMITS = httpx.Limits(
+    max_connections=32, max_keepalive_connections=8, keepalive_expiry=60
+)
+_broker_client_state: tuple[asyncio.AbstractEventLoop, httpx.AsyncClient] | None = None
+
+
+def _broker_client() -> httpx.AsyncClient:
+    """The pooled broker client of the running event loop. Pooled connections
+    belong to the loop that opened them, so a new loop gets a new client."""
+    global _broker_client_state
+    loop = asyncio.get_running_loop()
+    if _broker_client_state is None or _broker_client_state[0] is not loop:
+        _broker_client_state = (
+            loop,
+            httpx.AsyncClient(limits=_BROKER_POOL_LIMITS, trust_env=has_proxy_env()),
+        )
+    return _broker_client_state[1]
+
+
+async def close_broker_client() -> None:
+    """Close the pooled broker connections, on application shutdown."""
+    global _broker_client_state
+    if _broker_client_state is not None:
+        _, client = _broker_client_state
+        _broker_client_state = None
+        await client.aclose()
+
+
+async def _broker_request(
     container: dict[str, Any],
     path: str,
     *,
     method: str = "POST",
     body: dict[str, Any] | None = None,
-    timeout: float,
+    request_timeout: float,
 ) -> Any:
     """
     Send a signed request to the broker and return its parsed JSON body (an
-    empty dict when the broker replies with no content). Uses only Python
-    stdlib urllib, no extra dependencies. Raises the underlying urllib/OS
-    error; callers decide whether to surface or swallow it.
+    empty dict when the broker replies with no content). Raises
+    httpx.HTTPStatusError when the broker replies with an error and
+    httpx.RequestError when it is unreachable; callers decide whether to
+    surface or swallow it.
     """
     url = _broker_url(container, path)
     secret = _broker_secret(container)
     headers = {"X-Broker-Secret": secret} if secret else {}
-    data = None
-    if body is not None:
-        data = json.dumps(body).encode()
-        headers["Content-Type"] = "application/json"
-        headers["Content-Length"] = str(len(data))
-    req = urllib.request.Request(url, data=data, method=method, headers=headers)
-    with urllib.request.urlopen(req, timeout=timeout) as resp:  # nosec B310
-        raw = resp.read()
-    return json.loads(raw) if raw else {}
-
-
-def _broker_request_safe(
+    response = await _broker_client().request(
+        method, url, json=body, headers=headers, timeout=request_timeout
+    )
+    response.raise_for_status()
+    return response.json() if response.content else {}
+
+
+async def _broker_request_safe(
     container: dict[str, Any],
     path: str,
     label: str,
     *,
     method: str = "POST",
     body: dict[str, Any] | None = None,
-    timeout: float,
+    request_timeout: float,
 ) -> Any | None:
     """
     Best-effort variant of _broker_request: returns the parsed body, or None if
@@ -342,15 +383,15 @@ def _broker_request_safe(
     on a broker hiccup.
     """
     try:
-        return _broker_request(
-            container, path, method=method, body=body, timeout=timeout
+        return await _broker_request(
+            container, path, method=method, body=body, request_timeout=request_timeout
         )
     except Exception as exc:
         log.warning("broker %s failed, %s", label, exc)
         return None
 
 
-def _call_broker(container: dict[str, Any], rom_path: str, rom_name: str) -> None:
+async def _call_broker(container: dict[str, Any], rom_path: str, rom_name: str) -> None:
     """
     POST to the broker's /launch endpoint to tell the emulator container to
     load a ROM.
@@ -359,25 +400,26 @@ def _call_broker(container: dict[str, Any], rom_path: str, rom_name: str) -> Non
     """
     url = _broker_url(container, "/launch")
     try:
-        body = _broker_request(
+        body = await _broker_request(
             container,
             "/launch",
             body={"rom_path": rom_path, "rom_name": rom_name},
-            timeout=10,
+            request_timeout=10,
         )
         log.info("broker launched ROM, %s", body)
-    except urllib.error.HTTPError as exc:
-        error_body = exc.read().decode(errors="replace")
-        log.error("broker HTTP error %d: %s", exc.code, error_body)
+    except httpx.HTTPStatusError as exc:
+        status_code = exc.response.status_code
+        error_body = exc.response.text
+        log.error("broker HTTP error %d: %s", status_code, error_body)
         try:
             detail = json.loads(error_body)
         except Exception:
             detail = error_body
         raise HTTPException(
             status_code=502,
-            detail=f"Broker returned {exc.code}: {detail}",
+            detail=f"Broker returned {status_code}: {detail}",
         ) from exc
-    except (urllib.error.URLError, OSError) as exc:
+    except httpx.RequestError as exc:
         log.error("broker unreachable at %s: %s", url, exc)
         raise HTTPException(
             status_code=503,
@@ -389,7 +431,7 @@ def _call_broker(container: dict[str, Any], rom_path: str, rom_name: str) -> Non
         ) from exc
 
 
-def _save_and_exit_broker(
+async def _save_and_exit_broker(
     container: dict[str, Any], slot: int = 0, wait: bool = True
 ) -> bool:
     """
@@ -403,58 +445,101 @@ def _save_and_exit_broker(
     # save + reset path can approach that too. Time out past the slowest
     # broker so a slow-but-successful save is not reported as saved=False.
     # Overridable for operators who raise SAVE_WAIT on a broker.
-    body = _broker_request_safe(
+    body = await _broker_request_safe(
         container,
         "/save-and-exit",
         "save-and-exit",
         body={"slot": slot, "wait": wait},
-        timeout=STREAMING_SAVE_TIMEOUT if wait else 5,
+        request_timeout=STREAMING_SAVE_TIMEOUT if wait else 5,
     )
     saved = bool(body and body.get("saved", False))
     log.info("broker save-and-exit, saved=%s slot=%d wait=%s", saved, slot, wait)
     return saved
 
 
-def _volume_broker(container: dict[str, Any], level: int) -> bool:
+async def _volume_broker(container: dict[str, Any], level: int) -> bool:
     """POST /volume to the broker. Best-effort, logs but never raises."""
-    body = _broker_request_safe(
-        container, "/volume", "volume", body={"level": level}, timeout=5
+    body = await _broker_request_safe(
+        container, "/volume", "volume", body={"level": level}, request_timeout=5
     )
     return bool(body and body.get("status") == "ok")
 
 
-def _mute_broker(container: dict[str, Any], mute: bool | None) -> bool | None:
+async def _mute_broker(container: dict[str, Any], mute: bool | None) -> bool | None:
     """POST /mute to the broker. Returns confirmed mute state, or None on error."""
-    body = _broker_request_safe(
+    body = await _broker_request_safe(
         container,
         "/mute",
         "mute",
         body={} if mute is None else {"mute": mute},
-        timeout=5,
+        request_timeout=5,
     )
     return body.get("mute") if body is not None else None
 
 
-def _save_state_broker(container: dict[str, Any], slot: int) -> bool:
+async def _save_state_broker(container: dict[str, Any], slot: int) -> bool:
     """POST /save-state to the broker. Returns True if the request was accepted."""
-    body = _broker_request_safe(
-        container, "/save-state", "save-state", body={"slot": slot}, timeout=5
+    body = await _broker_request_safe(
+        container, "/save-state", "save-state", body={"slot": slot}, request_timeout=5
     )
     return bool(body and body.get("status") == "saving")
 
 
-def _load_state_broker(container: dict[str, Any], slot: int) -> bool:
+async def _load_state_broker(container: dict[str, Any], slot: int) -> bool:
     """POST /load-state to the broker. Returns True if broker confirmed success."""
     # Timeout covers the worst case: 9 slot cycles x ~5s xdotool timeout.
-    body = _broker_request_safe(
-        container, "/load-state", "load-state", body={"slot": slot}, timeout=60
+    body = await _broker_request_safe(
+        container, "/load-state", "load-state", body={"slot": slot}, request_timeout=60
     )
     return bool(body and body.get("loaded", False))
 
 
-def _stop_broker(container: dict[str, Any]) -> None:
+async def _stop_broker(container: dict[str, Any]) -> None:
     """Tell the broker to stop emulator. Best-effort, don't raise on failure."""
-    _broker_request_safe(container, "/launch", "stop", method="DELETE", timeout=5)
+    await _broker_request_safe(
+        container, "/launch", "stop", method="DELETE", request_timeout=5
+    )
+
+
+async def _probe_broker(container: dict[str, Any]) -> bool:
+    """
+    Whether the broker answers at all. Any HTTP reply counts as up (a broker
+    without a /health route still answers 404); only a connection error,
+    a timeout or an unusable broker URL counts as down.
+    """
+    try:
+        await _broker_client().get(
+            _broker_url(container, "/health"), timeout=HEALTH_PROBE_TIMEOUT
+        )
+    except (httpx.RequestError, HTTPException):
+        return False
+    return True
+
+
+async def _brokers_available(containers: list[dict[str, Any]]) -> list[bool]:
+    """Availability of each container's broker, probing only the brokers whose
+    cached result expired. Brokers shared by several containers are probed once."""
+    keys = [f"{_HEALTH_KEY_PREFIX}{_container_key(c)}" for c in containers]
+    if not keys:
+        return []
+
+    cached = dict(zip(keys, await async_cache.mget(keys), strict=True))
+    to_probe = {
+        key: container
+        for key, container in zip(keys, containers, strict=True)
+        if cached[key] is None
+    }
+    if to_probe:
+        probed = await asyncio.gather(*(_probe_broker(c) for c in to_probe.values()))
+        async with async_cache.pipeline() as pipe:
+            for key, up in zip(to_probe, probed, strict=True):
+                health = "1" if up else "0"
+                cached[key] = health
+                await pipe.set(key, health, ex=HEALTH_TTL_SECONDS)
+            await pipe.execute()
+
+    # Values are bytes unless the client decodes responses.
+    return [cached[key] in ("1", b"1") for key in keys]
 
 
 # ── Routes ────────────────────────────────────────────────────────────────────
@@ -473,12 +558,21 @@ async def get_config(request: Request) -> JSONResponse:
     """Return streaming configuration to the frontend"""
     cfg = _get_streaming_config()
 
-    safe_containers = []
+    containers = []
     for c in cfg.get("containers", []):
         if not c.get("platform") or not c.get("host"):
             log.warning("container missing platform/host, skipping: %s", c)
             continue
+        containers.append(c)
 
+    # Probing only happens while streaming is on; otherwise nothing is playable.
+    if cfg.get("enabled", False):
+        available = await _brokers_available(containers)
+    else:
+        available = [False] * len(containers)
+
+    safe_containers = []
+    for c, is_available in zip(containers, available, strict=True):
         platform = c.get("platform", "")
         safe_containers.append(
             {
@@ -488,6 +582,9 @@ async def get_config(request: Request) -> JSONResponse:
                 # Ship slot capabilities so the frontend selector reads them
                 # instead of keeping its own hardcoded per-platform copy.
                 "capabilities": platform_capabilities(platform),
+                # Whether the broker answered its last (cached) probe, so the
+                # UI can tell a container is down before attempting a claim.
+                "available": is_available,
             }
         )
 
@@ -565,8 +662,7 @@ async def claim_session(
 
     try:
         # Tell the broker to load the ROM, raises HTTPException on failure.
-        # Wrapped in asyncio.to_thread because urllib is synchronous.
-        await asyncio.to_thread(_call_broker, container, rom_path, rom_name)
+        await _call_broker(container, rom_path, rom_name)
     except Exception:
         # Launch failed, free the claim so the container isn't wedged.
         await async_cache.delete(_session_redis_key(session_key))
@@ -598,9 +694,7 @@ async def save_and_exit_session(
     """
     container, session_key, _ = await _resolve_owned_session(platform, request)
 
-    saved = await asyncio.to_thread(
-        _save_and_exit_broker, container, slot=req.slot, wait=req.wait
-    )
+    saved = await _save_and_exit_broker(container, slot=req.slot, wait=req.wait)
 
     if req.wait:
         # Broker confirmed the save+kill is done, the key can go now.
@@ -629,7 +723,7 @@ async def set_volume(
     """Set emulator audio volume (0-100)."""
     container, session_key, _ = await _resolve_owned_session(platform, request)
 
-    ok = await asyncio.to_thread(_volume_broker, container, req.level)
+    ok = await _volume_broker(container, req.level)
     if not ok:
         raise HTTPException(status_code=502, detail="Broker failed to set volume")
 
@@ -644,7 +738,7 @@ async def set_mute(
     """Toggle or explicitly set mute state. Omit body to toggle."""
     container, session_key, _ = await _resolve_owned_session(platform, request)
 
-    confirmed = await asyncio.to_thread(_mute_broker, container, req.mute)
+    confirmed = await _mute_broker(container, req.mute)
     if confirmed is None:
         raise HTTPException(status_code=502, detail="Broker failed to set mute state")
 
@@ -662,7 +756,7 @@ async def save_state(
     container, session_key, _ = await _resolve_owned_session(platform, request)
     _assert_valid_slot(platform, req.slot, allow_autosave=False)
 
-    ok = await asyncio.to_thread(_save_state_broker, container, req.slot)
+    ok = await _save_state_broker(container, req.slot)
     if not ok:
         raise HTTPException(status_code=502, detail="Broker failed to save state")
 
@@ -680,7 +774,7 @@ async def load_state(
     container, session_key, _ = await _resolve_owned_session(platform, request)
     _assert_valid_slot(platform, req.slot, allow_autosave=True)
 
-    ok = await asyncio.to_thread(_load_state_broker, container, req.slot)
+    ok = await _load_state_broker(container, req.slot)
     if not ok:
         raise HTTPException(status_code=502, detail="Broker failed to load state")
 
@@ -707,7 +801,7 @@ async def release_session(request: Request, platform: str) -> JSONResponse:
     await async_cache.delete(_session_redis_key(session_key))
 
     # Best-effort stop, don't block the user on broker errors.
-    await asyncio.to_thread(_stop_broker, container)
+    await _stop_broker(container)
 
     log.info("session released, platform=%s", platform)
     return JSONResponse({"status": "released", "platform": platform})
@@ -719,9 +813,12 @@ async def list_sessions(request: Request) -> JSONResponse:
     if request.user.role != Role.ADMIN:
         raise HTTPException(status_code=403, detail="Forbidden")
 
+    # One MGET for every session instead of a GET per scanned key.
+    keys = [key async for key in async_cache.scan_iter(match=f"{_SESSION_KEY_PREFIX}*")]
+    values = await async_cache.mget(keys) if keys else []
+
     sessions: dict[str, Any] = {}
-    async for key in async_cache.scan_iter(match=f"{_SESSION_KEY_PREFIX}*"):
-        raw = await async_cache.get(key)
+    for key, raw in zip(keys, values, strict=True):
         if raw is None:
             continue
         try:
@@ -752,16 +849,23 @@ async def force_release_all(request: Request) -> JSONResponse:
         if isinstance(c, dict)
     }
 
+    keys = [key async for key in async_cache.scan_iter(match=f"{_SESSION_KEY_PREFIX}*")]
+    if keys:
+        await async_cache.delete(*keys)
+
     released = []
-    async for key in async_cache.scan_iter(match=f"{_SESSION_KEY_PREFIX}*"):
-        await async_cache.delete(key)
+    to_stop = []
+    for key in keys:
         # scan_iter yields bytes unless the client decodes responses.
         key_str = key.decode() if isinstance(key, bytes) else key
         container_key = key_str.removeprefix(_SESSION_KEY_PREFIX)
         container = containers_by_key.get(container_key)
         if container is not None:
-            # Best-effort stop; a broker error must not abort the sweep.
-            await asyncio.to_thread(_stop_broker, container)
+            to_stop.append(container)
         released.append(container_key)
+
+    # Stop the brokers concurrently. Each stop is best-effort and never
+    # raises, so a dead broker neither aborts the sweep nor delays the others.
+    await asyncio.gather(*(_stop_broker(container) for container in to_stop))
     log.info("all sessions force-released by admin, %s", released)
     return JSONResponse({"status": "released", "platforms": released})
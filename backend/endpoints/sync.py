@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from fastapi import HTTPException, Request, status
 from pydantic import Field, model_validator
@@ -38,6 +38,10 @@ router = APIRouter(
     tags=["sync"],
 )
 
+# Delta negotiations look back this far past the device's watermark, so a save
+# whose write was still committing when the watermark was taken isn't missed.
+SYNC_WATERMARK_OVERLAP = timedelta(minutes=5)
+
 
 class ClientSaveState(BaseModel):
     rom_id: int = Field(description="ID of the ROM this save belongs to.")
@@ -79,6 +83,17 @@ class SyncNegotiatePayload(BaseModel):
     saves: list[ClientSaveState] = Field(
         description="Current save state on the client."
     )
+    delta: bool = Field(
+        default=False,
+        description=(
+            "Only consider server saves changed since the device's last cleanly "
+            "completed sync session, plus the (rom_id, slot) pairs sent in "
+            "'saves'. Server saves outside that set are left out of the "
+            "response instead of being offered again. Falls back to a full "
+            "negotiation when the device has no completed sync yet; the "
+            "response's 'delta' flag reports which one ran."
+        ),
+    )
 
 
 class SyncPlaySessionEntry(BaseModel):
@@ -161,20 +176,37 @@ def negotiate_sync(
     operations: list[SyncOperationSchema] = []
 
     # Pair on (rom_id, slot), keeping the newest row per slot: slot uploads are datetime-tagged (spec) so tagged filenames never equal the client's untagged name, and a slot accrues many rows over time. Null-slot rows stay archival-only.
-    server_saves = db_save_handler.get_saves(
-        user_id=request.user.id, slot_not_null=True
-    )
+    watermark = device.sync_watermark if payload.delta else None
+    delta = watermark is not None
     server_save_map: dict[tuple[int, str | None], Save] = {}
-    for save in server_saves:
-        key = (save.rom_id, save.slot)
-        current = server_save_map.get(key)
-        if current is None or to_utc(save.updated_at) > to_utc(current.updated_at):
-            server_save_map[key] = save
-
-    # Get all sync records for this device
-    all_save_ids = [s.id for s in server_saves]
+    if watermark is not None:
+        slot_keys = {
+            (client_save.rom_id, client_save.slot)
+            for client_save in payload.saves
+            if client_save.slot is not None
+        }
+        slot_keys |= db_save_handler.get_slot_keys_changed_since(
+            user_id=request.user.id,
+            device_id=device.id,
+            since=to_utc(watermark) - SYNC_WATERMARK_OVERLAP,
+        )
+        for save in db_save_handler.get_latest_slot_saves(
+            user_id=request.user.id, keys=slot_keys
+        ):
+            server_save_map[(save.rom_id, save.slot)] = save
+    else:
+        server_saves = db_save_handler.get_saves(
+            user_id=request.user.id, slot_not_null=True
+        )
+        for save in server_saves:
+            key = (save.rom_id, save.slot)
+            current = server_save_map.get(key)
+            if current is None or to_utc(save.updated_at) > to_utc(current.updated_at):
+                server_save_map[key] = save
+
+    # Get the sync records for this device
     device_syncs = db_device_save_sync_handler.get_syncs_for_device_and_saves(
-        device_id=device.id, save_ids=all_save_ids
+        device_id=device.id, save_ids=[s.id for s in server_save_map.values()]
     )
     sync_by_save_id = {s.save_id: s for s in device_syncs}
 
@@ -309,7 +341,7 @@ def negotiate_sync(
     db_device_handler.update_last_seen(device_id=device.id, user_id=request.user.id)
 
     log.info(
-        f"Sync negotiation for device {device.id}: "
+        f"Sync {'delta ' if delta else ''}negotiation for device {device.id}: "
         f"{total_upload} uploads, {total_download} downloads, "
         f"{total_conflict} conflicts, {total_no_op} no-ops"
     )
@@ -321,6 +353,7 @@ def negotiate_sync(
         total_download=total_download,
         total_conflict=total_conflict,
         total_no_op=total_no_op,
+        delta=delta,
     )
 
 
@@ -355,6 +388,15 @@ def complete_sync_session(
         operations_failed=payload.operations_failed,
     )
 
+    # A session the device finished cleanly brought it up to date as of the
+    # negotiation, so later delta negotiations can start from there.
+    if payload.operations_failed == 0:
+        db_device_handler.advance_sync_watermark(
+            device_id=sync_session.device_id,
+            user_id=request.user.id,
+            watermark=sync_session.initiated_at,
+        )
+
     log.info(
         f"Sync session {session_id} completed: "
         f"{payload.operations_completed} succeeded, {payload.operations_failed} failed"
@@ -14,8 +14,10 @@ from config import (
 )
 from decorators.auth import protected_route
 from endpoints.responses import (
+    BaseTaskStatusResponse,
     CleanupTaskStatusResponse,
     ConversionTaskStatusResponse,
+    ExportTaskStatusResponse,
     GenericTaskStatusResponse,
     ScanTaskStatusResponse,
     SyncTaskStatusResponse,
@@ -33,7 +35,10 @@ from handler.redis_handler import (
     low_prio_queue,
     redis_client,
 )
+from tasks.manual.build_cover_derivatives import build_cover_derivatives_task
 from tasks.manual.cleanup_missing_roms import cleanup_missing_roms_task
+from tasks.manual.rebuild_platform_stats import rebuild_platform_stats_task
+from tasks.manual.rebuild_sibling_groups import rebuild_sibling_groups_task
 from tasks.manual.recompute_save_content_hashes import (
     recompute_save_content_hashes_task,
 )
@@ -133,6 +138,27 @@ manual_tasks: list[ManualTask] = [
             "task": recompute_save_content_hashes_task,
         }
     ),
+    ManualTask(
+        {
+            "name": "rebuild_platform_stats",
+            "type": TaskType.CLEANUP,
+            "task": rebuild_platform_stats_task,
+        }
+    ),
+    ManualTask(
+        {
+            "name": "rebuild_sibling_groups",
+            "type": TaskType.CLEANUP,
+            "task": rebuild_sibling_groups_task,
+        }
+    ),
+    ManualTask(
+        {
+            "name": "build_cover_derivatives",
+            "type": TaskType.CONVERSION,
+            "task": build_cover_derivatives_task,
+        }
+    ),
 ]
 
 
@@ -162,7 +188,7 @@ def _build_task_status_response(
     ended_at = job.ended_at.isoformat() if job.ended_at else None
     enqueued_at = job.enqueued_at.isoformat() if job.enqueued_at else None
 
-    common_data = {
+    common_data: BaseTaskStatusResponse = {
         "task_name": task_name,
         "task_id": job.id,
         "status": job.get_status(),
@@ -176,7 +202,7 @@ def _build_task_status_response(
         return GenericTaskStatusResponse(
             task_type=TaskType.GENERIC,
             meta={},
-            **common_data,  # trunk-ignore(mypy/typeddict-item)
+            **common_data,
         )
 
     match TaskType(task_type):
@@ -184,43 +210,49 @@ def _build_task_status_response(
             return ScanTaskStatusResponse(
                 task_type=TaskType.SCAN,
                 meta={"scan_stats": job_meta.get("scan_stats")},
-                **common_data,  # trunk-ignore(mypy/typeddict-item)
+                **common_data,
             )
         case TaskType.CONVERSION:
             return ConversionTaskStatusResponse(
                 task_type=TaskType.CONVERSION,
                 meta={"conversion_stats": job_meta.get("conversion_stats")},
-                **common_data,  # trunk-ignore(mypy/typeddict-item)
+                **common_data,
             )
         case TaskType.UPDATE:
             return UpdateTaskStatusResponse(
                 task_type=TaskType.UPDATE,
                 meta={"update_stats": job_meta.get("update_stats")},
-                **common_data,  # trunk-ignore(mypy/typeddict-item)
+                **common_data,
             )
         case TaskType.CLEANUP:
             return CleanupTaskStatusResponse(
                 task_type=TaskType.CLEANUP,
                 meta={"cleanup_stats": job_meta.get("cleanup_stats")},
-                **common_data,  # trunk-ignore(mypy/typeddict-item)
+                **common_data,
+            )
+        case TaskType.EXPORT:
+            return ExportTaskStatusResponse(
+                task_type=TaskType.EXPORT,
+                meta={"export_stats": job_meta.get("export_stats")},
+                **common_data,
             )
         case TaskType.SYNC:
             return SyncTaskStatusResponse(
                 task_type=TaskType.SYNC,
                 meta={},
-                **common_data,  # trunk-ignore(mypy/typeddict-item)
+                **common_data,
             )
         case TaskType.WATCHER:
             return WatcherTaskStatusResponse(
                 task_type=TaskType.WATCHER,
                 meta={},
-                **common_data,  # trunk-ignore(mypy/typeddict-item)
+                **common_data,
             )
         case TaskType.GENERIC:
             return GenericTaskStatusResponse(
                 task_type=TaskType.GENERIC,
                 meta={},
-                **common_data,  # trunk-ignore(mypy/typeddict-item)
+                **common_data,
             )
         case _:
             raise ValueError(f"Invalid task type: {task_type}")
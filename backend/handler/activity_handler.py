@@ -4,11 +4,17 @@ Stores ephemeral "currently playing" state in Redis. Each active session is a
 Redis key with a short TTL, refreshed by periodic heartbeats from the client
 (browser) or the device. When the TTL expires (no heartbeat received), the
 session is considered ended automatically.
+
+Sessions are found through sorted-set indexes, one across all sessions and
+one per ROM, scored by the time each session expires. Listing trims the
+expired members and fetches the rest in one MGET, so it costs O(active
+sessions) however large the rest of the keyspace grows.
 """
 
 from __future__ import annotations
 
 import json
+import time
 from typing import TypedDict
 
 from handler.redis_handler import async_cache
@@ -34,9 +40,10 @@ class ActivityHandler:
     """Redis-backed store for currently active game play sessions."""
 
     ACTIVITY_TTL = 90  # seconds; refreshed by heartbeats
-    ROM_INDEX_TTL = 120  # slightly longer than ACTIVITY_TTL
+    INDEX_TTL = 120  # slightly longer than ACTIVITY_TTL
     KEY_PREFIX = "activity:user:"
-    ROM_INDEX_PREFIX = "activity:rom:"
+    INDEX_KEY = "activity:index"
+    ROM_INDEX_PREFIX = "activity:index:rom:"
 
     def _activity_key(self, user_id: int, device_id: str) -> str:
         return f"{self.KEY_PREFIX}{user_id}:{device_id}"
@@ -52,16 +59,20 @@ class ActivityHandler:
         key = self._activity_key(entry["user_id"], entry["device_id"])
         rom_key = self._rom_index_key(entry["rom_id"])
         member = self._member(entry["user_id"], entry["device_id"])
+        expires_at = time.time() + self.ACTIVITY_TTL
 
         async with async_cache.pipeline() as pipe:
             await pipe.set(key, json.dumps(entry), ex=self.ACTIVITY_TTL)
-            await pipe.sadd(rom_key, member)
-            await pipe.expire(rom_key, self.ROM_INDEX_TTL)
+            await pipe.zadd(self.INDEX_KEY, {member: expires_at})
+            await pipe.expire(self.INDEX_KEY, self.INDEX_TTL)
+            await pipe.zadd(rom_key, {member: expires_at})
+            await pipe.expire(rom_key, self.INDEX_TTL)
             await pipe.execute()
 
     async def clear_active(self, user_id: int, device_id: str) -> int | None:
         """Clear a user's active play session. Returns the rom_id that was cleared, or None."""
         key = self._activity_key(user_id, device_id)
+        member = self._member(user_id, device_id)
         raw = await async_cache.get(key)
         if not raw:
             return None
@@ -71,13 +82,16 @@ class ActivityHandler:
             rom_id = int(entry["rom_id"])
         except (ValueError, KeyError, TypeError) as e:
             log.warning(f"Failed to parse activity entry for cleanup: {e}")
-            await async_cache.delete(key)
+            async with async_cache.pipeline() as pipe:
+                await pipe.delete(key)
+                await pipe.zrem(self.INDEX_KEY, member)
+                await pipe.execute()
             return None
 
-        member = self._member(user_id, device_id)
         async with async_cache.pipeline() as pipe:
             await pipe.delete(key)
-            await pipe.srem(self._rom_index_key(rom_id), member)
+            await pipe.zrem(self.INDEX_KEY, member)
+            await pipe.zrem(self._rom_index_key(rom_id), member)
             await pipe.execute()
         return rom_id
 
@@ -92,53 +106,59 @@ class ActivityHandler:
         except ValueError:
             return None
 
-    async def get_all_active(self) -> list[ActivityEntry]:
-        """Get all currently active play sessions across all users."""
-        pattern = f"{self.KEY_PREFIX}*"
-        keys = [key async for key in async_cache.scan_iter(match=pattern)]
-        if not keys:
+    async def _get_indexed(
+        self, index_key: str, rom_id: int | None = None
+    ) -> list[ActivityEntry]:
+        """Read every live session in an index, dropping members that outlived it."""
+        async with async_cache.pipeline() as pipe:
+            await pipe.zremrangebyscore(index_key, "-inf", time.time())
+            await pipe.zrange(index_key, 0, -1)
+            _, members = await pipe.execute()
+        if not members:
             return []
 
-        # Single round-trip for every value instead of a GET per key.
-        entries: list[ActivityEntry] = []
-        for raw in await async_cache.mget(keys):
-            if not raw:
-                continue
-            try:
-                entries.append(json.loads(raw))
-            except ValueError:
-                continue
-        return entries
-
-    async def get_active_for_rom(self, rom_id: int) -> list[ActivityEntry]:
-        """Get all active play sessions for a specific ROM."""
-        rom_key = self._rom_index_key(rom_id)
-        members = await async_cache.smembers(rom_key)
-        entries: list[ActivityEntry] = []
+        live_members: list[str] = []
+        keys: list[str] = []
         stale_members: list[str] = []
-
         for member in members:
             try:
                 user_id_str, device_id = member.rsplit(":", 1)
-                user_id = int(user_id_str)
+                keys.append(self._activity_key(int(user_id_str), device_id))
+                live_members.append(member)
             except (ValueError, AttributeError):
                 stale_members.append(member)
-                continue
 
-            raw = await async_cache.get(self._activity_key(user_id, device_id))
+        # Single round-trip for every value instead of a GET per member.
+        values = await async_cache.mget(keys) if keys else []
+        entries: list[ActivityEntry] = []
+        for member, raw in zip(live_members, values, strict=True):
             if not raw:
-                # Key expired; clean up the stale set member.
+                # Cleared before its index score ran out
                 stale_members.append(member)
                 continue
             try:
-                entries.append(json.loads(raw))
+                entry = json.loads(raw)
             except ValueError:
                 stale_members.append(member)
+                continue
+            if rom_id is not None and entry.get("rom_id") != rom_id:
+                # The device moved on to another game
+                stale_members.append(member)
+                continue
+            entries.append(entry)
 
         if stale_members:
-            await async_cache.srem(rom_key, *stale_members)
+            await async_cache.zrem(index_key, *stale_members)
 
         return entries
 
+    async def get_all_active(self) -> list[ActivityEntry]:
+        """Get all currently active play sessions across all users."""
+        return await self._get_indexed(self.INDEX_KEY)
+
+    async def get_active_for_rom(self, rom_id: int) -> list[ActivityEntry]:
+        """Get all active play sessions for a specific ROM."""
+        return await self._get_indexed(self._rom_index_key(rom_id), rom_id=rom_id)
+
 
 activity_handler = ActivityHandler()
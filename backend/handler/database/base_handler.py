@@ -1,17 +1,22 @@
 import logging
 import time
+from collections.abc import Callable
 
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
 
 from config import DEV_SQL_ECHO
 from config.config_manager import ConfigManager
+from logger.logger import log
+from utils.metrics import count_sql_statement
 
 sync_engine = create_engine(
     ConfigManager.get_db_engine(), pool_pre_ping=True, echo=False
 )
 sync_session = sessionmaker(bind=sync_engine, expire_on_commit=False)
 
+event.listen(sync_engine, "before_cursor_execute", count_sql_statement)
+
 # Disable SQLAlchemy logging as echo will print the queries
 logging.getLogger("sqlalchemy.engine.Engine").handlers = [logging.NullHandler()]
 
@@ -34,4 +39,38 @@ if DEV_SQL_ECHO:
         print("--------END--------")
 
 
+_AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
+
+def run_after_commit(session: Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once ``session``'s transaction commits.
+
+    For side effects other workers must not observe early, like dropping a
+    cache that a concurrent request could refill with pre-commit rows. The
+    callback is discarded if the transaction rolls back.
+    """
+    session.info.setdefault(_AFTER_COMMIT_CALLBACKS, []).append(callback)
+
+
+@event.listens_for(sync_session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_CALLBACKS, []):
+        try:
+            callback()
+        except Exception as e:
+            # The data is already committed; a failed side effect must not
+            # surface as a failed write.
+            log.error(f"After-commit callback {callback!r} failed: {e}")
+
+
+@event.listens_for(sync_session, "after_soft_rollback")
+def _drop_after_commit_callbacks(
+    session: Session, previous_transaction: SessionTransaction
+) -> None:
+    # A savepoint rolling back (a retried insert) leaves the outer transaction
+    # to commit, so only the outermost rollback discards the callbacks.
+    if not previous_transaction.nested:
+        session.info.pop(_AFTER_COMMIT_CALLBACKS, None)
+
+
 class DBBaseHandler: ...
@@ -1,4 +1,6 @@
+import enum
 import functools
+from collections.abc import Collection as AbstractCollection
 from collections.abc import Sequence
 from datetime import datetime, timezone
 from typing import Any
@@ -45,6 +47,17 @@ MAX_VIRTUAL_COLLECTION_COVERS = 5
 COVERS_BATCH_SIZE = 100
 
 
+class SmartCollectionFact(enum.StrEnum):
+    """Per-user state a smart collection's criteria can read besides the ROM
+    row itself, named by writes that change nothing else."""
+
+    SAVES = "saves"
+    STATES = "states"
+    STATUSES = "statuses"
+    HIDDEN = "hidden"
+    COLLECTIONS = "collections"
+
+
 def with_roms(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
@@ -661,40 +674,143 @@ class DBCollectionsHandler(DBBaseHandler):
 
         return len(ids)
 
+    def get_smart_collection_facts(
+        self, smart_collection: SmartCollection
+    ) -> frozenset[SmartCollectionFact]:
+        """The per-user state a smart collection's membership can observe.
+
+        Every query is scoped to the owner, which drops the ROMs they've hidden,
+        so each collection observes `HIDDEN` whatever its criteria say.
+        """
+        criteria = self.get_smart_collection_criteria(smart_collection)
+        facts = {SmartCollectionFact.HIDDEN}
+        if criteria["has_saves"] is not None:
+            facts.add(SmartCollectionFact.SAVES)
+        if criteria["has_states"] is not None:
+            facts.add(SmartCollectionFact.STATES)
+        if criteria["statuses"]:
+            facts.add(SmartCollectionFact.STATUSES)
+        if criteria["favorite"] is not None or criteria["collection_id"]:
+            facts.add(SmartCollectionFact.COLLECTIONS)
+        return frozenset(facts)
+
+    @begin_session
+    def apply_smart_collection_delta(
+        self,
+        smart_collection: SmartCollection,
+        added: set[int],
+        removed: set[int],
+        session: Session = None,  # type: ignore
+    ) -> SmartCollection | None:
+        """Move ROMs in and out of a smart collection's cached membership.
+
+        Members without a cover never reach the cover arrays, so unless an
+        added ROM has one or a removed ROM's cover is on show, only the ids and
+        count change. Added ids go on the end: the cached list is read as a
+        set, and the next full refresh puts it back in the collection's order.
+        Otherwise this falls back to a full refresh.
+
+        The row is re-read under a lock first: `smart_collection` may be a
+        snapshot from before another request moved other ROMs in or out, and
+        writing its list back would undo that.
+        """
+        locked = session.scalar(
+            select(SmartCollection)
+            .where(SmartCollection.id == smart_collection.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        if locked is None:
+            return None
+
+        changed = session.execute(
+            select(Rom.id, Rom.path_cover_s, Rom.path_cover_l).where(
+                Rom.id.in_(added | removed)
+            )
+        ).all()
+        shown = {
+            url.split("?", 1)[0]
+            for url in (
+                *locked.path_covers_small,
+                *locked.path_covers_large,
+            )
+        }
+        for rom in changed:
+            covers = [c for c in (rom.path_cover_s, rom.path_cover_l) if c]
+            if rom.id in added and covers:
+                return self.refresh_smart_collection(locked.id, session=session)
+            if any(f"{FRONTEND_RESOURCES_PATH}/{c}" in shown for c in covers):
+                return self.refresh_smart_collection(locked.id, session=session)
+
+        current = set(locked.rom_ids)
+        rom_ids = [
+            rom_id for rom_id in locked.rom_ids if rom_id not in removed
+        ] + sorted(added - current)
+        return self.update_smart_collection(
+            locked.id,
+            {"rom_count": len(rom_ids), "rom_ids": rom_ids},
+            session=session,
+        )
+
     @begin_session
     def refresh_smart_collections_for_roms(
         self,
         rom_ids: Sequence[int],
         membership_only: bool = False,
+        facts: AbstractCollection[SmartCollectionFact] | None = None,
         session: Session = None,  # type: ignore
     ):
         """Refresh the collections a handful of changed ROMs touch.
 
         Editing one ROM rarely moves any collection, and asking whether given
         ids match is an indexed lookup, so only the collections that actually
-        hold one of them pay for a recount.
+        hold one of them pay for a recount. Every collection is asked at once,
+        in batched statements, rather than with a query each.
 
         `membership_only` is for changes that leave the ROM row alone, like a
         save, a state, a status or collection membership: nothing about the ROM
         can have moved except whether it matches, so a member that stayed one
-        needs no recount. That matters because autosaves land constantly. The
-        default suits a library change, where a ROM that stayed a member can
-        still have a new name, sort position or cover to reflect.
+        needs no recount, and one that moved is added or dropped in place. That
+        matters because autosaves land constantly. The default suits a library
+        change, where a ROM that stayed a member can still have a new name, sort
+        position or cover to reflect.
+
+        `facts` narrows a membership-only change to the collections whose
+        criteria read what it touched, so an autosave never evaluates a
+        collection that doesn't filter on saves.
         """
         from handler.database import db_rom_handler
 
         if not rom_ids:
             return
 
+        smart_collections = session.scalars(select(SmartCollection)).all()
+        if membership_only and facts is not None:
+            changed = set(facts)
+            smart_collections = [
+                smart_collection
+                for smart_collection in smart_collections
+                if changed & self.get_smart_collection_facts(smart_collection)
+            ]
+        if not smart_collections:
+            return
+
         candidates = set(rom_ids)
-        for smart_collection in session.scalars(select(SmartCollection)).all():
-            matching = db_rom_handler.get_smart_collection_matches(
-                smart_collection=smart_collection,
-                rom_ids=candidates,
-                user_id=smart_collection.user_id,
-                session=session,
-            )
+        matches = db_rom_handler.get_smart_collections_matches(
+            smart_collections=smart_collections,
+            rom_ids=candidates,
+            session=session,
+        )
+        for smart_collection in smart_collections:
+            matching = matches[smart_collection.id]
             cached = candidates & set(smart_collection.rom_ids)
-            moved = matching != cached if membership_only else bool(matching or cached)
-            if moved:
-                self.refresh_smart_collection(smart_collection.id, session=session)
+            if not membership_only:
+                if matching or cached:
+                    self.refresh_smart_collection(smart_collection.id, session=session)
+            elif matching != cached:
+                self.apply_smart_collection_delta(
+                    smart_collection,
+                    added=matching - cached,
+                    removed=cached - matching,
+                    session=session,
+                )
@@ -1,7 +1,7 @@
 from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, or_, select, update
 from sqlalchemy.orm import Session
 
 from decorators.database import begin_session
@@ -145,6 +145,29 @@ class DBDevicesHandler(DBBaseHandler):
             .execution_options(synchronize_session="evaluate")
         )
 
+    @begin_session
+    def advance_sync_watermark(
+        self,
+        device_id: str,
+        user_id: int,
+        watermark: datetime,
+        session: Session = None,  # type: ignore
+    ) -> None:
+        """Move the device's sync watermark forward; never moves it back."""
+        session.execute(
+            update(Device)
+            .where(
+                Device.id == device_id,
+                Device.user_id == user_id,
+                or_(
+                    Device.sync_watermark.is_(None),
+                    Device.sync_watermark < watermark,
+                ),
+            )
+            .values(sync_watermark=watermark)
+            .execution_options(synchronize_session=False)
+        )
+
     @begin_session
     def update_last_seen_debounced(
         self,
@@ -0,0 +1,433 @@
+"""In-memory inverted index over `roms_facets` for the gallery filters.
+
+Each facet value maps to a posting list: the sorted ids of the ROMs carrying
+it, packed in an `array` at four bytes an id. Memory follows the number of
+(ROM, value) pairs rather than the number of values times the largest ROM id,
+so large company, tag or franchise sets stay cheap in every worker. Listing the
+values present in the library and evaluating any/all/none filters then become
+set operations over a few posting lists instead of a pass over every
+`roms_facets` row.
+
+The index lives per worker process and is caught up incrementally. The ROM
+handlers publish the ids they wrote or deleted to a Redis stream once their
+transaction commits, so the stream is in commit order: a worker reads the
+entries past its position and re-reads just those rows. `roms_facets.updated_at`
+additionally catches writes made outside the handlers. The index is saved to
+FACET_INDEX_PATH after a rebuild, so a new worker loads it and catches up from
+the stream instead of reading the whole table.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Collection, Iterable, Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Final
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config import FACET_INDEX_PATH
+from handler.redis_handler import sync_cache
+from logger.logger import log
+from models.rom import RomFacets
+
+from .base_handler import run_after_commit
+
+# Facet name -> `roms_facets` column. Names match the filter-values payload.
+FACET_COLUMNS: Final = {
+    "genres": RomFacets.genres,
+    "franchises": RomFacets.franchises,
+    "collections": RomFacets.collections,
+    "companies": RomFacets.companies,
+    "game_modes": RomFacets.game_modes,
+    "age_ratings": RomFacets.age_ratings,
+    "player_counts": RomFacets.player_count,
+    "regions": RomFacets.regions,
+    "languages": RomFacets.languages,
+    "tags": RomFacets.tags,
+    "platforms": RomFacets.platform_id,
+}
+
+# Single-valued columns: a ROM has one player count and one platform.
+SCALAR_FACETS: Final = frozenset({"player_counts", "platforms"})
+
+# Timestamps are taken when a write starts, not when it commits, so a row can
+# land with an `updated_at` just behind rows already indexed. Re-reading a
+# window before the watermark picks those up; re-applying a row is harmless.
+# Handler writes don't depend on it: they come through the changes stream.
+WATERMARK_OVERLAP: Final = timedelta(seconds=60)
+
+# Past this many changed rows, rebuilding from scratch beats patching posting
+# lists one id at a time.
+INCREMENTAL_UPDATE_LIMIT: Final = 2_000
+
+# Ids of ROMs written or deleted, appended after each commit; see
+# `note_roms_changed`. Entries older than CHANGES_RETENTION are trimmed, so a
+# worker (or saved index) that hasn't read the stream for that long rebuilds.
+CHANGES_STREAM_KEY: Final = "romm:facet_index:changes"
+CHANGES_RETENTION: Final = timedelta(days=1)
+
+# How often a worker re-saves its caught-up index, at most.
+SNAPSHOT_INTERVAL: Final = timedelta(minutes=15)
+SNAPSHOT_VERSION: Final = 1
+
+# Unsigned int: ROM ids are positive and fit in four bytes.
+_ID_TYPECODE: Final = "I"
+
+# Changed ids re-read per statement
+_REREAD_CHUNK_SIZE: Final = 1_000
+
+_INDEX_SELECT = select(
+    RomFacets.rom_id,
+    RomFacets.updated_at,
+    *FACET_COLUMNS.values(),
+)
+
+FacetValues = tuple[tuple[Any, ...] | None, ...]
+
+
+def _intern(value: Any) -> Any:
+    # Every row brings its own copy of strings like "Action"; share one.
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def row_facet_values(row: Sequence[Any]) -> FacetValues:
+    """A row's facet values in `FACET_COLUMNS` order; None for a NULL column."""
+    values: list[tuple[Any, ...] | None] = []
+    for facet, value in zip(FACET_COLUMNS, row, strict=True):
+        if value is None:
+            values.append(None)
+        elif facet in SCALAR_FACETS:
+            # An empty player count is no value to offer, but not a NULL either.
+            values.append((_intern(value),) if value else ())
+        else:
+            values.append(tuple(_intern(v) for v in value))
+    return tuple(values)
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _stream_floor_id() -> str:
+    """The oldest stream id still within CHANGES_RETENTION."""
+    return f"{int((time.time() - CHANGES_RETENTION.total_seconds()) * 1000)}-0"
+
+
+def note_roms_changed(session: Session, rom_ids: Iterable[int]) -> None:
+    """Publish ``rom_ids`` to every worker's index once ``session`` commits.
+
+    Publishing before the commit would let a concurrent refresh re-read the
+    rows before the write is visible, and then never look again.
+    """
+    ids = ",".join(str(rom_id) for rom_id in rom_ids)
+    if not ids:
+        return
+
+    def publish() -> None:
+        sync_cache.xadd(
+            CHANGES_STREAM_KEY,
+            {"ids": ids},
+            minid=_stream_floor_id(),
+            approximate=True,
+        )
+
+    run_after_commit(session, publish)
+
+
+def _insert_sorted(ids: array, rom_id: int) -> None:
+    position = bisect_left(ids, rom_id)
+    if position == len(ids) or ids[position] != rom_id:
+        ids.insert(position, rom_id)
+
+
+def _discard_sorted(ids: array, rom_id: int) -> None:
+    position = bisect_left(ids, rom_id)
+    if position < len(ids) and ids[position] == rom_id:
+        del ids[position]
+
+
+def _stream_position() -> str:
+    """Id of the newest entry in the changes stream, or "0-0" if it's empty."""
+    newest = sync_cache.xrevrange(CHANGES_STREAM_KEY, count=1)
+    return _decode(newest[0][0]) if newest else "0-0"
+
+
+def _write_snapshot(path: Path, snapshot: dict[str, Any]) -> None:
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w") as fp:
+            json.dump(snapshot, fp)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        log.error(f"Failed to save facet index to {path}: {str(exc)}")
+
+
+class FacetIndex:
+    def __init__(self, path: str = FACET_INDEX_PATH) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._postings: dict[str, dict[Any, array]] = {f: {} for f in FACET_COLUMNS}
+        # ROMs whose facet column is not NULL. A NULL column never matches a
+        # JSON predicate, negated or not, so "none" excludes them too.
+        self._present: dict[str, array] = {
+            f: array(_ID_TYPECODE) for f in FACET_COLUMNS
+        }
+        self._rows: dict[int, FacetValues] = {}
+        self._built = False
+        self._watermark: datetime | None = None
+        # Last changes-stream entry applied, and when the stream was last read
+        self._position = "0-0"
+        self._position_read_at = 0.0
+        self._saved_at = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self._rows)
+
+    def clear(self) -> None:
+        """Drop the index so the next refresh loads or rebuilds it."""
+        with self._lock:
+            self._reset()
+
+    def refresh(self, session: Session) -> None:
+        """Catch the index up with `roms_facets`."""
+        with self._lock:
+            if not self._built and not self._load_snapshot():
+                self._rebuild(session)
+                return
+
+            if time.time() - self._position_read_at > CHANGES_RETENTION.total_seconds():
+                # Entries past our position may have been trimmed already
+                self._rebuild(session)
+                return
+
+            entries = sync_cache.xrange(
+                CHANGES_STREAM_KEY, min=f"({self._position}", max="+"
+            )
+            self._position_read_at = time.time()
+            changed_ids = {
+                int(rom_id)
+                for _, fields in entries
+                for rom_id in _decode(
+                    fields.get("ids") or fields.get(b"ids") or ""
+                ).split(",")
+                if rom_id
+            }
+
+            statement = _INDEX_SELECT
+            if self._watermark is not None:
+                statement = statement.where(
+                    RomFacets.updated_at >= self._watermark - WATERMARK_OVERLAP
+                )
+            changed = session.execute(statement).all()
+            if len(changed) + len(changed_ids) > INCREMENTAL_UPDATE_LIMIT:
+                self._rebuild(session)
+                return
+
+            for rom_id, updated_at, *values in changed:
+                self._update(rom_id, row_facet_values(values))
+                self._advance_watermark(updated_at)
+
+            self._reread(session, changed_ids)
+            if entries:
+                self._position = _decode(entries[-1][0])
+
+            if (changed or entries) and (
+                time.time() - self._saved_at > SNAPSHOT_INTERVAL.total_seconds()
+            ):
+                self._save_snapshot()
+
+    def _reread(self, session: Session, rom_ids: set[int]) -> None:
+        """Re-read ROMs named in the changes stream; ids without a row are gone."""
+        ordered = sorted(rom_ids)
+        for start in range(0, len(ordered), _REREAD_CHUNK_SIZE):
+            chunk = ordered[start : start + _REREAD_CHUNK_SIZE]
+            found: set[int] = set()
+            for rom_id, updated_at, *values in session.execute(
+                _INDEX_SELECT.where(RomFacets.rom_id.in_(chunk))
+            ):
+                self._update(rom_id, row_facet_values(values))
+                self._advance_watermark(updated_at)
+                found.add(rom_id)
+            for rom_id in set(chunk) - found:
+                self._remove(rom_id)
+
+    def _rebuild(self, session: Session) -> None:
+        # Read the position before the table: an entry appended after this
+        # read is past the position and gets applied on the next refresh.
+        position = _stream_position()
+        rows = session.execute(_INDEX_SELECT).all()
+
+        self._load((rom_id, row_facet_values(values)) for rom_id, _, *values in rows)
+        for _, updated_at, *_values in rows:
+            self._advance_watermark(updated_at)
+        self._position = position
+        self._position_read_at = time.time()
+        self._save_snapshot()
+
+    def _load(self, rows: Iterable[tuple[int, FacetValues]]) -> None:
+        self._reset()
+        ids_by_value: dict[str, dict[Any, list[int]]] = {f: {} for f in FACET_COLUMNS}
+        present: dict[str, list[int]] = {f: [] for f in FACET_COLUMNS}
+
+        for rom_id, values in rows:
+            self._rows[rom_id] = values
+            for facet, facet_values in zip(FACET_COLUMNS, values, strict=True):
+                if facet_values is None:
+                    continue
+                present[facet].append(rom_id)
+                for value in facet_values:
+                    ids_by_value[facet].setdefault(value, []).append(rom_id)
+
+        for facet in FACET_COLUMNS:
+            self._present[facet] = array(_ID_TYPECODE, sorted(present[facet]))
+            self._postings[facet] = {
+                value: array(_ID_TYPECODE, sorted(set(ids)))
+                for value, ids in ids_by_value[facet].items()
+            }
+        self._built = True
+
+    def _save_snapshot(self) -> None:
+        """Write the index to disk on a background thread."""
+        self._saved_at = time.time()
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": self._position_read_at,
+            "position": self._position,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            # Values are immutable tuples, so a shallow copy is a consistent view
+            "rows": dict(self._rows),
+        }
+        threading.Thread(
+            target=_write_snapshot, args=(self.path, snapshot), daemon=True
+        ).start()
+
+    def _load_snapshot(self) -> bool:
+        """Load the saved index, unless it's missing or older than the stream."""
+        try:
+            with open(self.path, "r") as fp:
+                snapshot = json.load(fp)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as exc:
+            log.warning(f"Ignoring unreadable facet index {self.path}: {str(exc)}")
+            return False
+
+        if (
+            not isinstance(snapshot, dict)
+            or snapshot.get("version") != SNAPSHOT_VERSION
+            or time.time() - snapshot.get("saved_at", 0)
+            > CHANGES_RETENTION.total_seconds()
+        ):
+            return False
+
+        self._load(
+            (
+                int(rom_id),
+                tuple(
+                    None if values is None else tuple(_intern(v) for v in values)
+                    for values in row
+                ),
+            )
+            for rom_id, row in snapshot["rows"].items()
+        )
+        self._position = snapshot["position"]
+        self._position_read_at = snapshot["saved_at"]
+        self._saved_at = snapshot["saved_at"]
+        if snapshot["watermark"]:
+            self._watermark = datetime.fromisoformat(snapshot["watermark"])
+        return True
+
+    def _advance_watermark(self, updated_at: datetime | None) -> None:
+        if updated_at is not None and (
+            self._watermark is None or updated_at > self._watermark
+        ):
+            self._watermark = updated_at
+
+    def _update(self, rom_id: int, values: FacetValues) -> None:
+        if self._rows.get(rom_id) == values:
+            return
+        self._remove(rom_id)
+
+        for facet, facet_values in zip(FACET_COLUMNS, values, strict=True):
+            if facet_values is None:
+                continue
+            _insert_sorted(self._present[facet], rom_id)
+            postings = self._postings[facet]
+            for value in facet_values:
+                ids = postings.get(value)
+                if ids is None:
+                    postings[value] = array(_ID_TYPECODE, [rom_id])
+                else:
+                    _insert_sorted(ids, rom_id)
+        self._rows[rom_id] = values
+
+    def _remove(self, rom_id: int) -> None:
+        values = self._rows.pop(rom_id, None)
+        if values is None:
+            return
+
+        for facet, facet_values in zip(FACET_COLUMNS, values, strict=True):
+            if facet_values is None:
+                continue
+            _discard_sorted(self._present[facet], rom_id)
+            postings = self._postings[facet]
+            for value in facet_values:
+                ids = postings.get(value)
+                if ids is None:
+                    continue
+                _discard_sorted(ids, rom_id)
+                if not ids:
+                    del postings[value]
+
+    def filter_values(self, scope: Collection[int] | None = None) -> dict[str, list]:
+        """Every facet value held by at least one ROM in ``scope`` (all if None)."""
+        with self._lock:
+            return {
+                facet: sorted(
+                    value
+                    for value, ids in postings.items()
+                    if scope is None or any(rom_id in scope for rom_id in ids)
+                )
+                for facet, postings in self._postings.items()
+            }
+
+    def match(self, facet: str, values: Sequence[Any], logic: str = "any") -> set[int]:
+        """Ids of the ROMs matching ``values`` on one facet.
+
+        Mirrors the JSON-array semantics of the facet columns: "all" on a
+        single-valued facet behaves as "any", and "none" leaves out ROMs whose
+        column is NULL.
+        """
+        with self._lock:
+            postings = self._postings[facet]
+            if logic == "all" and facet not in SCALAR_FACETS:
+                # Start from the shortest list so the working set only shrinks.
+                lists = sorted((postings.get(value, ()) for value in values), key=len)
+                if not lists:
+                    return set()
+                matched = set(lists[0])
+                for ids in lists[1:]:
+                    matched.intersection_update(ids)
+                return matched
+
+            matched = set()
+            for value in values:
+                matched.update(postings.get(value, ()))
+            if logic == "none":
+                return set(self._present[facet]).difference(matched)
+            return matched
+
+
+facet_index = FacetIndex()
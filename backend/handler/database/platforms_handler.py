@@ -10,6 +10,7 @@ from models.platform import Platform
 from models.rom import Rom
 
 from .base_handler import DBBaseHandler
+from .facet_index import note_roms_changed
 
 
 def with_firmware(func):
@@ -112,6 +113,7 @@ class DBPlatformsHandler(DBBaseHandler):
         session: Session = None,  # type: ignore
     ) -> None:
         # Remove all roms from that platforms first
+        rom_ids = session.scalars(select(Rom.id).where(Rom.platform_id == id)).all()
         session.execute(
             delete(Rom)
             .where(Rom.platform_id == id)
@@ -123,6 +125,7 @@ class DBPlatformsHandler(DBBaseHandler):
             .where(Platform.id == id)
             .execution_options(synchronize_session="evaluate")
         )
+        note_roms_changed(session, rom_ids)
 
     @begin_session
     def mark_missing_platforms(
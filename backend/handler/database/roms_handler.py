@@ -13,23 +13,17 @@ from sqlalchemy import (
     String,
     Text,
     and_,
+    bindparam,
     case,
     cast,
     delete,
     false,
     func,
+    insert,
 )
 from sqlalchemy import inspect as sa_inspect
-from sqlalchemy import (
-    literal,
-    not_,
-    or_,
-    select,
-    text,
-    true,
-    union,
-    update,
-)
+from sqlalchemy import literal, not_, or_, select, text, true, union, union_all, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import (
     Query,
     QueryableAttribute,
@@ -55,27 +49,31 @@ from models.music import MusicFavoriteTrack, MusicPlaylistTrack
 from models.platform import Platform
 from models.rom import (
     METADATA_SOURCE_COLUMNS,
+    SIBLING_ID_COLUMNS,
     Rom,
-    RomFacets,
     RomFile,
     RomFileCategory,
     RomMetadata,
     RomNote,
+    RomSiblingGroup,
     RomUser,
+    RomUserStatus,
     SiblingRom,
     TrackMeta,
     compute_name_sort_key,
 )
 from utils import get_version
-from utils.database import (
-    LIKE_ESCAPE_CHAR,
-    escape_like,
-    json_array_contains_all,
-    json_array_contains_any,
-    json_array_contains_value,
-)
+from utils.database import LIKE_ESCAPE_CHAR, escape_like, json_array_contains_value
+from utils.datetime import to_utc
+from utils.sibling_groups import assign_sibling_groups
 
 from .base_handler import DBBaseHandler
+from .facet_index import facet_index, note_roms_changed
+from .stats_handler import (
+    PLATFORM_STATS_FIELDS,
+    apply_platform_rollup_changes,
+    count_platform_rollups,
+)
 
 EJS_SUPPORTED_PLATFORMS = [
     UPS._3DO,
@@ -170,23 +168,18 @@ ROM_METADATA_ORDER_COLUMNS: dict[str, QueryableAttribute] = {
     "player_count": Rom.generated_player_count,
 }
 
-# Filter dropdowns read the narrow `roms_facets` mirror instead of `roms`,
-# whose rows carry the raw metadata blobs. Column order matches the unpacking
-# in `_collect_filter_values`.
-_FILTER_VALUES_SELECT = select(
-    RomFacets.genres,
-    RomFacets.franchises,
-    RomFacets.collections,
-    RomFacets.companies,
-    RomFacets.game_modes,
-    RomFacets.age_ratings,
-    RomFacets.player_count,
-    RomFacets.regions,
-    RomFacets.languages,
-    RomFacets.tags,
-    RomFacets.platform_id,
+# Smart collections per UNION ALL statement when matching changed ROMs, to keep
+# any single statement small.
+SMART_COLLECTION_MATCH_BATCH_SIZE = 50
+
+# Writes touching any of these can move a ROM between sibling groups.
+SIBLING_GROUP_FIELDS = frozenset(
+    {"platform_id", *(column.key for column in SIBLING_ID_COLUMNS)}
 )
 
+# Seeds per regroup round, to keep the provider-id OR under a sane size.
+SIBLING_REGROUP_CHUNK = 500
+
 # Cached ROM filter values (genres/franchises/etc.) so it doesn't get
 # recomputed on every call to /api/roms
 ROM_FILTERS_CACHE_VERSION_KEY = "filter_values:ver"
@@ -473,8 +466,16 @@ class DBRomsHandler(DBBaseHandler):
         query: Query = None,  # type: ignore
         session: Session = None,  # type: ignore
     ) -> Rom:
+        stats_before = (
+            count_platform_rollups(session, rom_ids=[rom.id]) if rom.id else {}
+        )
         rom = session.merge(rom)
         session.flush()
+        self._regroup_siblings(session, [rom.id])
+        apply_platform_rollup_changes(
+            session, stats_before, count_platform_rollups(session, rom_ids=[rom.id])
+        )
+        note_roms_changed(session, [rom.id])
 
         return session.scalar(query.filter_by(id=rom.id).limit(1))
 
@@ -671,32 +672,51 @@ class DBRomsHandler(DBBaseHandler):
         )
 
     @begin_session
-    def get_smart_collection_matches(
+    def get_smart_collections_matches(
         self,
         *,
-        smart_collection: SmartCollection,
+        smart_collections: Sequence[SmartCollection],
         rom_ids: Iterable[int],
-        user_id: int | None,
         session: Session = None,  # type: ignore
-    ) -> set[int]:
-        """Which of `rom_ids` currently match the collection's criteria.
+    ) -> dict[int, set[int]]:
+        """Which of `rom_ids` currently match each collection's criteria, as
+        its owner sees them, keyed by collection id.
 
-        Restricting the criteria to a few ids keeps this an indexed lookup, so a
-        caller can ask whether one ROM moved without scanning the library.
+        Restricting the criteria to a few ids keeps every branch an indexed
+        lookup, and the collections are asked in UNION ALL batches, so a change
+        costs a statement per batch rather than a query per collection.
         """
         from . import db_collection_handler
 
-        query = self._join_rom_user(select(Rom.id), user_id).filter(Rom.id.in_(rom_ids))
-        return set(
-            session.scalars(
+        rom_ids = list(rom_ids)
+        matches: dict[int, set[int]] = {sc.id: set() for sc in smart_collections}
+
+        def matches_select(smart_collection: SmartCollection) -> Select:
+            query = self._join_rom_user(
+                select(Rom.id), smart_collection.user_id
+            ).filter(Rom.id.in_(rom_ids))
+            return (
                 db_collection_handler.build_smart_collection_query(
                     query=query,  # type: ignore
                     smart_collection=smart_collection,
-                    user_id=user_id,
+                    user_id=smart_collection.user_id,
                     session=session,
                 )
+                .add_columns(literal(smart_collection.id).label("collection_id"))
+                .order_by(None)
             )
-        )
+
+        for start in range(
+            0, len(smart_collections), SMART_COLLECTION_MATCH_BATCH_SIZE
+        ):
+            batch = smart_collections[start : start + SMART_COLLECTION_MATCH_BATCH_SIZE]
+            selects = [matches_select(smart_collection) for smart_collection in batch]
+            statement = selects[0] if len(selects) == 1 else union_all(*selects)
+            rows: Sequence[tuple[int, int]] = session.execute(statement).tuples().all()
+            for rom_id, collection_id in rows:
+                matches[collection_id].add(rom_id)
+
+        return matches
 
     def _build_fulltext_boolean_query(self, term: str) -> str | None:
         words = FULLTEXT_BOOLEAN_OPERATORS_REGEX.sub(" ", term).split()
@@ -935,71 +955,6 @@ class DBRomsHandler(DBBaseHandler):
                 predicate = not_(predicate)
             return query.filter(predicate)
 
-    def _filter_by_genres(
-        self,
-        query: Query,
-        *,
-        session: Session,
-        values: Sequence[str],
-        match_all: bool = False,
-        match_none: bool = False,
-    ) -> Query:
-        op = json_array_contains_all if match_all else json_array_contains_any
-        condition = op(RomMetadata.genres, values, session=session)
-        return query.filter(~condition) if match_none else query.filter(condition)
-
-    def _filter_by_franchises(
-        self,
-        query: Query,
-        *,
-        session: Session,
-        values: Sequence[str],
-        match_all: bool = False,
-        match_none: bool = False,
-    ) -> Query:
-        op = json_array_contains_all if match_all else json_array_contains_any
-        condition = op(RomMetadata.franchises, values, session=session)
-        return query.filter(~condition) if match_none else query.filter(condition)
-
-    def _filter_by_collections(
-        self,
-        query: Query,
-        *,
-        session: Session,
-        values: Sequence[str],
-        match_all: bool = False,
-        match_none: bool = False,
-    ) -> Query:
-        op = json_array_contains_all if match_all else json_array_contains_any
-        condition = op(RomMetadata.collections, values, session=session)
-        return query.filter(~condition) if match_none else query.filter(condition)
-
-    def _filter_by_companies(
-        self,
-        query: Query,
-        *,
-        session: Session,
-        values: Sequence[str],
-        match_all: bool = False,
-        match_none: bool = False,
-    ) -> Query:
-        op = json_array_contains_all if match_all else json_array_contains_any
-        condition = op(RomMetadata.companies, values, session=session)
-        return query.filter(~condition) if match_none else query.filter(condition)
-
-    def _filter_by_age_ratings(
-        self,
-        query: Query,
-        *,
-        session: Session,
-        values: Sequence[str],
-        match_all: bool = False,
-        match_none: bool = False,
-    ) -> Query:
-        op = json_array_contains_all if match_all else json_array_contains_any
-        condition = op(RomMetadata.age_ratings, values, session=session)
-        return query.filter(~condition) if match_none else query.filter(condition)
-
     def _filter_by_status(
         self,
         query: Query,
@@ -1035,59 +990,6 @@ class DBRomsHandler(DBBaseHandler):
 
         return query.filter(or_(RomUser.hidden.is_(False), RomUser.hidden.is_(None)))
 
-    def _filter_by_regions(
-        self,
-        query: Query,
-        *,
-        session: Session,
-        values: Sequence[str],
-        match_all: bool = False,
-        match_none: bool = False,
-    ) -> Query:
-        op = json_array_contains_all if match_all else json_array_contains_any
-        condition = op(Rom.regions, values, session=session)
-        return query.filter(~condition) if match_none else query.filter(condition)
-
-    def _filter_by_languages(
-        self,
-        query: Query,
-        *,
-        session: Session,
-        values: Sequence[str],
-        match_all: bool = False,
-        match_none: bool = False,
-    ) -> Query:
-        op = json_array_contains_all if match_all else json_array_contains_any
-        condition = op(Rom.languages, values, session=session)
-        return query.filter(~condition) if match_none else query.filter(condition)
-
-    def _filter_by_tags(
-        self,
-        query: Query,
-        *,
-        session: Session,
-        values: Sequence[str],
-        match_all: bool = False,
-        match_none: bool = False,
-    ) -> Query:
-        op = json_array_contains_all if match_all else json_array_contains_any
-        condition = op(Rom.tags, values, session=session)
-        return query.filter(~condition) if match_none else query.filter(condition)
-
-    def _filter_by_player_counts(
-        self,
-        query: Query,
-        *,
-        session: Session,
-        values: Sequence[str],
-        match_all: bool = False,
-        match_none: bool = False,
-    ) -> Query:
-        condition = RomMetadata.player_count.in_(values)
-        if match_none:
-            return query.filter(not_(condition))
-        return query.filter(condition)
-
     def _filter_by_metadata_providers(
         self,
         query: Query,
@@ -1121,6 +1023,42 @@ class DBRomsHandler(DBBaseHandler):
             return query.filter(and_(*predicates))
         return query.filter(or_(*predicates))
 
+    def _filter_by_facet_index(
+        self,
+        query: Query,
+        session: Session,
+        facet_filters: Sequence[tuple[str, Sequence[str], str]],
+    ) -> Query:
+        """Apply every facet filter as one id-list predicate from the index.
+
+        The predicate is always a positive `IN`: a ROM the index hasn't caught
+        up with yet is left out rather than let through every filter. The ids
+        are rendered inline, so a broad filter isn't capped by the driver's
+        bound-parameter limit.
+        """
+        if not facet_filters:
+            return query
+
+        facet_index.refresh(session)
+        matches = sorted(
+            (
+                facet_index.match(facet, values, logic)
+                for facet, values, logic in facet_filters
+            ),
+            key=len,
+        )
+        matched = matches[0].intersection(*matches[1:])
+        return query.filter(
+            Rom.id.in_(
+                bindparam(
+                    "facet_rom_ids",
+                    sorted(matched),
+                    expanding=True,
+                    literal_execute=True,
+                )
+            )
+        )
+
     @begin_session
     def filter_roms(
         self,
@@ -1281,32 +1219,35 @@ class DBRomsHandler(DBBaseHandler):
         # Apply metadata and rom-level filters efficiently
         # Moved before applying group_by_meta_id to avoid missing titles when
         # filters don't match the primary ROM version in a group but would match a different version instead.
-        filters_to_apply = [
-            (genres, genres_logic, self._filter_by_genres),
-            (franchises, franchises_logic, self._filter_by_franchises),
-            (collections, collections_logic, self._filter_by_collections),
-            (companies, companies_logic, self._filter_by_companies),
-            (age_ratings, age_ratings_logic, self._filter_by_age_ratings),
-            (regions, regions_logic, self._filter_by_regions),
-            (languages, languages_logic, self._filter_by_languages),
-            (player_counts, player_counts_logic, self._filter_by_player_counts),
-            (
-                metadata_providers,
-                metadata_providers_logic,
-                self._filter_by_metadata_providers,
-            ),
-            (tags, tags_logic, self._filter_by_tags),
-        ]
-
-        for values, logic, filter_func in filters_to_apply:
-            if values:
-                query = filter_func(
-                    query,
-                    session=session,
-                    values=values,
-                    match_all=(logic == "all"),
-                    match_none=(logic == "none"),
+        # Facet filters are answered from the in-memory index.
+        query = self._filter_by_facet_index(
+            query,
+            session,
+            [
+                (facet, values, logic)
+                for facet, values, logic in (
+                    ("genres", genres, genres_logic),
+                    ("franchises", franchises, franchises_logic),
+                    ("collections", collections, collections_logic),
+                    ("companies", companies, companies_logic),
+                    ("age_ratings", age_ratings, age_ratings_logic),
+                    ("regions", regions, regions_logic),
+                    ("languages", languages, languages_logic),
+                    ("player_counts", player_counts, player_counts_logic),
+                    ("tags", tags, tags_logic),
                 )
+                if values
+            ],
+        )
+
+        if metadata_providers:
+            query = self._filter_by_metadata_providers(
+                query,
+                session=session,
+                values=metadata_providers,
+                match_all=(metadata_providers_logic == "all"),
+                match_none=(metadata_providers_logic == "none"),
+            )
 
         # BEWARE YE WHO ENTERS HERE 💀
         if group_by_meta_id:
@@ -1324,21 +1265,18 @@ class DBRomsHandler(DBBaseHandler):
             # Materialize only the columns the dedup window needs (not all of
             # Rom, whose JSON metadata blobs make the derived table huge), and
             # drop the carried-over ORDER BY the window doesn't use.
+            # Siblings share a materialized group id, so partitioning on it
+            # replaces a COALESCE over every provider id.
             base_subquery = (
                 query.order_by(None)
+                .outerjoin(RomSiblingGroup, RomSiblingGroup.rom_id == Rom.id)
                 .with_only_columns(  # type: ignore
                     Rom.id,
                     Rom.fs_name_no_ext,
                     _prerelease_rank().label("prerelease_rank"),
                     _region_rank().label("region_rank"),
                     Rom.platform_id,
-                    Rom.igdb_id,
-                    Rom.ss_id,
-                    Rom.moby_id,
-                    Rom.ra_id,
-                    Rom.hasheous_id,
-                    Rom.launchbox_id,
-                    Rom.tgdb_id,
+                    RomSiblingGroup.group_id,
                     Rom.flashpoint_id,
                 )
                 .subquery()
@@ -1361,38 +1299,8 @@ class DBRomsHandler(DBBaseHandler):
                     .over(
                         partition_by=func.coalesce(
                             _create_metadata_id_case(
-                                MetadataSource.IGDB,
-                                base_subquery.c.igdb_id,
-                                base_subquery.c.platform_id,
-                            ),
-                            _create_metadata_id_case(
-                                MetadataSource.SS,
-                                base_subquery.c.ss_id,
-                                base_subquery.c.platform_id,
-                            ),
-                            _create_metadata_id_case(
-                                MetadataSource.MOBY,
-                                base_subquery.c.moby_id,
-                                base_subquery.c.platform_id,
-                            ),
-                            _create_metadata_id_case(
-                                MetadataSource.RA,
-                                base_subquery.c.ra_id,
-                                base_subquery.c.platform_id,
-                            ),
-                            _create_metadata_id_case(
-                                MetadataSource.HASHEOUS,
-                                base_subquery.c.hasheous_id,
-                                base_subquery.c.platform_id,
-                            ),
-                            _create_metadata_id_case(
-                                MetadataSource.LAUNCHBOX,
-                                base_subquery.c.launchbox_id,
-                                base_subquery.c.platform_id,
-                            ),
-                            _create_metadata_id_case(
-                                MetadataSource.TGDB,
-                                base_subquery.c.tgdb_id,
+                                "group",
+                                base_subquery.c.group_id,
                                 base_subquery.c.platform_id,
                             ),
                             _create_metadata_id_case(
@@ -1427,14 +1335,6 @@ class DBRomsHandler(DBBaseHandler):
                 )
             )
 
-        # Optimize JOINs - only join tables when needed
-        needs_metadata_join = any(
-            [genres, franchises, collections, companies, age_ratings, player_counts]
-        )
-
-        if needs_metadata_join:
-            query = query.outerjoin(RomMetadata)
-
         # The RomUser table is already joined if user_id is set
         if statuses and user_id:
             query = self._filter_by_status(
@@ -1814,12 +1714,23 @@ class DBRomsHandler(DBBaseHandler):
                 "fs_extension": parts.extension,
             }
 
+        moves_stats = bool(PLATFORM_STATS_FIELDS.intersection(data))
+        if moves_stats:
+            stats_before = count_platform_rollups(session, rom_ids=[id])
+
         session.execute(
             update(Rom)
             .where(Rom.id == id)
             .values(**data)
             .execution_options(synchronize_session="evaluate")
         )
+        if SIBLING_GROUP_FIELDS.intersection(data):
+            self._regroup_siblings(session, [id])
+        if moves_stats:
+            apply_platform_rollup_changes(
+                session, stats_before, count_platform_rollups(session, rom_ids=[id])
+            )
+        note_roms_changed(session, [id])
         return session.query(Rom).filter_by(id=id).one()
 
     @begin_session
@@ -1851,11 +1762,248 @@ class DBRomsHandler(DBBaseHandler):
         id: int,
         session: Session = None,  # type: ignore
     ) -> None:
+        # The group row goes with the ROM, so note the group first: losing a
+        # member can split what it was holding together.
+        group_id = session.scalar(
+            select(RomSiblingGroup.group_id).where(RomSiblingGroup.rom_id == id)
+        )
+        stats_before = count_platform_rollups(session, rom_ids=[id])
         session.execute(
             delete(Rom)
             .where(Rom.id == id)
             .execution_options(synchronize_session="evaluate")
         )
+        if group_id is not None:
+            self._regroup_siblings(session, [], group_ids=[group_id])
+        apply_platform_rollup_changes(session, stats_before, {})
+        note_roms_changed(session, [id])
+
+    def _regroup_siblings(
+        self,
+        session: Session,
+        rom_ids: Iterable[int],
+        group_ids: Iterable[int] = (),
+    ) -> None:
+        """Reassign the sibling groups around ROMs whose provider ids changed.
+
+        Only the edges touching `rom_ids` changed, so the only groups that can
+        split or merge are the ones those ROMs were in (plus `group_ids`, for
+        ROMs already deleted) and the ones of ROMs now sharing an id with them.
+        Regrouping just those members gives the same result as a full rebuild.
+
+        Groups never span platforms, so regrouping is serialized per platform
+        by locking its row first; the reads after it are locking reads too, so
+        they see ROMs another regroup committed while this one waited.
+        """
+        rom_ids = list(rom_ids)
+        group_ids = list(group_ids)
+        self._lock_sibling_platforms(session, rom_ids, group_ids)
+
+        affected: set[int] = set(rom_ids)
+        for i in range(0, len(rom_ids), SIBLING_REGROUP_CHUNK):
+            chunk = rom_ids[i : i + SIBLING_REGROUP_CHUNK]
+            matches = [
+                and_(
+                    Rom.platform_id == platform_id,
+                    or_(
+                        *(
+                            column == value
+                            for column, value in zip(
+                                SIBLING_ID_COLUMNS, provider_ids, strict=True
+                            )
+                            if value is not None
+                        )
+                    ),
+                )
+                for platform_id, *provider_ids in session.execute(
+                    select(Rom.platform_id, *SIBLING_ID_COLUMNS).where(
+                        Rom.id.in_(chunk)
+                    )
+                )
+                if any(value is not None for value in provider_ids)
+            ]
+            if matches:
+                affected.update(
+                    session.scalars(
+                        select(Rom.id).where(or_(*matches)).with_for_update(read=True)
+                    )
+                )
+
+        groups = set(group_ids)
+        if affected:
+            groups.update(
+                session.scalars(
+                    select(RomSiblingGroup.group_id)
+                    .where(RomSiblingGroup.rom_id.in_(affected))
+                    .with_for_update(read=True)
+                )
+            )
+        if groups:
+            affected.update(
+                session.scalars(
+                    select(RomSiblingGroup.rom_id)
+                    .where(RomSiblingGroup.group_id.in_(groups))
+                    .with_for_update(read=True)
+                )
+            )
+        if not affected:
+            return
+
+        rows = session.execute(
+            select(Rom.id, Rom.platform_id, *SIBLING_ID_COLUMNS)
+            .where(Rom.id.in_(affected))
+            .with_for_update(read=True)
+        ).all()
+        session.execute(
+            delete(RomSiblingGroup).where(RomSiblingGroup.rom_id.in_(affected))
+        )
+        self._insert_sibling_groups(session, rows)
+
+    def _lock_sibling_platforms(
+        self,
+        session: Session,
+        rom_ids: Sequence[int],
+        group_ids: Sequence[int],
+    ) -> None:
+        """Lock the platform rows whose sibling groups are about to be rebuilt.
+
+        That's each ROM's platform, and the one its current group is on, which
+        differs when the write moved it to another platform.
+        """
+        platform_ids: set[int] = set()
+        if rom_ids:
+            platform_ids.update(
+                session.scalars(select(Rom.platform_id).where(Rom.id.in_(rom_ids)))
+            )
+        if rom_ids or group_ids:
+            platform_ids.update(
+                session.scalars(
+                    select(RomSiblingGroup.platform_id).where(
+                        or_(
+                            RomSiblingGroup.rom_id.in_(rom_ids),
+                            RomSiblingGroup.group_id.in_(group_ids),
+                        )
+                    )
+                )
+            )
+        if platform_ids:
+            # In id order, so two regroups spanning platforms can't deadlock
+            session.execute(
+                select(Platform.id)
+                .where(Platform.id.in_(platform_ids))
+                .order_by(Platform.id)
+                .with_for_update()
+            )
+
+    def _insert_sibling_groups(self, session: Session, rows: Sequence[Any]) -> int:
+        platform_ids = {row[0]: row[1] for row in rows}
+        assignment = assign_sibling_groups(rows)
+        values = [
+            {
+                "rom_id": rom_id,
+                "platform_id": platform_ids[rom_id],
+                "group_id": group_id,
+            }
+            for rom_id, group_id in assignment.items()
+        ]
+        for i in range(0, len(values), 1000):
+            session.execute(insert(RomSiblingGroup), values[i : i + 1000])
+        return len(values)
+
+    @begin_session
+    def rebuild_sibling_groups(
+        self,
+        session: Session = None,  # type: ignore
+    ) -> int:
+        """Recompute every ROM's sibling group from scratch.
+
+        Returns the number of ROMs placed in a group.
+        """
+        rows = session.execute(
+            select(Rom.id, Rom.platform_id, *SIBLING_ID_COLUMNS).where(
+                or_(*(column.is_not(None) for column in SIBLING_ID_COLUMNS))
+            )
+        ).all()
+        session.execute(delete(RomSiblingGroup))
+        return self._insert_sibling_groups(session, rows)
+
+    @begin_session
+    def get_cover_hashes(
+        self,
+        session: Session = None,  # type: ignore
+    ) -> set[str]:
+        """Return every cover hash still referenced by a ROM."""
+        return {
+            cover_hash
+            for cover_hash in session.scalars(
+                select(Rom.cover_hash).where(Rom.cover_hash.is_not(None)).distinct()
+            )
+            if cover_hash
+        }
+
+    @begin_session
+    def get_roms_with_covers(
+        self,
+        session: Session = None,  # type: ignore
+    ) -> Sequence[Rom]:
+        """Return every ROM with a large cover, with only its cover columns loaded."""
+        return session.scalars(
+            select(Rom)
+            .where(Rom.path_cover_l.is_not(None), Rom.path_cover_l != "")
+            .options(
+                load_only(
+                    Rom.platform_id,
+                    Rom.path_cover_l,
+                    Rom.cover_hash,
+                    Rom.cover_width,
+                )
+            )
+            .order_by(Rom.id)
+        ).all()
+
+    @begin_session
+    def get_rom_export_stamps(
+        self,
+        platform_id: int,
+        session: Session = None,  # type: ignore
+    ) -> list[tuple[int, datetime]]:
+        """Return `(id, updated_at)` of a platform's present ROMs, in the
+        name order exports list them, without loading the ROMs themselves."""
+        rows = session.execute(
+            select(Rom.id, Rom.updated_at)
+            .where(
+                and_(
+                    Rom.platform_id == platform_id,
+                    Rom.missing_from_fs.is_not(True),
+                )
+            )
+            .order_by(Rom.name_sort_key.asc(), Rom.id.asc())
+        ).all()
+        return [(rom_id, updated_at) for rom_id, updated_at in rows]
+
+    @begin_session
+    def get_roms_for_export(
+        self,
+        ids: Sequence[int],
+        session: Session = None,  # type: ignore
+    ) -> Sequence[Rom]:
+        """Get ROMs by id with only the joined metadata the exporters read,
+        skipping the saves/states/files loads of `get_roms_by_ids`."""
+        if not ids:
+            return []
+        return session.scalars(select(Rom).where(Rom.id.in_(ids))).unique().all()
+
+    @begin_session
+    def get_existing_rom_ids(
+        self,
+        ids: Iterable[int],
+        session: Session = None,  # type: ignore
+    ) -> set[int]:
+        """Return which of the given ids belong to a ROM, without loading them."""
+        ids = list(ids)
+        if not ids:
+            return set()
+        return set(session.scalars(select(Rom.id).where(Rom.id.in_(ids))).all())
 
     @begin_session
     def get_missing_rom_ids(
@@ -1978,6 +2126,100 @@ class DBRomsHandler(DBBaseHandler):
             select(RomUser).filter_by(rom_id=rom_id, user_id=user_id).limit(1)
         )
 
+    @begin_session
+    def record_rom_user_plays(
+        self,
+        user_id: int,
+        latest_plays: dict[int, datetime],
+        session: Session = None,  # type: ignore
+    ) -> None:
+        """Mark ROMs as played, given the end of each ROM's latest session.
+
+        Creates missing RomUser rows and updates the rest in two statements,
+        whatever the number of ROMs. Only a play newer than `last_played`
+        advances a row: a backfilled or device-synced older session must not
+        resurrect "now playing" or rewind the status. Playing again rewinds an
+        empty or "finished" status to "incomplete", but statuses the user set on
+        purpose (completed_100 / retired / never_playing) are left untouched.
+        """
+        if not latest_plays:
+            return
+
+        try:
+            new_rows, updates = self._plan_rom_user_plays(
+                user_id, latest_plays, session
+            )
+            with session.begin_nested():
+                if new_rows:
+                    session.execute(insert(RomUser), new_rows)
+        except IntegrityError:
+            # Another device of the same user recorded a first play of one of
+            # these ROMs concurrently. A locking read sees its committed rows,
+            # so they are updated instead of inserted again.
+            new_rows, updates = self._plan_rom_user_plays(
+                user_id, latest_plays, session, lock=True
+            )
+            if new_rows:
+                session.execute(insert(RomUser), new_rows)
+
+        if updates:
+            # ORM bulk UPDATE by primary key, sent as a single executemany
+            session.execute(update(RomUser), updates)
+
+    def _plan_rom_user_plays(
+        self,
+        user_id: int,
+        latest_plays: dict[int, datetime],
+        session: Session,
+        lock: bool = False,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Split plays into RomUser rows to insert and rows to advance."""
+        query = select(
+            RomUser.id, RomUser.rom_id, RomUser.last_played, RomUser.status
+        ).where(
+            RomUser.user_id == user_id,
+            RomUser.rom_id.in_(latest_plays.keys()),
+        )
+        if lock:
+            query = query.with_for_update()
+        existing = {row.rom_id: row for row in session.execute(query)}
+
+        new_rows: list[dict[str, Any]] = []
+        updates: list[dict[str, Any]] = []
+        for rom_id, latest_end_time in latest_plays.items():
+            row = existing.get(rom_id)
+            if row is None:
+                new_rows.append(
+                    {
+                        "rom_id": rom_id,
+                        "user_id": user_id,
+                        "last_played": latest_end_time,
+                        "now_playing": True,
+                        "status": RomUserStatus.INCOMPLETE,
+                    }
+                )
+                continue
+
+            if row.last_played is not None and latest_end_time <= to_utc(
+                row.last_played
+            ):
+                continue
+
+            updates.append(
+                {
+                    "id": row.id,
+                    "last_played": latest_end_time,
+                    "now_playing": True,
+                    "status": (
+                        RomUserStatus.INCOMPLETE
+                        if row.status in (None, RomUserStatus.FINISHED)
+                        else row.status
+                    ),
+                }
+            )
+
+        return new_rows, updates
+
     @begin_session
     def get_rom_user_by_id(
         self,
@@ -2030,8 +2272,13 @@ class DBRomsHandler(DBBaseHandler):
         rom_file: RomFile,
         session: Session = None,  # type: ignore
     ) -> RomFile:
+        rom_ids = [rom_file.rom_id]
+        stats_before = count_platform_rollups(session, rom_ids=rom_ids)
         merged = session.merge(rom_file)
         session.flush()
+        apply_platform_rollup_changes(
+            session, stats_before, count_platform_rollups(session, rom_ids=rom_ids)
+        )
         return merged
 
     def _apply_scanned_rom_file(
@@ -2090,6 +2337,7 @@ class DBRomsHandler(DBBaseHandler):
         Returns the persisted rows in scan order, plus the soundtrack covers
         left behind by dropped track metadata for the caller to unlink.
         """
+        stats_before = count_platform_rollups(session, rom_ids=[rom_id])
         existing = (
             session.scalars(
                 select(RomFile)
@@ -2162,6 +2410,9 @@ class DBRomsHandler(DBBaseHandler):
             )
 
         session.flush()
+        apply_platform_rollup_changes(
+            session, stats_before, count_platform_rollups(session, rom_ids=[rom_id])
+        )
         return SyncedRomFiles(files=saved, orphaned_cover_paths=orphaned_cover_paths)
 
     @begin_session
@@ -2788,61 +3039,6 @@ class DBRomsHandler(DBBaseHandler):
         # Return None when more than one match to avoid ambiguity.
         return matches[0] if len(matches) == 1 else None
 
-    def _collect_filter_values(
-        self,
-        session: Session,
-        statement: Select,
-    ) -> dict:
-        genres = set()
-        franchises = set()
-        collections = set()
-        companies = set()
-        game_modes = set()
-        age_ratings = set()
-        player_counts = set()
-        regions = set()
-        languages = set()
-        tags = set()
-        platforms = set()
-
-        for row in session.execute(statement):
-            g, f, cl, co, gm, ar, pc, rg, lg, tg, pid = row
-            if g:
-                genres.update(g)
-            if f:
-                franchises.update(f)
-            if cl:
-                collections.update(cl)
-            if co:
-                companies.update(co)
-            if gm:
-                game_modes.update(gm)
-            if ar:
-                age_ratings.update(ar)
-            if pc:
-                player_counts.add(pc)
-            if rg:
-                regions.update(rg)
-            if lg:
-                languages.update(lg)
-            if tg:
-                tags.update(tg)
-            platforms.add(pid)
-
-        return {
-            "genres": sorted(genres),
-            "franchises": sorted(franchises),
-            "collections": sorted(collections),
-            "companies": sorted(companies),
-            "game_modes": sorted(game_modes),
-            "age_ratings": sorted(age_ratings),
-            "player_counts": sorted(player_counts),
-            "regions": sorted(regions),
-            "languages": sorted(languages),
-            "tags": sorted(tags),
-            "platforms": sorted(platforms),
-        }
-
     def invalidate_filter_values_cache(self) -> None:
         old_version = str(int(sync_cache.incr(ROM_FILTERS_CACHE_VERSION_KEY)) - 1)
         old_keys_set = _filter_values_cache_keys_key(old_version)
@@ -2875,11 +3071,12 @@ class DBRomsHandler(DBBaseHandler):
             if cached is not None:
                 return json.loads(cached)
 
-        ids_subq = query.order_by(None).with_only_columns(Rom.id).scalar_subquery()  # type: ignore
-
-        statement = _FILTER_VALUES_SELECT.where(RomFacets.rom_id.in_(ids_subq))
-
-        result = self._collect_filter_values(session, statement)
+        # Only the ids come from the database; the values come from the index.
+        scope = set(
+            session.scalars(query.order_by(None).with_only_columns(Rom.id))  # type: ignore
+        )
+        facet_index.refresh(session)
+        result = facet_index.filter_values(scope)
         if redis_key is not None and version is not None:
             _store_versioned_cache(redis_key, version, result)
         return result
@@ -2892,4 +3089,5 @@ class DBRomsHandler(DBBaseHandler):
         """
         Returns all filter values across all ROM metadata
         """
-        return self._collect_filter_values(session, _FILTER_VALUES_SELECT)
+        facet_index.refresh(session)
+        return facet_index.filter_values()
@@ -1,11 +1,13 @@
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
+from datetime import datetime
 from typing import Literal
 
-from sqlalchemy import and_, asc, delete, desc, func, or_, select, update
+from sqlalchemy import and_, asc, delete, desc, func, or_, select, tuple_, update
 from sqlalchemy.orm import QueryableAttribute, Session, load_only
 
 from decorators.database import begin_session
 from models.assets import Save
+from models.device_save_sync import DeviceSaveSync
 from models.rom import Rom
 
 from .base_handler import DBBaseHandler
@@ -119,6 +121,71 @@ class DBSavesHandler(DBBaseHandler):
 
         return session.scalars(query).all()
 
+    @begin_session
+    def get_latest_slot_saves(
+        self,
+        user_id: int,
+        keys: Collection[tuple[int, str | None]],
+        session: Session = None,  # type: ignore
+    ) -> Sequence[Save]:
+        """The newest save in each of the given (rom_id, slot) pairs.
+
+        A slot accrues a row per upload, so this ranks rows within each pair
+        rather than loading the slot's whole history.
+        """
+        if not keys:
+            return []
+
+        ranked = (
+            select(
+                Save.id,
+                func.row_number()
+                .over(
+                    partition_by=(Save.rom_id, Save.slot),
+                    order_by=(Save.updated_at.desc(), Save.id.desc()),
+                )
+                .label("row_rank"),
+            )
+            .filter(
+                Save.user_id == user_id,
+                tuple_(Save.rom_id, Save.slot).in_(list(keys)),
+            )
+            .subquery()
+        )
+        return session.scalars(
+            select(Save)
+            .join(ranked, Save.id == ranked.c.id)
+            .filter(ranked.c.row_rank == 1)
+        ).all()
+
+    @begin_session
+    def get_slot_keys_changed_since(
+        self,
+        user_id: int,
+        device_id: str,
+        since: datetime,
+        session: Session = None,  # type: ignore
+    ) -> set[tuple[int, str | None]]:
+        """(rom_id, slot) pairs with a save changed after `since`, or whose sync
+        state on `device_id` changed (e.g. re-tracked) after it."""
+        changed_saves = select(Save.rom_id, Save.slot).filter(
+            Save.user_id == user_id,
+            Save.slot.is_not(None),
+            Save.updated_at > since,
+        )
+        changed_syncs = (
+            select(Save.rom_id, Save.slot)
+            .join(DeviceSaveSync, DeviceSaveSync.save_id == Save.id)
+            .filter(
+                DeviceSaveSync.device_id == device_id,
+                DeviceSaveSync.updated_at > since,
+                Save.user_id == user_id,
+                Save.slot.is_not(None),
+            )
+        )
+        rows = session.execute(changed_saves.union(changed_syncs)).all()
+        return {(rom_id, slot) for rom_id, slot in rows}
+
     @begin_session
     def get_save_by_id(
         self,
@@ -1,18 +1,40 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
 
-from sqlalchemy import distinct, func, select
+from sqlalchemy import delete, distinct, func, select
 from sqlalchemy.orm import InstrumentedAttribute, Session
 from sqlalchemy.sql.selectable import Select
 
 from decorators.database import begin_session
 from endpoints.responses.stats import MetadataCoverageItem, RegionBreakdownItem
 from models.assets import Save, Screenshot, State
+from models.platform import Platform, PlatformStats
 from models.rom import METADATA_SOURCE_FACET_COLUMNS, Rom, RomFacets, RomFile
 
 from .base_handler import DBBaseHandler
 
+# ROM columns a write has to touch to move its platform's rollup; file sizes
+# move with `rom_files` writes instead.
+PLATFORM_STATS_FIELDS = frozenset(
+    {
+        "platform_id",
+        "regions",
+        *(column.key for column in METADATA_SOURCE_FACET_COLUMNS.values()),
+    }
+)
+
+
+@dataclass
+class PlatformRollup:
+    """One platform's figures, or the share of them a set of ROMs makes up."""
+
+    rom_count: int = 0
+    filesize_bytes: int = 0
+    metadata_coverage: dict[str, int] = field(default_factory=dict)
+    region_counts: dict[str, int] = field(default_factory=dict)
+
 
 def _exclude_hidden(
     query: Select,
@@ -34,6 +56,206 @@ def _exclude_hidden(
     return query
 
 
+def _count_metadata_coverage(
+    session: Session,
+    hidden_platform_ids: Sequence[int] | None = None,
+    hidden_rom_ids: Sequence[int] | None = None,
+    platform_ids: Sequence[int] | None = None,
+    rom_ids: Sequence[int] | None = None,
+) -> dict[int, dict[str, int]]:
+    """ROMs matched per metadata source, per platform, from `roms_facets`."""
+    query = _exclude_hidden(
+        select(
+            RomFacets.platform_id,
+            *(
+                func.count(col).label(key)
+                for key, col in METADATA_SOURCE_FACET_COLUMNS.items()
+            ),
+        ).select_from(RomFacets),
+        hidden_platform_ids,
+        hidden_rom_ids,
+        platform_id_col=RomFacets.platform_id,
+        rom_id_col=RomFacets.rom_id,
+    )
+    if platform_ids is not None:
+        query = query.where(RomFacets.platform_id.in_(platform_ids))
+    if rom_ids is not None:
+        query = query.where(RomFacets.rom_id.in_(rom_ids))
+
+    return {
+        row.platform_id: {
+            key: getattr(row, key)
+            for key in METADATA_SOURCE_FACET_COLUMNS
+            if getattr(row, key) > 0
+        }
+        for row in session.execute(query.group_by(RomFacets.platform_id))
+    }
+
+
+def _count_regions(
+    session: Session,
+    hidden_platform_ids: Sequence[int] | None = None,
+    hidden_rom_ids: Sequence[int] | None = None,
+    platform_ids: Sequence[int] | None = None,
+    rom_ids: Sequence[int] | None = None,
+) -> dict[int, dict[str, int]]:
+    """ROMs per region, per platform, from `roms_facets`."""
+    query = _exclude_hidden(
+        select(RomFacets.platform_id, RomFacets.regions).where(
+            RomFacets.regions.is_not(None)
+        ),
+        hidden_platform_ids,
+        hidden_rom_ids,
+        platform_id_col=RomFacets.platform_id,
+        rom_id_col=RomFacets.rom_id,
+    )
+    if platform_ids is not None:
+        query = query.where(RomFacets.platform_id.in_(platform_ids))
+    if rom_ids is not None:
+        query = query.where(RomFacets.rom_id.in_(rom_ids))
+
+    counter: dict[int, dict[str, int]] = {}
+    for row in session.execute(query):
+        platform_id: int = row.platform_id
+        regions_list: list[str] | None = row.regions
+        if regions_list:
+            regions = counter.setdefault(platform_id, {})
+            for region in regions_list:
+                regions[region] = regions.get(region, 0) + 1
+    return counter
+
+
+def count_platform_rollups(
+    session: Session,
+    platform_ids: Sequence[int] | None = None,
+    rom_ids: Sequence[int] | None = None,
+) -> dict[int, PlatformRollup]:
+    """Aggregate the rollups of `platform_ids` (all if None), or just the share
+    of them `rom_ids` make up."""
+    rom_query = select(Rom.platform_id, func.count()).select_from(Rom)
+    size_query = (
+        select(Rom.platform_id, func.sum(RomFile.file_size_bytes))
+        .select_from(RomFile)
+        .join(Rom)
+    )
+    if platform_ids is not None:
+        rom_query = rom_query.where(Rom.platform_id.in_(platform_ids))
+        size_query = size_query.where(Rom.platform_id.in_(platform_ids))
+    if rom_ids is not None:
+        rom_query = rom_query.where(Rom.id.in_(rom_ids))
+        size_query = size_query.where(Rom.id.in_(rom_ids))
+
+    rollups = {
+        platform_id: PlatformRollup(rom_count=rom_count)
+        for platform_id, rom_count in session.execute(
+            rom_query.group_by(Rom.platform_id)
+        )
+    }
+    for platform_id, filesize in session.execute(size_query.group_by(Rom.platform_id)):
+        rollups[platform_id].filesize_bytes = int(filesize or 0)
+    coverage = _count_metadata_coverage(
+        session, platform_ids=platform_ids, rom_ids=rom_ids
+    )
+    for platform_id, sources in coverage.items():
+        rollups[platform_id].metadata_coverage = sources
+    regions = _count_regions(session, platform_ids=platform_ids, rom_ids=rom_ids)
+    for platform_id, region_counts in regions.items():
+        rollups[platform_id].region_counts = region_counts
+    return rollups
+
+
+def _lock_platforms(session: Session, platform_ids: Iterable[int] | None) -> None:
+    """Serialize rollup writes per platform, in id order to avoid deadlocks."""
+    query = select(Platform.id).order_by(Platform.id).with_for_update()
+    if platform_ids is not None:
+        query = query.where(Platform.id.in_(platform_ids))
+    session.execute(query).all()
+
+
+def _shift_counts(
+    counts: dict[str, int], removed: dict[str, int], added: dict[str, int]
+) -> dict[str, int]:
+    shifted = dict(counts)
+    for key, count in removed.items():
+        shifted[key] = shifted.get(key, 0) - count
+    for key, count in added.items():
+        shifted[key] = shifted.get(key, 0) + count
+    return {key: count for key, count in shifted.items() if count > 0}
+
+
+def apply_platform_rollup_changes(
+    session: Session,
+    before: dict[int, PlatformRollup],
+    after: dict[int, PlatformRollup],
+) -> None:
+    """Move the stored rollups by what a write changed.
+
+    `before` and `after` are `count_platform_rollups` over the ROMs the write
+    touched, taken on either side of it in the same transaction, so the update
+    costs as much as the write rather than a recount of its platforms.
+    """
+    platform_ids = sorted(before.keys() | after.keys())
+    if not platform_ids or before == after:
+        return
+
+    _lock_platforms(session, platform_ids)
+    stored = {
+        row.platform_id: row
+        for row in session.scalars(
+            select(PlatformStats)
+            .where(PlatformStats.platform_id.in_(platform_ids))
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+    }
+    for platform_id in platform_ids:
+        old = before.get(platform_id, PlatformRollup())
+        new = after.get(platform_id, PlatformRollup())
+        row = stored.get(platform_id)
+        if row is None:
+            row = PlatformStats(
+                platform_id=platform_id,
+                rom_count=0,
+                filesize_bytes=0,
+                metadata_coverage={},
+                region_counts={},
+            )
+        rom_count = row.rom_count + new.rom_count - old.rom_count
+        if rom_count <= 0:
+            # Platforms without ROMs have no row
+            if platform_id in stored:
+                session.delete(row)
+            continue
+
+        row.rom_count = rom_count
+        row.filesize_bytes += new.filesize_bytes - old.filesize_bytes
+        # Reassigned rather than mutated, so the JSON columns are flushed
+        row.metadata_coverage = _shift_counts(
+            row.metadata_coverage or {}, old.metadata_coverage, new.metadata_coverage
+        )
+        row.region_counts = _shift_counts(
+            row.region_counts or {}, old.region_counts, new.region_counts
+        )
+        session.add(row)
+
+
+def coverage_items(coverage: dict[str, int]) -> list[MetadataCoverageItem]:
+    """Shape a platform's source -> match count map for the stats response."""
+    return [
+        MetadataCoverageItem(source=key, matched=coverage[key])
+        for key in METADATA_SOURCE_FACET_COLUMNS
+        if coverage.get(key, 0) > 0
+    ]
+
+
+def region_items(regions: dict[str, int]) -> list[RegionBreakdownItem]:
+    """Shape a platform's region -> ROM count map, most common region first."""
+    return [
+        RegionBreakdownItem(region=region, count=count)
+        for region, count in sorted(regions.items(), key=lambda x: -x[1])
+    ]
+
+
 class DBStatsHandler(DBBaseHandler):
     @begin_session
     def get_platforms_count(
@@ -129,31 +351,11 @@ class DBStatsHandler(DBBaseHandler):
         Aggregates the narrow `roms_facets` mirror instead of `roms`, whose rows
         also carry the raw provider-metadata blobs.
         """
-        rows = session.execute(
-            _exclude_hidden(
-                select(
-                    RomFacets.platform_id,
-                    *(
-                        func.count(col).label(key)
-                        for key, col in METADATA_SOURCE_FACET_COLUMNS.items()
-                    ),
-                ).select_from(RomFacets),
-                hidden_platform_ids,
-                hidden_rom_ids,
-                platform_id_col=RomFacets.platform_id,
-                rom_id_col=RomFacets.rom_id,
-            ).group_by(RomFacets.platform_id)
-        ).all()
-
-        result: dict[int, list[MetadataCoverageItem]] = {}
-        for row in rows:
-            result[row.platform_id] = [
-                MetadataCoverageItem(source=key, matched=getattr(row, key))
-                for key in METADATA_SOURCE_FACET_COLUMNS
-                if getattr(row, key) > 0
-            ]
-
-        return result
+        counts = _count_metadata_coverage(session, hidden_platform_ids, hidden_rom_ids)
+        return {
+            platform_id: coverage_items(coverage)
+            for platform_id, coverage in counts.items()
+        }
 
     @begin_session
     def get_region_breakdown_by_platform(
@@ -166,32 +368,54 @@ class DBStatsHandler(DBBaseHandler):
 
         Reads the narrow `roms_facets` mirror rather than scanning `roms`.
         """
-        rows = session.execute(
-            _exclude_hidden(
-                select(RomFacets.platform_id, RomFacets.regions).where(
-                    RomFacets.regions.is_not(None)
-                ),
-                hidden_platform_ids,
-                hidden_rom_ids,
-                platform_id_col=RomFacets.platform_id,
-                rom_id_col=RomFacets.rom_id,
-            )
-        ).all()
-
-        counter: dict[int, dict[str, int]] = {}
-        for platform_id, regions_list in rows:
-            if regions_list:
-                if platform_id not in counter:
-                    counter[platform_id] = {}
-                for region in regions_list:
-                    counter[platform_id][region] = (
-                        counter[platform_id].get(region, 0) + 1
-                    )
-
+        counts = _count_regions(session, hidden_platform_ids, hidden_rom_ids)
         return {
-            pid: [
-                {"region": r, "count": c}
-                for r, c in sorted(regions.items(), key=lambda x: -x[1])
-            ]
-            for pid, regions in counter.items()
+            platform_id: region_items(regions)
+            for platform_id, regions in counts.items()
         }
+
+    @begin_session
+    def refresh_platform_stats(
+        self,
+        platform_ids: Iterable[int] | None = None,
+        session: Session = None,  # type: ignore
+    ) -> None:
+        """Recompute the `platforms_stats` rollups for `platform_ids` (all if None).
+
+        ROM writes keep the rows current as they go, so this is the fallback for
+        rows that drifted. The platform rows are locked first, so a concurrent
+        write waits for the rebuilt rows instead of racing their reinsert.
+        """
+        scope = None if platform_ids is None else sorted(set(platform_ids))
+        if scope == []:
+            return
+
+        _lock_platforms(session, scope)
+        rollups = count_platform_rollups(session, platform_ids=scope)
+
+        stale = delete(PlatformStats)
+        if scope is not None:
+            stale = stale.where(PlatformStats.platform_id.in_(scope))
+        session.execute(stale.execution_options(synchronize_session=False))
+        session.add_all(
+            PlatformStats(
+                platform_id=platform_id,
+                rom_count=rollup.rom_count,
+                filesize_bytes=rollup.filesize_bytes,
+                metadata_coverage=rollup.metadata_coverage,
+                region_counts=rollup.region_counts,
+            )
+            for platform_id, rollup in rollups.items()
+        )
+
+    @begin_session
+    def get_platform_stats(
+        self,
+        hidden_platform_ids: Sequence[int] | None = None,
+        session: Session = None,  # type: ignore
+    ) -> Sequence[PlatformStats]:
+        """Get the per-platform rollups."""
+        query = select(PlatformStats).order_by(PlatformStats.platform_id)
+        if hidden_platform_ids:
+            query = query.where(PlatformStats.platform_id.not_in(hidden_platform_ids))
+        return session.scalars(query).all()
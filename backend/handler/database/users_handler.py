@@ -6,8 +6,13 @@ from sqlalchemy.sql import Delete, Select, Update
 
 from decorators.database import begin_session
 from models.user import Role, User
+from utils.cache import invalidate_heartbeat_cache
 
-from .base_handler import DBBaseHandler
+from .base_handler import DBBaseHandler, run_after_commit
+
+# User columns the heartbeat payload reflects, through the admin accounts that
+# decide whether the setup wizard shows.
+HEARTBEAT_USER_FIELDS = frozenset({"role", "enabled"})
 
 
 class DBUsersHandler(DBBaseHandler):
@@ -43,7 +48,12 @@ class DBUsersHandler(DBBaseHandler):
         user: User,
         session: Session = None,  # type: ignore
     ) -> User:
-        return session.merge(user)
+        user = session.merge(user)
+        # The first admin account hides the setup wizard. Dropping the cache
+        # before the commit would let a concurrent heartbeat cache the old
+        # answer again.
+        run_after_commit(session, invalidate_heartbeat_cache)
+        return user
 
     @begin_session
     def get_user_by_username(
@@ -84,6 +94,8 @@ class DBUsersHandler(DBBaseHandler):
             .values(**data)
             .execution_options(synchronize_session="evaluate")
         )
+        if HEARTBEAT_USER_FIELDS.intersection(data):
+            run_after_commit(session, invalidate_heartbeat_cache)
         return session.query(User).filter_by(id=id).one()
 
     @begin_session
@@ -116,11 +128,13 @@ class DBUsersHandler(DBBaseHandler):
         id: int,
         session: Session = None,  # type: ignore
     ):
-        return session.execute(
+        result = session.execute(
             delete(User)
             .where(User.id == id)
             .execution_options(synchronize_session="evaluate")
         )
+        run_after_commit(session, invalidate_heartbeat_cache)
+        return result
 
     @begin_session
     def get_admin_users(
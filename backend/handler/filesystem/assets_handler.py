@@ -1,20 +1,42 @@
+import asyncio
 import hashlib
 import os
+import tempfile
 import threading
+import time
 import zipfile
+from io import BytesIO
 from mimetypes import guess_type
 from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO
 
 import magic
+from anyio import Path as AnyioPath
 from fastapi import HTTPException, UploadFile, status
 from fastapi.responses import FileResponse
+from starlette.datastructures import UploadFile as StarletteUploadFile
 
-from config import ASSETS_BASE_PATH
+from config import ASSETS_BASE_PATH, ENABLE_ASSET_DEDUPLICATION
 from logger.logger import log
 from models.user import User
+from utils.filesystem import link_or_copy_file
 from utils.media_types import IMAGE_EXT_BY_MIME_TYPE
 
-from .base_handler import FSHandler
+from .base_handler import (
+    WRITE_BLOCK_SIZE,
+    FSHandler,
+    StagedFile,
+    _open_file_object,
+)
+
+# Deduplicated save/state payloads live at blobs/{sha256[:2]}/{sha256}, and
+# every asset holding that content is a hardlink to it. The inode's link count
+# is the refcount: a blob whose count has dropped to 1 is unreferenced.
+ASSET_BLOBS_DIR = "blobs"
+# An upload may find a blob and link it a moment later, so an unreferenced
+# blob is only swept once its link count has been unchanged for this long.
+ASSET_BLOBS_GRACE_SECONDS = 3600
 
 # libmagic loads its database on construction (~few MB read from disk), so we
 # share a single Magic instance across requests. The underlying magic_t handle
@@ -83,10 +105,148 @@ def build_asset_file_response(
     )
 
 
+def _md5_file(path: Path) -> str:
+    hash_obj = hashlib.md5(usedforsecurity=False)
+    with open(path, "rb") as f:
+        while chunk := f.read(WRITE_BLOCK_SIZE):
+            hash_obj.update(chunk)
+    return hash_obj.hexdigest()
+
+
+def _zip_content_hash(path: Path) -> str:
+    """MD5 over the sorted ``name:md5`` lines of a zip's members.
+
+    Members are decompressed a block at a time, so a zipped save folder never
+    has to fit in memory.
+    """
+    with zipfile.ZipFile(path, "r") as zf:
+        file_hashes = []
+        for name in sorted(zf.namelist()):
+            if not name.endswith("/"):
+                hash_obj = hashlib.md5(usedforsecurity=False)
+                with zf.open(name) as member:
+                    while chunk := member.read(WRITE_BLOCK_SIZE):
+                        hash_obj.update(chunk)
+                file_hashes.append(f"{name}:{hash_obj.hexdigest()}")
+        combined = "\n".join(file_hashes)
+        return hashlib.md5(combined.encode(), usedforsecurity=False).hexdigest()
+
+
+def _write_blob(source: BinaryIO | SpooledTemporaryFile, blob_path: Path) -> None:
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path_str = tempfile.mkstemp(dir=blob_path.parent, prefix=".romm_tmp_")
+    temp_path = Path(temp_path_str)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := source.read(WRITE_BLOCK_SIZE):
+                out.write(chunk)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, blob_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _link_payload(
+    file: StarletteUploadFile | BinaryIO | BytesIO | bytes | SpooledTemporaryFile,
+    dest: Path,
+    blobs_path: Path,
+    digest: "hashlib._Hash | None" = None,
+) -> None:
+    """Hardlink ``dest`` to the blob holding ``file``'s content, storing the
+    blob first if this content has not been seen before.
+
+    The payload is read once to hash it, and a second time only when its blob
+    has to be written.
+    """
+    source = _open_file_object(file)
+    start = source.tell()
+    content_digest = hashlib.sha256()
+    while chunk := source.read(WRITE_BLOCK_SIZE):
+        content_digest.update(chunk)
+        if digest is not None:
+            digest.update(chunk)
+
+    sha256 = content_digest.hexdigest()
+    blob_path = blobs_path / sha256[:2] / sha256
+    for _ in range(2):
+        created = not blob_path.exists()
+        if created:
+            source.seek(start)
+            _write_blob(source, blob_path)
+
+        try:
+            link_or_copy_file(blob_path, dest)
+        except FileNotFoundError:
+            # Released by a delete between the existence check and the link
+            continue
+
+        if created and _link_count(blob_path) == 1:
+            # No hardlinks on this filesystem, so dest got a copy instead
+            blob_path.unlink(missing_ok=True)
+        return
+
+    raise FileNotFoundError(f"Asset blob kept disappearing: {blob_path}")
+
+
+def _link_count(path: Path) -> int:
+    try:
+        return path.stat().st_nlink
+    except FileNotFoundError:
+        return 0
+
+
+def _remove_unreferenced_blobs(blobs_path: Path) -> int:
+    removed = 0
+    # Linking and unlinking update st_ctime, so it records when the blob
+    # last gained or lost a reference
+    cutoff = time.time() - ASSET_BLOBS_GRACE_SECONDS
+    try:
+        prefixes = [entry.path for entry in os.scandir(blobs_path) if entry.is_dir()]
+    except OSError as exc:
+        log.error(f"Unable to list asset blobs {blobs_path}: {str(exc)}")
+        return 0
+
+    for prefix in prefixes:
+        with os.scandir(prefix) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                    if stat.st_nlink > 1 or stat.st_ctime > cutoff:
+                        continue
+                    os.unlink(entry.path)
+                    removed += 1
+                except OSError as exc:
+                    log.error(f"Failed to remove asset blob {entry.path}: {str(exc)}")
+    return removed
+
+
 class FSAssetsHandler(FSHandler):
     def __init__(self) -> None:
         super().__init__(base_path=ASSETS_BASE_PATH)
 
+    @property
+    def blobs_path(self) -> Path:
+        return self.base_path / ASSET_BLOBS_DIR
+
+    async def _write_payload(
+        self,
+        file: StarletteUploadFile | BinaryIO | BytesIO | bytes | SpooledTemporaryFile,
+        dest: Path,
+        digest: "hashlib._Hash | None" = None,
+    ) -> None:
+        if not ENABLE_ASSET_DEDUPLICATION:
+            await super()._write_payload(file, dest, digest)
+            return
+
+        await asyncio.to_thread(_link_payload, file, dest, self.blobs_path, digest)
+
+    async def remove_unreferenced_blobs(self) -> int:
+        """Remove deduplicated blobs no asset has been linked to for a while."""
+        if not await AnyioPath(self.blobs_path).exists():
+            return 0
+        return await asyncio.to_thread(_remove_unreferenced_blobs, self.blobs_path)
+
     def user_folder_path(self, user: User):
         return os.path.join("users", user.fs_safe_folder_name)
 
@@ -143,22 +303,10 @@ class FSAssetsHandler(FSHandler):
         )
 
     async def _compute_file_hash(self, file_path: str) -> str:
-        hash_obj = hashlib.md5(usedforsecurity=False)
-        async with await self.stream_file(file_path=file_path) as f:
-            while chunk := await f.read(8192):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+        return await asyncio.to_thread(_md5_file, self.base_path / file_path)
 
     async def _compute_zip_hash(self, zip_path: str) -> str:
-        with zipfile.ZipFile(self.base_path / zip_path, "r") as zf:
-            file_hashes = []
-            for name in sorted(zf.namelist()):
-                if not name.endswith("/"):
-                    content = zf.read(name)
-                    file_hash = hashlib.md5(content, usedforsecurity=False).hexdigest()
-                    file_hashes.append(f"{name}:{file_hash}")
-            combined = "\n".join(file_hashes)
-            return hashlib.md5(combined.encode(), usedforsecurity=False).hexdigest()
+        return await asyncio.to_thread(_zip_content_hash, self.base_path / zip_path)
 
     async def compute_content_hash(self, file_path: str) -> str | None:
         try:
@@ -169,3 +317,15 @@ class FSAssetsHandler(FSHandler):
         except Exception as e:
             log.debug(f"Failed to compute content hash for {file_path}: {e}")
             return None
+
+    async def compute_staged_content_hash(self, staged: StagedFile) -> str | None:
+        """Content hash of a staged file, matching what compute_content_hash
+        returns once it is committed. Plain files reuse the MD5 taken while
+        staging; zips hash their members from the staged copy."""
+        try:
+            if zipfile.is_zipfile(staged.temp_path):
+                return await asyncio.to_thread(_zip_content_hash, staged.temp_path)
+            return staged.md5
+        except Exception as e:
+            log.debug(f"Failed to compute content hash for {staged.temp_path}: {e}")
+            return None
@@ -1,11 +1,13 @@
 import asyncio
 import fnmatch
+import hashlib
 import os
 import re
 import shutil
 import tempfile
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from enum import Enum
 from io import BytesIO
 from pathlib import Path
@@ -23,7 +25,12 @@ from models.base import (
     compute_file_name_no_ext,
     compute_file_name_no_tags,
 )
-from utils.filesystem import iter_directories, iter_files, link_or_copy_file
+from utils.filesystem import (
+    iter_directories,
+    iter_files,
+    link_or_copy_file,
+    replace_on_write,
+)
 
 UUID_V4_REGEX = re.compile(
     r"[0-9a-f]{8}-[0-9a-f]{4}-[0-5][0-9a-f]{3}-[089ab][0-9a-f]{3}-[0-9a-f]{12}",
@@ -31,6 +38,59 @@ UUID_V4_REGEX = re.compile(
 )
 
 
+# Saves and states are written in blocks this size from a worker thread, so a
+# memory card of tens of MB takes a handful of writes instead of thousands of
+# event-loop round trips.
+WRITE_BLOCK_SIZE = 1024 * 1024
+
+
+def _open_file_object(
+    file: UploadFile | BinaryIO | BytesIO | bytes | SpooledTemporaryFile,
+) -> BinaryIO | SpooledTemporaryFile:
+    """A readable binary stream over ``file``'s content."""
+    if isinstance(file, UploadFile):
+        return file.file
+    if isinstance(file, BinaryIO) or isinstance(file, SpooledTemporaryFile):
+        file.seek(0)
+        return file
+    if isinstance(file, BytesIO):
+        return BytesIO(file.getbuffer())
+    if isinstance(file, bytes):
+        return BytesIO(file)
+    raise ValueError("Unsupported file type for writing")
+
+
+def _write_file_object(
+    file: UploadFile | BinaryIO | BytesIO | bytes | SpooledTemporaryFile,
+    dest: Path,
+    digest: "hashlib._Hash | None" = None,
+) -> None:
+    """Copy ``file`` into ``dest``, feeding every block to ``digest`` as well."""
+    source = _open_file_object(file)
+    with open(dest, "wb") as out:
+        while chunk := source.read(WRITE_BLOCK_SIZE):
+            out.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+
+
+@dataclass
+class StagedFile:
+    """A file written beside its target but not yet moved into place."""
+
+    temp_path: Path
+    md5: str
+    discarded: bool = False
+
+    def discard(self) -> None:
+        """Drop the staged bytes instead of committing them to the target."""
+        self.discarded = True
+
+
+class _StagedFileDiscarded(Exception):
+    pass
+
+
 class LibraryStructure(Enum):
     A = "struct_a"
     B = "struct_b"
@@ -308,6 +368,9 @@ class FSHandler:
             # mkstemp creates files with 0600 permissions
             os.chmod(temp_path, 0o644)
             os.replace(str(temp_path), str(target_path))
+            # rename() is a no-op when both names already link the same inode,
+            # as a deduplicated asset rewritten with unchanged content does
+            await AnyioPath(temp_path).unlink(missing_ok=True)
 
         # BaseException, not Exception: a cancelled scan raises CancelledError,
         # which would otherwise skip cleanup and strand a temp file per cancel.
@@ -460,22 +523,64 @@ class FSHandler:
 
             # Write file atomically
             async with self._atomic_write(final_file_path) as temp_path:
-                async with await open_file(temp_path, "wb") as temp_file:
-                    if isinstance(file, UploadFile):
-                        while chunk := file.file.read(8192):
-                            await temp_file.write(chunk)
-                    elif isinstance(file, BinaryIO) or isinstance(
-                        file, SpooledTemporaryFile
-                    ):
-                        file.seek(0)
-                        while chunk := file.read(8192):
-                            await temp_file.write(chunk)
-                    elif isinstance(file, BytesIO):
-                        await temp_file.write(file.getvalue())
-                    elif isinstance(file, bytes):
-                        await temp_file.write(file)
-                    else:
-                        raise ValueError("Unsupported file type for writing")
+                await self._write_payload(file, temp_path)
+
+    async def _write_payload(
+        self,
+        file: UploadFile | BinaryIO | BytesIO | bytes | SpooledTemporaryFile,
+        dest: Path,
+        digest: "hashlib._Hash | None" = None,
+    ) -> None:
+        """Put ``file``'s bytes at ``dest``, a temp file the caller moves into place."""
+        await asyncio.to_thread(_write_file_object, file, dest, digest)
+
+    @asynccontextmanager
+    async def stage_file(
+        self,
+        file: UploadFile | BinaryIO | BytesIO | bytes | SpooledTemporaryFile,
+        path: str,
+        filename: str | None = None,
+    ) -> AsyncIterator[StagedFile]:
+        """
+        Write file beside its target, hashing it in the same pass.
+
+        The staged file replaces the target when the caller's block exits,
+        unless the caller discards it first, e.g. after finding its hash
+        already stored. A discarded or failed write leaves the target as it was.
+        The target's file lock is held for the whole block, so the caller must
+        not run other handler operations on the same path inside it.
+
+        Args:
+            file: File-like object to write
+            path: Relative path within base directory
+            filename: Optional filename override
+
+        Yields:
+            The staged file, with the MD5 of its bytes
+        """
+        original_filename = filename or getattr(file, "filename", None)
+        if not original_filename:
+            raise ValueError("Filename cannot be empty")
+
+        sanitized_filename = self._sanitize_filename(original_filename)
+        target_directory = self.validate_path(path)
+        final_file_path = target_directory / sanitized_filename
+
+        lock = await self._get_file_lock(str(final_file_path))
+        async with lock:
+            target_directory.mkdir(parents=True, exist_ok=True)
+
+            try:
+                async with self._atomic_write(final_file_path) as temp_path:
+                    digest = hashlib.md5(usedforsecurity=False)
+                    await self._write_payload(file, temp_path, digest)
+                    staged = StagedFile(temp_path=temp_path, md5=digest.hexdigest())
+                    yield staged
+                    if staged.discarded:
+                        # Unwinds through _atomic_write, which removes the temp file
+                        raise _StagedFileDiscarded
+            except _StagedFileDiscarded:
+                pass
 
     @asynccontextmanager
     async def write_file_streamed(self, path: str, filename: str):
@@ -616,7 +721,10 @@ class FSHandler:
             if allow_link:
                 link_or_copy_file(source_full_path, dest_full_path)
             else:
-                shutil.copy2(str(source_full_path), str(dest_full_path))
+                # Replace rather than overwrite, so hardlinks to the old file
+                # keep their content
+                with replace_on_write(dest_full_path) as tmp_path:
+                    shutil.copy2(str(source_full_path), str(tmp_path))
 
     async def move_file_or_folder(self, source_path: str, dest_path: str) -> None:
         """
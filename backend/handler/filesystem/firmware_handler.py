@@ -1,12 +1,32 @@
+import asyncio
 import binascii
 import hashlib
+from pathlib import Path
 
 from config import LIBRARY_BASE_PATH
 from config.config_manager import config_manager as cm
 from exceptions.fs_exceptions import FirmwareNotFoundException
 from utils.hashing import crc32_to_hex
 
-from .base_handler import FSHandler
+from .base_handler import WRITE_BLOCK_SIZE, FSHandler
+
+
+def _hash_file(path: Path) -> dict[str, str]:
+    crc_c = 0
+    md5_h = hashlib.md5(usedforsecurity=False)
+    sha1_h = hashlib.sha1(usedforsecurity=False)
+
+    with open(path, "rb") as f:
+        while chunk := f.read(WRITE_BLOCK_SIZE):
+            md5_h.update(chunk)
+            sha1_h.update(chunk)
+            crc_c = binascii.crc32(chunk, crc_c)
+
+    return {
+        "crc_hash": crc32_to_hex(crc_c),
+        "md5_hash": md5_h.hexdigest(),
+        "sha1_hash": sha1_h.hexdigest(),
+    }
 
 
 class FSFirmwareHandler(FSHandler):
@@ -40,20 +60,7 @@ class FSFirmwareHandler(FSHandler):
         return [f for f in self.exclude_single_files(fs_firmware_files)]
 
     async def calculate_file_hashes(self, firmware_path: str, file_name: str) -> dict:
-        file_path = f"{firmware_path}/{file_name}"
-        async with await self.stream_file(file_path=file_path) as f:
-            crc_c = 0
-            md5_h = hashlib.md5(usedforsecurity=False)
-            sha1_h = hashlib.sha1(usedforsecurity=False)
-
-            # Read in chunks to avoid memory issues
-            while chunk := await f.read(8192):
-                md5_h.update(chunk)
-                sha1_h.update(chunk)
-                crc_c = binascii.crc32(chunk, crc_c)
-
-            return {
-                "crc_hash": crc32_to_hex(crc_c),
-                "md5_hash": md5_h.hexdigest(),
-                "sha1_hash": sha1_h.hexdigest(),
-            }
+        # One pass over the file in large blocks on a worker thread, rather
+        # than a thread hop per small read
+        full_path = self.validate_path(f"{firmware_path}/{file_name}")
+        return await asyncio.to_thread(_hash_file, full_path)
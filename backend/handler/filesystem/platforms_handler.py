@@ -7,6 +7,7 @@ from config import LIBRARY_BASE_PATH
 from config.config_manager import config_manager as cm
 from exceptions.fs_exceptions import PlatformAlreadyExistsException
 from logger.logger import log
+from utils.cache import invalidate_heartbeat_cache
 
 from .base_handler import FSHandler, LibraryStructure
 
@@ -89,6 +90,8 @@ class FSPlatformsHandler(FSHandler):
         except FileNotFoundError as e:
             raise PlatformAlreadyExistsException(fs_slug) from e
 
+        invalidate_heartbeat_cache()
+
     async def get_platforms(self) -> list[str]:
         """Retrieves all platforms from the filesystem.
 
@@ -1,23 +1,46 @@
+import asyncio
+import filecmp
 import gzip
+import hashlib
 import os
-from collections.abc import Callable, Iterable
+import shutil
+import tempfile
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import asynccontextmanager
 from io import BytesIO
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
+from anyio import AsyncFile
 from anyio import Path as AnyioPath
 from fastapi import status
 from PIL import Image, ImageFile, UnidentifiedImageError
 
 from adapters.services.screenscraper import media_download_slot
-from config import ENABLE_SCHEDULED_CONVERT_IMAGES_TO_WEBP, RESOURCES_BASE_PATH
+from config import (
+    ENABLE_COVER_DERIVATIVES,
+    ENABLE_SCHEDULED_CONVERT_IMAGES_TO_WEBP,
+    MEDIA_DOWNLOAD_HOST_CONCURRENCY,
+    RESOURCES_BASE_PATH,
+)
 from config.config_manager import MetadataMediaType
 from logger.logger import log
 from models.collection import Collection
 from models.rom import Rom
 from tasks.scheduled.convert_images_to_webp import ImageConverter
 from utils.context import ctx_httpx_client
+from utils.cover_derivatives import (
+    COVER_DERIVATIVE_FORMATS,
+    COVER_DERIVATIVE_ORIGINAL,
+    COVER_DERIVATIVE_SHARED_DIR,
+    cover_derivatives_path,
+    cover_rendition_widths,
+)
+from utils.filesystem import replace_on_write
+from utils.metrics import SCAN_MEDIA_BYTES
+from utils.rate_limiter import ConcurrencyLimiter
 
 from .base_handler import CoverSize, FSHandler
 
@@ -52,6 +75,30 @@ def _resolve_local_file_uri(uri: str) -> Path | None:
     return None
 
 
+# One limiter per host, created on first use. Media for identified ROMs is
+# fetched concurrently, so this keeps a scan from opening dozens of connections
+# to the same CDN.
+_host_limiters: dict[str, ConcurrencyLimiter] = {}
+
+
+@asynccontextmanager
+async def _download_slot(url: str) -> AsyncIterator[int]:
+    """Hold a per-host download slot for ``url``, yielding its timeout.
+
+    Providers with their own allowances (ScreenScraper) are throttled further
+    by `media_download_slot` once the host slot is held.
+    """
+    host = urlsplit(url).hostname or ""
+    limiter = _host_limiters.get(host)
+    if limiter is None:
+        limiter = _host_limiters[host] = ConcurrencyLimiter(
+            MEDIA_DOWNLOAD_HOST_CONCURRENCY
+        )
+
+    async with limiter, media_download_slot(url) as timeout:
+        yield timeout
+
+
 def _content_type_essence(header_value: str) -> str:
     """Return the MIME type token (before parameters), lowercased."""
     if not header_value:
@@ -75,6 +122,28 @@ def _check_content_type(
     return True
 
 
+async def _write_response(
+    response: httpx.Response, f: AsyncFile[bytes], *, gzipped: bool = False
+) -> None:
+    """Write a downloaded body to ``f``, counting it towards the media metrics.
+
+    Gzip-encoded bodies are read whole to be decompressed; anything else is
+    streamed through as it arrives.
+    """
+    if gzipped:
+        content = await response.aread()
+        SCAN_MEDIA_BYTES.inc(len(content))
+        try:
+            await f.write(gzip.decompress(content))
+        except gzip.BadGzipFile:
+            await f.write(content)
+        return
+
+    async for chunk in response.aiter_raw():
+        SCAN_MEDIA_BYTES.inc(len(chunk))
+        await f.write(chunk)
+
+
 # Some providers (notably ScreenScraper) serve a solid chroma-key green square
 # as a stand-in when a requested image doesn't exist. Persisting it would paint
 # a bright green cover or 3D-box face, so we detect and drop it instead.
@@ -145,7 +214,8 @@ class FSResourcesHandler(FSHandler):
         small_size = (small_width, small_height)
         small_img = cover.resize(small_size)
 
-        small_img.save(save_path)
+        with replace_on_write(Path(save_path)) as tmp_path:
+            small_img.save(tmp_path)
 
     async def _discard_if_chroma_key(self, relative_path: str) -> bool:
         """Remove a just-downloaded image if it's a chroma-key placeholder.
@@ -206,7 +276,7 @@ class FSResourcesHandler(FSHandler):
             httpx_client = ctx_httpx_client.get()
             downloaded = False
             try:
-                async with media_download_slot(url_cover) as timeout:
+                async with _download_slot(url_cover) as timeout:
                     async with httpx_client.stream(
                         "GET", url_cover, timeout=timeout
                     ) as response:
@@ -223,18 +293,7 @@ class FSResourcesHandler(FSHandler):
                             async with self.write_file_streamed(
                                 path=cover_file, filename=f"{CoverSize.BIG.value}.png"
                             ) as f:
-                                if is_gzipped:
-                                    # Content is gzipped, decompress it
-                                    content = await response.aread()
-                                    try:
-                                        decompressed_content = gzip.decompress(content)
-                                        await f.write(decompressed_content)
-                                    except gzip.BadGzipFile:
-                                        await f.write(content)
-                                else:
-                                    # Content is not gzipped, stream directly
-                                    async for chunk in response.aiter_raw():
-                                        await f.write(chunk)
+                                await _write_response(response, f, gzipped=is_gzipped)
 
                             downloaded = True
             except httpx.TransportError as exc:
@@ -352,6 +411,141 @@ class FSResourcesHandler(FSHandler):
 
         return path_cover_s, path_cover_l
 
+    def _build_cover_derivatives(self, source: Path) -> tuple[str, int]:
+        """Encode the responsive renditions of a cover, unless already stored.
+
+        Renditions are written to a scratch directory and renamed into place,
+        so a hash directory that exists is always complete, and a concurrent
+        build of the same artwork simply loses the rename.
+
+        Returns:
+            The cover hash and the source width.
+        """
+        with open(source, "rb") as f:
+            cover_hash = hashlib.file_digest(f, "sha256").hexdigest()
+
+        target = self.validate_path(cover_derivatives_path(cover_hash))
+        if target.is_dir():
+            # Reusing a directory no ROM referenced yet: bump its mtime so the
+            # orphan cleanup's grace period covers it until the hash is saved.
+            os.utime(target)
+            with Image.open(source) as img:
+                return cover_hash, img.width
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        scratch = Path(tempfile.mkdtemp(prefix=f".{cover_hash}.", dir=target.parent))
+        try:
+            with Image.open(source) as img:
+                has_alpha = img.mode in ("RGBA", "LA", "PA") or (
+                    img.mode == "P" and "transparency" in img.info
+                )
+                base = img.convert("RGBA" if has_alpha else "RGB")
+
+            # Widths at or above the source's are left to `original`: an
+            # upscaled or relabelled copy would only mislead `srcset`.
+            renditions: list[tuple[str, Image.Image]] = [
+                (COVER_DERIVATIVE_ORIGINAL, base)
+            ]
+            for width in cover_rendition_widths(base.width):
+                height = max(1, round(base.height * width / base.width))
+                renditions.append(
+                    (str(width), base.resize((width, height), Image.Resampling.LANCZOS))
+                )
+
+            for name, rendition in renditions:
+                for fmt in COVER_DERIVATIVE_FORMATS:
+                    rendition.save(
+                        scratch / f"{name}.{fmt}",
+                        fmt.upper(),
+                        quality=self.image_converter.quality,
+                    )
+
+            try:
+                scratch.rename(target)
+            except OSError:
+                if not target.is_dir():
+                    raise
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        return cover_hash, base.width
+
+    def _share_cover_files(self, cover_dir: Path, cover_hash: str) -> None:
+        """Hardlink a rom's cover files to the copies shared by its artwork.
+
+        The first rom to store an artwork leaves a link to each of its files
+        under the hash directory. Later roms whose files have the same bytes
+        are relinked to those, so the artwork takes its disk space once. Every
+        writer replaces a cover instead of rewriting it in place, so a rom
+        getting new artwork never changes the files of its former siblings.
+        """
+        shared_dir = self.validate_path(
+            f"{cover_derivatives_path(cover_hash)}/{COVER_DERIVATIVE_SHARED_DIR}"
+        )
+        shared_dir.mkdir(exist_ok=True)
+
+        for cover_file in cover_dir.iterdir():
+            if cover_file.name.startswith(".") or not cover_file.is_file():
+                continue
+
+            shared_file = shared_dir / cover_file.name
+            try:
+                os.link(cover_file, shared_file)
+                continue
+            except FileExistsError:
+                pass
+
+            if os.path.samefile(cover_file, shared_file) or not filecmp.cmp(
+                cover_file, shared_file, shallow=False
+            ):
+                continue
+
+            with replace_on_write(cover_file) as tmp_path:
+                os.link(shared_file, tmp_path)
+
+    async def store_cover_derivatives(self, rom: Rom) -> dict[str, Any]:
+        """Store responsive renditions of a rom's large cover.
+
+        The per-ROM small and big covers are kept, hardlinked to the copies
+        shared by the artwork; see `utils.cover_derivatives` for what still
+        reads them.
+
+        Returns:
+            The `cover_hash` keying the renditions and the `cover_width` of the
+            source, both None when disabled, when the rom has no cover, or when
+            the cover can't be decoded.
+        """
+        stored: dict[str, Any] = {"cover_hash": None, "cover_width": None}
+        if not ENABLE_COVER_DERIVATIVES:
+            return stored
+
+        cover_dir = self.validate_path(f"{rom.fs_resources_path}/cover")
+        # Prefer the original download over a WebP copy made from it, so the
+        # hash doesn't depend on whether conversion has run yet
+        sources = sorted(
+            cover_dir.glob(f"{CoverSize.BIG.value}.*"),
+            key=lambda p: p.suffix.lower() == ".webp",
+        )
+        if not sources:
+            return stored
+
+        try:
+            cover_hash, cover_width = await asyncio.to_thread(
+                self._build_cover_derivatives, sources[0]
+            )
+        except (UnidentifiedImageError, OSError, ValueError) as exc:
+            log.error(f"Unable to build cover derivatives for {sources[0]}: {str(exc)}")
+            return stored
+
+        try:
+            await asyncio.to_thread(self._share_cover_files, cover_dir, cover_hash)
+        except OSError as exc:
+            # Cross-device resources or no hardlink support: each rom keeps
+            # its own copy, as it did before
+            log.warning(f"Unable to share cover files of {cover_dir}: {str(exc)}")
+
+        return {"cover_hash": cover_hash, "cover_width": cover_width}
+
     async def remove_cover(self, entity: Rom | Collection | None):
         if not entity:
             return {"path_cover_s": "", "path_cover_l": ""}
@@ -383,7 +577,8 @@ class FSResourcesHandler(FSHandler):
 
         try:
             with Image.open(artwork) as img:
-                img.save(path_cover_l)
+                with replace_on_write(path_cover_l) as tmp_path:
+                    img.save(tmp_path)
                 self.resize_cover_to_small(img, save_path=str(path_cover_s))
 
                 if ENABLE_SCHEDULED_CONVERT_IMAGES_TO_WEBP:
@@ -436,7 +631,7 @@ class FSResourcesHandler(FSHandler):
             httpx_client = ctx_httpx_client.get()
             try:
                 async with (
-                    media_download_slot(url_screenhot) as timeout,
+                    _download_slot(url_screenhot) as timeout,
                     httpx_client.stream(
                         "GET", url_screenhot, timeout=timeout
                     ) as response,
@@ -454,18 +649,7 @@ class FSResourcesHandler(FSHandler):
                         async with self.write_file_streamed(
                             path=screenshot_path, filename=f"{idx}.jpg"
                         ) as f:
-                            if is_gzipped:
-                                # Content is gzipped, decompress it
-                                content = await response.aread()
-                                try:
-                                    decompressed_content = gzip.decompress(content)
-                                    await f.write(decompressed_content)
-                                except gzip.BadGzipFile:
-                                    await f.write(content)
-                            else:
-                                # Content is not gzipped, stream directly
-                                async for chunk in response.aiter_raw():
-                                    await f.write(chunk)
+                            await _write_response(response, f, gzipped=is_gzipped)
             except httpx.TransportError as exc:
                 log.error(f"Unable to fetch screenshot at {url_screenhot}: {str(exc)}")
                 return None
@@ -512,13 +696,17 @@ class FSResourcesHandler(FSHandler):
         if not url_screenshots or (not overwrite and self.screenshots_exist(rom)):
             return rom.path_screenshots or []
 
-        # Download and store new screenshots
-        path_screenshots: list[str] = []
-        for idx, url_screenshot in enumerate(url_screenshots):
-            await self._store_screenshot(rom, url_screenshot, idx)
-            path_screenshots.append(self._get_screenshot_path(rom, str(idx)))
-
-        return path_screenshots
+        # Download and store new screenshots, fetched concurrently
+        await asyncio.gather(
+            *(
+                self._store_screenshot(rom, url_screenshot, idx)
+                for idx, url_screenshot in enumerate(url_screenshots)
+            )
+        )
+        return [
+            self._get_screenshot_path(rom, str(idx))
+            for idx in range(len(url_screenshots))
+        ]
 
     # Manuals
     def manual_exists(self, rom: Rom) -> bool:
@@ -558,7 +746,7 @@ class FSResourcesHandler(FSHandler):
             httpx_client = ctx_httpx_client.get()
             try:
                 async with (
-                    media_download_slot(url_manual) as timeout,
+                    _download_slot(url_manual) as timeout,
                     httpx_client.stream("GET", url_manual, timeout=timeout) as response,
                 ):
                     if response.status_code == status.HTTP_200_OK:
@@ -582,18 +770,7 @@ class FSResourcesHandler(FSHandler):
                         async with self.write_file_streamed(
                             path=manual_path, filename=f"{rom.id}.pdf"
                         ) as f:
-                            if is_gzipped:
-                                # Decompress gzipped content
-                                content = await response.aread()
-                                try:
-                                    decompressed_content = gzip.decompress(content)
-                                    await f.write(decompressed_content)
-                                except gzip.BadGzipFile:
-                                    await f.write(content)
-                            else:
-                                # Content is not gzipped, stream directly
-                                async for chunk in response.aiter_raw():
-                                    await f.write(chunk)
+                            await _write_response(response, f, gzipped=is_gzipped)
             except httpx.TransportError as exc:
                 log.error(f"Unable to fetch manual at {url_manual}: {str(exc)}")
                 return None
@@ -648,7 +825,10 @@ class FSResourcesHandler(FSHandler):
             return
 
         try:
-            async with httpx_client.stream("GET", url, timeout=120) as response:
+            async with (
+                _download_slot(url),
+                httpx_client.stream("GET", url, timeout=120) as response,
+            ):
                 if response.status_code == status.HTTP_200_OK:
                     if not _check_content_type(response, ("image/",), "badge"):
                         return
@@ -656,8 +836,7 @@ class FSResourcesHandler(FSHandler):
                     async with self.write_file_streamed(
                         path=directory, filename=filename
                     ) as f:
-                        async for chunk in response.aiter_raw():
-                            await f.write(chunk)
+                        await _write_response(response, f)
         except httpx.TransportError as exc:
             log.error(f"Unable to fetch badge at {url}: {str(exc)}")
         except OSError as exc:
@@ -712,7 +891,7 @@ class FSResourcesHandler(FSHandler):
                 httpx_client = ctx_httpx_client.get()
                 try:
                     async with (
-                        media_download_slot(url_media) as timeout,
+                        _download_slot(url_media) as timeout,
                         httpx_client.stream(
                             "GET", url_media, timeout=timeout
                         ) as response,
@@ -728,8 +907,7 @@ class FSResourcesHandler(FSHandler):
                             async with self.write_file_streamed(
                                 path=directory, filename=filename
                             ) as f:
-                                async for chunk in response.aiter_raw():
-                                    await f.write(chunk)
+                                await _write_response(response, f)
                 except httpx.TransportError as exc:
                     log.error(f"Unable to fetch media file at {url_media}: {str(exc)}")
                     return False
@@ -763,26 +941,34 @@ class FSResourcesHandler(FSHandler):
         the ``*_url`` is kept so a later scan can retry. Returns whether the dict
         was modified.
         """
-        changed = False
 
+        async def store(media_path: str, media_url: str | None) -> bool:
+            if media_url:
+                return await self.store_media_file(
+                    url_transform(media_url) if url_transform else media_url,
+                    media_path,
+                )
+            # Nothing to fetch from, so the path only holds if an earlier scan
+            # already stored the file.
+            return await self.file_exists(media_path)
+
+        pending: list[str] = []
+        fetches = []
         for media_type in media_types:
             path_key = f"{media_type.value}_path"
             media_path = metadata.get(path_key)
             if not media_path:
                 continue
 
-            media_url = metadata.get(f"{media_type.value}_url")
-            if media_url:
-                stored = await self.store_media_file(
-                    url_transform(media_url) if url_transform else media_url,
-                    media_path,
-                )
-            else:
-                # Nothing to fetch from, so the path only holds if an earlier
-                # scan already stored the file.
-                stored = await self.file_exists(media_path)
+            pending.append(path_key)
+            fetches.append(store(media_path, metadata.get(f"{media_type.value}_url")))
+
+        # Each media type is a separate file, so they download concurrently.
+        stored = await asyncio.gather(*fetches)
 
-            if not stored:
+        changed = False
+        for path_key, was_stored in zip(pending, stored, strict=True):
+            if not was_stored:
                 metadata[path_key] = None
                 changed = True
 
@@ -2,8 +2,10 @@ import asyncio
 import binascii
 import fnmatch
 import hashlib
+import json
 import os
 import re
+import time
 import zlib
 from dataclasses import dataclass
 from pathlib import Path
@@ -22,6 +24,7 @@ from exceptions.fs_exceptions import (
     RomsNotFoundException,
 )
 from handler.metadata.base_handler import UniversalPlatformSlug as UPS
+from handler.redis_handler import async_cache
 from logger.logger import log
 from models.platform import Platform
 from models.rom import Rom, RomFile, RomFileCategory, TrackMeta
@@ -43,6 +46,7 @@ from utils.archives import (
 )
 from utils.filesystem import iter_files
 from utils.hashing import crc32_to_hex
+from utils.metrics import SCAN_HASH_SECONDS, SCAN_HASHED_BYTES
 
 from .base_handler import (
     LANGUAGES_BY_SHORTCODE,
@@ -147,6 +151,42 @@ def _make_file_hash(
     )
 
 
+# Digests recorded while a file was written (e.g. a chunked upload) are kept
+# long enough to cover the scan that follows, and are only trusted while the
+# file's size and mtime still match.
+RECORDED_HASHES_TTL = 7 * 24 * 60 * 60  # 7 days
+
+# What `_calculate_rom_hashes` decompresses before hashing; the raw bytes'
+# digests of these files aren't the ones a scan computes.
+_DECOMPRESSED_HASH_EXTENSIONS = frozenset((".zip", ".tar", ".gz", ".7z", ".bz2"))
+_DECOMPRESSED_HASH_MIME_TYPES = frozenset(
+    (
+        "application/zip",
+        "application/x-tar",
+        "application/x-gzip",
+        "application/x-7z-compressed",
+        "application/x-bzip2",
+    )
+)
+
+
+def _recorded_hashes_key(file_path: Path) -> str:
+    return f"rom_file_hashes:{file_path}"
+
+
+@dataclass(frozen=True)
+class _RecordedDigest:
+    """A finished digest standing in for a hashlib object."""
+
+    value: bytes
+
+    def digest(self) -> bytes:
+        return self.value
+
+    def hexdigest(self) -> str:
+        return self.value.hex()
+
+
 GENERIC_TAG_REGEX = re.compile(r"\(([^)]+)\)|\[([^]]+)\]")
 VERSION_TAG_REGEX = re.compile(r"^(?:version|ver|v)(?:[\s._-](.*)|([.\d].*))", re.I)
 REGION_TAG_REGEX = re.compile(r"^reg[\s|-](.*)$", re.I)
@@ -333,6 +373,57 @@ class FSRomsHandler(FSHandler):
             archive_members=archive_members,
         )
 
+    async def record_file_hashes(
+        self, file_path: Path, crc_c: int, md5_h: Any, sha1_h: Any
+    ) -> None:
+        """Remember digests computed while writing a file so the next scan of it
+        can skip rehashing.
+
+        Files the scanner decompresses before hashing are skipped, as their raw
+        digests aren't the ones it would compute.
+        """
+        if file_path.suffix.lower() in _DECOMPRESSED_HASH_EXTENSIONS:
+            return
+        file_type = await asyncio.to_thread(detect_mime_type, file_path)
+        if file_type in _DECOMPRESSED_HASH_MIME_TYPES:
+            return
+
+        stat = await AnyioPath(file_path).stat()
+        await async_cache.set(
+            _recorded_hashes_key(file_path),
+            json.dumps(
+                {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "crc": crc_c,
+                    "md5": md5_h.hexdigest(),
+                    "sha1": sha1_h.hexdigest(),
+                }
+            ),
+            ex=RECORDED_HASHES_TTL,
+        )
+
+    async def _get_recorded_hashes(
+        self, file_path: Path
+    ) -> tuple[int, _RecordedDigest, _RecordedDigest] | None:
+        raw = await async_cache.get(_recorded_hashes_key(file_path))
+        if not raw:
+            return None
+
+        recorded = json.loads(raw)
+        try:
+            stat = await AnyioPath(file_path).stat()
+        except OSError:
+            return None
+        if stat.st_size != recorded["size"] or stat.st_mtime_ns != recorded["mtime_ns"]:
+            return None
+
+        return (
+            recorded["crc"],
+            _RecordedDigest(bytes.fromhex(recorded["md5"])),
+            _RecordedDigest(bytes.fromhex(recorded["sha1"])),
+        )
+
     async def get_rom_files(
         self, rom: Rom, calculate_hashes: bool = True
     ) -> ParsedRomFiles:
@@ -556,15 +647,19 @@ class FSRomsHandler(FSHandler):
                     )
                 )
         elif hashable_platform:
-            try:
-                crc_c, _, md5_h, _, sha1_h, _ = await asyncio.to_thread(
-                    self._calculate_rom_hashes,
-                    Path(abs_fs_path, rom.fs_name),
-                )
-            except zlib.error:
-                crc_c = 0
-                md5_h = hashlib.md5(usedforsecurity=False)
-                sha1_h = hashlib.sha1(usedforsecurity=False)
+            recorded = await self._get_recorded_hashes(rom_dir)
+            if recorded:
+                crc_c, md5_h, sha1_h = recorded
+            else:
+                try:
+                    crc_c, _, md5_h, _, sha1_h, _ = await asyncio.to_thread(
+                        self._calculate_rom_hashes,
+                        Path(abs_fs_path, rom.fs_name),
+                    )
+                except zlib.error:
+                    crc_c = 0
+                    md5_h = hashlib.md5(usedforsecurity=False)
+                    sha1_h = hashlib.sha1(usedforsecurity=False)
 
             # A single-file ROM spans exactly one file, so its ROM-level hashes
             # are that file's hashes.
@@ -647,10 +742,13 @@ class FSRomsHandler(FSHandler):
             md5_h = hashlib.md5(usedforsecurity=False)
             sha1_h = hashlib.sha1(usedforsecurity=False)
             accumulate = rom_md5_h is not None and rom_sha1_h is not None
+            hashed_bytes = 0
+            started = time.perf_counter()
 
             def update_hashes(chunk: bytes | bytearray):
-                nonlocal crc_c, rom_crc_c
+                nonlocal crc_c, rom_crc_c, hashed_bytes
 
+                hashed_bytes += len(chunk)
                 md5_h.update(chunk)
                 sha1_h.update(chunk)
                 crc_c = binascii.crc32(chunk, crc_c)
@@ -686,6 +784,8 @@ class FSRomsHandler(FSHandler):
                 for chunk in read_basic_file(file_path):
                     update_hashes(chunk)
 
+            SCAN_HASH_SECONDS.observe(time.perf_counter() - started)
+            SCAN_HASHED_BYTES.inc(hashed_bytes)
             return crc_c, rom_crc_c, md5_h, rom_md5_h, sha1_h, rom_sha1_h
         except (FileNotFoundError, PermissionError):
             return (
@@ -13,6 +13,7 @@ from handler.metadata.base_handler import UniversalPlatformSlug as UPS
 from logger.logger import log
 from utils import get_version
 from utils.context import ctx_httpx_client
+from utils.metrics import HTTP_CLIENT_RETRIES
 from utils.rate_limiter import RateLimiter
 
 from .base_handler import BaseRom, MetadataHandler
@@ -436,6 +437,7 @@ class HLTBHandler(MetadataHandler):
 
                 if status_code == status.HTTP_403_FORBIDDEN and not is_last_attempt:
                     log.warning("HowLongToBeat rejected the session, renewing it")
+                    HTTP_CLIENT_RETRIES.inc(provider="hltb", reason="unauthorized")
                     await self._fetch_security_token()
                     if not self._has_session():
                         return {}
@@ -449,6 +451,7 @@ class HLTBHandler(MetadataHandler):
                         "HowLongToBeat rate limit hit, retrying after %ss",
                         HLTB_RATE_LIMIT_BACKOFF_SECONDS,
                     )
+                    HTTP_CLIENT_RETRIES.inc(provider="hltb", reason="rate_limited")
                     await asyncio.sleep(HLTB_RATE_LIMIT_BACKOFF_SECONDS)
                     continue
 
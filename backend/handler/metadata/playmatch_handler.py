@@ -14,6 +14,7 @@ from logger.logger import log
 from models.rom import Rom, RomFile
 from utils import get_version
 from utils.context import ctx_httpx_client
+from utils.metrics import HTTP_CLIENT_RETRIES
 from utils.rate_limiter import RateLimiter
 
 # Playmatch caps clients at 4 req/s per IP
@@ -196,6 +197,7 @@ class PlaymatchHandler(MetadataHandler):
                     and exc.response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
                 ):
                     log.warning("Playmatch: rate limit hit, retrying after 2s")
+                    HTTP_CLIENT_RETRIES.inc(provider="playmatch", reason="rate_limited")
                     await asyncio.sleep(2)
                     continue
                 log.warning(
@@ -0,0 +1,52 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.metrics import (
+    HTTP_REQUEST_REDIS_COMMANDS,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUEST_SQL_STATEMENTS,
+    RequestCounts,
+    ctx_request_counts,
+)
+
+
+class MetricsMiddleware:
+    """Record latency, SQL statements and Redis commands for each API request.
+
+    Requests are labelled by their route template (`/api/roms/{id}`) rather
+    than the raw path, which the router writes back into the scope once it has
+    matched, so the label set stays bounded however many ROMs there are.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        counts = RequestCounts()
+        token = ctx_request_counts.set(counts)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            ctx_request_counts.reset(token)
+
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(
+                elapsed, method=scope["method"], route=route, status=status_code
+            )
+            HTTP_REQUEST_SQL_STATEMENTS.observe(counts.sql_statements, route=route)
+            HTTP_REQUEST_REDIS_COMMANDS.observe(counts.redis_commands, route=route)
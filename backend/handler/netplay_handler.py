@@ -1,5 +1,8 @@
 import json
-from typing import Optional, TypedDict
+from collections.abc import Mapping
+from typing import Any, Optional, TypedDict, cast
+
+from redis.exceptions import WatchError
 
 from handler.redis_handler import async_cache
 
@@ -23,28 +26,227 @@ class NetplayRoom(TypedDict):
 
 
 class NetplayHandler:
-    """A class to handle netplay rooms in Redis."""
+    """A class to handle netplay rooms in Redis.
+
+    Each room is a hash of its settings plus a hash of its players, so a join
+    or leave touches one player instead of rewriting the whole room. Rooms are
+    indexed by game for the room list, and a third hash records which server
+    worker every socket in the room is connected to.
+
+    The handler also keeps worker-local routing state: which room each socket
+    on this worker is in, and whether all of a room's sockets are on this
+    worker. Frames of such a room are relayed without going through Redis.
+    """
 
     def __init__(self):
-        self.hash_name = "netplay:rooms"
+        self.rooms_key = "netplay:room_ids"
+
+        # sid -> room id, for sockets connected to this worker
+        self._socket_rooms: dict[str, str] = {}
+        # room id -> whether every socket of the room is on this worker
+        self._local_routes: dict[str, bool] = {}
+
+    def _room_key(self, room_id: str) -> str:
+        return f"netplay:room:{room_id}"
+
+    def _players_key(self, room_id: str) -> str:
+        return f"netplay:room:{room_id}:players"
+
+    def _sockets_key(self, room_id: str) -> str:
+        return f"netplay:room:{room_id}:sockets"
+
+    def _game_key(self, game_id: str) -> str:
+        return f"netplay:game:{game_id}"
+
+    @staticmethod
+    def _decode_room(
+        settings: dict[str, str], players: dict[str, str]
+    ) -> NetplayRoom | None:
+        if not settings:
+            return None
+        room: dict[str, Any] = {
+            field: json.loads(value) for field, value in settings.items()
+        }
+        room["players"] = {
+            player_id: json.loads(player) for player_id, player in players.items()
+        }
+        return cast(NetplayRoom, room)
+
+    async def create(self, room_id: str, room_data: NetplayRoom) -> bool:
+        """Create a room in Redis. Returns False if it already exists."""
+        # Claiming the id first makes creation race-free; the settings and
+        # players are then written together in one transaction
+        if not await async_cache.sadd(self.rooms_key, room_id):
+            return False
+
+        settings: Mapping[str | bytes, bytes | float | int | str] = {
+            field: json.dumps(value)
+            for field, value in room_data.items()
+            if field != "players"
+        }
+        players: Mapping[str | bytes, bytes | float | int | str] = {
+            player_id: json.dumps(player)
+            for player_id, player in room_data["players"].items()
+        }
+        async with async_cache.pipeline() as pipe:
+            await pipe.hset(self._room_key(room_id), mapping=settings)
+            await pipe.hset(self._players_key(room_id), mapping=players)
+            await pipe.sadd(self._game_key(str(room_data["game_id"])), room_id)
+            await pipe.execute()
+        return True
 
     async def get(self, room_id: str) -> NetplayRoom | None:
         """Get a room from Redis."""
-        room = await async_cache.hget(self.hash_name, room_id)
-        return json.loads(room) if room else None
+        async with async_cache.pipeline(transaction=False) as pipe:
+            await pipe.hgetall(self._room_key(room_id))
+            await pipe.hgetall(self._players_key(room_id))
+            settings, players = await pipe.execute()
+        return self._decode_room(settings, players)
 
-    async def set(self, room_id: str, room_data: NetplayRoom):
-        """Set a room in Redis."""
-        return await async_cache.hset(self.hash_name, room_id, json.dumps(room_data))
+    async def _get_many(self, room_ids: list[str]) -> dict[str, NetplayRoom]:
+        if not room_ids:
+            return {}
 
-    async def delete(self, room_ids: list[str]):
-        """Delete a room from Redis."""
-        return await async_cache.hdel(self.hash_name, *room_ids)
+        async with async_cache.pipeline(transaction=False) as pipe:
+            for room_id in room_ids:
+                await pipe.hgetall(self._room_key(room_id))
+                await pipe.hgetall(self._players_key(room_id))
+            results = await pipe.execute()
+
+        rooms: dict[str, NetplayRoom] = {}
+        for i, room_id in enumerate(room_ids):
+            room = self._decode_room(results[2 * i], results[2 * i + 1])
+            if room is not None:
+                rooms[room_id] = room
+        return rooms
+
+    async def get_game_rooms(self, game_id: str) -> dict[str, NetplayRoom]:
+        """Get the rooms of a game from Redis, without reading other games'."""
+        room_ids = sorted(await async_cache.smembers(self._game_key(game_id)))
+        rooms = await self._get_many(room_ids)
+
+        # Drop index entries of rooms deleted without it
+        stale_ids = [room_id for room_id in room_ids if room_id not in rooms]
+        if stale_ids:
+            await async_cache.srem(self._game_key(game_id), *stale_ids)
+        return rooms
 
     async def get_all(self) -> dict[str, NetplayRoom]:
         """Get all rooms from Redis."""
-        rooms = await async_cache.hgetall(self.hash_name)
-        return {room_id: json.loads(room_data) for room_id, room_data in rooms.items()}
+        return await self._get_many(sorted(await async_cache.smembers(self.rooms_key)))
+
+    async def add_player(
+        self, room_id: str, player_id: str, player: NetplayPlayerInfo, max_players: int
+    ) -> dict[str, NetplayPlayerInfo] | None:
+        """Add a player to a room, returning its players.
+
+        Returns None if the room is full or no longer exists. The room and its
+        players are watched while the capacity is checked, so the write lands
+        only if neither changed since: two joiners racing for the last slot
+        can't both be turned away, and a join racing `delete` can't leave a
+        players hash behind with no room around it.
+        """
+        room_key = self._room_key(room_id)
+        players_key = self._players_key(room_id)
+        async with async_cache.pipeline() as pipe:
+            while True:
+                try:
+                    await pipe.watch(room_key, players_key)
+                    if not await pipe.exists(room_key):
+                        return None
+                    players = await pipe.hgetall(players_key)
+                    if player_id not in players and len(players) >= max_players:
+                        return None
+
+                    pipe.multi()
+                    pipe.hset(players_key, player_id, json.dumps(player))
+                    pipe.hgetall(players_key)
+                    _, players = await pipe.execute()
+                    return {pid: json.loads(info) for pid, info in players.items()}
+                except WatchError:
+                    continue
+
+    async def remove_player(self, room_id: str, player_id: str) -> NetplayRoom | None:
+        """Remove a player from a room, returning what is left of the room."""
+        async with async_cache.pipeline() as pipe:
+            await pipe.hdel(self._players_key(room_id), player_id)
+            await pipe.hgetall(self._room_key(room_id))
+            await pipe.hgetall(self._players_key(room_id))
+            _, settings, players = await pipe.execute()
+        return self._decode_room(settings, players)
+
+    async def set_owner(self, room_id: str, owner: str):
+        """Hand a room over to another socket."""
+        return await async_cache.hset(
+            self._room_key(room_id), "owner", json.dumps(owner)
+        )
+
+    async def delete(self, room_ids: list[str]):
+        """Delete rooms from Redis."""
+        if not room_ids:
+            return
+
+        async with async_cache.pipeline() as pipe:
+            for room_id in room_ids:
+                await pipe.hget(self._room_key(room_id), "game_id")
+            game_ids = await pipe.execute()
+
+        async with async_cache.pipeline() as pipe:
+            for room_id, game_id in zip(room_ids, game_ids, strict=True):
+                await pipe.delete(
+                    self._room_key(room_id),
+                    self._players_key(room_id),
+                    self._sockets_key(room_id),
+                )
+                if game_id:
+                    await pipe.srem(self._game_key(str(json.loads(game_id))), room_id)
+            await pipe.srem(self.rooms_key, *room_ids)
+            await pipe.execute()
+
+        deleted = set(room_ids)
+        for room_id in deleted:
+            self._local_routes.pop(room_id, None)
+        for sid in [sid for sid, r in self._socket_rooms.items() if r in deleted]:
+            del self._socket_rooms[sid]
+
+    async def attach_socket(self, sid: str, room_id: str, host_id: str):
+        """Record that a socket of this worker is now in a room."""
+        previous_room_id = self._socket_rooms.get(sid)
+        if previous_room_id is not None and previous_room_id != room_id:
+            # Joining another room without leaving the first one
+            await self.detach_socket(sid)
+
+        self._socket_rooms[sid] = room_id
+        self._local_routes.pop(room_id, None)
+        await async_cache.hset(self._sockets_key(room_id), sid, host_id)
+
+    async def detach_socket(self, sid: str):
+        """Forget a socket of this worker, e.g. when it leaves or disconnects."""
+        room_id = self._socket_rooms.pop(sid, None)
+        if room_id is None:
+            return
+        self._local_routes.pop(room_id, None)
+        await async_cache.hdel(self._sockets_key(room_id), sid)
+
+    def get_socket_room(self, sid: str) -> str | None:
+        """The room a socket of this worker is in, without a Redis round trip."""
+        return self._socket_rooms.get(sid)
+
+    async def is_local_room(self, room_id: str, host_id: str) -> bool:
+        """Whether every socket of a room is connected to this worker.
+
+        Looked up in Redis once per membership change, not once per frame.
+        """
+        is_local = self._local_routes.get(room_id)
+        if is_local is None:
+            hosts = set(await async_cache.hvals(self._sockets_key(room_id)))
+            is_local = hosts == {host_id}
+            self._local_routes[room_id] = is_local
+        return is_local
+
+    def invalidate_route(self, room_id: str):
+        """Drop the cached routing decision of a room whose members changed."""
+        self._local_routes.pop(room_id, None)
 
 
 netplay_handler = NetplayHandler()
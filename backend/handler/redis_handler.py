@@ -1,6 +1,7 @@
 import os
 import sys
 from enum import Enum
+from typing import Any
 
 from redis import Redis
 from redis.asyncio import Redis as AsyncRedis
@@ -10,6 +11,7 @@ from rq.job import Job
 
 from config import IS_PYTEST_RUN, REDIS_URL
 from logger.logger import log
+from utils.metrics import count_redis_command
 
 
 class QueuePrio(Enum):
@@ -18,7 +20,23 @@ class QueuePrio(Enum):
     LOW = "low"
 
 
-redis_client = Redis.from_url(REDIS_URL)
+class CountingRedis(Redis):
+    """Counts commands towards the current API request's metrics."""
+
+    def execute_command(self, *args: Any, **options: Any) -> Any:
+        count_redis_command()
+        return super().execute_command(*args, **options)
+
+
+class CountingAsyncRedis(AsyncRedis):
+    """Counts commands towards the current API request's metrics."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        count_redis_command()
+        return await super().execute_command(*args, **options)
+
+
+redis_client = CountingRedis.from_url(REDIS_URL)
 
 high_prio_queue = Queue(name=QueuePrio.HIGH.value, connection=redis_client)
 default_queue = Queue(name=QueuePrio.DEFAULT.value, connection=redis_client)
@@ -33,7 +51,7 @@ def __get_sync_cache() -> Redis:
         return FakeRedis(version=7)
 
     # A separate client that auto-decodes responses is needed
-    client = Redis.from_url(REDIS_URL, decode_responses=True)
+    client = CountingRedis.from_url(REDIS_URL, decode_responses=True)
     log.debug(
         f"Sync redis/valkey connection established in {os.path.splitext(os.path.basename(sys.argv[0]))[0]}"
     )
@@ -48,7 +66,7 @@ def __get_async_cache() -> AsyncRedis:
         return FakeAsyncRedis(version=7)
 
     # A separate client that auto-decodes responses is needed
-    client = AsyncRedis.from_url(REDIS_URL, decode_responses=True)
+    client = CountingAsyncRedis.from_url(REDIS_URL, decode_responses=True)
     log.debug(
         f"Async redis/valkey connection established in {os.path.splitext(os.path.basename(sys.argv[0]))[0]}"
     )
@@ -2,6 +2,11 @@ import logging
 from typing import Any
 
 from rq import Worker
+from rq.job import Job
+from rq.queue import Queue
+
+from logger.logger import log
+from utils.metrics import metrics
 
 
 class _DropRegistryCleanupFilter(logging.Filter):
@@ -17,9 +22,21 @@ class _DropRegistryCleanupFilter(logging.Filter):
 
 
 class RomMWorker(Worker):
-    """RQ worker that silences the noisy registry-cleanup log line."""
+    """RQ worker that silences the noisy registry-cleanup log line and flushes
+    the metrics and streamed log lines a job recorded before its work horse
+    exits."""
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         if not any(isinstance(f, _DropRegistryCleanupFilter) for f in self.log.filters):
             self.log.addFilter(_DropRegistryCleanupFilter())
+
+    def perform_job(self, job: Job, queue: Queue) -> bool:
+        try:
+            return super().perform_job(job, queue)
+        finally:
+            # The work horse leaves through os._exit, which skips the flush
+            # threads' next tick along with every other exit hook.
+            metrics.flush()
+            for handler in log.handlers:
+                handler.flush()
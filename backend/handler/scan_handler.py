@@ -57,6 +57,7 @@ from models.rom import Rom, RomFile, RomFileCategory
 from models.user import User
 from utils import emoji
 from utils.audio_tags import persist_embedded_cover, remove_persisted_cover
+from utils.metrics import timed_scan_stage
 
 LOGGER_MODULE_NAME = {"module_name": "scan"}
 
@@ -440,6 +441,8 @@ async def scan_rom(
                 "url_manual": rom.url_manual,
                 "path_cover_s": rom.path_cover_s,
                 "path_cover_l": rom.path_cover_l,
+                "cover_hash": rom.cover_hash,
+                "cover_width": rom.cover_width,
                 "path_screenshots": rom.path_screenshots,
                 "path_manual": rom.path_manual,
                 "igdb_id": rom.igdb_id,
@@ -550,8 +553,8 @@ async def scan_rom(
         playmatch_hash_match,
         (hasheous_hash_match, hasheous_lookup_conclusive),
     ) = await asyncio.gather(
-        fetch_playmatch_hash_match(),
-        fetch_hasheous_hash_match(),
+        timed_scan_stage("hash_match_playmatch", fetch_playmatch_hash_match()),
+        timed_scan_stage("hash_match_hasheous", fetch_hasheous_hash_match()),
     )
 
     async def fetch_igdb_rom(
@@ -882,31 +885,38 @@ async def scan_rom(
     # others' results for this ROM, so each failure falls back to an empty match.
     provider_fetches = (
         (
+            "igdb",
             fetch_igdb_rom(playmatch_hash_match, hasheous_hash_match),
             IGDBRom(igdb_id=None),
         ),
-        (fetch_moby_rom(playmatch_hash_match), MobyGamesRom(moby_id=None)),
-        (fetch_ss_rom(playmatch_hash_match), SSRom(ss_id=None)),
-        (fetch_ra_rom(hasheous_hash_match), RAGameRom(ra_id=None)),
+        ("moby", fetch_moby_rom(playmatch_hash_match), MobyGamesRom(moby_id=None)),
+        ("ss", fetch_ss_rom(playmatch_hash_match), SSRom(ss_id=None)),
+        ("ra", fetch_ra_rom(hasheous_hash_match), RAGameRom(ra_id=None)),
         (
+            "launchbox",
             fetch_launchbox_rom(platform.slug, playmatch_hash_match),
             LaunchboxRom(launchbox_id=None),
         ),
         (
+            "hasheous",
             fetch_hasheous_rom(hasheous_hash_match),
             HasheousRom(hasheous_id=None, igdb_id=None, tgdb_id=None, ra_id=None),
         ),
-        (fetch_flashpoint_rom(), FlashpointRom(flashpoint_id=None)),
-        (fetch_hltb_rom(), HLTBRom(hltb_id=None)),
-        (fetch_gamelist_rom(), GamelistRom(gamelist_id=None)),
-        (fetch_libretro_rom(), LibretroRom(libretro_id=None)),
+        ("flashpoint", fetch_flashpoint_rom(), FlashpointRom(flashpoint_id=None)),
+        ("hltb", fetch_hltb_rom(), HLTBRom(hltb_id=None)),
+        ("gamelist", fetch_gamelist_rom(), GamelistRom(gamelist_id=None)),
+        ("libretro", fetch_libretro_rom(), LibretroRom(libretro_id=None)),
     )
     fetch_results = await asyncio.gather(
-        *(coro for coro, _ in provider_fetches), return_exceptions=True
+        *(
+            timed_scan_stage(f"fetch_{source}", coro)
+            for source, coro, _ in provider_fetches
+        ),
+        return_exceptions=True,
     )
 
     resolved: list[Any] = []
-    for (_, fallback), result in zip(provider_fetches, fetch_results, strict=True):
+    for (_, _, fallback), result in zip(provider_fetches, fetch_results, strict=True):
         if isinstance(result, BaseException):
             if not isinstance(result, Exception):
                 raise result
@@ -1012,6 +1022,8 @@ async def scan_rom(
                 "url_manual": "",
                 "path_cover_s": "",
                 "path_cover_l": "",
+                "cover_hash": None,
+                "cover_width": None,
                 "path_screenshots": [],
                 "path_manual": "",
             }
@@ -1202,7 +1214,12 @@ async def scan_rom(
     return Rom(**rom_attrs)
 
 
-async def _scan_asset(file_name: str, asset_path: str, should_hash: bool = False):
+async def _scan_asset(
+    file_name: str,
+    asset_path: str,
+    should_hash: bool = False,
+    content_hash: str | None = None,
+):
     file_path = f"{asset_path}/{file_name}"
     file_size = await fs_asset_handler.get_file_size(file_path)
 
@@ -1212,7 +1229,10 @@ async def _scan_asset(file_name: str, asset_path: str, should_hash: bool = False
         "file_size_bytes": file_size,
     }
 
-    if should_hash:
+    if content_hash:
+        # Already computed while the file was being written
+        result["content_hash"] = content_hash
+    elif should_hash:
         result["content_hash"] = await fs_asset_handler.compute_content_hash(file_path)
 
     return result
@@ -1224,11 +1244,14 @@ async def scan_save(
     platform_fs_slug: str,
     rom_id: int,
     emulator: str | None = None,
+    content_hash: str | None = None,
 ) -> Save:
     saves_path = fs_asset_handler.build_saves_file_path(
         user=user, platform_fs_slug=platform_fs_slug, rom_id=rom_id, emulator=emulator
     )
-    scanned_asset = await _scan_asset(file_name, saves_path, should_hash=True)
+    scanned_asset = await _scan_asset(
+        file_name, saves_path, should_hash=True, content_hash=content_hash
+    )
     return Save(**scanned_asset)
 
 
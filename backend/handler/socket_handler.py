@@ -1,18 +1,37 @@
 import socketio  # type: ignore
 
 from config import REDIS_URL
+from handler.netplay_handler import netplay_handler
 from utils import json_module
 
 
+class NetplayRedisManager(socketio.AsyncRedisManager):
+    """Redis client manager that keeps the netplay relay's routing current.
+
+    Every join and leave ends with a `users-updated` emit to the room, which
+    every worker sees, so a worker relaying a room locally learns here that a
+    player connected to another worker has joined.
+    """
+
+    async def _handle_emit(self, message):
+        if message.get("event") == "users-updated" and message.get("room"):
+            netplay_handler.invalidate_route(message["room"])
+        await super()._handle_emit(message)
+
+
 class SocketHandler:
-    def __init__(self, path: str) -> None:
+    def __init__(
+        self,
+        path: str,
+        client_manager: socketio.AsyncRedisManager | None = None,
+    ) -> None:
         self.socket_server = socketio.AsyncServer(
             cors_allowed_origins="*",
             async_mode="asgi",
             json=json_module,
             logger=False,
             engineio_logger=False,
-            client_manager=socketio.AsyncRedisManager(REDIS_URL),
+            client_manager=client_manager or socketio.AsyncRedisManager(REDIS_URL),
             ping_timeout=60,
             ping_interval=25,
             max_http_buffer_size=1e6,  # 1MB
@@ -23,4 +42,6 @@ class SocketHandler:
 
 
 socket_handler = SocketHandler(path="/ws/socket.io")
-netplay_socket_handler = SocketHandler(path="/netplay/socket.io")
+netplay_socket_handler = SocketHandler(
+    path="/netplay/socket.io", client_manager=NetplayRedisManager(REDIS_URL)
+)
@@ -1,7 +1,9 @@
 """SSH/SFTP handler for Push-Pull sync mode.
 
 Provides methods to connect to remote devices via SSH, list remote save files,
-and perform bidirectional file transfers using SFTP.
+and perform bidirectional file transfers using SFTP. Transfers run on an
+SSHSession, one connection and SFTP session per device, handed out by an
+SSHConnectionPool so a sync round opens each device only once.
 
 SSH keys are expected to be pre-mounted on the server (e.g. via Docker volume)
 at the path configured by SYNC_SSH_KEYS_PATH. Keys are looked up by device_id
@@ -11,11 +13,13 @@ device's sync_config.
 
 from __future__ import annotations
 
+import asyncio
 import functools
 import hashlib
 import os
 import tempfile
-from dataclasses import dataclass
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -40,6 +44,28 @@ class RemoteSaveInfo:
     content_hash: str | None = None
 
 
+@dataclass
+class SSHSession:
+    """An SSH connection to a device and the SFTP session its transfers share.
+
+    SFTP multiplexes requests over a single channel, so transfers running
+    concurrently on one session are pipelined rather than each paying for a
+    channel of its own.
+    """
+
+    conn: asyncssh.SSHClientConnection
+    sftp: asyncssh.SFTPClient
+    # Remote directories already created (or found) during this session
+    remote_dirs: set[str] = field(default_factory=set)
+
+    def is_closed(self) -> bool:
+        return self.conn.is_closed()
+
+    def close(self) -> None:
+        self.sftp.exit()
+        self.conn.close()
+
+
 class SSHSyncHandler:
     """Handles SSH/SFTP operations for push-pull sync mode.
 
@@ -127,7 +153,7 @@ class SSHSyncHandler:
 
     async def list_remote_saves(
         self,
-        conn: asyncssh.SSHClientConnection,
+        session: SSHSession,
         save_directories: list[dict],
     ) -> list[RemoteSaveInfo]:
         """List save files on a remote device.
@@ -136,51 +162,61 @@ class SSHSyncHandler:
             - platform_slug: str
             - path: str (remote directory path)
             - extension: str (optional, file extension filter, e.g. ".srm")
+
+        Entries come back from READDIR with their attributes, so a directory
+        costs one round trip instead of one stat per file. Only symlinks, whose
+        attributes describe the link, are stat'ed to reach their target.
         """
         results: list[RemoteSaveInfo] = []
 
-        async with conn.start_sftp_client() as sftp:
-            for dir_config in save_directories:
-                platform_slug = dir_config["platform_slug"]
-                remote_path = dir_config["path"]
-                extension = dir_config.get("extension", "")
+        for dir_config in save_directories:
+            platform_slug = dir_config["platform_slug"]
+            remote_path = dir_config["path"]
+            extension = dir_config.get("extension", "")
+
+            try:
+                entries = await session.sftp.readdir(remote_path)
+            except asyncssh.SFTPNoSuchFile:
+                log.warning(f"Remote directory not found: {remote_path}")
+                continue
+
+            for entry in entries:
+                file_name = str(entry.filename)
+                if file_name in (".", ".."):
+                    continue
+                if extension and not file_name.endswith(extension):
+                    continue
 
+                full_remote_path = f"{remote_path}/{file_name}"
+                attrs = entry.attrs
                 try:
-                    entries = await sftp.listdir(remote_path)
-                except asyncssh.SFTPNoSuchFile:
-                    log.warning(f"Remote directory not found: {remote_path}")
+                    if attrs.type in (
+                        asyncssh.constants.FILEXFER_TYPE_SYMLINK,
+                        asyncssh.constants.FILEXFER_TYPE_UNKNOWN,
+                    ):
+                        attrs = await session.sftp.stat(full_remote_path)
+                except asyncssh.SFTPError as e:
+                    log.warning(f"Failed to stat {full_remote_path}: {e}")
                     continue
 
-                for entry in entries:
-                    if extension and not entry.endswith(extension):
-                        continue
-
-                    full_remote_path = f"{remote_path}/{entry}"
-                    try:
-                        attrs = await sftp.stat(full_remote_path)
-                        if not attrs.type == asyncssh.constants.FILEXFER_TYPE_REGULAR:
-                            continue
-
-                        mtime = datetime.fromtimestamp(
-                            attrs.mtime or 0, tz=timezone.utc
-                        )
-                        results.append(
-                            RemoteSaveInfo(
-                                path=full_remote_path,
-                                file_name=entry,
-                                platform_slug=platform_slug,
-                                file_size=attrs.size or 0,
-                                mtime=mtime,
-                            )
-                        )
-                    except asyncssh.SFTPError as e:
-                        log.warning(f"Failed to stat {full_remote_path}: {e}")
+                if not attrs.type == asyncssh.constants.FILEXFER_TYPE_REGULAR:
+                    continue
+
+                results.append(
+                    RemoteSaveInfo(
+                        path=full_remote_path,
+                        file_name=file_name,
+                        platform_slug=platform_slug,
+                        file_size=attrs.size or 0,
+                        mtime=datetime.fromtimestamp(attrs.mtime or 0, tz=timezone.utc),
+                    )
+                )
 
         return results
 
     async def download_save(
         self,
-        conn: asyncssh.SSHClientConnection,
+        session: SSHSession,
         remote_path: str,
         local_path: str | None = None,
     ) -> tuple[str, str]:
@@ -192,8 +228,7 @@ class SSHSyncHandler:
             fd, local_path = tempfile.mkstemp(prefix="romm_sync_")
             os.close(fd)
 
-        async with conn.start_sftp_client() as sftp:
-            await sftp.get(remote_path, local_path)
+        await session.sftp.get(remote_path, local_path)
 
         # Compute hash
         hash_obj = hashlib.md5(usedforsecurity=False)
@@ -205,31 +240,94 @@ class SSHSyncHandler:
 
     async def upload_save(
         self,
-        conn: asyncssh.SSHClientConnection,
+        session: SSHSession,
         local_path: str,
         remote_path: str,
     ) -> None:
         """Upload a save file to a remote device."""
-        async with conn.start_sftp_client() as sftp:
-            # Ensure remote directory exists
-            remote_dir = str(Path(remote_path).parent)
+        # Ensure remote directory exists, once per directory per session
+        remote_dir = str(Path(remote_path).parent)
+        if remote_dir not in session.remote_dirs:
             try:
-                await sftp.mkdir(remote_dir)
+                await session.sftp.mkdir(remote_dir)
             except asyncssh.SFTPError:
                 pass  # Directory likely already exists
+            session.remote_dirs.add(remote_dir)
 
-            await sftp.put(local_path, remote_path)
-            log.info(f"Uploaded {local_path} -> {remote_path}")
+        await session.sftp.put(local_path, remote_path)
+        log.info(f"Uploaded {local_path} -> {remote_path}")
 
     async def delete_remote_save(
         self,
-        conn: asyncssh.SSHClientConnection,
+        session: SSHSession,
         remote_path: str,
     ) -> None:
         """Delete a save file from a remote device."""
-        async with conn.start_sftp_client() as sftp:
-            await sftp.remove(remote_path)
-            log.info(f"Deleted remote file: {remote_path}")
+        await session.sftp.remove(remote_path)
+        log.info(f"Deleted remote file: {remote_path}")
+
+
+# sync_config keys that decide which host and account a session talks to
+_CONNECTION_KEYS: tuple[str, ...] = (
+    "ssh_host",
+    "ssh_port",
+    "ssh_username",
+    "ssh_key_path",
+    "ssh_password",
+)
+
+
+class SSHConnectionPool:
+    """SSH sessions keyed by device id.
+
+    A device's session is opened on first acquire and handed back to every
+    later one until the pool closes. A session whose connection dropped, or
+    whose device now points at another host or account, is reopened.
+    """
+
+    def __init__(self, handler: SSHSyncHandler) -> None:
+        self.handler = handler
+        self._sessions: dict[str, tuple[tuple, SSHSession]] = {}
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def acquire(self, device_id: str, sync_config: dict) -> SSHSession:
+        """Return the open session for a device, connecting if there is none."""
+        params = tuple(sync_config.get(key) for key in _CONNECTION_KEYS)
+
+        async with self._locks[device_id]:
+            pooled = self._sessions.get(device_id)
+            if pooled:
+                pooled_params, session = pooled
+                if pooled_params == params and not session.is_closed():
+                    return session
+                self.discard(device_id)
+
+            conn = await self.handler.connect(sync_config, device_id=device_id)
+            try:
+                sftp = await conn.start_sftp_client()
+            except BaseException:
+                conn.close()
+                raise
+
+            session = SSHSession(conn=conn, sftp=sftp)
+            self._sessions[device_id] = (params, session)
+            return session
+
+    def discard(self, device_id: str) -> None:
+        """Close and forget a device's session, e.g. after it failed mid-sync."""
+        pooled = self._sessions.pop(device_id, None)
+        if pooled:
+            pooled[1].close()
+
+    def close(self) -> None:
+        for device_id in list(self._sessions):
+            self.discard(device_id)
+
+    async def __aenter__(self) -> SSHConnectionPool:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.close()
 
 
 @functools.cache
@@ -1,4 +1,8 @@
 import logging
+import os
+import queue
+import threading
+import time
 from typing import Final
 
 from logger.formatter import redact_sensitive, resolve_module_name, strip_ansi
@@ -10,6 +14,29 @@ LOG_CHANNEL: Final = "romm:logs"
 LOG_BUFFER_KEY: Final = "romm:logs:buffer"
 LOG_BUFFER_SIZE: Final = 1000
 
+# Records waiting to be shipped; past this, new records are dropped.
+LOG_QUEUE_SIZE: Final = 10_000
+# A batch ships once it holds this many records, or this long after its first.
+LOG_BATCH_SIZE: Final = 200
+LOG_FLUSH_INTERVAL: Final = 0.1  # seconds
+# How long flushing or closing the handler waits for the last batch to ship.
+LOG_CLOSE_TIMEOUT: Final = 2.0  # seconds
+
+_STOP: Final = object()
+
+
+def _payload(record: logging.LogRecord) -> str:
+    from utils import json_module
+
+    return json_module.dumps(
+        {
+            "ts": int(record.created * 1000),
+            "level": record.levelname,
+            "module": resolve_module_name(record).lower(),
+            "message": redact_sensitive(strip_ansi(record.getMessage())),
+        }
+    )
+
 
 class LogStreamHandler(logging.Handler):
     """Logging handler that mirrors records to Redis for real-time streaming.
@@ -19,9 +46,15 @@ class LogStreamHandler(logging.Handler):
     channel that a single forwarder in the main app relays to admin Socket.IO
     clients.
 
+    ``emit`` only queues the payload; a background thread ships queued records
+    in batches, one pipeline per batch, so logging from the event loop never
+    waits on Redis. When the queue is full, records are dropped and counted
+    rather than blocking the caller, and the viewer is told how many were lost.
+
     The handler is attached to the ``romm`` logger, so it runs in every process
     that imports it (main app, RQ workers, scheduler, watchers) and the stream
-    covers the whole backend.
+    covers the whole backend. A forked process (an RQ work horse) inherits the
+    queue but not the thread, so each process starts its own on first use.
 
     Failures are swallowed **silently** — stdout is the source-of-truth log, so
     a Redis hiccup (or the metadata package not being importable yet during the
@@ -29,26 +62,146 @@ class LogStreamHandler(logging.Handler):
     via ``handleError``.
     """
 
+    def __init__(
+        self,
+        level: int = logging.NOTSET,
+        *,
+        queue_size: int = LOG_QUEUE_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ) -> None:
+        super().__init__(level)
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._shipped_drops = 0
+        self._start_lock = threading.Lock()
+        self._pid: int | None = None
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+
     def emit(self, record: logging.LogRecord) -> None:
         try:
-            from handler.redis_handler import redis_client
-            from utils import json_module
-
-            module = resolve_module_name(record)
-            payload = json_module.dumps(
-                {
-                    "ts": int(record.created * 1000),
-                    "level": record.levelname,
-                    "module": module.lower(),
-                    "message": redact_sensitive(strip_ansi(record.getMessage())),
-                }
+            self._ensure_started()
+            self._queue.put_nowait(_payload(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:  # noqa: BLE001 - never raise/spam  # nosec B110
+            pass
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid():
+            return
+
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Forked: the parent's thread didn't come along, and whatever
+                # it had queued is the parent's to ship.
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                self.dropped = self._shipped_drops = 0
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._queue,),
+                name="romm-log-stream",
+                daemon=True,
             )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self, records: "queue.Queue[object]") -> None:
+        while True:
+            first = records.get()
+            if first is _STOP:
+                return
+            if isinstance(first, threading.Event):
+                first.set()
+                continue
 
-            # A single pipeline keeps buffer write + publish to one round-trip.
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    record = records.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    self._ship(batch)
+                    return
+                if isinstance(record, threading.Event):
+                    self._ship(batch)
+                    batch = []
+                    record.set()
+                    break
+                batch.append(record)
+
+            if not batch:
+                continue
+
+            self._ship(batch)
+
+    def _ship(self, batch: list[object]) -> None:
+        try:
+            from handler.redis_handler import redis_client
+
+            payloads = [str(payload) for payload in batch]
+            dropped = self.dropped - self._shipped_drops
+            if dropped:
+                payloads.append(
+                    _payload(
+                        logging.makeLogRecord(
+                            {
+                                "module_name": "logger",
+                                "levelname": "WARNING",
+                                "levelno": logging.WARNING,
+                                "msg": f"{dropped} log line(s) dropped from the stream",
+                            }
+                        )
+                    )
+                )
+                self._shipped_drops += dropped
+
+            # One pipeline per batch keeps buffer writes + publishes to a
+            # single round-trip. LPUSH of several values leaves the last one
+            # at the head, keeping the buffer newest-first.
             pipe = redis_client.pipeline()
-            pipe.lpush(LOG_BUFFER_KEY, payload)
+            pipe.lpush(LOG_BUFFER_KEY, *payloads)
             pipe.ltrim(LOG_BUFFER_KEY, 0, LOG_BUFFER_SIZE - 1)
-            pipe.publish(LOG_CHANNEL, payload)
+            for payload in payloads:
+                pipe.publish(LOG_CHANNEL, payload)
             pipe.execute()
         except Exception:  # noqa: BLE001 - never raise/spam  # nosec B110
             pass
+
+    def flush(self) -> None:
+        """Wait until everything queued so far has shipped.
+
+        For an RQ work horse, which leaves through ``os._exit`` right after its
+        job and would otherwise lose up to a flush interval of its last lines.
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+
+        shipped = threading.Event()
+        try:
+            self._queue.put(shipped, timeout=LOG_CLOSE_TIMEOUT)
+        except queue.Full:
+            return
+        shipped.wait(LOG_CLOSE_TIMEOUT)
+
+    def close(self) -> None:
+        """Ship what is still queued before the process exits."""
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            try:
+                self._queue.put(_STOP, timeout=LOG_CLOSE_TIMEOUT)
+            except queue.Full:
+                pass
+            thread.join(LOG_CLOSE_TIMEOUT)
+        super().close()
@@ -64,6 +64,9 @@ class Device(BaseModel):
     sync_config: Mapped[dict | None] = mapped_column(JSON, nullable=True)
 
     last_seen: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True))
+    # Negotiation time of the device's last cleanly completed sync session;
+    # delta negotiations only revisit saves changed after it.
+    sync_watermark: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True))
 
     user: Mapped[User] = relationship(lazy="joined")
     save_syncs: Mapped[list[DeviceSaveSync]] = relationship(
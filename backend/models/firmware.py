@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Sequence
 from functools import cached_property
+from itertools import batched
 from pathlib import Path
-from typing import TYPE_CHECKING, Final
+from typing import TYPE_CHECKING, Any, Final
 
 from sqlalchemy import BigInteger, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
-from handler.redis_handler import sync_cache
+from handler.redis_handler import async_cache, sync_cache
 from models.base import (
     FILE_EXTENSION_MAX_LENGTH,
     FILE_NAME_MAX_LENGTH,
@@ -21,7 +23,56 @@ if TYPE_CHECKING:
     from models.platform import Platform
 
 FIRMWARE_FIXTURES_DIR: Final = Path(__file__).parent / "fixtures"
-KNOWN_BIOS_KEY = "romm:known_bios_files"
+# Known BIOS files indexed by hash rather than file name, so a good dump is
+# verified whatever it was named. Built from `known_bios_files.json` at startup.
+KNOWN_BIOS_HASHES_KEY = "romm:known_bios_hashes"
+
+
+def known_bios_hash_fields(
+    platform_slug: str,
+    file_size_bytes: int,
+    md5_hash: str,
+    sha1_hash: str,
+    crc_hash: str,
+) -> list[str]:
+    """The index fields a file with these hashes would be recorded under.
+
+    CRC32 is short enough to collide, so its field carries the file size too.
+    """
+    return [
+        f"{platform_slug}:md5:{md5_hash.lower()}",
+        f"{platform_slug}:sha1:{sha1_hash.lower()}",
+        f"{platform_slug}:crc:{crc_hash.lower()}:{file_size_bytes}",
+    ]
+
+
+def build_known_bios_hash_index(
+    known_bios: dict[str, dict[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """Turn the `platform_slug:file_name` keyed fixture into a hash index."""
+    index: dict[str, dict[str, Any]] = {}
+    for key, entry in known_bios.items():
+        platform_slug, _, file_name = key.partition(":")
+        size = int(entry.get("size", 0))
+        fields = known_bios_hash_fields(
+            platform_slug,
+            size,
+            md5_hash=entry.get("md5", ""),
+            sha1_hash=entry.get("sha1", ""),
+            crc_hash=entry.get("crc", ""),
+        )
+        hashes = (entry.get("md5"), entry.get("sha1"), entry.get("crc"))
+        for field, hash_value in zip(fields, hashes, strict=True):
+            if hash_value:
+                index[field] = {"file_name": file_name, "size": size}
+    return index
+
+
+def _matches_known_bios(entries: Sequence[str | None], file_size_bytes: int) -> bool:
+    return any(
+        entry and int(json.loads(entry).get("size", 0)) == file_size_bytes
+        for entry in entries
+    )
 
 
 class Firmware(BaseModel):
@@ -72,22 +123,58 @@ class Firmware(BaseModel):
     def verify_file_hashes(
         cls,
         platform_slug: str,
-        file_name: str,
         file_size_bytes: int,
         md5_hash: str,
         sha1_hash: str,
         crc_hash: str,
+        file_name: str | None = None,
     ) -> bool:
-        cache_entry = sync_cache.hget(KNOWN_BIOS_KEY, f"{platform_slug}:{file_name}")
-        if cache_entry:
-            cache_json = json.loads(cache_entry)
-            return file_size_bytes == int(cache_json.get("size", 0)) and (
-                md5_hash == cache_json.get("md5")
-                or sha1_hash == cache_json.get("sha1")
-                or crc_hash == cache_json.get("crc")
-            )
+        """Whether the hashes match a known BIOS file of the platform.
+
+        Blocking; async callers verify in batches with `verify_firmware`.
+        ``file_name`` is ignored, as files are matched whatever they are named;
+        it is still accepted for the is_verified migration, which passes it.
+        """
+        entries = sync_cache.hmget(
+            KNOWN_BIOS_HASHES_KEY,
+            known_bios_hash_fields(
+                platform_slug, file_size_bytes, md5_hash, sha1_hash, crc_hash
+            ),
+        )
+        return _matches_known_bios(entries, file_size_bytes)
 
-        return False
+    @classmethod
+    async def verify_firmware(
+        cls, platform_slug: str, firmware: Sequence[Firmware]
+    ) -> list[bool]:
+        """Verify firmware of a platform against the known BIOS files with a
+        single index lookup. Results keep the order of ``firmware``."""
+        if not firmware:
+            return []
+
+        fields_per_file = [
+            known_bios_hash_fields(
+                platform_slug,
+                fw.file_size_bytes,
+                fw.md5_hash,
+                fw.sha1_hash,
+                fw.crc_hash,
+            )
+            for fw in firmware
+        ]
+        entries = await async_cache.hmget(
+            KNOWN_BIOS_HASHES_KEY,
+            [field for fields in fields_per_file for field in fields],
+        )
+
+        return [
+            _matches_known_bios(file_entries, fw.file_size_bytes)
+            for fw, file_entries in zip(
+                firmware,
+                batched(entries, len(fields_per_file[0]), strict=True),
+                strict=True,
+            )
+        ]
 
     def __repr__(self) -> str:
         return self.file_name
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Integer, String, Text, func, select
+from sqlalchemy import BigInteger, ForeignKey, Integer, String, Text, func, select
 from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from models.base import BaseModel
 from models.rom import Rom
+from utils.database import CustomJSON
 
 if TYPE_CHECKING:
     from models.firmware import Firmware
@@ -96,3 +97,25 @@ class Platform(BaseModel):
 
     def __repr__(self) -> str:
         return f"{self.name} ({self.slug}) ({self.id})"
+
+
+class PlatformStats(BaseModel):
+    """Per-platform rollup behind the Server Stats page.
+
+    Moved by every ROM and ROM file write by that write's own share, so the
+    dashboard reads one row per platform instead of aggregating the library on
+    every request. Platforms without ROMs have no row.
+    """
+
+    __tablename__ = "platforms_stats"
+
+    platform_id: Mapped[int] = mapped_column(
+        ForeignKey("platforms.id", ondelete="CASCADE"), primary_key=True
+    )
+    rom_count: Mapped[int] = mapped_column(Integer(), default=0)
+    filesize_bytes: Mapped[int] = mapped_column(BigInteger(), default=0)
+    # Metadata source -> ROMs matched by it, and region -> ROMs tagged with it.
+    metadata_coverage: Mapped[dict[str, int]] = mapped_column(
+        CustomJSON(), default=dict
+    )
+    region_counts: Mapped[dict[str, int]] = mapped_column(CustomJSON(), default=dict)
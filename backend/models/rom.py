@@ -44,6 +44,7 @@ from models.base import (
     BaseModel,
     compute_file_name_parts,
 )
+from utils.cover_derivatives import cover_srcset
 from utils.database import CustomJSON
 
 # Max length of the precomputed natural-sort key column.
@@ -117,6 +118,28 @@ class SiblingRom(BaseModel):
     )
 
 
+class RomSiblingGroup(BaseModel):
+    """Materialized sibling group of each ROM with at least one provider id.
+
+    ROMs on the same platform that share a provider id are siblings, and so is
+    anything linked to them through another shared id. The `sibling_roms` view
+    and the gallery's "Group ROMs" window both read this instead of comparing
+    every provider id across a self-join of `roms`. `DBRomsHandler` keeps it
+    current on every ROM write that can move a group.
+    """
+
+    __tablename__ = "rom_sibling_groups"
+
+    __table_args__ = (Index("idx_rom_sibling_groups_group_id", "group_id", "rom_id"),)
+
+    rom_id: Mapped[int] = mapped_column(
+        ForeignKey("roms.id", ondelete="CASCADE"), primary_key=True
+    )
+    platform_id: Mapped[int] = mapped_column(Integer(), nullable=False)
+    # The smallest ROM id in the group
+    group_id: Mapped[int] = mapped_column(Integer(), nullable=False)
+
+
 class RomArchiveMember(TypedDict):
     name: str
     size: int
@@ -306,7 +329,10 @@ class RomFacets(BaseModel):
 
     __tablename__ = "roms_facets"
 
-    __table_args__ = (Index("idx_roms_facets_platform_id", "platform_id"),)
+    __table_args__ = (
+        Index("idx_roms_facets_platform_id", "platform_id"),
+        Index("idx_roms_facets_updated_at", "updated_at"),
+    )
 
     rom_id: Mapped[int] = mapped_column(
         ForeignKey("roms.id", ondelete="CASCADE"), primary_key=True
@@ -367,11 +393,12 @@ class Rom(BaseModel):
     __table_args__ = (
         # Enforce unique fs name per platform to avoid duplicates
         Index("idx_roms_platform_id_fs_name", "platform_id", "fs_name", unique=True),
-        # Covers the sibling_roms view self-join and the group_by_meta_id dedup
-        # window. Both read only these columns, so the index has to carry every
-        # one of them: a single missing column (flashpoint_id or fs_name_no_ext,
-        # the window's partition tail and sort tiebreaker) drops the plan to a
-        # full scan of the wide roms row, JSON metadata blobs included.
+        # Covers the group_by_meta_id dedup window (and, until 0112, the
+        # sibling_roms view self-join). The window reads only these columns, so
+        # the index has to carry every one of them: a single missing column
+        # (flashpoint_id or fs_name_no_ext, the window's partition tail and sort
+        # tiebreaker) drops the plan to a full scan of the wide roms row, JSON
+        # metadata blobs included.
         Index(
             "idx_roms_sibling_cover",
             "platform_id",
@@ -472,6 +499,16 @@ class Rom(BaseModel):
     url_cover: Mapped[str | None] = mapped_column(
         Text, default="", doc="URL to cover image stored in IGDB"
     )
+    cover_hash: Mapped[str | None] = mapped_column(
+        String(length=64),
+        default=None,
+        doc="SHA-256 of the large cover, keying its responsive derivatives",
+    )
+    cover_width: Mapped[int | None] = mapped_column(
+        Integer,
+        default=None,
+        doc="Width of the large cover, bounding its responsive derivatives",
+    )
 
     path_manual: Mapped[str | None] = mapped_column(Text, default="")
     url_manual: Mapped[str | None] = mapped_column(
@@ -651,6 +688,10 @@ class Rom(BaseModel):
             else ""
         )
 
+    @property
+    def path_cover_srcset(self) -> dict[str, str]:
+        return cover_srcset(self.cover_hash, self.cover_width)
+
     @property
     def path_video(self) -> str | None:
         return (
@@ -797,6 +838,17 @@ METADATA_SOURCE_COLUMNS: dict[str, InstrumentedAttribute] = {
     "libretro": Rom.libretro_id,
 }
 
+# Provider ids that make two ROMs on a platform siblings when they match.
+SIBLING_ID_COLUMNS: tuple[InstrumentedAttribute, ...] = (
+    Rom.igdb_id,
+    Rom.moby_id,
+    Rom.ss_id,
+    Rom.launchbox_id,
+    Rom.ra_id,
+    Rom.hasheous_id,
+    Rom.tgdb_id,
+)
+
 # Same slugs mapped to the `roms_facets` mirror columns. The stats coverage
 # breakdown counts these off the narrow mirror instead of scanning `roms`.
 METADATA_SOURCE_FACET_COLUMNS: dict[str, InstrumentedAttribute] = {
@@ -28,7 +28,11 @@ from handler.metadata.base_handler import (
 )
 from handler.redis_handler import async_cache, low_prio_queue
 from logger.logger import log
-from models.firmware import FIRMWARE_FIXTURES_DIR, KNOWN_BIOS_KEY
+from models.firmware import (
+    FIRMWARE_FIXTURES_DIR,
+    KNOWN_BIOS_HASHES_KEY,
+    build_known_bios_hash_index,
+)
 from tasks.manual.recompute_save_content_hashes import (
     recompute_save_content_hashes_task,
 )
@@ -52,6 +56,8 @@ tracer = trace.get_tracer(__name__)
 
 RECOMPUTE_SAVE_HASHES_JOB_ID = "recompute_save_content_hashes_bootstrap"
 CONVERT_IMAGES_TO_WEBP_JOB_ID = "convert_images_to_webp_bootstrap"
+# Name-keyed known BIOS files, superseded by KNOWN_BIOS_HASHES_KEY
+LEGACY_KNOWN_BIOS_KEY = "romm:known_bios_files"
 
 
 def _enqueue_recompute_save_hashes_if_needed() -> None:
@@ -195,8 +201,12 @@ async def main() -> None:
             PSP_SERIAL_INDEX_KEY,
             METADATA_FIXTURES_DIR / "psp_serial_index.json",
         )
+        await async_cache.delete(LEGACY_KNOWN_BIOS_KEY)
         await conditionally_set_cache(
-            async_cache, KNOWN_BIOS_KEY, FIRMWARE_FIXTURES_DIR / "known_bios_files.json"
+            async_cache,
+            KNOWN_BIOS_HASHES_KEY,
+            FIRMWARE_FIXTURES_DIR / "known_bios_files.json",
+            transform=build_known_bios_hash_index,
         )
 
         log.info("Startup tasks completed")
@@ -0,0 +1,51 @@
+"""Build the responsive cover renditions of every ROM with a cover.
+
+Renditions are built whenever a cover is fetched or uploaded, so this task is
+for covers stored before that: it fills in `cover_hash` and `cover_width`, and
+hardlinks the per-ROM cover files of ROMs sharing the same artwork. Covers
+already built are only hashed again.
+"""
+
+from config import ENABLE_COVER_DERIVATIVES
+from handler.database import db_rom_handler
+from handler.filesystem import fs_resource_handler
+from logger.logger import log
+from tasks.tasks import Task, TaskType
+from utils.context import initialize_context
+
+
+class BuildCoverDerivativesTask(Task):
+    def __init__(self) -> None:
+        super().__init__(
+            title="Build cover derivatives",
+            description=(
+                "Encode the resized cover renditions of ROMs whose covers were "
+                "stored before they were built, and share identical covers on disk"
+            ),
+            task_type=TaskType.CONVERSION,
+            enabled=ENABLE_COVER_DERIVATIVES,
+            manual_run=True,
+            cron_string=None,
+        )
+
+    @initialize_context()
+    async def run(self) -> dict[str, int]:
+        log.info(f"Starting {self.title} task...")
+
+        built = 0
+        for rom in db_rom_handler.get_roms_with_covers():
+            derivatives = await fs_resource_handler.store_cover_derivatives(rom)
+            if not derivatives["cover_hash"]:
+                continue
+            if (
+                derivatives["cover_hash"] != rom.cover_hash
+                or derivatives["cover_width"] != rom.cover_width
+            ):
+                db_rom_handler.update_rom(rom.id, derivatives)
+                built += 1
+
+        log.info(f"{self.title} complete: {built} ROM(s) updated")
+        return {"roms_updated": built}
+
+
+build_cover_derivatives_task = BuildCoverDerivativesTask()
@@ -0,0 +1,108 @@
+"""Write gamelist.xml or metadata.pegasus.txt files into platform directories.
+
+Queued by the `/export` endpoints so large platforms export on a worker
+instead of inside the HTTP request. Each platform's file is streamed to disk,
+and ROMs unchanged since the previous export are replayed from its manifest.
+"""
+
+from dataclasses import dataclass
+from enum import StrEnum
+
+from logger.logger import log
+from tasks.tasks import Task, TaskType, update_job_meta
+from utils.context import initialize_context
+from utils.gamelist_exporter import GamelistExporter
+from utils.pegasus_exporter import PegasusExporter
+
+
+class ExportFormat(StrEnum):
+    GAMELIST = "gamelist"
+    PEGASUS = "pegasus"
+
+
+@dataclass
+class ExportStats:
+    """Statistics for platform export operations."""
+
+    total_platforms: int = 0
+    exported_platforms: int = 0
+    failed_platforms: int = 0
+    # ROM progress within the platform currently being exported
+    processed_roms: int = 0
+    total_roms: int = 0
+
+    def update(self, **kwargs) -> None:
+        for key, value in kwargs.items():
+            if hasattr(self, key):
+                setattr(self, key, value)
+
+        update_job_meta({"export_stats": self.to_dict()})
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "total_platforms": self.total_platforms,
+            "exported_platforms": self.exported_platforms,
+            "failed_platforms": self.failed_platforms,
+            "processed_roms": self.processed_roms,
+            "total_roms": self.total_roms,
+        }
+
+
+class ExportPlatformsTask(Task):
+    def __init__(self) -> None:
+        super().__init__(
+            title="Export platforms",
+            description=(
+                "Write gamelist.xml or metadata.pegasus.txt files into the "
+                "selected platform directories"
+            ),
+            task_type=TaskType.EXPORT,
+            enabled=True,
+            manual_run=False,
+            cron_string=None,
+        )
+
+    @initialize_context()
+    async def run(
+        self,
+        export_format: str,
+        platform_ids: list[int],
+        local_export: bool = False,
+        base_url: str | None = None,
+        full: bool = False,
+    ) -> dict[str, int]:
+        log.info(f"Starting {self.title} task ({export_format})...")
+
+        exporter: GamelistExporter | PegasusExporter
+        if ExportFormat(export_format) == ExportFormat.GAMELIST:
+            exporter = GamelistExporter(local_export=local_export, base_url=base_url)
+        else:
+            exporter = PegasusExporter(local_export=local_export, base_url=base_url)
+
+        stats = ExportStats()
+        stats.update(total_platforms=len(platform_ids))
+
+        def on_progress(processed: int, total: int) -> None:
+            stats.update(processed_roms=processed, total_roms=total)
+
+        for platform_id in platform_ids:
+            stats.update(processed_roms=0, total_roms=0)
+            success = await exporter.export_platform_to_file(
+                platform_id, request=None, full=full, on_progress=on_progress
+            )
+            if success:
+                stats.update(exported_platforms=stats.exported_platforms + 1)
+            else:
+                log.warning(
+                    f"Failed to write {export_format} export for platform {platform_id}"
+                )
+                stats.update(failed_platforms=stats.failed_platforms + 1)
+
+        log.info(
+            f"{self.title} completed: {stats.exported_platforms} exported, "
+            f"{stats.failed_platforms} failed"
+        )
+        return stats.to_dict()
+
+
+export_platforms_task = ExportPlatformsTask()
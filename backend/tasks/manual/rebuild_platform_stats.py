@@ -0,0 +1,40 @@
+"""Rebuild the Server Stats rollups from scratch.
+
+The `platforms_stats` rows are moved by the ROM write handlers in the same
+transaction as the write, so they only drift when a write bypasses those
+handlers. This task recomputes every platform's row, as a fallback for when the
+Server Stats page disagrees with the library.
+"""
+
+from handler.database import db_stats_handler
+from logger.logger import log
+from tasks.tasks import Task, TaskType
+from utils.context import initialize_context
+
+
+class RebuildPlatformStatsTask(Task):
+    def __init__(self) -> None:
+        super().__init__(
+            title="Rebuild server stats",
+            description=(
+                "Recompute the per-platform ROM counts, sizes, metadata "
+                "coverage and regions shown on the Server Stats page"
+            ),
+            task_type=TaskType.CLEANUP,
+            enabled=True,
+            manual_run=True,
+            cron_string=None,
+        )
+
+    @initialize_context()
+    async def run(self) -> dict[str, int]:
+        log.info(f"Starting {self.title} task...")
+
+        db_stats_handler.refresh_platform_stats()
+        platforms = len(db_stats_handler.get_platform_stats())
+
+        log.info(f"{self.title} complete: {platforms} platform(s) rebuilt")
+        return {"platforms": platforms}
+
+
+rebuild_platform_stats_task = RebuildPlatformStatsTask()
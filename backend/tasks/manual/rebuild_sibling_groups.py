@@ -0,0 +1,39 @@
+"""Rebuild every ROM's sibling group from scratch.
+
+`rom_sibling_groups` is regrouped around each ROM as it is added, edited or
+deleted, so it only drifts when provider ids change behind the handler's back,
+e.g. a bulk SQL fix. This task recomputes the whole table from the provider ids
+on `roms`.
+"""
+
+from handler.database import db_rom_handler
+from logger.logger import log
+from tasks.tasks import Task, TaskType
+from utils.context import initialize_context
+
+
+class RebuildSiblingGroupsTask(Task):
+    def __init__(self) -> None:
+        super().__init__(
+            title="Rebuild sibling groups",
+            description=(
+                "Recompute which ROMs are versions of the same game, from the "
+                "metadata provider ids they share"
+            ),
+            task_type=TaskType.CLEANUP,
+            enabled=True,
+            manual_run=True,
+            cron_string=None,
+        )
+
+    @initialize_context()
+    async def run(self) -> dict[str, int]:
+        log.info(f"Starting {self.title} task...")
+
+        grouped = db_rom_handler.rebuild_sibling_groups()
+
+        log.info(f"{self.title} complete: {grouped} ROM(s) grouped")
+        return {"roms_grouped": grouped}
+
+
+rebuild_sibling_groups_task = RebuildSiblingGroupsTask()
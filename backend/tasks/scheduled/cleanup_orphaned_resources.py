@@ -1,6 +1,7 @@
 import asyncio
 import os
 import shutil
+import time
 from dataclasses import dataclass
 
 from anyio import Path as AnyioPath
@@ -12,9 +13,15 @@ from config import (
     SCHEDULED_CLEANUP_ORPHANED_RESOURCES_CRON,
 )
 from handler.database import db_platform_handler, db_rom_handler
+from handler.filesystem import fs_asset_handler
 from logger.logger import log
 from tasks.tasks import PeriodicTask, TaskType, update_job_meta
 from utils.context import initialize_context
+from utils.cover_derivatives import COVER_DERIVATIVES_DIR
+
+# Cover derivatives are written before the rom row records their hash, so a
+# fresh, not-yet-referenced directory is left alone for this long.
+COVER_DERIVATIVES_GRACE_SECONDS = 86400
 
 
 def _numeric_subdirs(path: str) -> set[int]:
@@ -31,6 +38,56 @@ def _numeric_subdirs(path: str) -> set[int]:
         return set()
 
 
+def _remove_orphaned_cover_derivatives(
+    covers_path: str, referenced_hashes: set[str]
+) -> int:
+    """Remove content-addressed cover derivatives no rom references anymore.
+
+    A scan can pick an unreferenced directory back up at any moment, bumping
+    its mtime before it records the hash. Each directory is moved aside before
+    its mtime is trusted, so a scan either touched it first (and it is put
+    back) or finds it gone and builds it again.
+    """
+    removed = 0
+    cutoff = time.time() - COVER_DERIVATIVES_GRACE_SECONDS
+    try:
+        prefixes = [entry.path for entry in os.scandir(covers_path) if entry.is_dir()]
+    except OSError as exc:
+        log.error(f"Unable to list cover derivatives {covers_path}: {str(exc)}")
+        return 0
+
+    for prefix in prefixes:
+        try:
+            with os.scandir(prefix) as entries:
+                orphans = [
+                    entry.path
+                    for entry in entries
+                    if entry.is_dir() and entry.name not in referenced_hashes
+                ]
+        except OSError as exc:
+            log.error(f"Unable to list cover derivatives {prefix}: {str(exc)}")
+            continue
+
+        for path in orphans:
+            try:
+                if os.stat(path).st_mtime > cutoff:
+                    continue
+                doomed = os.path.join(prefix, f".{os.path.basename(path)}.removing")
+                os.rename(path, doomed)
+                if os.stat(doomed).st_mtime > cutoff:
+                    try:
+                        os.rename(doomed, path)
+                        continue
+                    except OSError:
+                        # Already rebuilt in place; this copy is surplus.
+                        pass
+                shutil.rmtree(doomed)
+                removed += 1
+            except OSError as exc:
+                log.error(f"Failed to remove cover derivatives {path}: {str(exc)}")
+    return removed
+
+
 def _scan_resource_dirs(roms_resources_path: str) -> dict[int, set[int]]:
     """Map each platform id on disk to the ROM ids that have a resource directory.
 
@@ -55,6 +112,8 @@ class CleanupStats:
     roms_in_fs: int = 0
     removed_fs_platforms: int = 0
     removed_fs_roms: int = 0
+    removed_cover_derivatives: int = 0
+    removed_asset_blobs: int = 0
 
     def update(self, **kwargs) -> None:
         for key, value in kwargs.items():
@@ -71,6 +130,8 @@ class CleanupStats:
             "roms_in_fs": self.roms_in_fs,
             "removed_fs_platforms": self.removed_fs_platforms,
             "removed_fs_roms": self.removed_fs_roms,
+            "removed_cover_derivatives": self.removed_cover_derivatives,
+            "removed_asset_blobs": self.removed_asset_blobs,
         }
 
 
@@ -106,6 +167,12 @@ class CleanupOrphanedResourcesTask(PeriodicTask):
 
         cleanup_stats = CleanupStats()
 
+        # Deduplicated save/state blobs live under assets, not resources, so
+        # they are swept regardless of what the resources directory holds
+        cleanup_stats.update(
+            removed_asset_blobs=await fs_asset_handler.remove_unreferenced_blobs()
+        )
+
         roms_resources_path = os.path.join(RESOURCES_BASE_PATH, "roms")
         roms_resources_dir = AnyioPath(roms_resources_path)
         if not await roms_resources_dir.exists():
@@ -196,15 +263,26 @@ class CleanupOrphanedResourcesTask(PeriodicTask):
                             f"Failed to remove ROM resource directory {platform_dir}/{rom_dir}: {e}"
                         )
 
+        covers_path = os.path.join(RESOURCES_BASE_PATH, COVER_DERIVATIVES_DIR)
+        if await AnyioPath(covers_path).exists():
+            removed_derivatives = await asyncio.to_thread(
+                _remove_orphaned_cover_derivatives,
+                covers_path,
+                db_rom_handler.get_cover_hashes(),
+            )
+            cleanup_stats.update(removed_cover_derivatives=removed_derivatives)
+
         if (
             cleanup_stats.removed_fs_platforms == 0
             and cleanup_stats.removed_fs_roms == 0
+            and cleanup_stats.removed_cover_derivatives == 0
+            and cleanup_stats.removed_asset_blobs == 0
         ):
             log.info("No orphaned resources found, cleanup completed!")
             return cleanup_stats.to_dict()
 
         log.info(
-            f"Removed {cleanup_stats.removed_fs_platforms} orphaned platforms and {cleanup_stats.removed_fs_roms} orphaned ROMs"
+            f"Removed {cleanup_stats.removed_fs_platforms} orphaned platforms, {cleanup_stats.removed_fs_roms} orphaned ROMs, {cleanup_stats.removed_cover_derivatives} orphaned cover derivatives and {cleanup_stats.removed_asset_blobs} unreferenced asset blobs"
         )
         log.info("Cleanup of orphaned resources completed successfully!")
 
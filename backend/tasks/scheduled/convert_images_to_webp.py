@@ -1,6 +1,13 @@
 """Background task to convert existing images to WebP format."""
 
 import asyncio
+import json
+import multiprocessing
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, List
@@ -11,9 +18,12 @@ from config import (
     ENABLE_SCHEDULED_CONVERT_IMAGES_TO_WEBP,
     RESOURCES_BASE_PATH,
     SCHEDULED_CONVERT_IMAGES_TO_WEBP_CRON,
+    WEBP_MANIFEST_PATH,
 )
 from logger.logger import log
 from tasks.tasks import PeriodicTask, TaskType, update_job_meta
+from utils.cover_derivatives import COVER_DERIVATIVES_DIR
+from utils.filesystem import replace_on_write
 from utils.media_types import ALLOWED_IMAGE_EXTENSIONS
 
 
@@ -71,27 +81,108 @@ class ImageConverter:
             return True
 
         try:
-            with Image.open(image_path) as img:
-                # Convert image mode if necessary
-                img = self._convert_image_mode(img)
-
-                # Save as WebP
-                img.save(webp_path, "WEBP", quality=self.quality, optimize=True)
-                log.info(f"Created WebP version: {webp_path}")
-                return True
+            self.save_webp(image_path)
+            log.info(f"Created WebP version: {webp_path}")
+            return True
 
         except Exception as exc:
             log.error(f"Failed to create WebP version of {image_path}: {str(exc)}")
             return False
 
+    def save_webp(self, image_path: Path) -> None:
+        """Write the WebP version of an image next to it, overwriting any.
+        Args:
+            image_path: Path to the source image
+        Raises:
+            UnidentifiedImageError, OSError: If the image can't be read or saved
+        """
+        with Image.open(image_path) as img:
+            # Convert image mode if necessary
+            img = self._convert_image_mode(img)
+
+            # Replaced rather than overwritten: covers of roms sharing the
+            # same artwork are hardlinks of one another
+            with replace_on_write(image_path.with_suffix(".webp")) as tmp_path:
+                img.save(tmp_path, "WEBP", quality=self.quality, optimize=True)
+
+
+# One converter per pool worker process, created on import of this module
+_worker_converter = ImageConverter()
+
+
+def _convert_in_worker(image_path: str) -> str | None:
+    """Convert one image inside a pool worker.
+
+    Opens the source once (decoding doubles as validation) and returns an error
+    message on failure, or None on success.
+    """
+    try:
+        _worker_converter.save_webp(Path(image_path))
+    except (UnidentifiedImageError, OSError) as exc:
+        return f"Invalid image file: {image_path} - {str(exc)}"
+    except Exception as exc:
+        return f"Unexpected error: {image_path} - {str(exc)}"
+
+    return None
+
+
+class ConversionManifest:
+    """Cover directories already fully converted, keyed by their mtime.
+
+    Writing a file into a directory bumps its mtime, so a cover directory whose
+    mtime matches the recorded one has gained no new images since the last run
+    and can be skipped without listing it.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.dirs: dict[str, int] = {}
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r") as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            log.warning(f"Ignoring unreadable WebP manifest {self.path}: {str(exc)}")
+            return
+
+        if isinstance(data, dict) and data.get("version") == self.VERSION:
+            self.dirs = data.get("dirs") or {}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as fp:
+                json.dump({"version": self.VERSION, "dirs": self.dirs}, fp)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            log.error(f"Failed to write WebP manifest {self.path}: {str(exc)}")
+
+    def is_current(self, cover_dir: str, mtime_ns: int) -> bool:
+        return self.dirs.get(cover_dir) == mtime_ns
+
+    def mark(self, cover_dir: str, mtime_ns: int) -> None:
+        self.dirs[cover_dir] = mtime_ns
+
+    def prune(self, seen_dirs: set[str]) -> None:
+        """Forget directories that no longer exist on disk."""
+        self.dirs = {k: v for k, v in self.dirs.items() if k in seen_dirs}
+
 
 @dataclass
 class ConversionStats:
-    """Statistics for cleanup operations."""
+    """Statistics for conversion operations."""
 
     processed: int = 0
     errors: int = 0
     total: int = 0
+    skipped_dirs: int = 0
+    images_per_second: float = 0.0
 
     def update(self, **kwargs) -> None:
         for key, value in kwargs.items():
@@ -100,17 +191,24 @@ class ConversionStats:
 
         update_job_meta({"conversion_stats": self.to_dict()})
 
-    def to_dict(self) -> dict[str, int]:
+    def to_dict(self) -> dict[str, int | float]:
         return {
             "processed": self.processed,
             "errors": self.errors,
             "total": self.total,
+            "skipped_dirs": self.skipped_dirs,
+            "images_per_second": self.images_per_second,
         }
 
 
 class ConvertImagesToWebPTask(PeriodicTask):
     """Task to convert existing images to WebP format."""
 
+    # Seconds between job meta / progress log updates
+    PROGRESS_INTERVAL = 1.0
+    # Conversions queued per worker, so workers never idle between submissions
+    QUEUE_DEPTH_PER_WORKER = 4
+
     def __init__(self):
         super().__init__(
             title="Convert images to WebP",
@@ -122,67 +220,116 @@ class ConvertImagesToWebPTask(PeriodicTask):
             func="tasks.scheduled.convert_images_to_webp.convert_images_to_webp_task.run",
         )
         self.resources_path = Path(RESOURCES_BASE_PATH)
-        self.converter = ImageConverter()
+        self.manifest_path = Path(WEBP_MANIFEST_PATH)
+        self.max_workers = os.process_cpu_count() or 1
         self._reset_counters()
 
     def _reset_counters(self) -> None:
         """Reset processing counters."""
         self.processed_count = 0
         self.error_count = 0
+        self.skipped_dirs = 0
         self.errors: list[str] = []
 
-    def _find_convertible_images(self) -> List[Path]:
-        """Find all convertible images in the resources directory.
-        Returns:
-            List of paths to image files that can be converted to WebP
+    def _walk_cover_dirs(self) -> Iterator[tuple[str, int]]:
+        """Yield every `cover` directory under the resources path, with its mtime.
+
+        `os.scandir` reports entry types from the directory read itself, so only
+        the cover directories themselves are stat'ed. A directory holding a
+        `cover` directory belongs to a ROM or collection, whose other media
+        directories never hold covers, so those aren't listed; neither is the
+        content-addressed cover derivatives tree.
+
+        Directories without a cover are still listed on every run: files added
+        to a cover directory don't change its parents' mtimes, so those can't
+        tell whether anything below them changed.
+        """
+        root = str(self.resources_path)
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            try:
+                with os.scandir(path) as entries:
+                    subdirs = [
+                        entry
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False)
+                    ]
+                cover = next((e for e in subdirs if e.name == "cover"), None)
+                if cover is not None:
+                    yield cover.path, cover.stat().st_mtime_ns
+                    continue
+            except OSError as exc:
+                log.warning(f"Unable to list resource directory {path}: {str(exc)}")
+                continue
+
+            stack.extend(
+                entry.path
+                for entry in subdirs
+                if not (path == root and entry.name == COVER_DERIVATIVES_DIR)
+            )
+
+    @staticmethod
+    def _list_convertible_images(cover_dir: str) -> list[str]:
+        """List images in a cover directory that don't have a WebP sibling yet."""
+        files: dict[str, str] = {}
+        with os.scandir(cover_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    files[entry.name] = entry.path
+
+        stems_with_webp = {
+            Path(name).stem for name in files if Path(name).suffix.lower() == ".webp"
+        }
+        return sorted(
+            path
+            for name, path in files.items()
+            if Path(name).suffix.lower() in ALLOWED_IMAGE_EXTENSIONS
+            and Path(name).suffix.lower() != ".webp"
+            and Path(name).stem not in stems_with_webp
+        )
+
+    def _find_convertible_images(
+        self, manifest: ConversionManifest
+    ) -> dict[str, list[str]]:
+        """Find convertible images, grouped by cover directory.
+
+        Directories recorded in the manifest with an unchanged mtime are skipped,
+        and directories with nothing left to convert are recorded on the spot.
         """
         if not self.resources_path.exists():
             log.warning(f"Resources path does not exist: {self.resources_path}")
-            return []
-
-        image_files = [
-            p
-            for p in self.resources_path.rglob("**/cover/*")
-            if p.is_file()
-            and not p.is_symlink()
-            and p.suffix.lower() in ALLOWED_IMAGE_EXTENSIONS
-            and p.suffix.lower() != ".webp"
-            and not p.with_suffix(".webp").exists()
-        ]
-
-        return sorted(image_files)  # Sort for consistent processing order
-
-    def _process_single_image(self, image_path: Path) -> bool:
-        """Process a single image file.
-        Args:
-            image_path: Path to the image file
-        Returns:
-            True if processing was successful, False otherwise
-        """
-        try:
-            # Validate image file first
-            with Image.open(image_path) as img:
-                img.verify()
-
-            # Convert to WebP
-            if self.converter.convert_to_webp(image_path):
-                self.processed_count += 1
-                return True
+            return {}
+
+        pending: dict[str, list[str]] = {}
+        seen_dirs: set[str] = set()
+        for cover_dir, mtime_ns in self._walk_cover_dirs():
+            key = os.path.relpath(cover_dir, self.resources_path)
+            seen_dirs.add(key)
+            if manifest.is_current(key, mtime_ns):
+                self.skipped_dirs += 1
+                continue
+
+            try:
+                images = self._list_convertible_images(cover_dir)
+            except OSError as exc:
+                log.warning(f"Unable to list cover directory {cover_dir}: {str(exc)}")
+                continue
+
+            if images:
+                pending[cover_dir] = images
             else:
-                self.error_count += 1
-                self.errors.append(f"Conversion failed: {image_path}")
-                return False
+                manifest.mark(key, mtime_ns)
 
-        except (UnidentifiedImageError, OSError) as exc:
-            log.warning(f"Skipping invalid image file {image_path}: {str(exc)}")
-            self.error_count += 1
-            self.errors.append(f"Invalid image file: {image_path} - {str(exc)}")
-            return False
-        except Exception as exc:
-            log.error(f"Unexpected error processing {image_path}: {str(exc)}")
-            self.error_count += 1
-            self.errors.append(f"Unexpected error: {image_path} - {str(exc)}")
-            return False
+        manifest.prune(seen_dirs)
+        return pending
+
+    def _mark_dir_converted(self, manifest: ConversionManifest, cover_dir: str) -> None:
+        try:
+            mtime_ns = os.stat(cover_dir).st_mtime_ns
+        except OSError:
+            return
+        manifest.mark(os.path.relpath(cover_dir, self.resources_path), mtime_ns)
 
     def _get_progress_message(self) -> str:
         """Get current progress message."""
@@ -195,42 +342,140 @@ class ConvertImagesToWebPTask(PeriodicTask):
         """
         log.info("Starting image to WebP conversion task")
 
+        # Reset counters
+        self._reset_counters()
+
+        manifest = ConversionManifest(self.manifest_path)
+        await asyncio.to_thread(manifest.load)
+
         # Find all convertible images
         conversion_stats = ConversionStats()
-        image_files = self._find_convertible_images()
-        total_files = len(image_files)
+        pending = await asyncio.to_thread(self._find_convertible_images, manifest)
+        total_files = sum(len(images) for images in pending.values())
 
         if total_files == 0:
-            conversion_stats.update(processed=0, errors=0, total=total_files)
+            await asyncio.to_thread(manifest.save)
+            conversion_stats.update(
+                processed=0,
+                errors=0,
+                total=total_files,
+                skipped_dirs=self.skipped_dirs,
+            )
             log.info("No convertible images found")
             return conversion_stats.to_dict()
 
-        log.info(f"Found {total_files} image files to process")
+        log.info(
+            f"Found {total_files} image files to process in {len(pending)} "
+            f"directories ({self.skipped_dirs} unchanged directories skipped), "
+            f"using {self.max_workers} workers"
+        )
 
-        # Reset counters
-        self._reset_counters()
+        loop = asyncio.get_running_loop()
+        remaining = {cover_dir: len(images) for cover_dir, images in pending.items()}
+        failed_dirs: set[str] = set()
+        in_flight: dict[asyncio.Future[str | None], tuple[str, str]] = {}
+        started_at = time.monotonic()
+        last_report = started_at
+
+        # The RQ worker is multi-threaded, so avoid forking it directly
+        mp_context = multiprocessing.get_context("forkserver")
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=mp_context
+        )
+        pool_broken = False
+
+        def mark_pool_broken() -> None:
+            nonlocal pool_broken
+            if not pool_broken:
+                pool_broken = True
+                log.warning("WebP conversion pool broke, converting in process")
+
+        def submit(cover_dir: str, image_path: str) -> None:
+            if not pool_broken:
+                try:
+                    future = loop.run_in_executor(
+                        executor, _convert_in_worker, image_path
+                    )
+                    in_flight[future] = (cover_dir, image_path)
+                    return
+                except BrokenProcessPool:
+                    mark_pool_broken()
+
+            # Same conversion on the event loop's default thread pool
+            future = loop.run_in_executor(None, _convert_in_worker, image_path)
+            in_flight[future] = (cover_dir, image_path)
+
+        def record(future: asyncio.Future[str | None]) -> None:
+            cover_dir, image_path = in_flight.pop(future)
+            try:
+                error = future.result()
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); retry the image in process
+                mark_pool_broken()
+                submit(cover_dir, image_path)
+                return
+
+            if error is None:
+                self.processed_count += 1
+            else:
+                log.warning(f"Skipping image: {error}")
+                self.error_count += 1
+                self.errors.append(error)
+                failed_dirs.add(cover_dir)
+
+            remaining[cover_dir] -= 1
+            # Failed directories stay out of the manifest so they're retried
+            if remaining[cover_dir] == 0 and cover_dir not in failed_dirs:
+                self._mark_dir_converted(manifest, cover_dir)
 
-        # Process images
-        for i, image_file in enumerate(image_files, 1):
-            self._process_single_image(image_file)
+        def report() -> None:
+            done = self.processed_count + self.error_count
+            elapsed = time.monotonic() - started_at
             conversion_stats.update(
                 processed=self.processed_count,
                 errors=self.error_count,
                 total=total_files,
+                skipped_dirs=self.skipped_dirs,
+                images_per_second=round(done / elapsed, 1) if elapsed else 0.0,
             )
 
-            # Log progress periodically
-            if i % 50 == 0 or i == total_files:
-                log.info(
-                    f"Progress: {i}/{total_files} - {self._get_progress_message()}"
+        max_in_flight = self.max_workers * self.QUEUE_DEPTH_PER_WORKER
+        with executor:
+            for cover_dir, images in pending.items():
+                for image_path in images:
+                    while len(in_flight) >= max_in_flight:
+                        done, _ = await asyncio.wait(
+                            in_flight, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            record(future)
+
+                    submit(cover_dir, image_path)
+
+                    now = time.monotonic()
+                    if now - last_report >= self.PROGRESS_INTERVAL:
+                        last_report = now
+                        report()
+                        log.debug(
+                            f"Progress: {self.processed_count + self.error_count}"
+                            f"/{total_files} - {self._get_progress_message()}"
+                        )
+
+            while in_flight:
+                done, _ = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
                 )
+                for future in done:
+                    record(future)
 
-            # Yield control to prevent blocking
-            if i % 10 == 0:
-                await asyncio.sleep(0.1)
+        report()
+        await asyncio.to_thread(manifest.save)
 
         # Log final results
-        log.info(f"Image to WebP conversion completed. {self._get_progress_message()}")
+        log.info(
+            f"Image to WebP conversion completed. {self._get_progress_message()} "
+            f"({conversion_stats.images_per_second} images/s)"
+        )
 
         return conversion_stats.to_dict()
 
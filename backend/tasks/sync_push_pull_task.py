@@ -1,17 +1,25 @@
 """Background task for Push-Pull sync mode.
 
 Connects to devices via SSH/SFTP, scans their save directories,
-and performs bidirectional sync operations.
+and performs bidirectional sync operations. Up to SYNC_PUSH_PULL_WORKERS
+devices sync at once, each over a single pooled SSH session on which a few
+transfers run concurrently.
 """
 
+import asyncio
+import json
 import os
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Final
 
 from anyio import Path as AnyioPath
 from anyio import open_file
 
-from config import ENABLE_SYNC_PUSH_PULL, SYNC_PUSH_PULL_CRON
+from config import (
+    ENABLE_SYNC_PUSH_PULL,
+    SYNC_PUSH_PULL_CRON,
+    SYNC_PUSH_PULL_WORKERS,
+)
 from handler.database import (
     db_device_handler,
     db_device_save_sync_handler,
@@ -20,14 +28,74 @@ from handler.database import (
     db_sync_session_handler,
 )
 from handler.filesystem import fs_asset_handler
+from handler.redis_handler import async_cache
 from handler.sync.comparison import compare_save_state
-from handler.sync.ssh_handler import get_ssh_sync_handler
+from handler.sync.ssh_handler import (
+    RemoteSaveInfo,
+    SSHConnectionPool,
+    SSHSession,
+    get_ssh_sync_handler,
+)
 from logger.formatter import highlight as hl
 from logger.logger import log
+from models.assets import Save
 from models.device import Device, SyncMode
 from models.sync_session import SyncSessionStatus
 from tasks.tasks import PeriodicTask, TaskType
 
+# Transfers in flight on one device's SFTP session at a time
+SYNC_PUSH_PULL_TRANSFERS_PER_DEVICE: Final[int] = 4
+REMOTE_HASHES_TTL: Final[int] = 30 * 24 * 60 * 60  # 30 days
+
+
+def _remote_hashes_key(device_id: str) -> str:
+    return f"sync_hashes:{device_id}"
+
+
+async def _load_remote_hashes(
+    device_id: str, remote_saves: list[RemoteSaveInfo]
+) -> None:
+    """Fill in content_hash for remote saves unchanged since the last round.
+
+    A device file whose path, mtime and size all match what the previous round
+    saw is taken to hold the same bytes, so it isn't downloaded again just to
+    be hashed.
+    """
+    cached = await async_cache.get(_remote_hashes_key(device_id))
+    if not cached:
+        return
+
+    try:
+        known = json.loads(cached)
+    except json.JSONDecodeError:
+        return
+
+    for remote_save in remote_saves:
+        mtime, size, content_hash = known.get(remote_save.path, (None, None, None))
+        if (mtime, size) == (remote_save.mtime.timestamp(), remote_save.file_size):
+            remote_save.content_hash = content_hash
+
+
+async def _store_remote_hashes(
+    device_id: str, remote_saves: list[RemoteSaveInfo]
+) -> None:
+    """Remember the hash of every remote save whose bytes are known.
+
+    Files that went missing drop out, so the cache follows the listing.
+    """
+    known = {
+        remote_save.path: [
+            remote_save.mtime.timestamp(),
+            remote_save.file_size,
+            remote_save.content_hash,
+        ]
+        for remote_save in remote_saves
+        if remote_save.content_hash
+    }
+    await async_cache.set(
+        _remote_hashes_key(device_id), json.dumps(known), ex=REMOTE_HASHES_TTL
+    )
+
 
 async def run_push_pull_sync(
     device_id: str | None = None,
@@ -53,17 +121,28 @@ async def run_push_pull_sync(
         log.info("No push_pull devices found")
         return {"status": "no_devices"}
 
-    results = []
-    for device in devices:
-        if not device.sync_enabled:
-            continue
-        result = await _sync_device(device, session_id=session_id)
-        results.append(result)
+    device_semaphore = asyncio.Semaphore(SYNC_PUSH_PULL_WORKERS)
+
+    async with SSHConnectionPool(get_ssh_sync_handler()) as pool:
 
-    return {"status": "completed", "device_results": results}
+        async def sync_device_with_semaphore(device: Device) -> dict:
+            async with device_semaphore:
+                return await _sync_device(device, pool, session_id=session_id)
 
+        results = await asyncio.gather(
+            *(
+                sync_device_with_semaphore(device)
+                for device in devices
+                if device.sync_enabled
+            )
+        )
 
-async def _sync_device(device: Device, session_id: int | None = None) -> dict:
+    return {"status": "completed", "device_results": list(results)}
+
+
+async def _sync_device(
+    device: Device, pool: SSHConnectionPool, session_id: int | None = None
+) -> dict:
     """Perform push-pull sync for a single device."""
     sync_config = device.sync_config or {}
     if not sync_config.get("ssh_host"):
@@ -102,8 +181,7 @@ async def _sync_device(device: Device, session_id: int | None = None) -> dict:
     )
 
     try:
-        ssh_sync_handler = get_ssh_sync_handler()
-        conn = await ssh_sync_handler.connect(sync_config, device_id=device.id)
+        ssh_session = await pool.acquire(device.id, sync_config)
     except Exception as e:
         log.error(f"Push-pull: failed to connect to device {device.id}: {e}")
         db_sync_session_handler.fail_session(
@@ -129,10 +207,13 @@ async def _sync_device(device: Device, session_id: int | None = None) -> dict:
             db_sync_session_handler.complete_session(session_id=sync_session.id)
             return {"device_id": device.id, "status": "no_directories"}
 
-        remote_saves = await ssh_sync_handler.list_remote_saves(conn, save_directories)
+        remote_saves = await pool.handler.list_remote_saves(
+            ssh_session, save_directories
+        )
         log.info(
             f"Push-pull: found {len(remote_saves)} remote saves on device {device.id}"
         )
+        await _load_remote_hashes(device.id, remote_saves)
 
         db_sync_session_handler.update_session(
             session_id=sync_session.id,
@@ -144,39 +225,58 @@ async def _sync_device(device: Device, session_id: int | None = None) -> dict:
 
         operations_planned = len(remote_saves)
 
-        for remote_save in remote_saves:
-            try:
-                action = await _process_remote_save(device, conn, remote_save)
-                if action == "conflict":
-                    await emit_sync_conflict(
-                        user_id=device.user_id,
-                        device_id=device.id,
-                        session_id=sync_session.id,
-                        file_name=remote_save.file_name,
-                        rom_id=0,
-                        reason=f"Conflict detected for {remote_save.file_name}",
+        transfer_semaphore = asyncio.Semaphore(SYNC_PUSH_PULL_TRANSFERS_PER_DEVICE)
+
+        async def process_with_semaphore(remote_save: RemoteSaveInfo) -> None:
+            nonlocal completed, failed
+
+            async with transfer_semaphore:
+                try:
+                    action = await _process_remote_save(
+                        device, ssh_session, remote_save
                     )
-                if action != "skipped":
-                    completed += 1
-            except Exception:
-                log.error(
-                    f"Push-pull: failed to process {remote_save.file_name} "
-                    f"on device {device.id}",
-                    exc_info=True,
+                    if action == "conflict":
+                        await emit_sync_conflict(
+                            user_id=device.user_id,
+                            device_id=device.id,
+                            session_id=sync_session.id,
+                            file_name=remote_save.file_name,
+                            rom_id=0,
+                            reason=f"Conflict detected for {remote_save.file_name}",
+                        )
+                    if action != "skipped":
+                        completed += 1
+                except Exception:
+                    log.error(
+                        f"Push-pull: failed to process {remote_save.file_name} "
+                        f"on device {device.id}",
+                        exc_info=True,
+                    )
+                    # Whatever the device holds now, its hash is unknown
+                    remote_save.content_hash = None
+                    failed += 1
+
+                await emit_sync_progress(
+                    user_id=device.user_id,
+                    device_id=device.id,
+                    session_id=sync_session.id,
+                    operations_completed=completed + failed,
+                    operations_planned=operations_planned,
+                    current_file=remote_save.file_name,
                 )
-                failed += 1
 
-            await emit_sync_progress(
-                user_id=device.user_id,
-                device_id=device.id,
-                session_id=sync_session.id,
-                operations_completed=completed + failed,
-                operations_planned=operations_planned,
-                current_file=remote_save.file_name,
-            )
+        # Let every transfer settle before a failure discards the shared session
+        results = await asyncio.gather(
+            *(process_with_semaphore(remote_save) for remote_save in remote_saves),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        await _store_remote_hashes(device.id, remote_saves)
 
         push_count = await _push_missing_saves(
-            device, conn, remote_saves, save_directories
+            device, ssh_session, remote_saves, save_directories
         )
         completed += push_count
 
@@ -191,9 +291,9 @@ async def _sync_device(device: Device, session_id: int | None = None) -> dict:
             session_id=sync_session.id,
             error_message=str(e),
         )
+        # Don't hand a session that may be broken to anything else this round
+        pool.discard(device.id)
         return {"device_id": device.id, "status": "failed", "error": str(e)}
-    finally:
-        conn.close()
 
     db_sync_session_handler.complete_session(
         session_id=sync_session.id,
@@ -224,10 +324,14 @@ async def _sync_device(device: Device, session_id: int | None = None) -> dict:
 
 async def _process_remote_save(
     device: Device,
-    conn,
-    remote_save,
+    conn: SSHSession,
+    remote_save: RemoteSaveInfo,
 ) -> str:
-    """Process a single remote save file. Returns action taken."""
+    """Process a single remote save file. Returns action taken.
+
+    The file is only downloaded when its hash isn't already known from an
+    earlier round, or when its bytes are pulled to the server.
+    """
     ssh_sync_handler = get_ssh_sync_handler()
     # Look up platform
     platform = db_platform_handler.get_platform_by_fs_slug(remote_save.platform_slug)
@@ -260,9 +364,13 @@ async def _process_remote_save(
     )
 
     # Download remote file to get its hash
-    local_path, remote_hash = await ssh_sync_handler.download_save(
-        conn, remote_save.path
-    )
+    local_path: str | None = None
+    remote_hash = remote_save.content_hash
+    if remote_hash is None:
+        local_path, remote_hash = await ssh_sync_handler.download_save(
+            conn, remote_save.path
+        )
+        remote_save.content_hash = remote_hash
 
     try:
         result = compare_save_state(
@@ -287,6 +395,11 @@ async def _process_remote_save(
             log.info(
                 f"Push-pull: pulling {hl(remote_save.file_name)} from device {device.id}"
             )
+            if local_path is None:
+                local_path, remote_hash = await ssh_sync_handler.download_save(
+                    conn, remote_save.path
+                )
+                remote_save.content_hash = remote_hash
             async with await open_file(local_path, "rb") as f:
                 file_data = await f.read()
             await fs_asset_handler.write_file(
@@ -315,6 +428,8 @@ async def _process_remote_save(
             )
             server_file_path = f"{matched_save.file_path}/{matched_save.file_name}"
             server_full_path = fs_asset_handler.validate_path(server_file_path)
+            # The device copy is about to change under its listed mtime
+            remote_save.content_hash = None
             await ssh_sync_handler.upload_save(
                 conn, str(server_full_path), remote_save.path
             )
@@ -333,7 +448,7 @@ async def _process_remote_save(
             return "conflict"
 
     finally:
-        if await AnyioPath(local_path).exists():
+        if local_path and await AnyioPath(local_path).exists():
             os.unlink(local_path)
 
     return "skipped"
@@ -341,7 +456,7 @@ async def _process_remote_save(
 
 async def _push_missing_saves(
     device: Device,
-    conn,
+    conn: SSHSession,
     remote_saves,
     save_directories: list[dict],
 ) -> int:
@@ -360,6 +475,7 @@ async def _push_missing_saves(
         platform_paths[dir_config["platform_slug"]] = dir_config["path"]
 
     # Check server saves for each configured platform
+    missing_saves: list[tuple[Save, str]] = []
     for dir_config in save_directories:
         platform_slug = dir_config["platform_slug"]
         platform = db_platform_handler.get_platform_by_fs_slug(platform_slug)
@@ -375,6 +491,8 @@ async def _push_missing_saves(
 
         remote_set = remote_files.get(platform_slug, set())
         remote_dir = platform_paths.get(platform_slug, "")
+        if not remote_dir:
+            continue
 
         for save in server_saves:
             if save.file_name in remote_set:
@@ -387,30 +505,39 @@ async def _push_missing_saves(
             if device_sync and device_sync.is_untracked:
                 continue
 
-            # Push to device
-            if remote_dir:
-                try:
-                    server_file_path = f"{save.file_path}/{save.file_name}"
-                    server_full_path = fs_asset_handler.validate_path(server_file_path)
-                    remote_path = f"{remote_dir}/{save.file_name}"
-                    await ssh_sync_handler.upload_save(
-                        conn, str(server_full_path), remote_path
-                    )
-                    db_device_save_sync_handler.upsert_sync(
-                        device_id=device.id,
-                        save_id=save.id,
-                        synced_at=datetime.now(timezone.utc),
-                    )
-                    pushed += 1
-                    log.info(
-                        f"Push-pull: pushed missing save {hl(save.file_name)} "
-                        f"to device {device.id}"
-                    )
-                except Exception:
-                    log.error(
-                        f"Push-pull: failed to push {save.file_name} to device {device.id}",
-                        exc_info=True,
-                    )
+            missing_saves.append((save, f"{remote_dir}/{save.file_name}"))
+
+    transfer_semaphore = asyncio.Semaphore(SYNC_PUSH_PULL_TRANSFERS_PER_DEVICE)
+
+    async def push_with_semaphore(save: Save, remote_path: str) -> None:
+        nonlocal pushed
+
+        async with transfer_semaphore:
+            try:
+                server_file_path = f"{save.file_path}/{save.file_name}"
+                server_full_path = fs_asset_handler.validate_path(server_file_path)
+                await ssh_sync_handler.upload_save(
+                    conn, str(server_full_path), remote_path
+                )
+                db_device_save_sync_handler.upsert_sync(
+                    device_id=device.id,
+                    save_id=save.id,
+                    synced_at=datetime.now(timezone.utc),
+                )
+                pushed += 1
+                log.info(
+                    f"Push-pull: pushed missing save {hl(save.file_name)} "
+                    f"to device {device.id}"
+                )
+            except Exception:
+                log.error(
+                    f"Push-pull: failed to push {save.file_name} to device {device.id}",
+                    exc_info=True,
+                )
+
+    await asyncio.gather(
+        *(push_with_semaphore(save, remote_path) for save, remote_path in missing_saves)
+    )
 
     return pushed
 
@@ -42,6 +42,7 @@ class TaskType(str, Enum):
     UPDATE = "update"
     SYNC = "sync"
     WATCHER = "watcher"
+    EXPORT = "export"
     GENERIC = "generic"
 
 
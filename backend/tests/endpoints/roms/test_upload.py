@@ -1,3 +1,5 @@
+import binascii
+import hashlib
 from pathlib import Path
 from unittest.mock import AsyncMock
 from uuid import UUID
@@ -129,6 +131,110 @@ def test_upload_chunk_complete_success(
     assert final_file.read_bytes() == b"ABCDEFGHIJK"
 
 
+def _upload_chunks(
+    client: TestClient,
+    token: str,
+    upload_id: str,
+    chunks: list[tuple[int, bytes]],
+) -> None:
+    for index, content in chunks:
+        response = client.put(
+            f"/api/roms/upload/{upload_id}",
+            headers={**_auth_headers(token), "x-chunk-index": str(index)},
+            content=content,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+
+def test_complete_records_hashes_of_out_of_order_chunks(
+    client: TestClient,
+    access_token: str,
+    platform: Platform,
+    upload_fs: dict,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    record_file_hashes = AsyncMock()
+    monkeypatch.setattr(
+        upload_endpoint.fs_rom_handler, "record_file_hashes", record_file_hashes
+    )
+    start_response = _start_upload(
+        client,
+        access_token,
+        platform.id,
+        filename="metroid.gba",
+        total_size=11,
+        total_chunks=3,
+    )
+    upload_id = start_response.json()["upload_id"]
+
+    _upload_chunks(
+        client, access_token, upload_id, [(2, b"IJK"), (0, b"ABCD"), (1, b"EFGH")]
+    )
+    complete = client.post(
+        f"/api/roms/upload/{upload_id}/complete",
+        headers=_auth_headers(access_token),
+    )
+
+    assert complete.status_code == status.HTTP_201_CREATED
+    final_file = upload_fs["final_dir"] / "metroid.gba"
+    assert final_file.read_bytes() == b"ABCDEFGHIJK"
+
+    record_file_hashes.assert_awaited_once()
+    assert record_file_hashes.await_args is not None
+    file_path, crc_c, md5_h, sha1_h = record_file_hashes.await_args.args
+    assert file_path == final_file
+    assert crc_c == binascii.crc32(b"ABCDEFGHIJK")
+    assert md5_h.hexdigest() == hashlib.md5(b"ABCDEFGHIJK").hexdigest()
+    assert sha1_h.hexdigest() == hashlib.sha1(b"ABCDEFGHIJK").hexdigest()
+
+
+def test_complete_skips_hashes_when_hashed_chunk_is_rewritten(
+    client: TestClient,
+    access_token: str,
+    platform: Platform,
+    upload_fs: dict,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    record_file_hashes = AsyncMock()
+    monkeypatch.setattr(
+        upload_endpoint.fs_rom_handler, "record_file_hashes", record_file_hashes
+    )
+    start_response = _start_upload(
+        client, access_token, platform.id, filename="metroid.gba"
+    )
+    upload_id = start_response.json()["upload_id"]
+
+    _upload_chunks(
+        client, access_token, upload_id, [(0, b"ABCDEF"), (0, b"ABCDEF"), (1, b"GHIJK")]
+    )
+    complete = client.post(
+        f"/api/roms/upload/{upload_id}/complete",
+        headers=_auth_headers(access_token),
+    )
+
+    assert complete.status_code == status.HTTP_201_CREATED
+    record_file_hashes.assert_not_awaited()
+
+
+def test_start_evicts_digests_of_expired_uploads(
+    client: TestClient,
+    access_token: str,
+    platform: Platform,
+    upload_fs: dict,
+):
+    abandoned = _start_upload(
+        client, access_token, platform.id, filename="abandoned.gba"
+    ).json()["upload_id"]
+    upload_endpoint._upload_digests[abandoned].expires_at = 0
+
+    upload_id = _start_upload(
+        client, access_token, platform.id, filename="metroid.gba"
+    ).json()["upload_id"]
+
+    assert abandoned not in upload_endpoint._upload_digests
+    assert upload_id in upload_endpoint._upload_digests
+
+
 def test_upload_chunk_invalid_upload_id(client: TestClient, access_token: str):
     response = client.put(
         "/api/roms/upload/not-a-uuid",
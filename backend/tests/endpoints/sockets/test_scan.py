@@ -99,6 +99,22 @@ async def test_merging_scan_stats():
     assert stats.new_firmware == 25
 
 
+async def test_scan_stats_saves_job_meta_on_a_timer(mocker):
+    update_job_meta = mocker.patch.object(scan_module, "update_job_meta")
+    socket_manager = AsyncMock()
+    stats = ScanStats()
+
+    for _ in range(5):
+        await stats.increment(socket_manager=socket_manager, scanned_roms=1)
+
+    # Every change is emitted, but only the first within the interval is saved.
+    assert socket_manager.emit.await_count == 5
+    update_job_meta.assert_called_once()
+
+    stats.save_job_meta()
+    update_job_meta.assert_called_with({"scan_stats": stats.to_dict()})
+
+
 class TestScanTotals:
     """The scan tracker totals must reflect the platforms/roms actually scanned."""
 
@@ -188,6 +204,18 @@ class TestScanTotals:
         assert result.total_platforms == 1
         assert result.total_roms == 100
 
+    async def test_progress_is_coalesced_before_done(self, patched, mocker):
+        """Stats updates are held and sent once, ahead of the done event."""
+        result = await scan_platforms(
+            platform_ids=[],
+            metadata_sources=[],
+            scan_type=ScanType.QUICK,
+        )
+
+        events = [c.args[0] for c in patched.emit.await_args_list]
+        assert events == ["scan:update_stats", "scan:done"]
+        assert patched.emit.await_args_list[-1].args[1] == result.to_dict()
+
 
 class TestScreenScraperScanReporting:
     """The scan hands ScreenScraper's own bookkeeping to ss_handler, and only
@@ -1099,7 +1127,9 @@ class TestIdentifyPlatformFirmwareReporting:
             AsyncMock(return_value=Firmware(file_name="known.bin", platform_id=1)),
         )
         mocker.patch.object(
-            scan_module.Firmware, "verify_file_hashes", return_value=True
+            scan_module.Firmware,
+            "verify_firmware",
+            AsyncMock(side_effect=lambda slug, firmware: [True] * len(firmware)),
         )
         mocker.patch.object(
             scan_module.fs_rom_handler, "get_roms", AsyncMock(return_value=[])
@@ -1205,11 +1235,12 @@ class TestIdentifyFirmwareRehashing:
         mocker.patch.object(
             scan_module, "redis_client", Mock(get=Mock(return_value=None))
         )
-        mocker.patch.object(
-            scan_module.Firmware, "verify_file_hashes", return_value=True
-        )
-
         patches = SimpleNamespace(
+            verify_firmware=mocker.patch.object(
+                scan_module.Firmware,
+                "verify_firmware",
+                AsyncMock(side_effect=lambda slug, firmware: [True] * len(firmware)),
+            ),
             scan_firmware=mocker.patch.object(
                 scan_module,
                 "scan_firmware",
@@ -1249,7 +1280,7 @@ class TestIdentifyFirmwareRehashing:
         platform = Platform(name="Test", slug="test", fs_slug="test")
         platform.id = 1
         return await scan_module._identify_firmware(
-            platform=platform, fs_fw="bios.bin", scan_type=scan_type
+            platform=platform, fs_firmware=["bios.bin"], scan_type=scan_type
         )
 
     @pytest.mark.parametrize(
@@ -1333,6 +1364,23 @@ class TestIdentifyFirmwareRehashing:
         patched.scan_firmware.assert_called_once()
         patched.get_file_size.assert_not_called()
 
+    async def test_verifies_changed_files_in_one_lookup(self, patched):
+        patched.db_firmware.get_firmware_by_filename.return_value = None
+        platform = Platform(name="Test", slug="test", fs_slug="test")
+        platform.id = 1
+
+        assert (
+            await scan_module._identify_firmware(
+                platform=platform,
+                fs_firmware=["bios.bin", "other.bin"],
+                scan_type=ScanType.QUICK,
+            )
+            == 2
+        )
+
+        patched.verify_firmware.assert_awaited_once()
+        assert patched.db_firmware.add_firmware.call_count == 2
+
 
 class TestScanSelectedRoms:
     """A ROM-id-scoped scan works off the database, not the platform folder."""
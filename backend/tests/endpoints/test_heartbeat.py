@@ -1,11 +1,18 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import status
 
 from exceptions.fs_exceptions import PlatformAlreadyExistsException
+from handler.database import db_user_handler
+from handler.filesystem import fs_platform_handler
+from handler.database.base_handler import sync_session
 from handler.metadata.launchbox_handler.handler import LaunchboxHandler
+from handler.redis_handler import sync_cache
+from models.user import Role, User
 from utils import get_version
+from utils.cache import HEARTBEAT_CACHE_KEY
 
 
 def test_heartbeat(client):
@@ -54,6 +61,64 @@ def test_heartbeat(client):
     assert isinstance(oidc["RP_INITIATED_LOGOUT"], bool)
 
 
+def test_heartbeat_is_cached(client):
+    with patch(
+        "endpoints.heartbeat.fs_platform_handler.get_platforms",
+        new_callable=AsyncMock,
+        return_value=["n64"],
+    ) as mock_get_platforms:
+        first = client.get("/api/heartbeat")
+        second = client.get("/api/heartbeat")
+
+    assert first.json() == second.json()
+    assert second.json()["FILESYSTEM"]["FS_PLATFORMS"] == ["n64"]
+    mock_get_platforms.assert_awaited_once()
+
+
+def test_heartbeat_cache_dropped_when_admin_created(client):
+    with patch("endpoints.heartbeat.DISABLE_SETUP_WIZARD", False):
+        response = client.get("/api/heartbeat")
+        assert response.json()["SYSTEM"]["SHOW_SETUP_WIZARD"] is True
+
+        db_user_handler.add_user(
+            User(username="first_admin", hashed_password="x", role=Role.ADMIN)
+        )
+
+        response = client.get("/api/heartbeat")
+        assert response.json()["SYSTEM"]["SHOW_SETUP_WIZARD"] is False
+
+
+def test_heartbeat_cache_dropped_after_the_user_change_commits(admin_user: User):
+    sync_cache.set(HEARTBEAT_CACHE_KEY, "{}")
+
+    with sync_session.begin() as session:
+        db_user_handler.update_user(
+            admin_user.id, {"enabled": False}, session=session
+        )
+        # Still inside the transaction: a heartbeat rebuilt now would read the
+        # old row, so the cached payload has to survive until the commit.
+        assert sync_cache.get(HEARTBEAT_CACHE_KEY) is not None
+
+    assert sync_cache.get(HEARTBEAT_CACHE_KEY) is None
+
+
+def test_heartbeat_cache_dropped_when_platform_added(client):
+    with patch(
+        "endpoints.heartbeat.fs_platform_handler.get_platforms",
+        new_callable=AsyncMock,
+        side_effect=[["n64"], ["n64", "snes"]],
+    ):
+        client.get("/api/heartbeat")
+        with patch(
+            "handler.filesystem.platforms_handler.FSPlatformsHandler.make_directory",
+            new_callable=AsyncMock,
+        ):
+            asyncio.run(fs_platform_handler.add_platform("snes"))
+        response = client.get("/api/heartbeat")
+
+    assert response.json()["FILESYSTEM"]["FS_PLATFORMS"] == ["n64", "snes"]
+
+
 @pytest.mark.parametrize("authorization_header", ["Bearer ", "Foo", "a b c"])
 def test_heartbeat_with_malformed_authorization_header(
     client, authorization_header: str
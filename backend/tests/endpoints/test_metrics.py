@@ -0,0 +1,28 @@
+from fastapi import status
+
+from utils.metrics import SCAN_HASHED_BYTES
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_get_metrics_requires_auth(client):
+    response = client.get("/api/metrics")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_get_metrics_forbidden_without_logs_read(client, viewer_access_token):
+    response = client.get("/api/metrics", headers=_auth(viewer_access_token))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_get_metrics_returns_prometheus_text(client, access_token):
+    SCAN_HASHED_BYTES.inc(1024)
+
+    response = client.get("/api/metrics", headers=_auth(access_token))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE romm_scan_hashed_bytes_total counter" in response.text
+    assert "# TYPE romm_http_request_seconds histogram" in response.text
@@ -601,6 +601,55 @@ class TestPlaySessionRomUserUpdates:
         assert rom_user is not None
         assert rom_user.last_played is not None
 
+    def test_batch_updates_every_rom(
+        self,
+        client,
+        access_token: str,
+        device: Device,
+        admin_user: User,
+        rom: Rom,
+        platform: Platform,
+    ):
+        _prime_rom_user(rom.id, admin_user.id, status=RomUserStatus.FINISHED)
+        new_rom = db_rom_handler.add_rom(
+            Rom(
+                platform_id=platform.id,
+                name="new_rom",
+                slug="new_rom_slug",
+                fs_name="new_rom.zip",
+                fs_name_no_tags="new_rom",
+                fs_name_no_ext="new_rom",
+                fs_extension="zip",
+                fs_path=f"{platform.slug}/roms",
+            )
+        )
+        sessions = [
+            _session(rom_id=rom.id, start_offset_hours=-5),
+            _session(rom_id=rom.id, start_offset_hours=-2),
+            _session(rom_id=new_rom.id, start_offset_hours=-4),
+            _session(rom_id=new_rom.id, start_offset_hours=-3),
+        ]
+
+        response = client.post(
+            "/api/play-sessions",
+            json=_ingest(device_id=device.id, sessions=sessions),
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["created_count"] == 4
+
+        for rom_id, latest in ((rom.id, sessions[1]), (new_rom.id, sessions[3])):
+            rom_user = db_rom_handler.get_rom_user(rom_id=rom_id, user_id=admin_user.id)
+            assert rom_user.now_playing is True
+            assert rom_user.status == RomUserStatus.INCOMPLETE
+            expected = datetime.fromisoformat(latest["end_time"])
+            assert abs((to_utc(rom_user.last_played) - expected).total_seconds()) < 2
+
+        updated_device = db_device_handler.get_device(
+            device_id=device.id, user_id=admin_user.id
+        )
+        assert updated_device.last_seen is not None
+
 
 class TestPlaySessionQuery:
     def test_filter_by_rom_id(
@@ -0,0 +1,168 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from endpoints import search
+from handler.scan_handler import MetadataSource
+
+
+@pytest.fixture
+async def cache():
+    async with FakeAsyncRedis(version=7, decode_responses=True) as cache:
+        with patch("endpoints.search.async_cache", cache):
+            yield cache
+
+
+def _provider(results: list[dict], delay: float = 0) -> MagicMock:
+    async def get_matched_roms_by_name(*args, **kwargs):
+        await asyncio.sleep(delay)
+        return results
+
+    handler = MagicMock()
+    handler.get_matched_roms_by_name = AsyncMock(side_effect=get_matched_roms_by_name)
+    handler.normalize_search_term = lambda name, remove_articles: name.lower()
+    return handler
+
+
+@pytest.fixture
+def rom():
+    return SimpleNamespace(
+        id=1,
+        platform_id=7,
+        regions=["USA"],
+        platform=SimpleNamespace(slug="snes", moby_id=15, ss_id=4),
+    )
+
+
+@pytest.fixture
+def providers(cache):
+    handlers = {
+        "meta_igdb_handler": _provider(
+            [{"igdb_id": 1, "name": "Chrono Trigger", "url_cover": "igdb.png"}],
+            delay=0.05,
+        ),
+        "meta_moby_handler": _provider(
+            [
+                {"moby_id": 2, "name": "Chrono Trigger", "url_cover": "moby.png"},
+                {"moby_id": 3, "name": "Chrono Cross", "url_cover": "cross.png"},
+            ]
+        ),
+        "meta_ss_handler": _provider([]),
+        "meta_flashpoint_handler": _provider([]),
+        "meta_launchbox_handler": _provider([]),
+    }
+    sgdb = MagicMock()
+    sgdb.get_details_by_names = AsyncMock(
+        return_value={"sgdb_id": 9, "url_cover": "sgdb.png"}
+    )
+    libretro = MagicMock()
+    libretro.get_rom = AsyncMock(return_value={"libretro_id": None})
+
+    with patch.multiple(
+        "endpoints.search",
+        meta_sgdb_handler=sgdb,
+        meta_libretro_handler=libretro,
+        get_main_platform_igdb_id=MagicMock(return_value=19),
+        get_priority_ordered_metadata_sources=MagicMock(
+            return_value=[MetadataSource.IGDB, MetadataSource.MOBY]
+        ),
+        **handlers,
+    ):
+        yield SimpleNamespace(sgdb=sgdb, libretro=libretro, **handlers)
+
+
+def _parse_events(chunks: list[str]) -> list[tuple[str, list[dict]]]:
+    events = []
+    for chunk in chunks:
+        event_line, data_line = chunk.strip().split("\n")
+        events.append(
+            (
+                event_line.removeprefix("event: "),
+                json.loads(data_line.removeprefix("data: ")),
+            )
+        )
+    return events
+
+
+def test_merge_matches_prefers_higher_priority_source(rom):
+    with patch(
+        "endpoints.search.get_priority_ordered_metadata_sources",
+        return_value=[MetadataSource.MOBY, MetadataSource.IGDB],
+    ):
+        merged = search._merge_matches(
+            rom,
+            {
+                MetadataSource.IGDB: [
+                    {"igdb_id": 1, "name": "Chrono Trigger", "url_cover": "igdb.png"}
+                ],
+                MetadataSource.MOBY: [
+                    {"moby_id": 2, "name": "Chrono Trigger", "url_cover": "moby.png"}
+                ],
+            },
+            {"chrono trigger": {"sgdb_id": 9}},
+        )
+
+    match = merged["chrono trigger"]
+    assert match["url_cover"] == "moby.png"
+    assert match["igdb_url_cover"] == "igdb.png"
+    assert match["moby_url_cover"] == "moby.png"
+    assert match["sgdb_id"] == 9
+    assert match["platform_id"] == 7
+
+
+async def test_stream_search_emits_fastest_provider_first(rom, providers):
+    chunks = [chunk async for chunk in search._stream_search(rom, "chrono", "name")]
+    events = _parse_events(chunks)
+
+    # Moby answers first, before IGDB has returned anything
+    first_event, first_results = events[0]
+    assert first_event == "results"
+    assert {match["moby_id"] for match in first_results} == {2, 3}
+    assert all(match["igdb_id"] is None for match in first_results)
+
+    last_event, final_results = events[-1]
+    assert last_event == "done"
+    by_name = {match["name"]: match for match in final_results}
+    assert by_name["Chrono Trigger"]["igdb_id"] == 1
+    assert by_name["Chrono Trigger"]["moby_id"] == 2
+    assert by_name["Chrono Trigger"]["sgdb_url_cover"] == "sgdb.png"
+    assert by_name["Chrono Cross"]["sgdb_id"] == 9
+
+    # Covers are looked up once per merged name
+    assert providers.sgdb.get_details_by_names.await_count == 2
+
+
+async def test_stream_search_survives_failing_provider(rom, providers):
+    providers.meta_igdb_handler.get_matched_roms_by_name.side_effect = Exception(
+        "IGDB is down"
+    )
+
+    chunks = [chunk async for chunk in search._stream_search(rom, "chrono", "name")]
+    last_event, final_results = _parse_events(chunks)[-1]
+
+    assert last_event == "done"
+    assert {match["moby_id"] for match in final_results} == {2, 3}
+
+
+async def test_repeated_search_is_served_from_cache(rom, providers):
+    first = [chunk async for chunk in search._stream_search(rom, "chrono", "name")]
+    second = [chunk async for chunk in search._stream_search(rom, "chrono", "name")]
+
+    assert _parse_events(first)[-1] == _parse_events(second)[-1]
+    assert providers.meta_igdb_handler.get_matched_roms_by_name.await_count == 1
+    assert providers.meta_moby_handler.get_matched_roms_by_name.await_count == 1
+    assert providers.sgdb.get_details_by_names.await_count == 2
+    # Empty results are asked again, in case the provider was unavailable
+    assert providers.meta_ss_handler.get_matched_roms_by_name.await_count == 2
+
+
+async def test_search_cache_is_keyed_on_rom_regions(rom, providers):
+    [chunk async for chunk in search._stream_search(rom, "chrono", "name")]
+    rom.regions = ["Japan"]
+    [chunk async for chunk in search._stream_search(rom, "chrono", "name")]
+
+    assert providers.meta_igdb_handler.get_matched_roms_by_name.await_count == 2
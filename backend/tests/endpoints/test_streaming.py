@@ -68,13 +68,19 @@ def _mock_cm(enabled=True, containers=None):
 
 
 @contextmanager
-def _streaming(*containers, enabled=True):
-    """Patch the streaming config to serve exactly the given containers."""
-    with patch(
-        "endpoints.streaming.cm.get_config",
-        return_value=_mock_cm(enabled=enabled, containers=list(containers)),
+def _streaming(*containers, enabled=True, broker_up=True):
+    """Patch the streaming config to serve exactly the given containers, with
+    their brokers' health probe stubbed so /config never hits the network."""
+    with (
+        patch(
+            "endpoints.streaming.cm.get_config",
+            return_value=_mock_cm(enabled=enabled, containers=list(containers)),
+        ),
+        patch(
+            "endpoints.streaming._probe_broker", return_value=broker_up
+        ) as probe_broker,
     ):
-        yield
+        yield probe_broker
 
 
 def _container_for(rom: Rom, broker_host="http://192.168.1.10:8000"):
@@ -160,6 +166,101 @@ def test_get_config_ships_platform_capabilities(client, access_token):
     }
 
 
+def test_get_config_reports_cached_broker_availability(client, access_token):
+    """/config tells the UI which brokers are up, probing each at most once per
+    health window rather than on every request."""
+    container = {"platform": "ps2", "host": "http://192.168.1.10:3000"}
+    with _streaming(container, broker_up=False) as probe_broker:
+        r1 = client.get("/api/streaming/config", headers=_auth(access_token))
+        r2 = client.get("/api/streaming/config", headers=_auth(access_token))
+    assert r1.json()["containers"][0]["available"] is False
+    assert r2.json()["containers"][0]["available"] is False
+    assert probe_broker.call_count == 1
+
+
+def test_get_config_probes_shared_broker_once(client, access_token):
+    ps2 = {"platform": "ps2", "host": "http://192.168.1.10:3000"}
+    ps1 = {"platform": "psx", "host": "http://192.168.1.10:3000"}
+    with _streaming(ps2, ps1) as probe_broker:
+        r = client.get("/api/streaming/config", headers=_auth(access_token))
+    assert [c["available"] for c in r.json()["containers"]] == [True, True]
+    assert probe_broker.call_count == 1
+
+
+def test_get_config_skips_probe_when_disabled(client, access_token):
+    container = {"platform": "ps2", "host": "http://192.168.1.10:3000"}
+    with _streaming(container, enabled=False) as probe_broker:
+        r = client.get("/api/streaming/config", headers=_auth(access_token))
+    assert r.json()["containers"][0]["available"] is False
+    probe_broker.assert_not_called()
+
+
+# ── Broker client ─────────────────────────────────────────────────────────────
+
+
+_BROKER_CONTAINER = {
+    "platform": "ps2",
+    "host": "http://192.168.1.10:3000",
+    "broker_host": "http://192.168.1.10:8000",
+}
+
+
+def _broker_client(handler):
+    return patch(
+        "endpoints.streaming._broker_client",
+        return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_broker_request_sends_signed_json():
+    from endpoints.streaming import _broker_request
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url == "http://192.168.1.10:8000/volume"
+        assert request.headers["X-Broker-Secret"] == "s3cret"
+        assert request.read() == b'{"level":50}'
+        return httpx.Response(200, json={"status": "ok"})
+
+    container = {**_BROKER_CONTAINER, "broker_secret": "s3cret"}
+    with _broker_client(handler):
+        body = await _broker_request(
+            container, "/volume", body={"level": 50}, request_timeout=5
+        )
+    assert body == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_call_broker_maps_broker_errors():
+    from fastapi import HTTPException
+
+    from endpoints.streaming import _call_broker
+
+    def rejecting(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={"error": "no such file"})
+
+    def unreachable(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    with _broker_client(rejecting), pytest.raises(HTTPException) as rejected:
+        await _call_broker(_BROKER_CONTAINER, "/romm/library/game.iso", "Game")
+    with _broker_client(unreachable), pytest.raises(HTTPException) as down:
+        await _call_broker(_BROKER_CONTAINER, "/romm/library/game.iso", "Game")
+    assert rejected.value.status_code == 502
+    assert down.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_control_ops_swallow_broker_errors():
+    from endpoints.streaming import _volume_broker
+
+    def unreachable(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    with _broker_client(unreachable):
+        assert await _volume_broker(_BROKER_CONTAINER, 50) is False
+
+
 # ── Claiming ──────────────────────────────────────────────────────────────────
 
 
@@ -482,6 +583,38 @@ def test_force_release_all_stops_brokers(client, access_token, rom: Rom):
     assert stop_broker.call_count == 1
 
 
+def test_force_release_all_stops_brokers_concurrently(client, access_token):
+    """One slow broker must not serialise the sweep over the others."""
+    ps2, psx = _rom_on("ps2"), _rom_on("psx")
+    containers = [
+        _container_for(ps2, broker_host="http://192.168.1.10:8000"),
+        _container_for(psx, broker_host="http://192.168.1.11:8000"),
+    ]
+    in_flight = 0
+    peak = 0
+
+    async def slow_stop(container):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+
+    with _streaming(*containers):
+        _claim_ok(client, access_token, ps2.id)
+        _claim_ok(client, access_token, psx.id)
+        with patch("endpoints.streaming._stop_broker", side_effect=slow_stop):
+            r = client.delete("/api/streaming/sessions", headers=_auth(access_token))
+        sessions = client.get("/api/streaming/sessions", headers=_auth(access_token))
+    assert r.status_code == 200
+    assert sorted(r.json()["platforms"]) == [
+        "http://192.168.1.10:8000",
+        "http://192.168.1.11:8000",
+    ]
+    assert peak == 2
+    assert sessions.json() == {}
+
+
 # ── Auth guards ───────────────────────────────────────────────────────────────
 
 
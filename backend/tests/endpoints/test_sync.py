@@ -18,6 +18,7 @@ from models.assets import Save
 from models.device import Device, SyncMode
 from models.rom import Rom
 from models.user import User
+from utils.datetime import to_utc
 
 
 class TestSyncNegotiate:
@@ -418,6 +419,142 @@ class TestPushPullTrigger:
         assert "session_id" in call_kwargs.kwargs
 
 
+class TestDeltaNegotiate:
+    @staticmethod
+    def _negotiate(client, access_token, device_id, saves, delta=True):
+        response = client.post(
+            "/api/sync/negotiate",
+            json={"device_id": device_id, "saves": saves, "delta": delta},
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    def test_delta_without_watermark_runs_full_negotiation(
+        self, client, access_token: str, admin_user: User, save: Save
+    ):
+        device = db_device_handler.add_device(
+            Device(id="delta-dev-1", user_id=admin_user.id, sync_enabled=True)
+        )
+
+        data = self._negotiate(client, access_token, device.id, [])
+
+        assert data["delta"] is False
+        assert any(
+            op["action"] == "download" and op["save_id"] == save.id
+            for op in data["operations"]
+        )
+
+    def test_delta_skips_saves_unchanged_since_watermark(
+        self, client, access_token: str, admin_user: User, save: Save
+    ):
+        """A full negotiation offers a never-synced save; a delta one only
+        revisits saves changed after the device's last clean sync."""
+        device = db_device_handler.add_device(
+            Device(
+                id="delta-dev-2",
+                user_id=admin_user.id,
+                sync_enabled=True,
+                sync_watermark=datetime.now(timezone.utc) + timedelta(hours=1),
+            )
+        )
+
+        data = self._negotiate(client, access_token, device.id, [])
+
+        assert data["delta"] is True
+        assert data["operations"] == []
+
+    def test_delta_offers_saves_changed_since_watermark(
+        self, client, access_token: str, admin_user: User, save: Save
+    ):
+        device = db_device_handler.add_device(
+            Device(
+                id="delta-dev-3",
+                user_id=admin_user.id,
+                sync_enabled=True,
+                sync_watermark=datetime.now(timezone.utc) - timedelta(days=1),
+            )
+        )
+
+        data = self._negotiate(client, access_token, device.id, [])
+
+        assert data["delta"] is True
+        assert [op["save_id"] for op in data["operations"]] == [save.id]
+        assert data["operations"][0]["action"] == "download"
+
+    def test_delta_pairs_saves_the_client_sends(
+        self, client, access_token: str, admin_user: User, save: Save
+    ):
+        """Client keys are looked up even when the server save is older than
+        the watermark, so they still pair instead of negotiating as uploads."""
+        device = db_device_handler.add_device(
+            Device(
+                id="delta-dev-4",
+                user_id=admin_user.id,
+                sync_enabled=True,
+                sync_watermark=datetime.now(timezone.utc) + timedelta(hours=1),
+            )
+        )
+
+        data = self._negotiate(
+            client,
+            access_token,
+            device.id,
+            [
+                {
+                    "rom_id": save.rom_id,
+                    "file_name": save.file_name,
+                    "slot": save.slot,
+                    "updated_at": "2026-03-01T00:00:00Z",
+                    "file_size_bytes": 100,
+                }
+            ],
+        )
+
+        assert len(data["operations"]) == 1
+        assert data["operations"][0]["save_id"] == save.id
+        assert data["total_upload"] == 0
+
+    def test_clean_completion_advances_watermark(
+        self, client, access_token: str, admin_user: User
+    ):
+        device = db_device_handler.add_device(
+            Device(id="delta-dev-5", user_id=admin_user.id, sync_enabled=True)
+        )
+        failed = db_sync_session_handler.create_session(
+            device_id=device.id, user_id=admin_user.id
+        )
+        client.post(
+            f"/api/sync/sessions/{failed.id}/complete",
+            json={"operations_completed": 1, "operations_failed": 1},
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        device = db_device_handler.get_device(
+            device_id=device.id, user_id=admin_user.id
+        )
+        assert device is not None
+        assert device.sync_watermark is None
+
+        clean = db_sync_session_handler.create_session(
+            device_id=device.id, user_id=admin_user.id
+        )
+        response = client.post(
+            f"/api/sync/sessions/{clean.id}/complete",
+            json={"operations_completed": 2, "operations_failed": 0},
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        device = db_device_handler.get_device(
+            device_id=device.id, user_id=admin_user.id
+        )
+        assert device is not None
+        assert device.sync_watermark is not None
+        assert to_utc(device.sync_watermark).replace(microsecond=0) == (
+            to_utc(clean.initiated_at).replace(microsecond=0)
+        )
+
+
 class TestNegotiateAdvanced:
     def test_negotiate_untracked_save_returns_noop(
         self, client, access_token: str, admin_user: User, save: Save
@@ -590,13 +727,19 @@ class TestNegotiateAdvanced:
                 content_hash=content_hash,
             )
 
-        with mock.patch(
-            "endpoints.saves.fs_asset_handler.write_file", new_callable=mock.AsyncMock
-        ), mock.patch(
-            "endpoints.saves.fs_asset_handler.remove_file", new_callable=mock.AsyncMock
-        ), mock.patch(
-            "endpoints.saves.scan_save",
-            new=mock.AsyncMock(side_effect=make_scanned),
+        with (
+            mock.patch(
+                "endpoints.saves.fs_asset_handler.write_file",
+                new_callable=mock.AsyncMock,
+            ),
+            mock.patch(
+                "endpoints.saves.fs_asset_handler.remove_file",
+                new_callable=mock.AsyncMock,
+            ),
+            mock.patch(
+                "endpoints.saves.scan_save",
+                new=mock.AsyncMock(side_effect=make_scanned),
+            ),
         ):
             return client.post(
                 f"/api/saves?rom_id={rom.id}&slot=autosave&emulator=eden"
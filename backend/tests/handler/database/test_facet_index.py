@@ -0,0 +1,156 @@
+"""Checks for the in-memory facet index behind the gallery filters.
+
+The index mirrors `roms_facets`, which the database keeps in sync through
+triggers, so these tests write through the normal handlers and assert the
+posting lists follow after a refresh.
+"""
+
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import update
+
+from handler.database import db_rom_handler
+from handler.database.base_handler import run_after_commit, sync_session
+from handler.database.facet_index import FacetIndex
+from models.platform import Platform
+from models.rom import Rom, RomFacets
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> FacetIndex:
+    return FacetIndex(str(tmp_path / "facet_index.json"))
+
+
+def _refresh(index: FacetIndex) -> None:
+    with sync_session.begin() as session:
+        index.refresh(session)
+
+
+class TestFacetIndex:
+    def test_values_follow_a_metadata_edit(self, index: FacetIndex, rom: Rom):
+        _refresh(index)
+        db_rom_handler.update_rom(
+            rom.id,
+            {"igdb_metadata": {"genres": ["Puzzle"]}, "languages": ["En"]},
+        )
+
+        _refresh(index)
+        values = index.filter_values()
+        assert values["genres"] == ["Puzzle"]
+        assert values["languages"] == ["En"]
+        assert values["platforms"] == [rom.platform_id]
+
+    def test_scope_limits_values(self, index: FacetIndex, rom: Rom):
+        db_rom_handler.update_rom(rom.id, {"igdb_metadata": {"genres": ["Puzzle"]}})
+        _refresh(index)
+
+        assert index.filter_values({rom.id})["genres"] == ["Puzzle"]
+        assert index.filter_values(set())["genres"] == []
+
+    def test_match_logic(self, index: FacetIndex, rom: Rom):
+        db_rom_handler.update_rom(
+            rom.id, {"igdb_metadata": {"genres": ["Action", "RPG"]}}
+        )
+        _refresh(index)
+
+        assert index.match("genres", ["RPG", "Puzzle"], "any") == {rom.id}
+        assert index.match("genres", ["RPG", "Puzzle"], "all") == set()
+        assert index.match("genres", ["Action", "RPG"], "all") == {rom.id}
+        assert index.match("genres", ["RPG"], "none") == set()
+        assert index.match("genres", ["Puzzle"], "none") == {rom.id}
+
+    def test_deleted_rom_leaves_the_index(self, index: FacetIndex, rom: Rom):
+        _refresh(index)
+        assert index.size == 1
+
+        db_rom_handler.delete_rom(rom.id)
+        _refresh(index)
+
+        assert index.size == 0
+        assert index.filter_values()["platforms"] == []
+
+    def test_delete_and_insert_between_refreshes(
+        self, index: FacetIndex, rom: Rom, platform: Platform
+    ):
+        _refresh(index)
+
+        db_rom_handler.delete_rom(rom.id)
+        replacement = db_rom_handler.add_rom(
+            Rom(
+                platform_id=platform.id,
+                name="replacement",
+                slug="replacement",
+                fs_name="replacement.zip",
+                fs_name_no_tags="replacement",
+                fs_name_no_ext="replacement",
+                fs_extension="zip",
+                fs_path=f"{platform.slug}/roms",
+            )
+        )
+        _refresh(index)
+
+        assert index.size == 1
+        assert index.match("platforms", [platform.id]) == {replacement.id}
+
+    def test_edit_behind_the_watermark_is_picked_up(self, index: FacetIndex, rom: Rom):
+        _refresh(index)
+        db_rom_handler.update_rom(rom.id, {"igdb_metadata": {"genres": ["Puzzle"]}})
+        # As if the write's transaction had started long before it committed
+        with sync_session.begin() as session:
+            session.execute(
+                update(RomFacets)
+                .where(RomFacets.rom_id == rom.id)
+                .values(updated_at=RomFacets.updated_at - timedelta(hours=1))
+            )
+
+        _refresh(index)
+        assert index.match("genres", ["Puzzle"]) == {rom.id}
+
+    def test_clear_rebuilds_on_next_refresh(self, index: FacetIndex, rom: Rom):
+        _refresh(index)
+
+        index.clear()
+        assert index.size == 0
+
+        _refresh(index)
+        assert index.size == 1
+
+
+class TestChangesArePublishedAfterCommit:
+    def test_savepoint_rollback_keeps_callbacks(self):
+        ran: list[str] = []
+        with sync_session.begin() as session:
+            run_after_commit(session, lambda: ran.append("published"))
+            session.begin_nested().rollback()
+
+        assert ran == ["published"]
+
+    def test_rollback_drops_callbacks(self):
+        ran: list[str] = []
+        session = sync_session()
+        session.begin()
+        run_after_commit(session, lambda: ran.append("published"))
+        session.rollback()
+        session.close()
+
+        assert ran == []
+
+
+class TestFilterRomsUsesFacetIndex:
+    def test_genre_filter(self, rom: Rom):
+        db_rom_handler.update_rom(rom.id, {"igdb_metadata": {"genres": ["Puzzle"]}})
+
+        query, _ = db_rom_handler.get_roms_query()
+
+        with sync_session.begin() as session:
+            matched = db_rom_handler.filter_roms(
+                query=query, genres=["Puzzle"], session=session
+            )
+            assert [r.id for r in session.scalars(matched)] == [rom.id]
+
+            excluded = db_rom_handler.filter_roms(
+                query=query, genres=["Puzzle"], genres_logic="none", session=session
+            )
+            assert list(session.scalars(excluded)) == []
@@ -0,0 +1,77 @@
+"""Checks for the materialized sibling groups behind `sibling_roms`.
+
+The groups are regrouped by the ROM handler on every write that can move one,
+so these tests write through `add_rom`/`update_rom`/`delete_rom` and read the
+siblings back through the view.
+"""
+
+from handler.database import db_rom_handler
+from models.platform import Platform
+from models.rom import Rom
+
+
+def _add_rom(platform: Platform, fs_name: str, **ids) -> Rom:
+    return db_rom_handler.add_rom(
+        Rom(
+            platform_id=platform.id,
+            name=fs_name,
+            slug=fs_name,
+            fs_name=f"{fs_name}.zip",
+            fs_name_no_tags=fs_name,
+            fs_name_no_ext=fs_name,
+            fs_extension="zip",
+            fs_path=f"{platform.slug}/roms",
+            **ids,
+        )
+    )
+
+
+def _sibling_ids(rom: Rom) -> set[int]:
+    loaded = db_rom_handler.get_rom(rom.id)
+    assert loaded is not None
+    return {sibling.id for sibling in loaded.sibling_roms}
+
+
+class TestSiblingGroups:
+    def test_shared_id_makes_siblings(self, platform: Platform):
+        rom_a = _add_rom(platform, "a", igdb_id=1)
+        rom_b = _add_rom(platform, "b", igdb_id=1)
+        rom_c = _add_rom(platform, "c", igdb_id=2)
+
+        assert _sibling_ids(rom_a) == {rom_b.id}
+        assert _sibling_ids(rom_c) == set()
+
+    def test_siblings_are_transitive(self, platform: Platform):
+        rom_a = _add_rom(platform, "a", igdb_id=1)
+        rom_b = _add_rom(platform, "b", igdb_id=1, ss_id=5)
+        rom_c = _add_rom(platform, "c", ss_id=5)
+
+        assert _sibling_ids(rom_a) == {rom_b.id, rom_c.id}
+
+    def test_update_moves_a_rom_between_groups(self, platform: Platform):
+        rom_a = _add_rom(platform, "a", igdb_id=1)
+        rom_b = _add_rom(platform, "b", igdb_id=1)
+        rom_c = _add_rom(platform, "c", igdb_id=2)
+
+        db_rom_handler.update_rom(rom_b.id, {"igdb_id": 2})
+
+        assert _sibling_ids(rom_a) == set()
+        assert _sibling_ids(rom_c) == {rom_b.id}
+
+    def test_deleting_a_bridge_splits_the_group(self, platform: Platform):
+        rom_a = _add_rom(platform, "a", igdb_id=1)
+        bridge = _add_rom(platform, "b", igdb_id=1, ss_id=5)
+        rom_c = _add_rom(platform, "c", ss_id=5)
+
+        db_rom_handler.delete_rom(bridge.id)
+
+        assert _sibling_ids(rom_a) == set()
+        assert _sibling_ids(rom_c) == set()
+
+    def test_rebuild_matches_incremental_groups(self, platform: Platform):
+        rom_a = _add_rom(platform, "a", igdb_id=1)
+        rom_b = _add_rom(platform, "b", igdb_id=1)
+        _add_rom(platform, "c")
+
+        assert db_rom_handler.rebuild_sibling_groups() == 2
+        assert _sibling_ids(rom_a) == {rom_b.id}
@@ -4,6 +4,9 @@ Bulk `update()` bypasses the ORM `@validates` hooks, so `update_rom` keeps
 the columns derived from `name` / `fs_name` in sync explicitly.
 """
 
+from datetime import UTC, datetime
+from unittest.mock import patch
+
 import pytest
 from sqlalchemy.exc import IntegrityError
 
@@ -17,6 +20,7 @@ from models.assets import Save, State
 from models.platform import Platform
 from models.rom import Rom, RomFile, RomFileCategory, TrackMeta
 from models.user import User
+from utils.datetime import to_utc
 
 
 class TestUpdateRomDerivedColumns:
@@ -460,3 +464,34 @@ class TestSyncRomFiles:
 
         assert synced.files == []
         assert synced.orphaned_cover_paths == ["covers/track01.png"]
+
+
+class TestRecordRomUserPlays:
+    def test_concurrent_first_play_updates_the_inserted_row(
+        self, rom: Rom, admin_user: User
+    ):
+        played_at = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+        plan = db_rom_handler._plan_rom_user_plays
+        calls = 0
+
+        def plan_then_race(*args, **kwargs):
+            # Another device commits the user's first play of the ROM between
+            # this ingest's read and its insert
+            nonlocal calls
+            calls += 1
+            planned = plan(*args, **kwargs)
+            if calls == 1:
+                db_rom_handler.add_rom_user(rom.id, admin_user.id)
+            return planned
+
+        with patch.object(
+            db_rom_handler, "_plan_rom_user_plays", side_effect=plan_then_race
+        ):
+            db_rom_handler.record_rom_user_plays(admin_user.id, {rom.id: played_at})
+
+        assert calls == 2
+        rom_user = db_rom_handler.get_rom_user(rom.id, admin_user.id)
+        assert rom_user is not None
+        assert rom_user.last_played is not None
+        assert to_utc(rom_user.last_played) == played_at
+        assert rom_user.now_playing is True
@@ -8,6 +8,7 @@ memory and writing it back on every read (see #4029).
 from collections.abc import Sequence
 
 from handler.database import db_collection_handler, db_rom_handler, db_save_handler
+from handler.database.collections_handler import SmartCollectionFact
 from models.assets import Save
 from models.collection import Collection, SmartCollection
 from models.platform import Platform
@@ -362,6 +363,117 @@ def test_refresh_for_roms_membership_only_skips_a_member_that_stayed(
     assert refresh.call_count == 0
 
 
+def test_smart_collection_facts_follow_the_criteria():
+    saves_and_statuses = SmartCollection(
+        filter_criteria={"has_saves": False, "statuses": ["finished"]}
+    )
+    favorites = SmartCollection(filter_criteria={"favorite": True})
+    genres = SmartCollection(filter_criteria={"genres": ["Racing"]})
+
+    assert db_collection_handler.get_smart_collection_facts(saves_and_statuses) == {
+        SmartCollectionFact.HIDDEN,
+        SmartCollectionFact.SAVES,
+        SmartCollectionFact.STATUSES,
+    }
+    assert db_collection_handler.get_smart_collection_facts(favorites) == {
+        SmartCollectionFact.HIDDEN,
+        SmartCollectionFact.COLLECTIONS,
+    }
+    # Hiding a ROM drops it from every owner-scoped query
+    assert db_collection_handler.get_smart_collection_facts(genres) == {
+        SmartCollectionFact.HIDDEN
+    }
+
+
+def test_refresh_for_roms_only_evaluates_collections_that_read_the_change(
+    platform: Platform, admin_user: User, mocker
+):
+    saves = _add_smart_collection(admin_user, {"has_saves": True}, name="Saves")
+    _add_smart_collection(admin_user, {"genres": ["Racing"]}, name="Racing")
+    rom = _add_rom(platform, "Rally One")
+    db_collection_handler.refresh_smart_collections()
+
+    _add_save(rom, admin_user)
+    matches = mocker.spy(db_rom_handler, "get_smart_collections_matches")
+    db_collection_handler.refresh_smart_collections_for_roms(
+        [rom.id], membership_only=True, facts={SmartCollectionFact.SAVES}
+    )
+
+    assert matches.call_count == 1
+    asked = matches.call_args.kwargs["smart_collections"]
+    assert [smart_collection.id for smart_collection in asked] == [saves.id]
+
+
+def test_refresh_for_roms_applies_membership_moves_in_place(
+    platform: Platform, admin_user: User, mocker
+):
+    # A ROM without a cover can't change the cover arrays, so moving it in or
+    # out only touches the cached ids and count.
+    collection = _add_smart_collection(admin_user, {"has_saves": True})
+    rom = _add_rom(platform, "Rally One")
+    db_collection_handler.refresh_smart_collections()
+    refresh = mocker.spy(db_collection_handler, "refresh_smart_collection")
+
+    save = _add_save(rom, admin_user)
+    db_collection_handler.refresh_smart_collections_for_roms(
+        [rom.id], membership_only=True, facts={SmartCollectionFact.SAVES}
+    )
+    added = db_collection_handler.get_smart_collection(collection.id)
+    assert added is not None
+    assert added.rom_ids == [rom.id] and added.rom_count == 1
+
+    db_save_handler.delete_save(save.id)
+    db_collection_handler.refresh_smart_collections_for_roms(
+        [rom.id], membership_only=True, facts={SmartCollectionFact.SAVES}
+    )
+    removed = db_collection_handler.get_smart_collection(collection.id)
+    assert removed is not None
+    assert removed.rom_ids == [] and removed.rom_count == 0
+    assert refresh.call_count == 0
+
+
+def test_membership_delta_applies_to_the_current_row(
+    platform: Platform, admin_user: User
+):
+    # A delta computed from a stale snapshot must not undo a move another
+    # request made in the meantime.
+    collection = _add_smart_collection(admin_user, {"has_saves": True})
+    first = _add_rom(platform, "Rally One")
+    second = _add_rom(platform, "Rally Two")
+    db_collection_handler.refresh_smart_collections()
+    snapshot = db_collection_handler.get_smart_collection(collection.id)
+    assert snapshot is not None
+
+    db_collection_handler.apply_smart_collection_delta(
+        snapshot, added={first.id}, removed=set()
+    )
+    db_collection_handler.apply_smart_collection_delta(
+        snapshot, added={second.id}, removed=set()
+    )
+
+    current = db_collection_handler.get_smart_collection(collection.id)
+    assert current is not None
+    assert current.rom_ids == [first.id, second.id] and current.rom_count == 2
+
+
+def test_refresh_for_roms_recounts_when_a_moved_rom_has_a_cover(
+    platform: Platform, admin_user: User, mocker
+):
+    collection = _add_smart_collection(admin_user, {"has_saves": True})
+    rom = _add_rom(platform, "Rally One", cover="roms/1/1/cover/small.png")
+    db_collection_handler.refresh_smart_collections()
+    refresh = mocker.spy(db_collection_handler, "refresh_smart_collection")
+
+    _add_save(rom, admin_user)
+    db_collection_handler.refresh_smart_collections_for_roms(
+        [rom.id], membership_only=True, facts={SmartCollectionFact.SAVES}
+    )
+
+    after = db_collection_handler.get_smart_collection(collection.id)
+    assert refresh.call_count == 1
+    assert after is not None and len(after.path_covers_small) == 1
+
+
 def test_cached_membership_belongs_to_the_owner(
     platform: Platform, admin_user: User, editor_user: User
 ):
@@ -6,9 +6,12 @@ extended with the provider match ids) rather than scanning the multi-gigabyte
 through the normal handler and assert the breakdowns read the mirrored values.
 """
 
+from sqlalchemy import update
+
 from handler.database import db_platform_handler, db_rom_handler, db_stats_handler
-from models.platform import Platform
-from models.rom import Rom
+from handler.database.base_handler import sync_session
+from models.platform import Platform, PlatformStats
+from models.rom import Rom, RomFile
 
 
 def _add_platform(slug: str) -> Platform:
@@ -138,3 +141,106 @@ class TestMetadataCoverage:
         )
 
         assert coverage[platform.id] == [{"source": "igdb", "matched": 1}]
+
+
+class TestPlatformStatsRollups:
+    def test_refresh_builds_one_row_per_platform(self):
+        platform_a = _add_platform("platform_a")
+        platform_b = _add_platform("platform_b")
+        _add_platform("platform_empty")
+        rom = _add_rom(platform_a, "a1", igdb_id=1, regions=["USA", "Japan"])
+        _add_rom(platform_a, "a2", regions=["USA"])
+        _add_rom(platform_b, "b1", moby_id=5)
+        db_rom_handler.add_rom_file(
+            RomFile(
+                rom_id=rom.id,
+                file_name="a1.zip",
+                file_path=rom.fs_path,
+                file_size_bytes=1000,
+            )
+        )
+
+        db_stats_handler.refresh_platform_stats()
+
+        rows = {row.platform_id: row for row in db_stats_handler.get_platform_stats()}
+        assert set(rows) == {platform_a.id, platform_b.id}
+        assert rows[platform_a.id].rom_count == 2
+        assert rows[platform_a.id].filesize_bytes == 1000
+        assert rows[platform_a.id].metadata_coverage == {"igdb": 1}
+        assert rows[platform_a.id].region_counts == {"USA": 2, "Japan": 1}
+        assert rows[platform_b.id].metadata_coverage == {"moby": 1}
+
+    def test_scoped_refresh_leaves_other_platforms(self):
+        platform_a = _add_platform("platform_a")
+        platform_b = _add_platform("platform_b")
+        _add_rom(platform_a, "a1")
+        _add_rom(platform_b, "b1")
+        # Drift both rows, as a write bypassing the handlers would
+        with sync_session.begin() as session:
+            session.execute(update(PlatformStats).values(rom_count=5))
+
+        db_stats_handler.refresh_platform_stats([platform_a.id])
+
+        rows = {row.platform_id: row for row in db_stats_handler.get_platform_stats()}
+        assert rows[platform_a.id].rom_count == 1
+        assert rows[platform_b.id].rom_count == 5
+
+    def test_deleting_the_last_rom_drops_the_row(self):
+        platform_a = _add_platform("platform_a")
+        platform_b = _add_platform("platform_b")
+        rom = _add_rom(platform_a, "a1")
+        _add_rom(platform_b, "b1")
+
+        db_rom_handler.delete_rom(rom.id)
+
+        rows = db_stats_handler.get_platform_stats()
+        assert [row.platform_id for row in rows] == [platform_b.id]
+
+    def test_hidden_platforms_are_excluded(self):
+        platform_a = _add_platform("platform_a")
+        platform_b = _add_platform("platform_b")
+        _add_rom(platform_a, "a1")
+        _add_rom(platform_b, "b1")
+
+        rows = db_stats_handler.get_platform_stats(hidden_platform_ids=[platform_b.id])
+
+        assert [row.platform_id for row in rows] == [platform_a.id]
+
+    def test_rom_writes_move_the_rollups(self):
+        platform_a = _add_platform("platform_a")
+        platform_b = _add_platform("platform_b")
+        rom = _add_rom(platform_a, "a1", igdb_id=1, regions=["USA"])
+        _add_rom(platform_a, "a2", regions=["USA"])
+        db_rom_handler.add_rom_file(
+            RomFile(
+                rom_id=rom.id,
+                file_name="a1.zip",
+                file_path=rom.fs_path,
+                file_size_bytes=1000,
+            )
+        )
+
+        rows = {row.platform_id: row for row in db_stats_handler.get_platform_stats()}
+        assert rows[platform_a.id].rom_count == 2
+        assert rows[platform_a.id].filesize_bytes == 1000
+        assert rows[platform_a.id].metadata_coverage == {"igdb": 1}
+        assert rows[platform_a.id].region_counts == {"USA": 2}
+
+        db_rom_handler.update_rom(
+            rom.id, {"platform_id": platform_b.id, "regions": ["Japan"]}
+        )
+
+        rows = {row.platform_id: row for row in db_stats_handler.get_platform_stats()}
+        assert rows[platform_a.id].rom_count == 1
+        assert rows[platform_a.id].filesize_bytes == 0
+        assert rows[platform_a.id].metadata_coverage == {}
+        assert rows[platform_a.id].region_counts == {"USA": 1}
+        assert rows[platform_b.id].rom_count == 1
+        assert rows[platform_b.id].filesize_bytes == 1000
+        assert rows[platform_b.id].metadata_coverage == {"igdb": 1}
+        assert rows[platform_b.id].region_counts == {"Japan": 1}
+
+        db_rom_handler.delete_rom(rom.id)
+
+        rows = db_stats_handler.get_platform_stats()
+        assert [row.platform_id for row in rows] == [platform_a.id]
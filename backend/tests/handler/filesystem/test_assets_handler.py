@@ -3,6 +3,7 @@ import os
 import shutil
 import tempfile
 import zipfile
+from io import BytesIO
 from pathlib import Path
 from unittest.mock import Mock
 
@@ -500,3 +501,137 @@ class TestComputeContentHash:
         assert (
             result == pinned
         ), f"nested-switch-shape zip-hash drifted: got={result} want={pinned}"
+
+    @pytest.mark.asyncio
+    async def test_staged_hash_matches_committed_hash(
+        self, handler: FSAssetsHandler, temp_base: str
+    ):
+        """The hash taken while staging equals compute_content_hash of the
+        committed file, for zips and plain files alike."""
+        reload_zipfile()
+        zip_bytes = BytesIO()
+        with zipfile.ZipFile(zip_bytes, "w") as zf:
+            zf.writestr("card/a.bin", b"memory card" * 1000)
+            zf.writestr("card/b.bin", b"\x00\x01\x02\x03")
+
+        for name, content in (
+            ("test.zip", zip_bytes.getvalue()),
+            ("test.srm", b"raw save data \x00\x01\xff"),
+        ):
+            async with handler.stage_file(content, "users/test/saves", name) as staged:
+                staged_hash = await handler.compute_staged_content_hash(staged)
+
+            assert staged_hash is not None
+            assert staged_hash == await handler.compute_content_hash(
+                f"users/test/saves/{name}"
+            )
+
+
+class TestAssetDeduplication:
+    """Identical save/state payloads share one content-addressed blob."""
+
+    @pytest.fixture(autouse=True)
+    def enable_deduplication(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(
+            "handler.filesystem.assets_handler.ENABLE_ASSET_DEDUPLICATION", True
+        )
+
+    @pytest.fixture
+    def temp_base(self):
+        path = tempfile.mkdtemp()
+        yield path
+        shutil.rmtree(path, ignore_errors=True)
+
+    @pytest.fixture
+    def handler(self, temp_base: str):
+        handler = FSAssetsHandler()
+        handler.base_path = Path(temp_base).resolve()
+        return handler
+
+    @staticmethod
+    def _blobs(handler: FSAssetsHandler) -> list[Path]:
+        return [path for path in handler.blobs_path.rglob("*") if path.is_file()]
+
+    @pytest.mark.asyncio
+    async def test_identical_payloads_share_a_blob(self, handler: FSAssetsHandler):
+        await handler.write_file(b"save data", "users/a/saves", "one.srm")
+        await handler.write_file(BytesIO(b"save data"), "users/b/saves", "two.srm")
+
+        first = handler.base_path / "users/a/saves/one.srm"
+        second = handler.base_path / "users/b/saves/two.srm"
+        (blob,) = self._blobs(handler)
+        assert blob.name == hashlib.sha256(b"save data").hexdigest()
+        assert os.path.samefile(first, blob) and os.path.samefile(second, blob)
+        assert blob.stat().st_nlink == 3
+        assert first.read_bytes() == b"save data"
+
+    @pytest.mark.asyncio
+    async def test_rewrite_with_same_content_leaves_no_temp_file(
+        self, handler: FSAssetsHandler
+    ):
+        await handler.write_file(b"save data", "users/a/saves", "one.srm")
+        await handler.write_file(b"save data", "users/a/saves", "one.srm")
+
+        assert os.listdir(handler.base_path / "users/a/saves") == ["one.srm"]
+        (blob,) = self._blobs(handler)
+        assert blob.stat().st_nlink == 2
+
+    @pytest.mark.asyncio
+    async def test_staged_file_is_linked_and_hashed(self, handler: FSAssetsHandler):
+        async with handler.stage_file(
+            b"state", "users/a/states", "one.state"
+        ) as staged:
+            assert (
+                staged.md5 == hashlib.md5(b"state", usedforsecurity=False).hexdigest()
+            )
+
+        (blob,) = self._blobs(handler)
+        assert os.path.samefile(handler.base_path / "users/a/states/one.state", blob)
+
+    @pytest.mark.asyncio
+    async def test_removing_the_last_asset_leaves_the_blob_to_the_sweep(
+        self, handler: FSAssetsHandler, monkeypatch: pytest.MonkeyPatch
+    ):
+        await handler.write_file(b"save data", "users/a/saves", "one.srm")
+        await handler.write_file(b"save data", "users/b/saves", "two.srm")
+
+        await handler.remove_file("users/a/saves/one.srm")
+        await handler.remove_file("users/b/saves/two.srm")
+        (blob,) = self._blobs(handler)
+        assert blob.stat().st_nlink == 1
+
+        monkeypatch.setattr(
+            "handler.filesystem.assets_handler.ASSET_BLOBS_GRACE_SECONDS", -60
+        )
+        assert await handler.remove_unreferenced_blobs() == 1
+        assert self._blobs(handler) == []
+
+    @pytest.mark.asyncio
+    async def test_sweep_removes_only_stale_unreferenced_blobs(
+        self, handler: FSAssetsHandler, monkeypatch: pytest.MonkeyPatch
+    ):
+        await handler.write_file(b"kept", "users/a/saves", "kept.srm")
+        await handler.write_file(b"orphan", "users/a/saves", "orphan.srm")
+        # Deleted behind the handler's back, so the blob is left unreferenced
+        (handler.base_path / "users/a/saves/orphan.srm").unlink()
+
+        assert await handler.remove_unreferenced_blobs() == 0
+
+        monkeypatch.setattr(
+            "handler.filesystem.assets_handler.ASSET_BLOBS_GRACE_SECONDS", -60
+        )
+        assert await handler.remove_unreferenced_blobs() == 1
+        (blob,) = self._blobs(handler)
+        assert blob.name == hashlib.sha256(b"kept").hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_disabled_writes_plain_files(
+        self, handler: FSAssetsHandler, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(
+            "handler.filesystem.assets_handler.ENABLE_ASSET_DEDUPLICATION", False
+        )
+        await handler.write_file(b"save data", "users/a/saves", "one.srm")
+
+        assert not handler.blobs_path.exists()
+        assert (handler.base_path / "users/a/saves/one.srm").stat().st_nlink == 1
@@ -1,5 +1,7 @@
 import asyncio
 import errno
+import hashlib
+import os
 import shutil
 import tempfile
 from io import BytesIO
@@ -10,7 +12,11 @@ import pytest
 from fastapi import UploadFile
 
 from config.config_manager import DEFAULT_EXCLUDED_FILES
-from handler.filesystem.base_handler import FSHandler, region_ranks_for_priority
+from handler.filesystem.base_handler import (
+    WRITE_BLOCK_SIZE,
+    FSHandler,
+    region_ranks_for_priority,
+)
 from models.base import FILE_NAME_MAX_LENGTH
 
 
@@ -488,6 +494,41 @@ class TestFSHandler:
         with pytest.raises(ValueError, match="cannot be empty"):
             await handler.get_file_size("")
 
+    async def test_stage_file_commits_with_md5(
+        self, handler: FSHandler, sample_file_content
+    ):
+        """A staged file lands on its target, hashed in the same pass"""
+        async with handler.stage_file(
+            sample_file_content, ".", "test_file.txt"
+        ) as staged:
+            assert not (handler.base_path / "test_file.txt").exists()
+
+        assert (
+            staged.md5
+            == hashlib.md5(sample_file_content, usedforsecurity=False).hexdigest()
+        )
+        assert await handler.read_file("test_file.txt") == sample_file_content
+
+    async def test_stage_file_discard_keeps_existing_target(
+        self, handler: FSHandler, sample_file_content
+    ):
+        """A discarded staged file leaves the target and no temp file behind"""
+        await handler.write_file(sample_file_content, ".", "test_file.txt")
+
+        async with handler.stage_file(b"replacement", ".", "test_file.txt") as staged:
+            staged.discard()
+
+        assert await handler.read_file("test_file.txt") == sample_file_content
+        assert await handler.list_files(".") == ["test_file.txt"]
+
+    async def test_write_file_in_large_blocks(self, handler: FSHandler):
+        """Content larger than one write block is copied intact"""
+        content = os.urandom(WRITE_BLOCK_SIZE * 2 + 123)
+
+        await handler.write_file(BytesIO(content), ".", "big.bin")
+
+        assert await handler.read_file("big.bin") == content
+
     async def test_atomic_write_rollback(self, handler: FSHandler):
         """Test atomic write rollback on failure"""
 
@@ -10,6 +10,7 @@ import pytest
 from PIL import Image
 
 import adapters.services.screenscraper as ss_module
+import handler.filesystem.resources_handler as resources_module
 from adapters.services.screenscraper import (
     SS_DEFAULT_MAX_THREADS,
     SS_DEFAULT_MEDIA_TIMEOUT,
@@ -25,6 +26,11 @@ from handler.filesystem.resources_handler import (
 )
 from models.collection import Collection
 from models.rom import Rom
+from utils.cover_derivatives import (
+    COVER_DERIVATIVE_FORMATS,
+    cover_derivatives_path,
+    cover_srcset,
+)
 from utils.rate_limiter import ConcurrencyLimiter, RateLimiter
 
 
@@ -223,41 +229,49 @@ class TestFSResourcesHandler:
         assert isinstance(small_exists, bool)
         assert isinstance(big_exists, bool)
 
-    def test_resize_cover_to_small_high_resolution(self, handler: FSResourcesHandler):
+    def test_resize_cover_to_small_high_resolution(
+        self, handler: FSResourcesHandler, tmp_path
+    ):
         """Test resize_cover_to_small with high resolution image"""
         # Create a mock image with high resolution
         mock_image = Mock()
         mock_image.height = 1500
         mock_image.width = 1000
         mock_image.resize.return_value = mock_image
+        mock_image.save.side_effect = lambda path: Path(path).write_bytes(b"small")
 
-        save_path = "/tmp/test_small.png"
+        save_path = tmp_path / "test_small.png"
 
-        handler.resize_cover_to_small(mock_image, save_path)
+        handler.resize_cover_to_small(mock_image, str(save_path))
 
         # Should use 0.2 ratio for high resolution
         expected_width = int(1000 * 0.2)
         expected_height = int(1500 * 0.2)
         mock_image.resize.assert_called_once_with((expected_width, expected_height))
-        mock_image.save.assert_called_once_with(save_path)
+        mock_image.save.assert_called_once()
+        assert save_path.read_bytes() == b"small"
 
-    def test_resize_cover_to_small_low_resolution(self, handler: FSResourcesHandler):
+    def test_resize_cover_to_small_low_resolution(
+        self, handler: FSResourcesHandler, tmp_path
+    ):
         """Test resize_cover_to_small with low resolution image"""
         # Create a mock image with low resolution
         mock_image = Mock()
         mock_image.height = 800
         mock_image.width = 600
         mock_image.resize.return_value = mock_image
+        mock_image.save.side_effect = lambda path: Path(path).write_bytes(b"small")
 
-        save_path = "/tmp/test_small.png"
+        save_path = tmp_path / "test_small.png"
 
-        handler.resize_cover_to_small(mock_image, save_path)
+        handler.resize_cover_to_small(mock_image, str(save_path))
 
         # Should use 0.4 ratio for low resolution
         expected_width = int(600 * 0.4)
         expected_height = int(800 * 0.4)
         mock_image.resize.assert_called_once_with((expected_width, expected_height))
-        mock_image.save.assert_called_once_with(save_path)
+        mock_image.save.assert_called_once()
+        assert save_path.read_bytes() == b"small"
 
     def test_get_cover_path_no_cover(
         self, handler: FSResourcesHandler, rom: Rom, tmp_path
@@ -1296,6 +1310,79 @@ class TestScreenScraperMediaThrottling:
         ]
 
 
+class _PeakTrackingClient:
+    """Holds each request open for a tick and records the peak overlap per host."""
+
+    def __init__(self):
+        self.in_flight: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+
+    def stream(self, _method: str, url: str, **_kwargs):
+        client = self
+        host = httpx.URL(url).host
+
+        class _Context:
+            async def __aenter__(self):
+                client.in_flight[host] = client.in_flight.get(host, 0) + 1
+                client.peak[host] = max(
+                    client.peak.get(host, 0), client.in_flight[host]
+                )
+                await asyncio.sleep(0.01)
+                return _FakeResponse()
+
+            async def __aexit__(self, *_args):
+                client.in_flight[host] -= 1
+                return False
+
+        return _Context()
+
+
+class TestPerHostDownloadLimit:
+    """Media is fetched concurrently, but no host sees more than its cap."""
+
+    @pytest.fixture(autouse=True)
+    def _isolate_limiters(self, monkeypatch):
+        monkeypatch.setattr(resources_module, "_host_limiters", {})
+        monkeypatch.setattr(resources_module, "MEDIA_DOWNLOAD_HOST_CONCURRENCY", 2)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_downloads_are_capped_per_host(self, tmp_path):
+        handler = FSResourcesHandler()
+        handler.base_path = tmp_path
+        client = _PeakTrackingClient()
+
+        with patch("handler.filesystem.resources_handler.ctx_httpx_client") as mock_ctx:
+            mock_ctx.get.return_value = client
+            await asyncio.gather(
+                *(
+                    handler.store_ra_badge(
+                        f"https://{host}/badge{i}.png", f"badges/{host}/{i}.png"
+                    )
+                    for host in ("a.example.com", "b.example.com")
+                    for i in range(6)
+                )
+            )
+
+        assert client.peak == {"a.example.com": 2, "b.example.com": 2}
+
+    @pytest.mark.asyncio
+    async def test_screenshots_download_concurrently(self, tmp_path):
+        handler = FSResourcesHandler()
+        handler.base_path = tmp_path
+        client = _PeakTrackingClient()
+        rom = Mock(spec=Rom)
+        rom.fs_resources_path = "roms/1/1"
+
+        with patch("handler.filesystem.resources_handler.ctx_httpx_client") as mock_ctx:
+            mock_ctx.get.return_value = client
+            paths = await handler.get_rom_screenshots(
+                rom, True, [f"https://cdn.example.com/{i}.jpg" for i in range(3)]
+            )
+
+        assert paths == [f"roms/1/1/screenshots/{i}.jpg" for i in range(3)]
+        assert client.peak == {"cdn.example.com": 2}
+
+
 COVER_URL = "http://example.com/cover.png"
 
 
@@ -1624,3 +1711,183 @@ class TestCoverSingleFetch:
         assert client.requests == [COVER_URL]
         assert path_small == "collections/3/cover/small.png"
         assert path_big == "collections/3/cover/big.png"
+
+
+class TestCoverDerivatives:
+    """Responsive renditions are keyed by the cover's content hash."""
+
+    @pytest.fixture(autouse=True)
+    def enabled(self):
+        with patch(
+            "handler.filesystem.resources_handler.ENABLE_COVER_DERIVATIVES", True
+        ):
+            yield
+
+    @pytest.fixture
+    def handler(self, tmp_path):
+        handler = FSResourcesHandler()
+        handler.base_path = tmp_path
+        return handler
+
+    @staticmethod
+    def _rom(rom_id: int) -> Rom:
+        rom = Mock(spec=Rom)
+        rom.id = rom_id
+        rom.platform_id = 1
+        rom.fs_resources_path = f"roms/1/{rom_id}"
+        return rom
+
+    @staticmethod
+    def _write_big_cover(
+        handler: FSResourcesHandler,
+        rom: Rom,
+        color: tuple[int, int, int] = (10, 20, 30),
+        suffix: str = "png",
+        size: tuple[int, int] = (600, 800),
+    ) -> None:
+        path = handler.base_path / rom.fs_resources_path / "cover" / f"big.{suffix}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.new("RGB", size, color).save(path)
+
+    @staticmethod
+    async def _hash(handler: FSResourcesHandler, rom: Rom) -> str | None:
+        return (await handler.store_cover_derivatives(rom))["cover_hash"]
+
+    async def test_builds_every_width_and_format(self, handler: FSResourcesHandler):
+        rom = self._rom(1)
+        self._write_big_cover(handler, rom)
+
+        stored = await handler.store_cover_derivatives(rom)
+
+        cover_hash = stored["cover_hash"]
+        assert cover_hash is not None
+        assert stored["cover_width"] == 600
+        derivatives = handler.base_path / "covers" / cover_hash[:2] / cover_hash
+        for fmt in COVER_DERIVATIVE_FORMATS:
+            with Image.open(derivatives / f"128.{fmt}") as img:
+                assert img.size == (128, 171)
+            with Image.open(derivatives / f"512.{fmt}") as img:
+                assert img.size == (512, 683)
+            with Image.open(derivatives / f"original.{fmt}") as img:
+                assert img.size == (600, 800)
+
+    async def test_never_upscales_a_narrow_source(self, handler: FSResourcesHandler):
+        rom = self._rom(1)
+        self._write_big_cover(handler, rom, size=(100, 150))
+
+        stored = await handler.store_cover_derivatives(rom)
+
+        cover_hash = stored["cover_hash"]
+        assert cover_hash is not None
+        derivatives = handler.base_path / "covers" / cover_hash[:2] / cover_hash
+        assert sorted(p.stem for p in derivatives.iterdir() if p.is_file()) == [
+            "original"
+        ] * len(COVER_DERIVATIVE_FORMATS)
+        srcset = cover_srcset(cover_hash, stored["cover_width"])
+        assert srcset["webp"] == (
+            f"/assets/romm/resources/{cover_derivatives_path(cover_hash)}"
+            "/original.webp 100w"
+        )
+
+    async def test_shared_artwork_is_stored_once(self, handler: FSResourcesHandler):
+        first, second = self._rom(1), self._rom(2)
+        self._write_big_cover(handler, first)
+        self._write_big_cover(handler, second)
+
+        first_hash = await self._hash(handler, first)
+        second_hash = await self._hash(handler, second)
+
+        assert first_hash == second_hash
+        assert len(list((handler.base_path / "covers").glob("*/*"))) == 1
+
+    async def test_shared_artwork_hardlinks_the_rom_covers(
+        self, handler: FSResourcesHandler
+    ):
+        first, second = self._rom(1), self._rom(2)
+        self._write_big_cover(handler, first)
+        self._write_big_cover(handler, second)
+        first_big = handler.base_path / first.fs_resources_path / "cover" / "big.png"
+        second_big = handler.base_path / second.fs_resources_path / "cover" / "big.png"
+
+        await self._hash(handler, first)
+        await self._hash(handler, second)
+
+        assert os.path.samefile(first_big, second_big)
+
+        # Re-storing one rom's artwork leaves the other's cover as it was
+        with Image.open(first_big) as img:
+            handler.resize_cover_to_small(img, save_path=str(first_big))
+
+        with Image.open(second_big) as img:
+            assert img.size == (600, 800)
+
+    async def test_differing_cover_files_are_not_shared(
+        self, handler: FSResourcesHandler
+    ):
+        first, second = self._rom(1), self._rom(2)
+        for rom in (first, second):
+            self._write_big_cover(handler, rom)
+        self._write_big_cover(handler, first, color=(1, 2, 3), suffix="webp")
+        self._write_big_cover(handler, second, color=(4, 5, 6), suffix="webp")
+
+        await self._hash(handler, first)
+        await self._hash(handler, second)
+
+        first_webp = handler.base_path / first.fs_resources_path / "cover" / "big.webp"
+        second_webp = (
+            handler.base_path / second.fs_resources_path / "cover" / "big.webp"
+        )
+        assert not os.path.samefile(first_webp, second_webp)
+
+    async def test_distinct_artwork_gets_distinct_hashes(
+        self, handler: FSResourcesHandler
+    ):
+        first, second = self._rom(1), self._rom(2)
+        self._write_big_cover(handler, first, color=(10, 20, 30))
+        self._write_big_cover(handler, second, color=(30, 20, 10))
+
+        assert await self._hash(handler, first) != await self._hash(handler, second)
+
+    async def test_hash_ignores_the_webp_copy(self, handler: FSResourcesHandler):
+        rom = self._rom(1)
+        self._write_big_cover(handler, rom)
+        before = await self._hash(handler, rom)
+
+        self._write_big_cover(handler, rom, color=(99, 99, 99), suffix="webp")
+
+        assert await self._hash(handler, rom) == before
+
+    async def test_no_cover_returns_none(self, handler: FSResourcesHandler):
+        assert await self._hash(handler, self._rom(1)) is None
+
+    async def test_undecodable_cover_returns_none(self, handler: FSResourcesHandler):
+        rom = self._rom(1)
+        path = handler.base_path / rom.fs_resources_path / "cover" / "big.png"
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"not an image")
+
+        assert await self._hash(handler, rom) is None
+        assert list((handler.base_path / "covers").glob("*/*")) == []
+
+    async def test_disabled_returns_none(self, handler: FSResourcesHandler):
+        rom = self._rom(1)
+        self._write_big_cover(handler, rom)
+
+        with patch(
+            "handler.filesystem.resources_handler.ENABLE_COVER_DERIVATIVES", False
+        ):
+            assert await self._hash(handler, rom) is None
+
+    def test_srcset_lists_widths_below_the_source(self):
+        srcset = cover_srcset("ab" + "0" * 62, 300)
+
+        assert set(srcset) == set(COVER_DERIVATIVE_FORMATS)
+        base_url = f"/assets/romm/resources/covers/ab/ab{'0' * 62}"
+        assert srcset["webp"] == (
+            f"{base_url}/128.webp 128w, {base_url}/256.webp 256w, "
+            f"{base_url}/original.webp 300w"
+        )
+        assert cover_srcset(None, None) == {}
+
+    def test_srcset_without_a_width_is_empty(self):
+        assert cover_srcset("ab" + "0" * 62, None) == {}
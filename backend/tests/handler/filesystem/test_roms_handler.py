@@ -1,4 +1,5 @@
 import hashlib
+import json
 import os
 import shutil
 import tempfile
@@ -18,7 +19,9 @@ from handler.filesystem.base_handler import (
 from handler.filesystem.roms_handler import (
     FileHash,
     FSRomsHandler,
+    _recorded_hashes_key,
 )
+from handler.redis_handler import async_cache
 from models.platform import Platform
 from models.rom import Rom, RomFile, RomFileCategory
 from utils.archives import extract_chd_hash
@@ -564,6 +567,87 @@ class TestFSRomsHandler:
         assert parsed_rom_files.md5_hash == only_file.md5_hash
         assert parsed_rom_files.sha1_hash == only_file.sha1_hash
 
+    @pytest.mark.asyncio
+    async def test_get_rom_files_single_rom_uses_recorded_hashes(
+        self, handler: FSRomsHandler, rom_single, config
+    ):
+        """Hashes recorded when the file was written replace rehashing it."""
+        rom_path = handler.validate_path("n64/roms") / rom_single.fs_name
+        md5_h = hashlib.md5(b"recorded", usedforsecurity=False)
+        sha1_h = hashlib.sha1(b"recorded", usedforsecurity=False)
+        await handler.record_file_hashes(rom_path, 0x1234ABCD, md5_h, sha1_h)
+
+        try:
+            with pytest.MonkeyPatch.context() as m:
+                m.setattr(
+                    "handler.filesystem.roms_handler.cm.get_config", lambda: config
+                )
+                m.setattr("os.path.exists", lambda x: False)
+                m.setattr(
+                    handler,
+                    "_calculate_rom_hashes",
+                    Mock(side_effect=AssertionError("file was rehashed")),
+                )
+
+                parsed_rom_files = await handler.get_rom_files(rom_single)
+        finally:
+            await async_cache.delete(_recorded_hashes_key(rom_path))
+
+        assert parsed_rom_files.crc_hash == "1234abcd"
+        assert parsed_rom_files.md5_hash == md5_h.hexdigest()
+        assert parsed_rom_files.sha1_hash == sha1_h.hexdigest()
+        assert parsed_rom_files.rom_files[0].md5_hash == md5_h.hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_get_rom_files_ignores_stale_recorded_hashes(
+        self, handler: FSRomsHandler, rom_single, config
+    ):
+        """A file changed since its hashes were recorded is hashed again."""
+        rom_path = handler.validate_path("n64/roms") / rom_single.fs_name
+        await async_cache.set(
+            _recorded_hashes_key(rom_path),
+            json.dumps(
+                {
+                    "size": rom_path.stat().st_size,
+                    "mtime_ns": rom_path.stat().st_mtime_ns - 1,
+                    "crc": 0x1234ABCD,
+                    "md5": hashlib.md5(b"recorded").hexdigest(),
+                    "sha1": hashlib.sha1(b"recorded").hexdigest(),
+                }
+            ),
+        )
+
+        try:
+            with pytest.MonkeyPatch.context() as m:
+                m.setattr(
+                    "handler.filesystem.roms_handler.cm.get_config", lambda: config
+                )
+                m.setattr("os.path.exists", lambda x: False)
+
+                parsed_rom_files = await handler.get_rom_files(rom_single)
+        finally:
+            await async_cache.delete(_recorded_hashes_key(rom_path))
+
+        assert parsed_rom_files.crc_hash == "efb5af2e"
+        assert parsed_rom_files.md5_hash == "0f343b0931126a20f133d67c2b018a3b"
+
+    @pytest.mark.asyncio
+    async def test_record_file_hashes_skips_files_hashed_decompressed(
+        self, handler: FSRomsHandler, tmp_path: Path
+    ):
+        """Raw digests of an archive aren't what the scan computes for it."""
+        archive = tmp_path / "game.gz"
+        archive.write_bytes(b"not really gzip")
+
+        await handler.record_file_hashes(
+            archive,
+            1,
+            hashlib.md5(usedforsecurity=False),
+            hashlib.sha1(usedforsecurity=False),
+        )
+
+        assert await async_cache.get(_recorded_hashes_key(archive)) is None
+
     @pytest.mark.asyncio
     async def test_get_rom_files_multi_rom_hash_spans_every_part(
         self, handler: FSRomsHandler, rom_multi, config
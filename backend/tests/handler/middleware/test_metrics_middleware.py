@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from handler.middleware.metrics_middleware import MetricsMiddleware
+from utils.metrics import count_redis_command, count_sql_statement
+
+
+def create_test_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/roms/{id}")
+    def get_rom(id: int) -> dict:
+        count_sql_statement()
+        count_sql_statement()
+        count_redis_command()
+        return {"id": id}
+
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+class TestMetricsMiddleware:
+    def test_records_by_route_template(self):
+        client = TestClient(create_test_app())
+        with (
+            patch(
+                "handler.middleware.metrics_middleware.HTTP_REQUEST_SECONDS"
+            ) as seconds,
+            patch(
+                "handler.middleware.metrics_middleware.HTTP_REQUEST_SQL_STATEMENTS"
+            ) as sql,
+            patch(
+                "handler.middleware.metrics_middleware.HTTP_REQUEST_REDIS_COMMANDS"
+            ) as redis,
+        ):
+            response = client.get("/api/roms/42")
+
+        assert response.status_code == 200
+        _, labels = seconds.observe.call_args
+        assert labels == {"method": "GET", "route": "/api/roms/{id}", "status": 200}
+        sql.observe.assert_called_once_with(2, route="/api/roms/{id}")
+        redis.observe.assert_called_once_with(1, route="/api/roms/{id}")
+
+    def test_unmatched_paths_share_a_label(self):
+        client = TestClient(create_test_app())
+        with patch(
+            "handler.middleware.metrics_middleware.HTTP_REQUEST_SECONDS"
+        ) as seconds:
+            response = client.get("/api/nope/123")
+
+        assert response.status_code == 404
+        _, labels = seconds.observe.call_args
+        assert labels == {"method": "GET", "route": "unmatched", "status": 404}
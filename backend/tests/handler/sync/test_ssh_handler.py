@@ -0,0 +1,143 @@
+"""Tests for the SSH sync handler's session pool and remote listing."""
+
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import asyncssh
+import pytest
+
+from handler.sync.ssh_handler import SSHConnectionPool, SSHSession, SSHSyncHandler
+
+SYNC_CONFIG = {"ssh_host": "1.2.3.4", "ssh_username": "root"}
+
+
+def _connection() -> MagicMock:
+    conn = MagicMock()
+    conn.is_closed.return_value = False
+    conn.start_sftp_client = AsyncMock(return_value=MagicMock())
+    return conn
+
+
+def _conn(session: SSHSession) -> MagicMock:
+    # The pool's sessions wrap the mock connections `handler.connect` returns
+    return cast(MagicMock, session.conn)
+
+
+@pytest.fixture
+def handler(tmp_path) -> SSHSyncHandler:
+    with patch("handler.sync.ssh_handler.SYNC_SSH_KEYS_PATH", str(tmp_path)):
+        handler = SSHSyncHandler()
+    handler.connect = AsyncMock(side_effect=lambda *_, **__: _connection())  # type: ignore[method-assign]
+    return handler
+
+
+class TestSSHConnectionPool:
+    async def test_acquire_reuses_the_device_session(self, handler: SSHSyncHandler):
+        async with SSHConnectionPool(handler) as pool:
+            first = await pool.acquire("dev-1", SYNC_CONFIG)
+            second = await pool.acquire("dev-1", SYNC_CONFIG)
+            other = await pool.acquire("dev-2", SYNC_CONFIG)
+
+        assert first is second
+        assert other is not first
+        assert cast(AsyncMock, handler.connect).await_count == 2
+        _conn(first).start_sftp_client.assert_awaited_once()
+
+    async def test_acquire_reconnects_when_config_changes(
+        self, handler: SSHSyncHandler
+    ):
+        async with SSHConnectionPool(handler) as pool:
+            first = await pool.acquire("dev-1", SYNC_CONFIG)
+            second = await pool.acquire("dev-1", {**SYNC_CONFIG, "ssh_port": 2222})
+
+        assert second is not first
+        _conn(first).close.assert_called()
+
+    async def test_acquire_reconnects_when_connection_dropped(
+        self, handler: SSHSyncHandler
+    ):
+        async with SSHConnectionPool(handler) as pool:
+            first = await pool.acquire("dev-1", SYNC_CONFIG)
+            _conn(first).is_closed.return_value = True
+            second = await pool.acquire("dev-1", SYNC_CONFIG)
+
+        assert second is not first
+
+    async def test_close_closes_every_session(self, handler: SSHSyncHandler):
+        async with SSHConnectionPool(handler) as pool:
+            sessions = [
+                await pool.acquire("dev-1", SYNC_CONFIG),
+                await pool.acquire("dev-2", SYNC_CONFIG),
+            ]
+
+        for session in sessions:
+            cast(MagicMock, session.sftp).exit.assert_called_once()
+            _conn(session).close.assert_called_once()
+
+
+def _name(filename: str, file_type: int, size: int = 8) -> asyncssh.SFTPName:
+    return asyncssh.SFTPName(
+        filename, attrs=asyncssh.SFTPAttrs(type=file_type, size=size, mtime=100)
+    )
+
+
+class TestListRemoteSaves:
+    async def test_lists_regular_files_from_readdir_attrs(
+        self, handler: SSHSyncHandler
+    ):
+        sftp = MagicMock()
+        sftp.readdir = AsyncMock(
+            return_value=[
+                _name(".", asyncssh.FILEXFER_TYPE_DIRECTORY),
+                _name("..", asyncssh.FILEXFER_TYPE_DIRECTORY),
+                _name("game.srm", asyncssh.FILEXFER_TYPE_REGULAR, size=32),
+                _name("backups.srm", asyncssh.FILEXFER_TYPE_DIRECTORY),
+                _name("notes.txt", asyncssh.FILEXFER_TYPE_REGULAR),
+                _name("linked.srm", asyncssh.FILEXFER_TYPE_SYMLINK),
+            ]
+        )
+        sftp.stat = AsyncMock(
+            return_value=asyncssh.SFTPAttrs(
+                type=asyncssh.FILEXFER_TYPE_REGULAR, size=64, mtime=200
+            )
+        )
+        session = SSHSession(conn=MagicMock(), sftp=sftp)
+
+        saves = await handler.list_remote_saves(
+            session,
+            [{"platform_slug": "snes", "path": "/saves/snes", "extension": ".srm"}],
+        )
+
+        assert [(s.path, s.file_size) for s in saves] == [
+            ("/saves/snes/game.srm", 32),
+            ("/saves/snes/linked.srm", 64),
+        ]
+        # Only the symlink needs a stat of its own
+        sftp.stat.assert_awaited_once_with("/saves/snes/linked.srm")
+
+    async def test_missing_directory_is_skipped(self, handler: SSHSyncHandler):
+        sftp = MagicMock()
+        sftp.readdir = AsyncMock(side_effect=asyncssh.SFTPNoSuchFile("gone"))
+        session = SSHSession(conn=MagicMock(), sftp=sftp)
+
+        saves = await handler.list_remote_saves(
+            session, [{"platform_slug": "snes", "path": "/saves/snes"}]
+        )
+
+        assert saves == []
+
+
+class TestUploadSave:
+    async def test_remote_directory_is_created_once_per_session(
+        self, handler: SSHSyncHandler
+    ):
+        sftp = MagicMock()
+        sftp.mkdir = AsyncMock()
+        sftp.put = AsyncMock()
+        session = SSHSession(conn=MagicMock(), sftp=sftp)
+
+        await handler.upload_save(session, "/server/a.srm", "/saves/snes/a.srm")
+        await handler.upload_save(session, "/server/b.srm", "/saves/snes/b.srm")
+
+        sftp.mkdir.assert_awaited_once_with("/saves/snes")
+        assert sftp.put.await_count == 2
@@ -0,0 +1,102 @@
+"""Tests for the Redis-backed "now playing" presence store."""
+
+from unittest.mock import patch
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from handler.activity_handler import ActivityEntry, ActivityHandler
+
+
+@pytest.fixture
+async def cache():
+    # Production clients decode responses; the shared test client does not
+    async with FakeAsyncRedis(version=7, decode_responses=True) as cache:
+        with patch("handler.activity_handler.async_cache", cache):
+            yield cache
+
+
+@pytest.fixture
+def handler(cache) -> ActivityHandler:
+    return ActivityHandler()
+
+
+def _entry(user_id: int = 1, device_id: str = "dev-1", rom_id: int = 10):
+    return ActivityEntry(
+        user_id=user_id,
+        username=f"user{user_id}",
+        avatar_path="",
+        rom_id=rom_id,
+        rom_name="Game",
+        rom_cover_path="",
+        screenshot_path="",
+        platform_slug="gba",
+        platform_name="Game Boy Advance",
+        device_id=device_id,
+        device_type="web",
+        started_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+class TestActivityIndex:
+    async def test_get_all_active_lists_indexed_sessions(
+        self, handler: ActivityHandler, cache
+    ):
+        await handler.set_active(_entry(user_id=1))
+        await handler.set_active(_entry(user_id=2, device_id="dev-2"))
+        # Unrelated keys sharing the prefix must not be picked up
+        await cache.set("activity:user:99:ghost", "{}")
+
+        entries = await handler.get_all_active()
+
+        assert sorted(e["user_id"] for e in entries) == [1, 2]
+
+    async def test_get_all_active_does_not_scan_the_keyspace(
+        self, handler: ActivityHandler, cache
+    ):
+        await handler.set_active(_entry())
+
+        with patch.object(cache, "scan_iter") as scan_iter:
+            entries = await handler.get_all_active()
+
+        assert len(entries) == 1
+        scan_iter.assert_not_called()
+
+    async def test_expired_sessions_are_trimmed(self, handler: ActivityHandler, cache):
+        await handler.set_active(_entry())
+
+        with patch(
+            "handler.activity_handler.time.time",
+            return_value=9_999_999_999,
+        ):
+            entries = await handler.get_all_active()
+
+        assert entries == []
+        assert await cache.zcard(ActivityHandler.INDEX_KEY) == 0
+
+    async def test_clear_active_removes_from_indexes(
+        self, handler: ActivityHandler, cache
+    ):
+        await handler.set_active(_entry())
+
+        assert await handler.clear_active(1, "dev-1") == 10
+        assert await handler.get_all_active() == []
+        assert await handler.get_active_for_rom(10) == []
+
+    async def test_get_active_for_rom(self, handler: ActivityHandler):
+        await handler.set_active(_entry(user_id=1, rom_id=10))
+        await handler.set_active(_entry(user_id=2, device_id="dev-2", rom_id=20))
+
+        entries = await handler.get_active_for_rom(10)
+
+        assert [e["user_id"] for e in entries] == [1]
+
+    async def test_device_switching_rom_leaves_old_rom(
+        self, handler: ActivityHandler, cache
+    ):
+        await handler.set_active(_entry(rom_id=10))
+        await handler.set_active(_entry(rom_id=20))
+
+        assert await handler.get_active_for_rom(10) == []
+        assert [e["rom_id"] for e in await handler.get_active_for_rom(20)] == [20]
+        assert await cache.zcard(handler._rom_index_key(10)) == 0
@@ -0,0 +1,159 @@
+from unittest.mock import patch
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from handler.netplay_handler import NetplayHandler, NetplayPlayerInfo, NetplayRoom
+
+
+@pytest.fixture
+async def handler():
+    async with FakeAsyncRedis(version=7, decode_responses=True) as cache:
+        with patch("handler.netplay_handler.async_cache", cache):
+            yield NetplayHandler()
+
+
+def _player(sid: str, player_id: str) -> NetplayPlayerInfo:
+    return NetplayPlayerInfo(
+        socketId=sid,
+        player_name=f"Player {player_id}",
+        userid=player_id,
+        playerId=None,
+    )
+
+
+def _room(game_id: str = "42", max_players: int = 2) -> NetplayRoom:
+    return NetplayRoom(
+        owner="sid-1",
+        players={"p1": _player("sid-1", "p1")},
+        peers=[],
+        room_name="Room",
+        game_id=game_id,
+        domain=None,
+        password=None,
+        max_players=max_players,
+    )
+
+
+async def test_create_round_trips_and_refuses_duplicates(handler):
+    assert await handler.create("room-1", _room())
+    assert not await handler.create("room-1", _room(game_id="7"))
+
+    assert await handler.get("room-1") == _room()
+
+
+async def test_game_rooms_only_lists_the_game(handler):
+    await handler.create("room-1", _room(game_id="42"))
+    await handler.create("room-2", _room(game_id="7"))
+
+    assert list(await handler.get_game_rooms("42")) == ["room-1"]
+    assert set(await handler.get_all()) == {"room-1", "room-2"}
+
+
+async def test_add_player_respects_max_players(handler):
+    await handler.create("room-1", _room(max_players=2))
+
+    players = await handler.add_player(
+        "room-1", "p2", _player("sid-2", "p2"), max_players=2
+    )
+    assert players is not None and set(players) == {"p1", "p2"}
+
+    assert (
+        await handler.add_player("room-1", "p3", _player("sid-3", "p3"), max_players=2)
+        is None
+    )
+    room = await handler.get("room-1")
+    assert room is not None and set(room["players"]) == {"p1", "p2"}
+
+
+async def test_remove_player_returns_remaining_room(handler):
+    await handler.create("room-1", _room())
+    await handler.add_player("room-1", "p2", _player("sid-2", "p2"), max_players=2)
+
+    room = await handler.remove_player("room-1", "p1")
+
+    assert room is not None
+    assert set(room["players"]) == {"p2"}
+    assert room["owner"] == "sid-1"
+
+
+async def test_delete_drops_room_and_indexes(handler):
+    await handler.create("room-1", _room())
+
+    await handler.delete(["room-1"])
+
+    assert await handler.get("room-1") is None
+    assert await handler.get_game_rooms("42") == {}
+    assert await handler.get_all() == {}
+    # The id can be used again
+    assert await handler.create("room-1", _room())
+
+
+async def test_room_is_local_until_a_remote_socket_joins(handler):
+    await handler.create("room-1", _room())
+    await handler.attach_socket("sid-1", "room-1", "worker-a")
+
+    assert handler.get_socket_room("sid-1") == "room-1"
+    assert await handler.is_local_room("room-1", "worker-a")
+
+    # Another worker records its socket; the cached route holds until the
+    # membership change is announced
+    other_worker = NetplayHandler()
+    await other_worker.attach_socket("sid-2", "room-1", "worker-b")
+    assert await handler.is_local_room("room-1", "worker-a")
+
+    handler.invalidate_route("room-1")
+    assert not await handler.is_local_room("room-1", "worker-a")
+
+    await other_worker.detach_socket("sid-2")
+    handler.invalidate_route("room-1")
+    assert await handler.is_local_room("room-1", "worker-a")
+
+
+async def test_add_player_to_a_deleted_room_leaves_nothing_behind(handler):
+    await handler.create("room-1", _room())
+    await handler.delete(["room-1"])
+
+    assert (
+        await handler.add_player("room-1", "p2", _player("sid-2", "p2"), max_players=2)
+        is None
+    )
+    assert await handler.get("room-1") is None
+    assert await handler.get_all() == {}
+
+
+async def test_rejoining_player_does_not_count_twice(handler):
+    await handler.create("room-1", _room(max_players=2))
+    await handler.add_player("room-1", "p2", _player("sid-2", "p2"), max_players=2)
+
+    players = await handler.add_player(
+        "room-1", "p2", _player("sid-3", "p2"), max_players=2
+    )
+
+    assert players is not None and players["p2"]["socketId"] == "sid-3"
+
+
+async def test_attach_to_another_room_leaves_the_first(handler):
+    await handler.create("room-1", _room())
+    await handler.create("room-2", _room())
+    await handler.attach_socket("sid-1", "room-1", "worker-a")
+
+    await handler.attach_socket("sid-1", "room-2", "worker-a")
+
+    assert handler.get_socket_room("sid-1") == "room-2"
+    other_worker = NetplayHandler()
+    await other_worker.attach_socket("sid-2", "room-1", "worker-b")
+    # Only the other worker's socket is left in the first room
+    assert not await handler.is_local_room("room-1", "worker-a")
+    assert await handler.is_local_room("room-2", "worker-a")
+
+
+async def test_delete_forgets_local_routes(handler):
+    await handler.create("room-1", _room())
+    await handler.attach_socket("sid-1", "room-1", "worker-a")
+    assert await handler.is_local_room("room-1", "worker-a")
+
+    await handler.delete(["room-1"])
+
+    assert handler.get_socket_room("sid-1") is None
+    assert "room-1" not in handler._local_routes
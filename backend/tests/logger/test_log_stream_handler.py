@@ -0,0 +1,108 @@
+import json
+import logging
+import threading
+from unittest.mock import patch
+
+from fakeredis import FakeRedis
+
+from logger.log_stream_handler import LOG_BUFFER_KEY, LogStreamHandler
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {"levelname": "INFO", "levelno": logging.INFO, "msg": message}
+    )
+
+
+def _buffered_messages(redis: FakeRedis) -> list[str]:
+    # The buffer is newest-first; read it back in logging order.
+    return [
+        json.loads(item)["message"] for item in redis.lrange(LOG_BUFFER_KEY, 0, -1)
+    ][::-1]
+
+
+class TestLogStreamHandler:
+    def test_close_ships_queued_records_in_order(self):
+        redis = FakeRedis()
+        handler = LogStreamHandler(flush_interval=60)
+
+        with patch("handler.redis_handler.redis_client", redis):
+            for n in range(5):
+                handler.emit(_record(f"line {n}"))
+            handler.close()
+
+        assert _buffered_messages(redis) == [f"line {n}" for n in range(5)]
+
+    def test_flush_ships_queued_records_and_keeps_running(self):
+        redis = FakeRedis()
+        handler = LogStreamHandler(flush_interval=60)
+
+        with patch("handler.redis_handler.redis_client", redis):
+            handler.emit(_record("line 0"))
+            handler.emit(_record("line 1"))
+            handler.flush()
+            assert _buffered_messages(redis) == ["line 0", "line 1"]
+
+            handler.emit(_record("line 2"))
+            handler.close()
+
+        assert _buffered_messages(redis) == ["line 0", "line 1", "line 2"]
+
+    def test_records_ship_in_batches(self):
+        redis = FakeRedis()
+        handler = LogStreamHandler(batch_size=3, flush_interval=60)
+        pipelines: list[int] = []
+        pipeline = redis.pipeline
+
+        def counting_pipeline(*args, **kwargs):
+            pipelines.append(1)
+            return pipeline(*args, **kwargs)
+
+        with (
+            patch("handler.redis_handler.redis_client", redis),
+            patch.object(redis, "pipeline", counting_pipeline),
+        ):
+            for n in range(6):
+                handler.emit(_record(f"line {n}"))
+            handler.close()
+
+        assert len(pipelines) == 2
+        assert len(_buffered_messages(redis)) == 6
+
+    def test_full_queue_drops_and_reports(self):
+        redis = FakeRedis()
+        handler = LogStreamHandler(queue_size=2, flush_interval=60)
+        release = threading.Event()
+
+        def stalled_ship(batch):
+            release.wait()
+            original_ship(batch)
+
+        original_ship = handler._ship
+        with (
+            patch("handler.redis_handler.redis_client", redis),
+            patch.object(handler, "_ship", stalled_ship),
+        ):
+            # The first record is taken off the queue by the shipping thread,
+            # which then stalls; the queue fills behind it.
+            handler.emit(_record("first"))
+            for _ in range(50):
+                if handler._queue.empty():
+                    break
+                threading.Event().wait(0.01)
+            for n in range(5):
+                handler.emit(_record(f"line {n}"))
+            assert handler.dropped == 3
+
+            release.set()
+            handler.close()
+
+        messages = _buffered_messages(redis)
+        assert "3 log line(s) dropped from the stream" in messages
+
+    def test_redis_failure_is_swallowed(self):
+        handler = LogStreamHandler()
+
+        with patch("handler.redis_handler.redis_client", None):
+            handler.emit(_record("lost"))
+            handler.close()
@@ -0,0 +1,112 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from fakeredis import FakeAsyncRedis, FakeRedis
+
+from models.firmware import (
+    KNOWN_BIOS_HASHES_KEY,
+    Firmware,
+    build_known_bios_hash_index,
+)
+
+KNOWN_BIOS = {
+    "psx:scph5501.bin": {
+        "size": "524288",
+        "crc": "8D8CB7E4",
+        "md5": "490f666e1afb15b7362b406ed1cea246",
+        "sha1": "0555c6fae8906f3f09baf5988f00e55f88e9f30b",
+    },
+}
+
+
+@pytest.fixture
+async def cache():
+    async with FakeAsyncRedis(version=7, decode_responses=True) as cache:
+        await cache.hset(
+            KNOWN_BIOS_HASHES_KEY,
+            mapping={
+                field: json.dumps(entry)
+                for field, entry in build_known_bios_hash_index(KNOWN_BIOS).items()
+            },
+        )
+        with patch("models.firmware.async_cache", cache):
+            yield cache
+
+
+def _firmware(
+    file_name: str = "scph5501.bin",
+    size: int = 524288,
+    md5: str = "490f666e1afb15b7362b406ed1cea246",
+    sha1: str = "0555c6fae8906f3f09baf5988f00e55f88e9f30b",
+    crc: str = "8d8cb7e4",
+) -> Firmware:
+    firmware = Firmware(file_name=file_name, platform_id=1)
+    firmware.file_size_bytes = size
+    firmware.md5_hash = md5
+    firmware.sha1_hash = sha1
+    firmware.crc_hash = crc
+    return firmware
+
+
+def test_hash_index_is_keyed_by_platform_and_hash():
+    index = build_known_bios_hash_index(KNOWN_BIOS)
+
+    entry = {"file_name": "scph5501.bin", "size": 524288}
+    assert index == {
+        "psx:md5:490f666e1afb15b7362b406ed1cea246": entry,
+        "psx:sha1:0555c6fae8906f3f09baf5988f00e55f88e9f30b": entry,
+        "psx:crc:8d8cb7e4:524288": entry,
+    }
+
+
+async def test_verifies_a_renamed_dump(cache):
+    assert await Firmware.verify_firmware("psx", [_firmware("PSX BIOS (USA).bin")]) == [
+        True
+    ]
+
+
+async def test_verifies_on_a_single_matching_hash(cache):
+    firmware = _firmware(md5="0" * 32, sha1="0" * 40)
+
+    assert await Firmware.verify_firmware("psx", [firmware]) == [True]
+
+
+async def test_rejects_a_size_mismatch(cache):
+    firmware = _firmware(size=1024)
+
+    assert await Firmware.verify_firmware("psx", [firmware]) == [False]
+
+
+async def test_rejects_a_bios_of_another_platform(cache):
+    assert await Firmware.verify_firmware("ps2", [_firmware()]) == [False]
+
+
+async def test_verifies_a_batch_in_order(cache):
+    results = await Firmware.verify_firmware(
+        "psx", [_firmware(), _firmware(md5="0" * 32, sha1="0" * 40, crc="0" * 8)]
+    )
+
+    assert results == [True, False]
+
+
+def test_sync_verify_accepts_and_ignores_file_name():
+    """The is_verified migration still passes the file name."""
+    cache = FakeRedis(version=7, decode_responses=True)
+    cache.hset(
+        KNOWN_BIOS_HASHES_KEY,
+        mapping={
+            field: json.dumps(entry)
+            for field, entry in build_known_bios_hash_index(KNOWN_BIOS).items()
+        },
+    )
+
+    with patch("models.firmware.sync_cache", cache):
+        assert Firmware.verify_file_hashes(
+            platform_slug="psx",
+            file_name="PSX BIOS (USA).bin",
+            file_size_bytes=524288,
+            md5_hash="490f666e1afb15b7362b406ed1cea246",
+            sha1_hash="0555c6fae8906f3f09baf5988f00e55f88e9f30b",
+            crc_hash="8d8cb7e4",
+        )
@@ -143,6 +143,17 @@ class TestCleanupOrphanedResourcesRun:
         assert stats["platforms_in_fs"] == 0
         assert stats["removed_fs_platforms"] == 0
 
+    async def test_sweeps_asset_blobs_without_resources(self, tmp_path, mocker):
+        mocker.patch.object(mod, "RESOURCES_BASE_PATH", str(tmp_path / "missing"))
+        sweep = mocker.patch.object(
+            mod.fs_asset_handler, "remove_unreferenced_blobs", return_value=3
+        )
+
+        stats = await CleanupOrphanedResourcesTask().run()
+
+        sweep.assert_awaited_once()
+        assert stats["removed_asset_blobs"] == 3
+
 
 class TestScanResourceDirs:
     """The resource tree walk backing the cleanup task."""
@@ -194,3 +205,70 @@ class TestScanResourceDirs:
 
         with patch.object(mod.os, "scandir", side_effect=flaky_scandir):
             assert mod._scan_resource_dirs(str(tmp_path)) == {1: set()}
+
+
+class TestRemoveOrphanedCoverDerivatives:
+    @staticmethod
+    def _make_derivatives(root, cover_hash: str, age: int = 0):
+        path = root / cover_hash[:2] / cover_hash
+        path.mkdir(parents=True)
+        (path / "128.webp").write_bytes(b"webp")
+        if age:
+            mtime = os.stat(path).st_mtime - age
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_removes_unreferenced_hashes(self, tmp_path):
+        grace = mod.COVER_DERIVATIVES_GRACE_SECONDS + 60
+        kept = self._make_derivatives(tmp_path, "aa11", age=grace)
+        orphan = self._make_derivatives(tmp_path, "bb22", age=grace)
+
+        removed = mod._remove_orphaned_cover_derivatives(str(tmp_path), {"aa11"})
+
+        assert removed == 1
+        assert kept.exists()
+        assert not orphan.exists()
+
+    def test_keeps_fresh_unreferenced_hashes(self, tmp_path):
+        # A scan writes the derivatives before the rom row records the hash
+        fresh = self._make_derivatives(tmp_path, "cc33")
+
+        assert mod._remove_orphaned_cover_derivatives(str(tmp_path), set()) == 0
+        assert fresh.exists()
+
+    def test_missing_directory(self, tmp_path):
+        assert (
+            mod._remove_orphaned_cover_derivatives(str(tmp_path / "missing"), set())
+            == 0
+        )
+
+    def test_unreadable_prefix_is_skipped(self, tmp_path):
+        grace = mod.COVER_DERIVATIVES_GRACE_SECONDS + 60
+        self._make_derivatives(tmp_path, "aa11", age=grace)
+        orphan = self._make_derivatives(tmp_path, "bb22", age=grace)
+
+        real_scandir = os.scandir
+
+        def flaky_scandir(path):
+            if str(path).endswith(os.sep + "aa"):
+                raise PermissionError(13, "Permission denied")
+            return real_scandir(path)
+
+        with patch.object(mod.os, "scandir", side_effect=flaky_scandir):
+            assert mod._remove_orphaned_cover_derivatives(str(tmp_path), set()) == 1
+        assert not orphan.exists()
+
+    def test_keeps_a_hash_a_scan_picks_up_mid_removal(self, tmp_path):
+        grace = mod.COVER_DERIVATIVES_GRACE_SECONDS + 60
+        reused = self._make_derivatives(tmp_path, "aa11", age=grace)
+        real_rename = os.rename
+
+        def rename_after_scan_touch(src, dst):
+            # The scan bumps the mtime between the first stat and the move
+            if src == str(reused):
+                os.utime(src)
+            real_rename(src, dst)
+
+        with patch.object(mod.os, "rename", side_effect=rename_after_scan_touch):
+            assert mod._remove_orphaned_cover_derivatives(str(tmp_path), set()) == 0
+        assert (reused / "128.webp").exists()
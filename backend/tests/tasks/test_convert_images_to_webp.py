@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from tasks.scheduled import convert_images_to_webp
+from tasks.scheduled.convert_images_to_webp import (
+    ConversionManifest,
+    ConvertImagesToWebPTask,
+)
+
+
+def _write_image(path: Path, mode: str = "RGB") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new(mode, (4, 4)).save(path)
+
+
+@pytest.fixture
+def task(tmp_path: Path) -> ConvertImagesToWebPTask:
+    task = ConvertImagesToWebPTask()
+    task.resources_path = tmp_path / "resources"
+    task.manifest_path = tmp_path / "cache" / "webp_manifest.json"
+    task.max_workers = 2
+    task.resources_path.mkdir()
+    return task
+
+
+class TestConvertImagesToWebPTask:
+    async def test_converts_covers_in_parallel(self, task: ConvertImagesToWebPTask):
+        cover_dir = task.resources_path / "roms" / "1" / "10" / "cover"
+        _write_image(cover_dir / "big.png")
+        _write_image(cover_dir / "small.png", mode="P")
+        _write_image(task.resources_path / "roms" / "1" / "11" / "cover" / "big.jpg")
+
+        result = await task.run()
+
+        assert result["processed"] == 3
+        assert result["errors"] == 0
+        assert result["total"] == 3
+        assert (cover_dir / "big.webp").exists()
+        assert (cover_dir / "small.webp").exists()
+
+    async def test_rerun_skips_unchanged_directories(
+        self, task: ConvertImagesToWebPTask
+    ):
+        _write_image(task.resources_path / "roms" / "1" / "10" / "cover" / "big.png")
+        await task.run()
+
+        result = await task.run()
+
+        assert result["total"] == 0
+        assert result["skipped_dirs"] == 1
+
+    async def test_new_image_invalidates_directory(self, task: ConvertImagesToWebPTask):
+        cover_dir = task.resources_path / "roms" / "1" / "10" / "cover"
+        _write_image(cover_dir / "big.png")
+        await task.run()
+
+        _write_image(cover_dir / "small.png")
+        # Guard against coarse filesystem timestamps
+        stat = os.stat(cover_dir)
+        os.utime(cover_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        result = await task.run()
+
+        assert result["processed"] == 1
+        assert (cover_dir / "small.webp").exists()
+
+    async def test_invalid_image_is_retried(self, task: ConvertImagesToWebPTask):
+        cover_dir = task.resources_path / "roms" / "1" / "10" / "cover"
+        cover_dir.mkdir(parents=True)
+        (cover_dir / "big.png").write_bytes(b"not an image")
+
+        result = await task.run()
+        assert result["errors"] == 1
+
+        manifest = ConversionManifest(task.manifest_path)
+        manifest.load()
+        assert manifest.dirs == {}
+
+    async def test_walk_skips_media_beside_covers(self, task: ConvertImagesToWebPTask):
+        rom_dir = task.resources_path / "roms" / "1" / "10"
+        _write_image(rom_dir / "cover" / "big.png")
+        _write_image(rom_dir / "screenshots" / "cover" / "0.png")
+        _write_image(task.resources_path / "covers" / "ab" / "cover" / "1.png")
+
+        walked = [path for path, _ in task._walk_cover_dirs()]
+
+        assert walked == [str(rom_dir / "cover")]
+
+    async def test_broken_pool_falls_back_to_in_process_conversion(
+        self, task: ConvertImagesToWebPTask, monkeypatch: pytest.MonkeyPatch
+    ):
+        class BrokenPool:
+            """Every submitted image fails as if its worker had been killed."""
+
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return None
+
+            def submit(self, fn, *args):
+                future: Future = Future()
+                future.set_exception(BrokenProcessPool("worker died"))
+                return future
+
+        monkeypatch.setattr(convert_images_to_webp, "ProcessPoolExecutor", BrokenPool)
+        cover_dir = task.resources_path / "roms" / "1" / "10" / "cover"
+        _write_image(cover_dir / "big.png")
+        _write_image(cover_dir / "small.png")
+
+        result = await task.run()
+
+        assert result["processed"] == 2
+        assert result["errors"] == 0
+        assert (cover_dir / "big.webp").exists()
+        assert (cover_dir / "small.webp").exists()
+
+
+class TestConversionManifest:
+    def test_round_trip(self, tmp_path: Path):
+        manifest = ConversionManifest(tmp_path / "manifest.json")
+        manifest.mark("roms/1/10/cover", 123)
+        manifest.save()
+
+        loaded = ConversionManifest(tmp_path / "manifest.json")
+        loaded.load()
+        assert loaded.is_current("roms/1/10/cover", 123)
+        assert not loaded.is_current("roms/1/10/cover", 124)
+
+    def test_corrupt_manifest_is_ignored(self, tmp_path: Path):
+        (tmp_path / "manifest.json").write_text("{not json")
+
+        manifest = ConversionManifest(tmp_path / "manifest.json")
+        manifest.load()
+        assert manifest.dirs == {}
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+from tasks.manual.export_platforms import export_platforms_task
+from utils.gamelist_exporter import GamelistExporter
+from utils.pegasus_exporter import PegasusExporter
+
+
+class TestExportPlatformsTask:
+    async def test_counts_exported_and_failed_platforms(self):
+        async def fake_export(self, platform_id, request, *, full, on_progress):
+            on_progress(3, 3)
+            return platform_id != 2
+
+        with patch.object(GamelistExporter, "export_platform_to_file", fake_export):
+            result = await export_platforms_task.run(
+                export_format="gamelist", platform_ids=[1, 2, 3]
+            )
+
+        assert result == {
+            "total_platforms": 3,
+            "exported_platforms": 2,
+            "failed_platforms": 1,
+            "processed_roms": 3,
+            "total_roms": 3,
+        }
+
+    async def test_builds_pegasus_exporter_with_options(self):
+        exporters: list[PegasusExporter] = []
+
+        async def fake_export(self, platform_id, request, *, full, on_progress):
+            exporters.append(self)
+            assert request is None
+            assert full is True
+            return True
+
+        with patch.object(PegasusExporter, "export_platform_to_file", fake_export):
+            await export_platforms_task.run(
+                export_format="pegasus",
+                platform_ids=[1],
+                local_export=False,
+                base_url="http://romm.local/",
+                full=True,
+            )
+
+        assert len(exporters) == 1
+        assert exporters[0].local_export is False
+        assert exporters[0].base_url == "http://romm.local/"
@@ -1,5 +1,6 @@
 """Tests for SyncPushPullTask initialization and configuration."""
 
+import asyncio
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -14,8 +15,10 @@ from models.rom import Rom
 from models.user import User
 from tasks.sync_push_pull_task import (
     SyncPushPullTask,
+    _load_remote_hashes,
     _process_remote_save,
     _push_missing_saves,
+    _store_remote_hashes,
     sync_push_pull_task,
 )
 from tasks.tasks import PeriodicTask, TaskType
@@ -187,13 +190,12 @@ class TestNullSlotLeakInProcessRemoteSave:
         )
         ssh.upload_save = AsyncMock()
 
-        with patch(
-            "tasks.sync_push_pull_task.get_ssh_sync_handler", return_value=ssh
-        ), patch("tasks.sync_push_pull_task.fs_asset_handler"), patch(
-            "tasks.sync_push_pull_task.compare_save_state"
-        ) as mock_cmp, patch(
-            "tasks.sync_push_pull_task.AnyioPath"
-        ) as mock_anyio_path:
+        with (
+            patch("tasks.sync_push_pull_task.get_ssh_sync_handler", return_value=ssh),
+            patch("tasks.sync_push_pull_task.fs_asset_handler"),
+            patch("tasks.sync_push_pull_task.compare_save_state") as mock_cmp,
+            patch("tasks.sync_push_pull_task.AnyioPath") as mock_anyio_path,
+        ):
             mock_cmp.return_value = MagicMock(action="no_op", reason=None)
             mock_anyio_path.return_value.exists = AsyncMock(return_value=False)
             await _process_remote_save(
@@ -249,9 +251,10 @@ class TestNullSlotLeakInPushMissingSaves:
             {"platform_slug": platform.fs_slug, "path": "/remote/saves"}
         ]
         # Empty remote_saves means every server save would be considered "missing".
-        with patch(
-            "tasks.sync_push_pull_task.get_ssh_sync_handler", return_value=ssh
-        ), patch("tasks.sync_push_pull_task.fs_asset_handler") as mock_assets:
+        with (
+            patch("tasks.sync_push_pull_task.get_ssh_sync_handler", return_value=ssh),
+            patch("tasks.sync_push_pull_task.fs_asset_handler") as mock_assets,
+        ):
             mock_assets.validate_path.side_effect = lambda p: f"/server/{p}"
             pushed = await _push_missing_saves(
                 device,
@@ -271,3 +274,156 @@ class TestNullSlotLeakInPushMissingSaves:
         ), f"slotted save was not pushed: {uploaded_local_paths}"
         # And the upload count should reflect slotted-only.
         assert pushed == 1
+
+
+class TestConcurrentDeviceSync:
+    @patch("tasks.sync_push_pull_task.ENABLE_SYNC_PUSH_PULL", True)
+    @patch("tasks.sync_push_pull_task.SYNC_PUSH_PULL_WORKERS", 2)
+    @patch("tasks.sync_push_pull_task.get_ssh_sync_handler")
+    @patch("tasks.sync_push_pull_task.db_device_handler")
+    async def test_devices_sync_concurrently_up_to_the_worker_limit(
+        self, mock_device_handler, _mock_ssh
+    ):
+        from tasks.sync_push_pull_task import run_push_pull_sync
+
+        devices = [MagicMock(id=f"pp-dev-{i}", sync_enabled=True) for i in range(5)] + [
+            MagicMock(id="pp-dev-off", sync_enabled=False)
+        ]
+        mock_device_handler.get_all_devices_by_sync_mode.return_value = devices
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_sync_device(device, pool, session_id=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"device_id": device.id, "status": "completed"}
+
+        with patch("tasks.sync_push_pull_task._sync_device", fake_sync_device):
+            result = await run_push_pull_sync()
+
+        assert result["status"] == "completed"
+        assert [r["device_id"] for r in result["device_results"]] == [
+            f"pp-dev-{i}" for i in range(5)
+        ]
+        assert peak == 2
+
+
+class TestSyncDeviceFailure:
+    @patch("tasks.sync_push_pull_task.db_sync_session_handler")
+    async def test_session_is_discarded_after_sibling_transfers_settle(
+        self, _mock_session_handler
+    ):
+        from tasks.sync_push_pull_task import _sync_device
+
+        device = MagicMock(
+            id="pp-dev",
+            user_id=1,
+            sync_config={
+                "ssh_host": "device.local",
+                "save_directories": [{"platform_slug": "gba", "path": "/saves"}],
+            },
+        )
+        remote_saves = [
+            RemoteSaveInfo(
+                path=f"/saves/{name}",
+                file_name=name,
+                platform_slug="gba",
+                file_size=8,
+                mtime=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            )
+            for name in ("fast.sav", "slow.sav")
+        ]
+        pool = MagicMock()
+        pool.acquire = AsyncMock()
+        pool.handler.list_remote_saves = AsyncMock(return_value=remote_saves)
+        settled: list[str] = []
+
+        async def process(device, conn, remote_save):
+            if remote_save.file_name == "slow.sav":
+                await asyncio.sleep(0.01)
+            settled.append(remote_save.file_name)
+            return "no_op"
+
+        async def progress(**kwargs):
+            if kwargs["current_file"] == "fast.sav":
+                raise ConnectionError("socket gone")
+
+        pool.discard.side_effect = lambda _: settled.append("discarded")
+
+        with (
+            patch("tasks.sync_push_pull_task._load_remote_hashes", AsyncMock()),
+            patch("tasks.sync_push_pull_task._process_remote_save", process),
+            patch("endpoints.sockets.sync.emit_sync_started", AsyncMock()),
+            patch("endpoints.sockets.sync.emit_sync_error", AsyncMock()),
+            patch("endpoints.sockets.sync.emit_sync_progress", progress),
+        ):
+            result = await _sync_device(device, pool)
+
+        assert result["status"] == "failed"
+        assert settled == ["fast.sav", "slow.sav", "discarded"]
+
+
+class TestRemoteHashCache:
+    def _remote_save(self, mtime: datetime, file_size: int = 8) -> RemoteSaveInfo:
+        return RemoteSaveInfo(
+            path="/remote/gba/game.sav",
+            file_name="game.sav",
+            platform_slug="gba",
+            file_size=file_size,
+            mtime=mtime,
+        )
+
+    async def test_unchanged_remote_save_reuses_its_hash(self):
+        mtime = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        synced = self._remote_save(mtime)
+        synced.content_hash = "abc123"
+        await _store_remote_hashes("pp-hash-dev", [synced])
+
+        listed = self._remote_save(mtime)
+        await _load_remote_hashes("pp-hash-dev", [listed])
+
+        assert listed.content_hash == "abc123"
+
+    async def test_changed_remote_save_is_hashed_again(self):
+        mtime = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        synced = self._remote_save(mtime)
+        synced.content_hash = "abc123"
+        await _store_remote_hashes("pp-hash-dev", [synced])
+
+        touched = self._remote_save(datetime(2026, 1, 2, tzinfo=timezone.utc))
+        resized = self._remote_save(mtime, file_size=16)
+        await _load_remote_hashes("pp-hash-dev", [touched, resized])
+
+        assert touched.content_hash is None
+        assert resized.content_hash is None
+
+    async def test_known_hash_skips_download(self):
+        device = MagicMock(id="pp-dev-3", user_id=1)
+        remote_save = self._remote_save(datetime(2026, 1, 1, tzinfo=timezone.utc))
+        remote_save.content_hash = "abc123"
+
+        ssh = MagicMock()
+        ssh.download_save = AsyncMock()
+
+        with (
+            patch("tasks.sync_push_pull_task.get_ssh_sync_handler", return_value=ssh),
+            patch("tasks.sync_push_pull_task.db_platform_handler"),
+            patch("tasks.sync_push_pull_task.db_save_handler") as mock_save_handler,
+            patch("tasks.sync_push_pull_task.db_device_save_sync_handler"),
+            patch("tasks.sync_push_pull_task.compare_save_state") as mock_cmp,
+        ):
+            mock_save_handler.get_saves.return_value = [
+                MagicMock(file_name="game.sav", content_hash="abc123")
+            ]
+            mock_cmp.return_value = MagicMock(action="no_op", reason=None)
+            action = await _process_remote_save(
+                device, conn=MagicMock(), remote_save=remote_save
+            )
+
+        assert action == "no_op"
+        assert mock_cmp.call_args.kwargs["client_hash"] == "abc123"
+        ssh.download_save.assert_not_called()
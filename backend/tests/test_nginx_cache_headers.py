@@ -5,8 +5,9 @@ classes and the template must sort each request into the right one:
 
   * Frozen forever (fingerprinted): content-hashed Vite bundles
     (``index-<hash>.js``) and library resources requested with a cache-busting
-    query (covers ``?ts=``, manuals ``?v=``). The URL changes when the file
-    does, so a cached copy is never stale.
+    query (covers ``?ts=``, manuals ``?v=``), plus the content-addressed cover
+    derivatives under ``covers/``. The URL changes when the file does, so a
+    cached copy is never stale.
   * Revalidating (stable URLs across image upgrades / re-scrapes): the bundled
     EmulatorJS/Ruffle runtimes, icons/fonts/logos, and the query-less resources
     (screenshots, RA badges, which reuse names like ``0.jpg`` and are
@@ -189,6 +190,7 @@ IMMUTABLE_URLS = [
     "/assets/romm/resources/roms/1/1/cover/small.png?ts=2026-01-01T00:00:00",
     "/assets/romm/resources/roms/1/1/cover/big.png?ts=1700000000",
     "/assets/romm/resources/roms/1/1/manual/1.pdf?v=1700000000",
+    "/assets/romm/resources/covers/ab/abcdef0123/256.webp",
 ]
 
 # Stable URLs that must revalidate so an upgrade / re-scrape is picked up. This
@@ -0,0 +1,116 @@
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from utils import export_manifest
+from utils.export_manifest import (
+    ExportManifest,
+    assets_to_record,
+    build_rom_content_url,
+    place_assets,
+)
+
+STAMP = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+OPTIONS = {"local_export": True, "base_url": None}
+
+
+@pytest.fixture(autouse=True)
+def manifest_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_manifest, "EXPORT_MANIFEST_PATH", str(tmp_path))
+    return tmp_path
+
+
+class TestExportManifest:
+    def test_round_trip(self):
+        manifest = ExportManifest("gamelist_1", OPTIONS)
+        manifest.mark(10, STAMP, "  <game />\n")
+        manifest.save()
+
+        loaded = ExportManifest("gamelist_1", OPTIONS)
+        loaded.load()
+        assert loaded.get(10, STAMP) == "  <game />\n"
+        assert loaded.get(10, STAMP + timedelta(seconds=1)) is None
+        assert loaded.get(11, STAMP) is None
+
+    def test_changed_options_discard_entries(self):
+        manifest = ExportManifest("gamelist_1", OPTIONS)
+        manifest.mark(10, STAMP, "  <game />\n")
+        manifest.save()
+
+        loaded = ExportManifest("gamelist_1", {**OPTIONS, "local_export": False})
+        loaded.load()
+        assert loaded.entries == {}
+
+    def test_corrupt_manifest_is_ignored(self, manifest_dir: Path):
+        (manifest_dir / "gamelist_1.json").write_text("{not json")
+
+        manifest = ExportManifest("gamelist_1", OPTIONS)
+        manifest.load()
+        assert manifest.entries == {}
+
+    def test_prune_forgets_removed_roms(self):
+        manifest = ExportManifest("gamelist_1", OPTIONS)
+        manifest.mark(10, STAMP, "a")
+        manifest.mark(11, STAMP, "b")
+
+        manifest.prune({11})
+        assert manifest.get(10, STAMP) is None
+        assert manifest.get(11, STAMP) == "b"
+
+    def test_missing_assets_flags_roms_with_removed_files(self, tmp_path: Path):
+        platform_dir = tmp_path / "snes"
+        (platform_dir / "assets/covers").mkdir(parents=True)
+        (platform_dir / "assets/covers/a.jpg").write_bytes(b"a")
+
+        manifest = ExportManifest("gamelist_1", OPTIONS)
+        manifest.mark(10, STAMP, "a", ["./assets/covers/a.jpg"])
+        manifest.mark(11, STAMP, "b", ["./assets/covers/b.jpg"])
+        manifest.mark(12, STAMP, "c")
+        manifest.save()
+
+        loaded = ExportManifest("gamelist_1", OPTIONS)
+        loaded.load()
+        assert loaded.missing_assets([10, 11, 12, 13], platform_dir) == {11}
+
+
+def test_assets_to_record_keeps_failed_placements_with_a_source(tmp_path: Path):
+    present = tmp_path / "present.jpg"
+    present.write_bytes(b"x")
+    pairs = [
+        (tmp_path / "placed.jpg", tmp_path / "dest/placed.jpg"),
+        (present, tmp_path / "dest/present.jpg"),
+        (tmp_path / "gone.jpg", tmp_path / "dest/gone.jpg"),
+    ]
+
+    assert assets_to_record(pairs, [True, False, False]) == [True, True, False]
+
+
+async def test_place_assets_keeps_order_and_bounds_concurrency(monkeypatch):
+    monkeypatch.setattr(export_manifest, "ASSET_PLACEMENT_WORKERS", 2)
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def place(source: Path, dest: Path) -> bool:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return source.name != "missing"
+
+    pairs = [(Path(name), Path("dest") / name) for name in ("a", "missing", "c", "d")]
+
+    assert await place_assets(place, pairs) == [True, False, True, True]
+    assert peak == 2
+
+
+def test_build_rom_content_url():
+    assert (
+        build_rom_content_url(7, "Game (USA).zip", "http://romm.local/")
+        == "http://romm.local/api/roms/7/content/Game (USA).zip"
+    )
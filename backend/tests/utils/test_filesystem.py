@@ -8,7 +8,12 @@ import pytest
 from hypothesis import assume, given
 from hypothesis import strategies as st
 
-from utils.filesystem import link_or_copy_file, sanitize_filename
+from utils.filesystem import (
+    concatenate_files,
+    link_or_copy_file,
+    replace_on_write,
+    sanitize_filename,
+)
 
 INVALID_AFTER_SANITIZE = set('\\/:|*?"<>+\0')
 
@@ -186,6 +191,85 @@ class TestLinkOrCopyFile:
         assert args[1].name.startswith(".romm_link_tmp_")
 
 
+class TestReplaceOnWrite:
+    """Test the rename-into-place rewrite that leaves other hardlinks alone."""
+
+    def test_other_hardlinks_keep_the_old_content(self, tmp_path):
+        dest = tmp_path / "big.png"
+        dest.write_bytes(b"old")
+        sibling = tmp_path / "sibling.png"
+        os.link(dest, sibling)
+
+        with replace_on_write(dest) as tmp_file:
+            assert tmp_file.parent == dest.parent
+            assert tmp_file.suffix == ".png"
+            tmp_file.write_bytes(b"new")
+
+        assert dest.read_bytes() == b"new"
+        assert sibling.read_bytes() == b"old"
+
+    def test_failed_write_leaves_dest_and_no_tempfile(self, tmp_path):
+        dest = tmp_path / "big.png"
+        dest.write_bytes(b"old")
+
+        with pytest.raises(OSError):
+            with replace_on_write(dest) as tmp_file:
+                tmp_file.write_bytes(b"partial")
+                raise OSError("disk full")
+
+        assert dest.read_bytes() == b"old"
+        assert [p.name for p in tmp_path.iterdir()] == ["big.png"]
+
+
+class TestConcatenateFiles:
+    """Test the kernel-side concatenation used to assemble chunked uploads."""
+
+    @pytest.fixture
+    def parts(self, tmp_path):
+        parts = []
+        for i, payload in enumerate((b"ABCDEF", b"", b"GHIJK" * 1000)):
+            part = tmp_path / f"{i:05d}"
+            part.write_bytes(payload)
+            parts.append(part)
+        return parts
+
+    def test_writes_parts_in_order(self, tmp_path, parts):
+        dest = tmp_path / "dest.bin"
+
+        written = concatenate_files(parts, dest)
+
+        expected = b"".join(part.read_bytes() for part in parts)
+        assert dest.read_bytes() == expected
+        assert written == len(expected)
+
+    def test_falls_back_to_buffered_copy_on_exdev(self, tmp_path, parts):
+        """EXDEV from copy_file_range (older kernels, cross-filesystem) must
+        fall back to copying through userspace rather than failing."""
+        dest = tmp_path / "dest.bin"
+        exdev = OSError(errno.EXDEV, "Invalid cross-device link")
+
+        with patch(
+            "utils.filesystem.os.copy_file_range", side_effect=exdev, create=True
+        ):
+            written = concatenate_files(parts, dest)
+
+        expected = b"".join(part.read_bytes() for part in parts)
+        assert dest.read_bytes() == expected
+        assert written == len(expected)
+
+    def test_reraises_non_fallback_oserror(self, tmp_path, parts):
+        dest = tmp_path / "dest.bin"
+        enospc = OSError(errno.ENOSPC, "No space left on device")
+
+        with patch(
+            "utils.filesystem.os.copy_file_range", side_effect=enospc, create=True
+        ):
+            with pytest.raises(OSError) as excinfo:
+                concatenate_files(parts, dest)
+
+        assert excinfo.value.errno == errno.ENOSPC
+
+
 class TestSanitizeFilename:
     """Property-based tests for the cross-filesystem filename sanitizer."""
 
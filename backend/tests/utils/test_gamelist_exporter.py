@@ -1,3 +1,5 @@
+import shutil
+from datetime import timedelta
 from os.path import isabs
 from xml.etree.ElementTree import fromstring
 
@@ -357,6 +359,9 @@ def isolated_filesystem(tmp_path, monkeypatch):
     library_base = tmp_path / "library"
     monkeypatch.setattr(fs_resource_handler, "base_path", resources_base)
     monkeypatch.setattr(fs_platform_handler, "base_path", library_base)
+    monkeypatch.setattr(
+        "utils.export_manifest.EXPORT_MANIFEST_PATH", str(tmp_path / "exports")
+    )
     return resources_base, library_base
 
 
@@ -412,6 +417,32 @@ async def test_export_platform_to_file_copies_assets(
         assert elem is not None and elem.text == expected
 
 
+async def test_export_platform_to_file_replaces_deleted_assets(
+    platform_with_roms, isolated_filesystem
+):
+    """A ROM replayed from the export manifest gets its assets placed again when
+    they were deleted from the platform directory since the previous export."""
+    resources_base, library_base = isolated_filesystem
+    platform, _ = platform_with_roms
+
+    src = resources_base / "snes/covers/super-mario-world.jpg"
+    src.parent.mkdir(parents=True, exist_ok=True)
+    src.write_bytes(b"cover-bytes")
+
+    exporter = GamelistExporter(local_export=True)
+    assert await exporter.export_platform_to_file(platform.id, request=None) is True
+
+    platform_dir = library_base / fs_platform_handler.get_platform_fs_structure(
+        platform.fs_slug
+    )
+    shutil.rmtree(platform_dir / "assets")
+
+    assert await exporter.export_platform_to_file(platform.id, request=None) is True
+
+    cover = platform_dir / "assets/covers/Super Mario World (USA).jpg"
+    assert cover.read_bytes() == b"cover-bytes"
+
+
 async def test_export_platform_to_file_keeps_miximage_variants_separate(
     platform_with_roms, isolated_filesystem
 ):
@@ -501,3 +532,68 @@ async def test_export_platform_to_file_omits_tags_when_copy_fails(
     screenshot = game.find("screenshot")
     assert screenshot is not None
     assert screenshot.text == "./assets/screenshots/Super Mario World (USA).jpg"
+
+
+async def test_export_platform_to_file_replays_unchanged_roms(
+    platform_with_roms, isolated_filesystem, monkeypatch
+):
+    """A second export re-renders only the ROMs updated since the first one and
+    writes the same document."""
+    _, library_base = isolated_filesystem
+    platform, roms = platform_with_roms
+
+    exporter = GamelistExporter(local_export=True)
+    assert await exporter.export_platform_to_file(platform.id, request=None) is True
+
+    gamelist = (
+        library_base
+        / fs_platform_handler.get_platform_fs_structure(platform.fs_slug)
+        / "gamelist.xml"
+    )
+    first_export = gamelist.read_text()
+
+    rendered: list[int] = []
+    render_game = GamelistExporter._render_game
+
+    def counting_render_game(self, rom, *args, **kwargs):
+        rendered.append(rom.id)
+        return render_game(self, rom, *args, **kwargs)
+
+    monkeypatch.setattr(GamelistExporter, "_render_game", counting_render_game)
+
+    assert await exporter.export_platform_to_file(platform.id, request=None) is True
+    assert rendered == []
+    assert gamelist.read_text() == first_export
+
+    # Stamps may only have second precision, so move the edit past the export
+    db_rom_handler.update_rom(
+        roms[0].id,
+        {
+            "summary": "An updated summary.",
+            "updated_at": roms[0].updated_at + timedelta(seconds=1),
+        },
+    )
+
+    assert await exporter.export_platform_to_file(platform.id, request=None) is True
+    assert rendered == [roms[0].id]
+    desc = fromstring(gamelist.read_text()).findall("game")[0].find("desc")
+    assert desc is not None and desc.text == "An updated summary."
+
+
+def test_export_gamelist_xml_base_url_without_request(platform_with_roms):
+    """Background exports have no request, so URLs come from the base URL."""
+    platform, roms = platform_with_roms
+
+    exporter = GamelistExporter(base_url="http://romm.local/")
+    game = fromstring(exporter.export_platform_to_xml(platform.id, request=None))[0]
+
+    path = game.find("path")
+    assert path is not None
+    assert path.text == (
+        f"http://romm.local/api/roms/{roms[0].id}/content/Super Mario World (USA).sfc"
+    )
+    thumbnail = game.find("thumbnail")
+    assert thumbnail is not None
+    assert thumbnail.text == (
+        f"http://romm.local{FRONTEND_RESOURCES_PATH}/snes/covers/super-mario-world.jpg"
+    )
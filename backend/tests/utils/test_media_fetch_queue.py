@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from utils.media_fetch_queue import MediaFetchQueue
+
+
+class TestMediaFetchQueue:
+    async def test_drain_waits_for_submitted_jobs(self):
+        queue = MediaFetchQueue(max_pending=2)
+        done: list[int] = []
+
+        async def job(n: int) -> None:
+            await asyncio.sleep(0)
+            done.append(n)
+
+        for n in range(5):
+            await queue.submit(job(n), name=str(n))
+        await queue.drain()
+
+        assert sorted(done) == [0, 1, 2, 3, 4]
+        assert queue.pending == 0
+
+    async def test_submit_blocks_while_full(self):
+        queue = MediaFetchQueue(max_pending=1)
+        release = asyncio.Event()
+
+        async def blocked() -> None:
+            await release.wait()
+
+        async def quick() -> None:
+            return None
+
+        await queue.submit(blocked(), name="blocked")
+        second = asyncio.create_task(queue.submit(quick(), name="quick"))
+        await asyncio.sleep(0)
+        assert not second.done()
+
+        release.set()
+        await second
+        await queue.drain()
+
+    async def test_failing_job_does_not_raise(self):
+        queue = MediaFetchQueue(max_pending=1)
+
+        async def failing() -> None:
+            raise RuntimeError("boom")
+
+        await queue.submit(failing(), name="failing")
+        await queue.drain()
+
+        # The slot was released, so the next job still runs.
+        ran = asyncio.Event()
+
+        async def job() -> None:
+            ran.set()
+
+        await queue.submit(job(), name="job")
+        await queue.drain()
+        assert ran.is_set()
+
+    async def test_cancel_stops_outstanding_jobs(self):
+        queue = MediaFetchQueue(max_pending=2)
+
+        async def forever() -> None:
+            await asyncio.Event().wait()
+
+        await queue.submit(forever(), name="forever")
+        await queue.cancel()
+        assert queue.pending == 0
+
+        # Cancelled jobs give their slots back.
+        ran = asyncio.Event()
+
+        async def job() -> None:
+            ran.set()
+
+        await queue.submit(job(), name="job")
+        await queue.submit(job(), name="job")
+        await queue.drain()
+        assert ran.is_set()
+
+    def test_non_positive_size_raises(self):
+        with pytest.raises(ValueError):
+            MediaFetchQueue(max_pending=0)
@@ -0,0 +1,132 @@
+import pytest
+
+from handler.redis_handler import sync_cache
+from utils.metrics import (
+    METRICS_KEY_PREFIX,
+    MetricsRegistry,
+    RequestCounts,
+    count_redis_command,
+    count_sql_statement,
+    ctx_request_counts,
+)
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry(flush_interval=3600)
+    yield registry
+    for key in sync_cache.scan_iter(f"{METRICS_KEY_PREFIX}test_*"):
+        sync_cache.delete(key)
+
+
+class TestCounter:
+    def test_renders_totals_per_label_set(self, registry: MetricsRegistry):
+        counter = registry.counter("test_retries_total", "Retries.", ("provider",))
+        counter.inc(provider="igdb")
+        counter.inc(2, provider="igdb")
+        counter.inc(provider="screenscraper")
+
+        lines = registry.render().splitlines()
+
+        assert lines[:2] == [
+            "# HELP test_retries_total Retries.",
+            "# TYPE test_retries_total counter",
+        ]
+        assert 'test_retries_total{provider="igdb"} 3' in lines
+        assert 'test_retries_total{provider="screenscraper"} 1' in lines
+
+    def test_rejects_wrong_labels(self, registry: MetricsRegistry):
+        counter = registry.counter("test_labelled_total", "Labelled.", ("provider",))
+        with pytest.raises(ValueError):
+            counter.inc(host="example.com")
+
+    def test_escapes_label_values(self, registry: MetricsRegistry):
+        counter = registry.counter("test_escaped_total", "Escaped.", ("route",))
+        counter.inc(route='a"b\\c')
+
+        assert 'test_escaped_total{route="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_sums_across_registries(self, registry: MetricsRegistry):
+        # Another process recording the same metric lands in the same hash.
+        other = MetricsRegistry(flush_interval=3600)
+        other.counter("test_shared_total", "Shared.").inc(4)
+        other.flush()
+
+        registry.counter("test_shared_total", "Shared.").inc(1)
+
+        assert "test_shared_total 5" in registry.render().splitlines()
+
+
+class TestHistogram:
+    def test_buckets_render_cumulative(self, registry: MetricsRegistry):
+        histogram = registry.histogram(
+            "test_latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0)
+        )
+        histogram.observe(0.05, stage="files")
+        histogram.observe(0.5, stage="files")
+        histogram.observe(5, stage="files")
+
+        lines = registry.render().splitlines()
+
+        assert "# TYPE test_latency_seconds histogram" in lines
+        assert 'test_latency_seconds_bucket{stage="files",le="0.1"} 1' in lines
+        assert 'test_latency_seconds_bucket{stage="files",le="1"} 2' in lines
+        assert 'test_latency_seconds_bucket{stage="files",le="+Inf"} 3' in lines
+        assert 'test_latency_seconds_sum{stage="files"} 5.55' in lines
+        assert 'test_latency_seconds_count{stage="files"} 3' in lines
+
+    def test_bound_is_inclusive(self, registry: MetricsRegistry):
+        histogram = registry.histogram("test_bound_seconds", "Bound.", buckets=(1.0,))
+        histogram.observe(1.0)
+
+        assert 'test_bound_seconds_bucket{le="1"} 1' in registry.render()
+
+    def test_time_observes_once(self, registry: MetricsRegistry):
+        histogram = registry.histogram("test_timed_seconds", "Timed.")
+        with histogram.time():
+            pass
+
+        assert "test_timed_seconds_count 1" in registry.render().splitlines()
+
+
+class TestRegistry:
+    def test_failed_flush_keeps_deltas(
+        self, registry: MetricsRegistry, monkeypatch: pytest.MonkeyPatch
+    ):
+        counter = registry.counter("test_kept_total", "Kept.")
+        counter.inc(2)
+
+        def broken_pipeline(*args, **kwargs):
+            raise ConnectionError("redis is down")
+
+        monkeypatch.setattr(sync_cache, "pipeline", broken_pipeline)
+        registry.flush()
+        monkeypatch.undo()
+
+        assert "test_kept_total 2" in registry.render().splitlines()
+
+    def test_metric_without_samples_renders_header_only(
+        self, registry: MetricsRegistry
+    ):
+        registry.counter("test_empty_total", "Empty.")
+
+        assert registry.render() == (
+            "# HELP test_empty_total Empty.\n# TYPE test_empty_total counter\n"
+        )
+
+
+class TestRequestCounts:
+    def test_counts_only_inside_a_request(self):
+        count_sql_statement()
+        count_redis_command()
+
+        counts = RequestCounts()
+        token = ctx_request_counts.set(counts)
+        try:
+            count_sql_statement()
+            count_sql_statement()
+            count_redis_command()
+        finally:
+            ctx_request_counts.reset(token)
+
+        assert counts == RequestCounts(sql_statements=2, redis_commands=1)
@@ -0,0 +1,55 @@
+from utils.sibling_groups import assign_sibling_groups
+
+
+class TestAssignSiblingGroups:
+    def test_shared_id_groups_roms(self):
+        groups = assign_sibling_groups(
+            [
+                (1, 10, 100, None),
+                (2, 10, 100, None),
+                (3, 10, 101, None),
+            ]
+        )
+
+        assert groups == {1: 1, 2: 1, 3: 3}
+
+    def test_groups_are_transitive_across_columns(self):
+        # 1 and 3 share nothing, but both share an id with 2.
+        groups = assign_sibling_groups(
+            [
+                (3, 10, None, 7),
+                (2, 10, 100, 7),
+                (1, 10, 100, None),
+            ]
+        )
+
+        assert groups == {1: 1, 2: 1, 3: 1}
+
+    def test_platforms_are_kept_apart(self):
+        groups = assign_sibling_groups([(1, 10, 100), (2, 20, 100)])
+
+        assert groups == {1: 1, 2: 2}
+
+    def test_same_value_in_different_columns_is_no_match(self):
+        groups = assign_sibling_groups([(1, 10, 100, None), (2, 10, None, 100)])
+
+        assert groups == {1: 1, 2: 2}
+
+    def test_roms_without_ids_are_left_out(self):
+        groups = assign_sibling_groups([(1, 10, None, None), (2, 10, 5, None)])
+
+        assert groups == {2: 2}
+
+    def test_merging_keeps_the_smallest_id(self):
+        # Two groups form separately and are joined by the last row.
+        groups = assign_sibling_groups(
+            [
+                (5, 10, 100, None),
+                (9, 10, 100, None),
+                (2, 10, None, 200),
+                (7, 10, None, 200),
+                (8, 10, 100, 200),
+            ]
+        )
+
+        assert set(groups.values()) == {2}
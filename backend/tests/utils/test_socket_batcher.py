@@ -0,0 +1,84 @@
+import asyncio
+from unittest.mock import AsyncMock, call
+
+from utils.socket_batcher import SocketEventBatcher
+
+
+def _batcher(interval: float = 60) -> tuple[SocketEventBatcher, AsyncMock]:
+    socket_manager = AsyncMock()
+    batcher = SocketEventBatcher(
+        socket_manager,
+        batched={"scan:scanning_rom": "scan:scanning_roms"},
+        coalesced={"scan:update_stats"},
+        interval=interval,
+    )
+    return batcher, socket_manager
+
+
+class TestSocketEventBatcher:
+    async def test_batched_events_are_held_until_flushed(self):
+        batcher, socket_manager = _batcher()
+
+        await batcher.emit("scan:scanning_rom", {"id": 1})
+        await batcher.emit("scan:scanning_rom", {"id": 2})
+        socket_manager.emit.assert_not_called()
+
+        await batcher.flush()
+
+        socket_manager.emit.assert_awaited_once_with(
+            "scan:scanning_roms", [{"id": 1}, {"id": 2}]
+        )
+
+    async def test_repeats_for_a_rom_keep_the_latest_payload(self):
+        batcher, socket_manager = _batcher()
+
+        await batcher.emit("scan:scanning_rom", {"id": 1, "name": "old"})
+        await batcher.emit("scan:scanning_rom", {"id": 2, "name": "other"})
+        await batcher.emit("scan:scanning_rom", {"id": 1, "name": "new"})
+        await batcher.flush()
+
+        socket_manager.emit.assert_awaited_once_with(
+            "scan:scanning_roms",
+            [{"id": 1, "name": "new"}, {"id": 2, "name": "other"}],
+        )
+
+    async def test_coalesced_events_send_only_the_latest(self):
+        batcher, socket_manager = _batcher()
+
+        for scanned in range(5):
+            await batcher.emit("scan:update_stats", {"scanned_roms": scanned})
+        await batcher.flush()
+
+        socket_manager.emit.assert_awaited_once_with(
+            "scan:update_stats", {"scanned_roms": 4}
+        )
+
+    async def test_other_events_flush_held_events_first(self):
+        batcher, socket_manager = _batcher()
+
+        await batcher.emit("scan:scanning_rom", {"id": 1})
+        await batcher.emit("scan:update_stats", {"scanned_roms": 1})
+        await batcher.emit("scan:done", {"scanned_roms": 1})
+
+        assert socket_manager.emit.await_args_list == [
+            call("scan:scanning_roms", [{"id": 1}]),
+            call("scan:update_stats", {"scanned_roms": 1}),
+            call("scan:done", {"scanned_roms": 1}),
+        ]
+
+    async def test_targeted_events_are_never_held(self):
+        batcher, socket_manager = _batcher()
+
+        await batcher.emit("scan:update_stats", {"scanned_roms": 1}, to="sid")
+
+        socket_manager.emit.assert_awaited_once_with(
+            "scan:update_stats", {"scanned_roms": 1}, to="sid"
+        )
+
+    async def test_held_events_flush_on_their_own(self):
+        batcher, socket_manager = _batcher(interval=0.01)
+
+        await batcher.emit("scan:scanning_rom", {"id": 1})
+        await asyncio.sleep(0.05)
+
+        socket_manager.emit.assert_awaited_once_with("scan:scanning_roms", [{"id": 1}])
@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+"""Benchmark the gallery, detail, collection, stats and feed endpoints.
+
+Seeds the database with ``generate_test_data.py`` when it holds no ROMs yet (or
+always, with ``--reseed``), then drives the endpoints in-process through the
+ASGI app with a fixed mix of parameters: platform and unscoped galleries with
+their sidecars, later pages, every sort, facet filters, ``group_by_meta_id``,
+search, collections, ROM details, ``/stats`` and the device feeds. Cases that
+depend on visibility also run as a regular user with some platforms and ROMs
+hidden from them.
+
+Every case sends the same requests twice: cold, with the gallery caches in
+Redis and the in-memory facet index dropped before each request, then warm,
+after one unmeasured pass. Each phase reports p50/p95/p99 latency, SQL queries
+per request and response bytes. Pass ``--json`` to keep the report (keys are
+sorted, so reports from two commits diff cleanly) and ``--baseline`` to compare
+against an earlier one: the exit code is non-zero when a p95 grows past
+``--max-regression`` or a case issues more queries than before.
+
+Run from the backend directory, against a throwaway database:
+
+    uv run tools/benchmark_api.py --roms 50000 --json before.json
+
+Requests are drawn from ``--seed``, so two runs over the same data send the
+same requests. Redis and the database come from the usual env vars (DB_HOST,
+DB_NAME, REDIS_HOST, ...). This is a TEST tool: ``--reseed`` wipes the tables
+``generate_test_data.py`` fills, and cold runs drop the shared gallery caches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess  # nosec B404 - only runs git and the seeding script
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+# Allow running as `python3 tools/benchmark_api.py` from backend/.
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_PATH)
+
+# isort: off
+# The app is the usual entrypoint and resolves the backend's import order on
+# its own, so it must be imported before anything else from the backend.
+from main import app  # noqa: E402
+
+# isort: on
+import httpx  # noqa: E402
+from sqlalchemy import event, func, select  # noqa: E402
+
+from handler.auth import oauth_handler  # noqa: E402
+from handler.database import (  # noqa: E402
+    db_permission_handler,
+    db_rom_handler,
+    db_user_handler,
+)
+from handler.database.base_handler import sync_engine, sync_session  # noqa: E402
+from handler.database.facet_index import facet_index  # noqa: E402
+from models.collection import Collection, SmartCollection  # noqa: E402
+from models.permission import PermEntity  # noqa: E402
+from models.rom import Rom  # noqa: E402
+from models.user import Role, User  # noqa: E402
+from utils import get_version  # noqa: E402
+
+# Sorts offered by the gallery, including the per-user and metadata columns.
+ORDER_BYS = [
+    "name",
+    "fs_size_bytes",
+    "created_at",
+    "first_release_date",
+    "average_rating",
+    "last_played",
+]
+# Page size the gallery asks for.
+PAGE_SIZE = 72
+# Facets picked for filtered galleries, with the values to choose from.
+FILTER_FACETS = ["genres", "regions", "franchises", "player_counts", "age_ratings"]
+FILTER_LOGICS = ["any", "any", "all", "none"]
+
+# ---------------------------------------------------------------------------
+# Seeding and fixtures.
+# ---------------------------------------------------------------------------
+
+
+def count_roms() -> int:
+    with sync_session() as session:
+        return session.scalar(select(func.count()).select_from(Rom)) or 0
+
+
+def seed_database(args: argparse.Namespace) -> None:
+    """Fill the database through `generate_test_data.py`, without images."""
+    command = [
+        sys.executable,
+        os.path.join(BACKEND_PATH, "tools", "generate_test_data.py"),
+        "--roms",
+        str(args.roms),
+        "--seed",
+        str(args.seed),
+        "--no-images",
+    ]
+    if args.reseed:
+        command.append("--wipe")
+    subprocess.run(command, cwd=BACKEND_PATH, check=True)  # nosec B603
+
+
+@dataclass
+class Fixtures:
+    """Ids and values the requests are drawn from."""
+
+    rom_count: int
+    platform_ids: list[int]
+    rom_ids: list[int]
+    collection_ids: list[int]
+    smart_collection_ids: list[int]
+    filter_values: dict[str, list[Any]]
+    search_terms: list[str]
+
+
+def load_fixtures(seed: int) -> Fixtures:
+    with sync_session() as session:
+        platform_ids = list(
+            session.scalars(
+                select(Rom.platform_id)
+                .group_by(Rom.platform_id)
+                .order_by(Rom.platform_id)
+            )
+        )
+        rom_ids = list(session.scalars(select(Rom.id).order_by(Rom.id)))
+        collection_ids = list(
+            session.scalars(select(Collection.id).order_by(Collection.id))
+        )
+        smart_collection_ids = list(
+            session.scalars(select(SmartCollection.id).order_by(SmartCollection.id))
+        )
+        names = session.scalars(select(Rom.name).order_by(Rom.id).limit(2000)).all()
+
+    rng = random.Random(seed)  # nosec B311 - picks benchmark inputs only
+    words = sorted(
+        {
+            word.strip("():,.-").lower()
+            for name in names
+            if name
+            for word in name.split()
+            if len(word) >= 4
+        }
+    )
+    filters = db_rom_handler.get_rom_filters()
+    return Fixtures(
+        rom_count=len(rom_ids),
+        platform_ids=platform_ids,
+        rom_ids=rom_ids,
+        collection_ids=collection_ids,
+        smart_collection_ids=smart_collection_ids,
+        filter_values={
+            facet: list(filters.get(facet) or []) for facet in FILTER_FACETS
+        },
+        search_terms=rng.sample(words, k=min(len(words), 200)),
+    )
+
+
+@dataclass
+class Principal:
+    user: User
+    token: str
+    hidden_platform_ids: list[int] = field(default_factory=list)
+    hidden_rom_ids: list[int] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+def _access_token(user: User) -> str:
+    return oauth_handler.create_access_token(
+        data={
+            "sub": user.username,
+            "iss": "romm:oauth",
+            "scopes": " ".join(user.oauth_scopes),
+        },
+        expires_delta=timedelta(hours=6),
+    )
+
+
+def load_principals(
+    fixtures: Fixtures, args: argparse.Namespace
+) -> dict[str, Principal]:
+    """The admin, plus a regular user ("viewer") with entities hidden from them."""
+    admins = [u for u in db_user_handler.get_users(roles=[Role.ADMIN]) if u.enabled]
+    if not admins:
+        raise SystemExit("No enabled admin user; seed the database first.")
+    principals = {"admin": Principal(admins[0], _access_token(admins[0]))}
+
+    users = [u for u in db_user_handler.get_users(roles=[Role.USER]) if u.enabled]
+    if not users:
+        print("No enabled regular user: skipping the viewer cases.")
+        return principals
+
+    viewer = Principal(users[0], _access_token(users[0]))
+    rng = random.Random(args.seed)  # nosec B311 - picks benchmark inputs only
+    already_platforms = db_permission_handler.get_hidden_entity_ids(
+        PermEntity.PLATFORMS, viewer.user.id, None
+    )
+    already_roms = db_permission_handler.get_hidden_entity_ids(
+        PermEntity.ROMS, viewer.user.id, None
+    )
+    # Hiding every platform would leave the viewer nothing to page through.
+    platforms = rng.sample(
+        fixtures.platform_ids,
+        k=min(args.hidden_platforms, max(len(fixtures.platform_ids) - 1, 0)),
+    )
+    roms = rng.sample(fixtures.rom_ids, k=min(args.hidden_roms, len(fixtures.rom_ids)))
+    for platform_id in platforms:
+        if platform_id not in already_platforms:
+            db_permission_handler.add_hidden_entity(
+                PermEntity.PLATFORMS, platform_id, user_id=viewer.user.id
+            )
+            viewer.hidden_platform_ids.append(platform_id)
+    for rom_id in roms:
+        if rom_id not in already_roms:
+            db_permission_handler.add_hidden_entity(
+                PermEntity.ROMS, rom_id, user_id=viewer.user.id
+            )
+            viewer.hidden_rom_ids.append(rom_id)
+
+    principals["viewer"] = viewer
+    return principals
+
+
+def unhide(principals: dict[str, Principal]) -> None:
+    """Remove the hides `load_principals` added, leaving earlier ones alone."""
+    for principal in principals.values():
+        for platform_id in principal.hidden_platform_ids:
+            db_permission_handler.remove_hidden_entity(
+                PermEntity.PLATFORMS, platform_id, user_id=principal.user.id
+            )
+        for rom_id in principal.hidden_rom_ids:
+            db_permission_handler.remove_hidden_entity(
+                PermEntity.ROMS, rom_id, user_id=principal.user.id
+            )
+
+
+# ---------------------------------------------------------------------------
+# Cases.
+# ---------------------------------------------------------------------------
+
+Params = dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    # Builds one request (path, query params) from the fixtures.
+    build: Callable[[Fixtures, random.Random], tuple[str, Params]]
+    principal: str = "admin"
+
+
+def _first_page(**params: Any) -> Params:
+    """What the gallery sends when it opens: a page plus every sidecar."""
+    return {"limit": PAGE_SIZE, "offset": 0, "order_by": "name", **params}
+
+
+def _later_page(fixtures: Fixtures, rng: random.Random, **params: Any) -> Params:
+    """A page scrolled to later, once the gallery already holds the sidecars."""
+    last_page = max(fixtures.rom_count // PAGE_SIZE - 1, 0)
+    return {
+        "limit": PAGE_SIZE,
+        "offset": rng.randint(1, max(last_page, 1)) * PAGE_SIZE,
+        "order_by": "name",
+        "with_char_index": False,
+        "with_filter_values": False,
+        "with_rom_id_index": False,
+        "with_total": False,
+        **params,
+    }
+
+
+def _platform(fixtures: Fixtures, rng: random.Random) -> Params:
+    return {"platform_ids": [rng.choice(fixtures.platform_ids)]}
+
+
+def _facet_filter(fixtures: Fixtures, rng: random.Random) -> Params:
+    facets = [f for f in FILTER_FACETS if fixtures.filter_values[f]]
+    params: Params = {}
+    for facet in rng.sample(facets, k=min(len(facets), rng.randint(1, 2))):
+        values = fixtures.filter_values[facet]
+        params[facet] = rng.sample(values, k=min(len(values), rng.randint(1, 2)))
+        params[f"{facet}_logic"] = rng.choice(FILTER_LOGICS)
+    return params
+
+
+def _sorted(rng: random.Random) -> Params:
+    return {"order_by": rng.choice(ORDER_BYS), "order_dir": rng.choice(["asc", "desc"])}
+
+
+def _pick(ids: list[int], rng: random.Random) -> int:
+    # A missing id still measures the 404 path rather than aborting the run.
+    return rng.choice(ids) if ids else 1
+
+
+CASES = [
+    Case(
+        "roms: platform gallery",
+        lambda fx, rng: ("/api/roms", _first_page(**_platform(fx, rng))),
+    ),
+    Case("roms: library gallery", lambda fx, rng: ("/api/roms", _first_page())),
+    Case(
+        "roms: later page",
+        lambda fx, rng: ("/api/roms", _later_page(fx, rng)),
+    ),
+    Case(
+        "roms: sorted",
+        lambda fx, rng: (
+            "/api/roms",
+            _first_page(**_platform(fx, rng), **_sorted(rng)),
+        ),
+    ),
+    Case(
+        "roms: filtered",
+        lambda fx, rng: ("/api/roms", _first_page(**_facet_filter(fx, rng))),
+    ),
+    Case(
+        "roms: filtered + sorted",
+        lambda fx, rng: (
+            "/api/roms",
+            _first_page(**_platform(fx, rng), **_facet_filter(fx, rng), **_sorted(rng)),
+        ),
+    ),
+    Case(
+        "roms: group_by_meta_id",
+        lambda fx, rng: (
+            "/api/roms",
+            _first_page(**_platform(fx, rng), group_by_meta_id=True),
+        ),
+    ),
+    Case(
+        "roms: search",
+        lambda fx, rng: (
+            "/api/roms",
+            _first_page(search_term=rng.choice(fx.search_terms or ["game"])),
+        ),
+    ),
+    Case(
+        "roms: collection",
+        lambda fx, rng: (
+            "/api/roms",
+            _first_page(collection_id=_pick(fx.collection_ids, rng)),
+        ),
+    ),
+    Case(
+        "roms: smart collection",
+        lambda fx, rng: (
+            "/api/roms",
+            _first_page(smart_collection_id=_pick(fx.smart_collection_ids, rng)),
+        ),
+    ),
+    Case(
+        "rom: detail",
+        lambda fx, rng: (f"/api/roms/{_pick(fx.rom_ids, rng)}", {}),
+    ),
+    Case("collections: list", lambda fx, rng: ("/api/collections", {})),
+    Case(
+        "collections: detail",
+        lambda fx, rng: (f"/api/collections/{_pick(fx.collection_ids, rng)}", {}),
+    ),
+    Case("collections: smart", lambda fx, rng: ("/api/collections/smart", {})),
+    Case(
+        "collections: virtual",
+        lambda fx, rng: ("/api/collections/virtual", {"type": "all"}),
+    ),
+    Case(
+        "stats",
+        lambda fx, rng: ("/api/stats", {"include_platform_stats": True}),
+    ),
+    Case("feeds: webrcade", lambda fx, rng: ("/api/feeds/webrcade", {})),
+    Case("feeds: tinfoil", lambda fx, rng: ("/api/feeds/tinfoil", {})),
+    Case("feeds: pkgj psvita", lambda fx, rng: ("/api/feeds/pkgj/psvita/games", {})),
+    Case(
+        "viewer roms: platform gallery",
+        lambda fx, rng: ("/api/roms", _first_page(**_platform(fx, rng))),
+        principal="viewer",
+    ),
+    Case(
+        "viewer roms: filtered",
+        lambda fx, rng: ("/api/roms", _first_page(**_facet_filter(fx, rng))),
+        principal="viewer",
+    ),
+    Case(
+        "viewer rom: detail",
+        lambda fx, rng: (f"/api/roms/{_pick(fx.rom_ids, rng)}", {}),
+        principal="viewer",
+    ),
+    Case(
+        "viewer collections: list",
+        lambda fx, rng: ("/api/collections", {}),
+        principal="viewer",
+    ),
+    Case(
+        "viewer stats",
+        lambda fx, rng: ("/api/stats", {"include_platform_stats": True}),
+        principal="viewer",
+    ),
+]
+
+# ---------------------------------------------------------------------------
+# Runs and reporting.
+# ---------------------------------------------------------------------------
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted `values`."""
+    if not values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class QueryCounter:
+    """Counts statements sent to the database while a request runs."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *_: Any) -> None:
+        self.count += 1
+
+
+def drop_caches() -> None:
+    """Forget the gallery sidecars cached in Redis and the facet index."""
+    db_rom_handler.invalidate_filter_values_cache()
+    facet_index.clear()
+
+
+@dataclass
+class PhaseResult:
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    sizes: list[int] = field(default_factory=list)
+    statuses: Counter[int] = field(default_factory=Counter)
+
+    def to_dict(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        requests = len(latencies)
+        return {
+            "requests": requests,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "queries_per_request": (
+                round(sum(self.queries) / requests, 2) if requests else 0.0
+            ),
+            "max_queries": max(self.queries, default=0),
+            "bytes_per_request": round(sum(self.sizes) / requests) if requests else 0,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+        }
+
+
+async def run_case(
+    client: httpx.AsyncClient,
+    case: Case,
+    principal: Principal,
+    fixtures: Fixtures,
+    counter: QueryCounter,
+    args: argparse.Namespace,
+) -> dict[str, dict[str, Any]]:
+    # Seeded per case, so adding a case never changes another one's requests.
+    rng = random.Random(f"{args.seed}:{case.name}")  # nosec B311
+    requests = [case.build(fixtures, rng) for _ in range(args.requests)]
+
+    async def send(path: str, params: Params, result: PhaseResult | None) -> None:
+        counter.count = 0
+        started = time.perf_counter()
+        response = await client.get(path, params=params, headers=principal.headers)
+        elapsed = time.perf_counter() - started
+        if result is not None:
+            result.latencies.append(elapsed)
+            result.queries.append(counter.count)
+            result.sizes.append(len(response.content))
+            result.statuses[response.status_code] += 1
+
+    cold = PhaseResult()
+    for path, params in requests:
+        drop_caches()
+        await send(path, params, cold)
+
+    warm = PhaseResult()
+    for path, params in requests:
+        await send(path, params, None)
+    for path, params in requests:
+        await send(path, params, warm)
+
+    return {"cold": cold.to_dict(), "warm": warm.to_dict()}
+
+
+def _format_bytes(value: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+
+def print_case(name: str, phases: dict[str, dict[str, Any]]) -> None:
+    for phase, s in phases.items():
+        errors = sum(n for code, n in s["statuses"].items() if not code.startswith("2"))
+        print(
+            f"  {name:<32} {phase:<5} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} "
+            f"{s['p99_ms']:>9.2f} {s['queries_per_request']:>8.1f} "
+            f"{_format_bytes(s['bytes_per_request']):>11}"
+            + (f"  {errors} non-2xx" if errors else "")
+        )
+
+
+def compare_to_baseline(
+    cases: dict[str, dict[str, dict[str, Any]]],
+    baseline_path: str,
+    max_regression: float,
+) -> list[str]:
+    """Describe every case that got slower, or chattier, than the baseline."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["cases"]
+
+    regressions = []
+    for name, phases in cases.items():
+        for phase, result in phases.items():
+            before = baseline.get(name, {}).get(phase)
+            if before is None:
+                continue
+
+            if result["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+                regressions.append(
+                    f"{name} ({phase}): p95 {result['p95_ms']:.2f} ms, "
+                    f"was {before['p95_ms']:.2f}"
+                )
+            # Query counts don't vary between runs over the same data, so any
+            # growth is a real change.
+            if result["queries_per_request"] > before["queries_per_request"]:
+                regressions.append(
+                    f"{name} ({phase}): {result['queries_per_request']:.1f} "
+                    f"queries/request, was {before['queries_per_request']:.1f}"
+                )
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(  # nosec B603 B607
+            ["git", "rev-parse", "HEAD"],
+            cwd=BACKEND_PATH,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(
+    args: argparse.Namespace, fixtures: Fixtures, principals: dict[str, Principal]
+) -> dict[str, dict[str, dict[str, Any]]]:
+    counter = QueryCounter()
+    selected = [
+        case
+        for case in CASES
+        if case.principal in principals
+        and (not args.cases or any(term in case.name for term in args.cases))
+    ]
+
+    print(
+        f"\n  {'case':<32} {'phase':<5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'queries':>8} {'bytes':>11}"
+    )
+    results = {}
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://romm.benchmark"
+        ) as client,
+    ):
+        for case in selected:
+            results[case.name] = await run_case(
+                client, case, principals[case.principal], fixtures, counter, args
+            )
+            print_case(case.name, results[case.name])
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--roms",
+        type=int,
+        default=20_000,
+        help="ROMs to seed when the database is empty (default: 20000)",
+    )
+    parser.add_argument(
+        "--reseed",
+        action="store_true",
+        help="Wipe and reseed the database even when it already holds ROMs",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=1337, help="RNG seed for reproducible output"
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=50,
+        help="Measured requests per case and phase (default: 50)",
+    )
+    parser.add_argument(
+        "--cases",
+        type=lambda value: value.split(","),
+        default=[],
+        help="Comma-separated substrings; only matching cases run (default: all)",
+    )
+    parser.add_argument(
+        "--hidden-platforms",
+        type=int,
+        default=2,
+        help="Platforms hidden from the viewer during the run (default: 2)",
+    )
+    parser.add_argument(
+        "--hidden-roms",
+        type=int,
+        default=200,
+        help="ROMs hidden from the viewer during the run (default: 200)",
+    )
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    parser.add_argument(
+        "--baseline", help="Compare against a JSON file written by --json"
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed p95 slowdown against --baseline, as a fraction (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    if args.reseed or count_roms() == 0:
+        seed_database(args)
+
+    fixtures = load_fixtures(args.seed)
+    if not fixtures.rom_ids:
+        print("The database holds no ROMs to benchmark.")
+        return 1
+    print(
+        f"Benchmarking {fixtures.rom_count:,} ROMs on {len(fixtures.platform_ids)} "
+        f"platforms, {args.requests} requests per case and phase."
+    )
+
+    principals = load_principals(fixtures, args)
+    try:
+        cases = asyncio.run(run(args, fixtures, principals))
+    finally:
+        unhide(principals)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "commit": git_commit(),
+                    "version": get_version(),
+                    "options": {
+                        "seed": args.seed,
+                        "requests": args.requests,
+                        "hidden_platforms": args.hidden_platforms,
+                        "hidden_roms": args.hidden_roms,
+                    },
+                    "data": {
+                        "roms": fixtures.rom_count,
+                        "platforms": len(fixtures.platform_ids),
+                        "collections": len(fixtures.collection_ids),
+                        "smart_collections": len(fixtures.smart_collection_ids),
+                    },
+                    "cases": cases,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        print(f"\nReport written to {args.json}.")
+
+    if args.baseline:
+        regressions = compare_to_baseline(cases, args.baseline, args.max_regression)
+        if regressions:
+            print("\nRegressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,932 @@
+#!/usr/bin/env python3
+"""Benchmark library scans against a synthetic on-disk library.
+
+Writes a reproducible library of single files, multi-disc folders and zip/7z
+archives, then runs `scan_platforms` over it once per scan type (QUICK, HASHES
+and COMPLETE by default, in that order, so the first QUICK scan adds every ROM
+and the later ones rescan known files). Metadata comes from a local stub that
+replays the IGDB, ScreenScraper and Hasheous responses recorded in the test
+cassettes, so runs are repeatable and never touch the real providers.
+
+Each run reports ROMs/sec, bytes hashed/sec, DB round trips per ROM, Socket.IO
+messages and the latency percentiles of every scan stage. Pass ``--json`` to
+keep the numbers and ``--baseline`` to compare against an earlier run: the exit
+code is non-zero when throughput drops (or DB round trips grow) past
+``--max-regression``.
+
+Run from the backend directory, with a throwaway base path and database:
+
+    ROMM_BASE_PATH=/tmp/romm-bench uv run tools/benchmark_scan.py --roms 5000
+
+The library is written to ``{ROMM_BASE_PATH}/library/roms`` and reused by later
+runs with the same options. Redis and the database come from the usual env vars
+(DB_HOST, DB_NAME, REDIS_HOST, ...); a database filled by
+``generate_test_data.py`` makes a realistic backdrop. This is a TEST tool: the
+scan adds, updates and marks missing ROMs like a real one would.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess  # nosec B404 - only runs the 7-Zip binary the backend already uses
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+# Allow running as `python3 tools/benchmark_scan.py` from backend/.
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_PATH)
+
+# Provider handlers only run when credentials are configured. These are read at
+# import time, so they are set before anything imports `config`. Every request
+# goes to the local stub, so real credentials are never needed (or sent).
+for _name, _value in {
+    "IGDB_CLIENT_ID": "benchmark",
+    "IGDB_CLIENT_SECRET": "benchmark",
+    "SCREENSCRAPER_USER": "benchmark",
+    "SCREENSCRAPER_PASSWORD": "benchmark",
+    "HASHEOUS_API_ENABLED": "true",
+    "PLAYMATCH_API_ENABLED": "false",
+}.items():
+    os.environ[_name] = _value
+
+# isort: off
+# `generate_test_data` sorts out the metadata package import order on its own,
+# so it must be imported before anything else from the backend.
+from generate_test_data import make_title, slugify  # noqa: E402
+
+# isort: on
+import httpx  # noqa: E402
+import yaml  # noqa: E402
+import yarl  # noqa: E402
+from aiohttp import web  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from config import LIBRARY_BASE_PATH  # noqa: E402
+from config.config_manager import config_manager as cm  # noqa: E402
+from utils.archives import SEVEN_ZIP_PATH  # noqa: E402
+from utils.zip_cache import _ensure_zipfile_writable  # noqa: E402
+
+# ---------------------------------------------------------------------------
+# Synthetic library.
+# ---------------------------------------------------------------------------
+
+# File extension per platform, and whether its games ship as multi-disc sets.
+PLATFORM_FILES: dict[str, tuple[str, bool]] = {
+    "n64": ("z64", False),
+    "snes": ("sfc", False),
+    "gba": ("gba", False),
+    "genesis": ("md", False),
+    "psx": ("bin", True),
+    "saturn": ("bin", True),
+    "segacd": ("bin", True),
+}
+DEFAULT_PLATFORMS = ("n64", "snes", "gba", "psx")
+REGIONS = ("USA", "Europe", "Japan", "World")
+
+# Relative weights of each layout; multi-disc only applies to disc platforms.
+LAYOUT_WEIGHTS = {"file": 70, "multi_disc": 10, "zip": 12, "7z": 8}
+
+MARKER_FILE = ".romm-benchmark.json"
+
+
+@dataclass
+class Library:
+    root: Path
+    platforms: list[str]
+    layouts: Counter[str] = field(default_factory=Counter)
+    total_bytes: int = 0
+
+
+def _cue_sheet(bin_name: str) -> str:
+    return (
+        f'FILE "{bin_name}" BINARY\n'
+        "  TRACK 01 MODE2/2352\n"
+        "    INDEX 01 00:00:00\n"
+    )
+
+
+def _write_7z(archive: Path, member_name: str, data: bytes) -> bool:
+    if not os.path.exists(SEVEN_ZIP_PATH):
+        return False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        member = Path(tmp, member_name)
+        member.write_bytes(data)
+        # trunk-ignore(bandit/B603): fixed binary, arguments are paths we built
+        result = subprocess.run(  # nosec B603
+            [SEVEN_ZIP_PATH, "a", "-bd", "-y", "-mx=1", str(archive), str(member)],
+            capture_output=True,
+            check=False,
+        )
+    return result.returncode == 0
+
+
+def _unique_name(rng: random.Random, taken: set[str]) -> str:
+    while True:
+        name = f"{make_title(rng)} ({rng.choice(REGIONS)})"
+        name = name.replace(":", " -").replace("/", "-")
+        if name not in taken:
+            taken.add(name)
+            return name
+
+
+def build_library(
+    root: Path,
+    platforms: list[str],
+    roms: int,
+    rom_size: int,
+    seed: int,
+) -> Library:
+    """Write `roms` ROMs spread evenly over `platforms` under `root`."""
+    # Importing the backend patches zipfile for Enhanced Deflate reads only.
+    _ensure_zipfile_writable()
+    rng = random.Random(seed)  # nosec B311 - fake data, not security-sensitive
+    library = Library(root=root, platforms=platforms)
+    warned_7z = False
+
+    for index, slug in enumerate(platforms):
+        extension, has_discs = PLATFORM_FILES.get(slug, ("bin", False))
+        platform_dir = root / slug
+        platform_dir.mkdir(parents=True, exist_ok=True)
+
+        layouts = [
+            layout for layout in LAYOUT_WEIGHTS if has_discs or layout != "multi_disc"
+        ]
+        weights = [LAYOUT_WEIGHTS[layout] for layout in layouts]
+        count = roms // len(platforms) + (index < roms % len(platforms))
+        taken: set[str] = set()
+
+        for _ in range(count):
+            name = _unique_name(rng, taken)
+            layout = rng.choices(layouts, weights)[0]
+            size = max(1024, int(rom_size * rng.uniform(0.5, 1.5)))
+
+            if layout == "multi_disc":
+                rom_dir = platform_dir / name
+                rom_dir.mkdir(exist_ok=True)
+                for disc in range(1, rng.randint(2, 4) + 1):
+                    bin_name = f"{name} (Disc {disc}).{extension}"
+                    (rom_dir / bin_name).write_bytes(rng.randbytes(size))
+                    (rom_dir / f"{name} (Disc {disc}).cue").write_text(
+                        _cue_sheet(bin_name)
+                    )
+                    library.total_bytes += size
+            elif layout == "zip":
+                with zipfile.ZipFile(
+                    platform_dir / f"{name}.zip", "w", zipfile.ZIP_DEFLATED
+                ) as archive:
+                    archive.writestr(f"{name}.{extension}", rng.randbytes(size))
+                library.total_bytes += size
+            elif layout == "7z":
+                data = rng.randbytes(size)
+                if not _write_7z(
+                    platform_dir / f"{name}.7z", f"{name}.{extension}", data
+                ):
+                    if not warned_7z:
+                        print(f"  {SEVEN_ZIP_PATH} not available, writing zips instead")
+                        warned_7z = True
+                    layout = "zip"
+                    with zipfile.ZipFile(
+                        platform_dir / f"{name}.zip", "w", zipfile.ZIP_DEFLATED
+                    ) as archive:
+                        archive.writestr(f"{name}.{extension}", data)
+                library.total_bytes += size
+            else:
+                (platform_dir / f"{name}.{extension}").write_bytes(rng.randbytes(size))
+                library.total_bytes += size
+
+            library.layouts[layout] += 1
+
+    return library
+
+
+def prepare_library(args: argparse.Namespace) -> Library:
+    """Reuse the library from an earlier run with the same options, or write it.
+
+    A library without our marker file is never touched, so pointing the tool at
+    a real ROMM_BASE_PATH fails instead of overwriting anything.
+    """
+    root = Path(LIBRARY_BASE_PATH, cm.get_config().ROMS_FOLDER_NAME)
+    marker = Path(LIBRARY_BASE_PATH, MARKER_FILE)
+    options = {
+        "platforms": args.platforms,
+        "roms": args.roms,
+        "rom_size": args.rom_size_kb * 1024,
+        "seed": args.seed,
+    }
+
+    if marker.exists():
+        stored = json.loads(marker.read_text())
+        if stored.get("options") == options:
+            print(f"Reusing the benchmark library in {root}.")
+            return Library(
+                root=root,
+                platforms=args.platforms,
+                layouts=Counter(stored["layouts"]),
+                total_bytes=stored["total_bytes"],
+            )
+        shutil.rmtree(root, ignore_errors=True)
+    elif root.exists() and any(root.iterdir()):
+        raise SystemExit(
+            f"{root} holds a library this tool did not write. "
+            "Point ROMM_BASE_PATH at an empty directory."
+        )
+
+    print(f"Writing {args.roms:,} ROMs to {root} (seed={args.seed})...")
+    started = time.perf_counter()
+    library = build_library(
+        root, args.platforms, args.roms, options["rom_size"], args.seed
+    )
+    marker.write_text(
+        json.dumps(
+            {
+                "options": options,
+                "layouts": dict(library.layouts),
+                "total_bytes": library.total_bytes,
+            }
+        )
+    )
+    print(
+        f"  {_format_bytes(library.total_bytes)} in "
+        f"{time.perf_counter() - started:.1f}s: "
+        + ", ".join(f"{n:,} {layout}" for layout, n in library.layouts.items())
+    )
+    return library
+
+
+# ---------------------------------------------------------------------------
+# Stub metadata providers.
+# ---------------------------------------------------------------------------
+
+CASSETTES = (
+    "tests/handler/cassettes/test_fastapi/test_scan_rom.yaml",
+    "tests/adapters/services/cassettes/test_screenscraper/"
+    "TestScreenScraperServiceIntegration.test_get_game_info_by_game_id_real_api.yaml",
+)
+
+# Allowances served in place of the recorded ScreenScraper account's, unless
+# --provider-limits is passed, so the scan isn't paced by a free account.
+UNLIMITED_SS_USER = {
+    "maxthreads": "32",
+    "maxrequestspermin": "1000000",
+    "maxrequestsperday": "100000000",
+    "maxrequestskoperday": "100000000",
+    "requeststoday": "0",
+    "requestskotoday": "0",
+    "maxdownloadspeed": "1000000",
+}
+
+MEDIA_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp", ".gif", "mediaJeu.php")
+
+
+@dataclass
+class Recording:
+    query: dict[str, list[str]]
+    body: str
+    status: int
+    payload: Any
+
+
+def _load_recordings(paths: list[str]) -> dict[tuple[str, str, str], list[Recording]]:
+    """Index the cassettes' interactions by (method, host, path)."""
+    recordings: dict[tuple[str, str, str], list[Recording]] = defaultdict(list)
+    for path in paths:
+        with open(os.path.join(BACKEND_PATH, path)) as f:
+            cassette = yaml.safe_load(f)
+
+        for interaction in cassette["interactions"]:
+            request, response = interaction["request"], interaction["response"]
+            body = response["body"]["string"]
+            if isinstance(body, bytes):
+                # Text bodies were stored decoded; binary ones as sent.
+                body = gzip.decompress(body) if body[:2] == b"\x1f\x8b" else body
+                body = body.decode()
+            try:
+                payload = json.loads(body)
+            except json.JSONDecodeError:
+                continue
+
+            url = yarl.URL(request["uri"])
+            request_body = request.get("body") or ""
+            recordings[(request["method"], url.host or "", url.path)].append(
+                Recording(
+                    query={k: url.query.getall(k) for k in url.query},
+                    body=(
+                        request_body.decode()
+                        if isinstance(request_body, bytes)
+                        else str(request_body)
+                    ),
+                    status=response["status"]["code"],
+                    payload=payload,
+                )
+            )
+    return recordings
+
+
+def stable_id(namespace: str, key: str) -> int:
+    """A provider id for `key` that is the same on every run."""
+    digest = hashlib.blake2b(f"{namespace}:{key}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest) % 10_000_000 + 1
+
+
+class StubProviders:
+    """Replays recorded provider responses from a local HTTP server.
+
+    A recording answers every request to the same endpoint, with the ids (and,
+    for name searches, the name) rewritten from the request. Each title then
+    gets its own stable id, as it would from the real provider, instead of
+    every ROM turning into the recorded game and into one huge sibling group.
+    """
+
+    def __init__(
+        self, cassettes: list[str], latency: float, provider_limits: bool
+    ) -> None:
+        self.recordings = _load_recordings(cassettes)
+        self.latency = latency
+        self.provider_limits = provider_limits
+        self.requests: Counter[str] = Counter()
+        self.unrecorded: Counter[str] = Counter()
+        self.url = ""
+        self._runner: web.AppRunner | None = None
+        self._media = self._placeholder_image()
+
+    @staticmethod
+    def _placeholder_image() -> bytes:
+        buffer = BytesIO()
+        Image.new("RGB", (264, 352), (64, 96, 160)).save(buffer, "PNG")
+        return buffer.getvalue()
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_route("*", "/{host}/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        await web.SockSite(self._runner, sock).start()
+        self.url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def url_for(self, base_url: str) -> str:
+        """Where the stub serves `base_url`, e.g. the IGDB API root."""
+        url = yarl.URL(base_url)
+        return f"{self.url}/{url.host}{url.path}"
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        host = request.match_info["host"]
+        path = "/" + request.match_info["path"]
+        body = (await request.read()).decode(errors="replace")
+        self.requests[host] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if path.endswith(MEDIA_SUFFIXES):
+            return web.Response(body=self._media, content_type="image/png")
+
+        if host.endswith("screenscraper.fr") and path.endswith("ssuserInfos.php"):
+            return web.json_response(self._ss_user_info())
+
+        # DEV_MODE talks to Hasheous' beta host, which shares the recordings.
+        recordings = self.recordings.get(
+            (request.method, host.removeprefix("beta."), path)
+        )
+        if not recordings:
+            self.unrecorded[f"{request.method} {host}{path}"] += 1
+            raise web.HTTPNotFound()
+
+        query = {k: request.query.getall(k) for k in request.query}
+        recording = next(
+            (r for r in recordings if r.query == query and r.body == body),
+            recordings[0],
+        )
+        payload = json.loads(json.dumps(recording.payload))
+        payload = self._rekey(host, path, query, body, payload)
+        return web.json_response(payload, status=recording.status)
+
+    def _ss_user_info(self) -> dict[str, Any]:
+        for (_, host, _), recordings in self.recordings.items():
+            if host.endswith("screenscraper.fr"):
+                ssuser = dict(recordings[0].payload["response"]["ssuser"])
+                break
+        else:
+            ssuser = {}
+        if not self.provider_limits:
+            ssuser.update(UNLIMITED_SS_USER)
+        return {"response": {"ssuser": ssuser}}
+
+    def _rekey(
+        self,
+        host: str,
+        path: str,
+        query: dict[str, list[str]],
+        body: str,
+        payload: Any,
+    ) -> Any:
+        def first(name: str) -> str | None:
+            values = query.get(name)
+            return values[0] if values else None
+
+        if host == "api.igdb.com" and isinstance(payload, list) and payload:
+            by_id = re.search(r"where \(?id\s*=\s*\(?(\d+)", body)
+            search = re.search(r'search "([^"]*)"', body) or re.search(
+                r'name ~ \*"([^"]*)"\*', body
+            )
+            game = payload[0]
+            if by_id:
+                game["id"] = int(by_id.group(1))
+            elif search:
+                game["id"] = stable_id("igdb", search.group(1))
+                game["name"] = search.group(1)
+                game["slug"] = slugify(search.group(1))
+            return [game]
+
+        if host.endswith("hasheous.org") and path.endswith("/Lookup/ByHash"):
+            hashes = json.loads(body or "[]")
+            key = (hashes[0].get("mD5") or hashes[0].get("crc")) if hashes else ""
+            payload["id"] = stable_id("hasheous", key)
+            for source in payload.get("metadata", []):
+                if source.get("source") == "IGDB" and source.get("immutableId"):
+                    source["immutableId"] = str(stable_id("igdb", key))
+            return payload
+
+        if host.endswith("hasheous.org") and path.endswith("/MetadataProxy/IGDB/Game"):
+            payload["id"] = int(first("Id") or 0)
+            return payload
+
+        if host.endswith("screenscraper.fr") and isinstance(payload, dict):
+            response = payload.get("response", {})
+            game = response.get("jeu")
+            if game:
+                key = first("md5") or first("crc") or first("romnom") or ""
+                game["id"] = first("gameid") or str(stable_id("ss", key))
+            if not self.provider_limits and "ssuser" in response:
+                response["ssuser"].update(UNLIMITED_SS_USER)
+            return payload
+
+        return payload
+
+
+class _StubTransport(httpx.AsyncBaseTransport):
+    """Sends every request of an httpx client to the stub instead.
+
+    The handlers that use httpx (Twitch auth, Hasheous, media downloads) build
+    their URLs inline, so rerouting the client covers them all at once.
+    """
+
+    def __init__(self, stub: StubProviders) -> None:
+        self._stub = stub
+        self._transport = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        target = httpx.URL(self._stub.url_for(str(request.url)))
+        request.url = target.copy_with(query=request.url.query)
+        request.headers["host"] = target.netloc.decode()
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def install_stub(stub: StubProviders, provider_limits: bool) -> None:
+    """Point the metadata handlers used by scans at the stub."""
+    import adapters.services.igdb as igdb_service
+    import utils.context
+    from handler.metadata import meta_igdb_handler, meta_ss_handler
+
+    meta_igdb_handler.igdb_service.url = yarl.URL(
+        stub.url_for(str(meta_igdb_handler.igdb_service.url))
+    )
+    meta_ss_handler.ss_service.url = yarl.URL(
+        stub.url_for(str(meta_ss_handler.ss_service.url))
+    )
+
+    # The SSRF guard on context clients rightly refuses loopback, which is
+    # where the stub lives, so scans in this process get rerouted clients.
+    def create_stub_httpx_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=_StubTransport(stub))
+
+    utils.context.create_httpx_async_client = create_stub_httpx_client
+
+    if not provider_limits:
+        igdb_service._rate_limiter.set_requests_per_second(1_000_000)
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation.
+# ---------------------------------------------------------------------------
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted `values`."""
+    if not values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.stages: dict[str, list[float]] = defaultdict(list)
+        self.db_round_trips = 0
+        self.bytes_hashed = 0
+        self.socket_messages: Counter[str] = Counter()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage].append(seconds)
+
+    def count_round_trip(self, *_: Any) -> None:
+        with self._lock:
+            self.db_round_trips += 1
+
+    def count_hashed(self, file_path: Any) -> None:
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return
+        with self._lock:
+            self.bytes_hashed += size
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def wrap(self, owner: Any, name: str, stage: str) -> None:
+        """Replace `owner.name` with a version that records its duration."""
+        original = getattr(owner, name)
+
+        if inspect.iscoroutinefunction(original):
+
+            @wraps(original)
+            async def timed_async(*args: Any, **kwargs: Any) -> Any:
+                with self.timed(stage):
+                    return await original(*args, **kwargs)
+
+            setattr(owner, name, timed_async)
+        else:
+
+            @wraps(original)
+            def timed_sync(*args: Any, **kwargs: Any) -> Any:
+                with self.timed(stage):
+                    return original(*args, **kwargs)
+
+            setattr(owner, name, timed_sync)
+
+
+class _CountingSocketManager:
+    """Stands in for the Socket.IO manager, counting what a scan would send."""
+
+    def __init__(self, metrics: Metrics) -> None:
+        self._metrics = metrics
+
+    async def emit(self, event: str, *_: Any, **__: Any) -> None:
+        self._metrics.socket_messages[event] += 1
+
+
+# Stages timed per call. The scan module imports some of these by name, so
+# they are wrapped where the scan looks them up.
+def instrument(metrics: Metrics) -> None:
+    from sqlalchemy import event
+
+    import endpoints.sockets.scan as scan_module
+    from handler.database import db_rom_handler
+    from handler.database.base_handler import sync_engine
+    from handler.filesystem import fs_rom_handler
+
+    event.listen(sync_engine, "before_cursor_execute", metrics.count_round_trip)
+
+    calculate_hashes = fs_rom_handler._calculate_rom_hashes
+
+    def counting_calculate_hashes(file_path: Any, *args: Any, **kwargs: Any) -> Any:
+        metrics.count_hashed(file_path)
+        return calculate_hashes(file_path, *args, **kwargs)
+
+    fs_rom_handler._calculate_rom_hashes = counting_calculate_hashes  # type: ignore[method-assign]
+
+    stages: list[tuple[Any, str, str]] = [
+        (scan_module, "_identify_rom", "rom (total)"),
+        (fs_rom_handler, "get_roms", "list platform files"),
+        (fs_rom_handler, "get_rom_files", "read + hash files"),
+        (scan_module, "scan_rom", "metadata lookup"),
+        (scan_module, "_fetch_rom_media", "media download"),
+        (db_rom_handler, "add_rom", "db add_rom"),
+        (db_rom_handler, "update_rom", "db update_rom"),
+    ]
+    for owner, name, stage in stages:
+        metrics.wrap(owner, name, stage)
+
+    scan_module._get_socket_manager = lambda: _CountingSocketManager(metrics)  # type: ignore[assignment]
+
+
+# ---------------------------------------------------------------------------
+# Runs and reporting.
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class RunResult:
+    scan_type: str
+    seconds: float
+    roms: int
+    bytes_hashed: int
+    db_round_trips: int
+    socket_messages: int
+    provider_requests: int
+    stages: dict[str, dict[str, float]]
+
+    @property
+    def roms_per_sec(self) -> float:
+        return self.roms / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.bytes_hashed / self.seconds if self.seconds else 0.0
+
+    @property
+    def db_round_trips_per_rom(self) -> float:
+        return self.db_round_trips / self.roms if self.roms else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "scan_type": self.scan_type,
+            "seconds": round(self.seconds, 3),
+            "roms": self.roms,
+            "roms_per_sec": round(self.roms_per_sec, 2),
+            "bytes_hashed": self.bytes_hashed,
+            "bytes_hashed_per_sec": round(self.bytes_per_sec),
+            "db_round_trips": self.db_round_trips,
+            "db_round_trips_per_rom": round(self.db_round_trips_per_rom, 2),
+            "socket_messages": self.socket_messages,
+            "provider_requests": self.provider_requests,
+            "stages": self.stages,
+        }
+
+
+async def run_scan(
+    scan_type: str,
+    platforms: list[str],
+    metadata_sources: list[str],
+    metrics: Metrics,
+    stub: StubProviders,
+) -> RunResult:
+    from endpoints.sockets.scan import scan_platforms
+    from handler.scan_handler import ScanType
+
+    metrics.reset()
+    provider_requests = sum(stub.requests.values())
+    started = time.perf_counter()
+    stats = await scan_platforms(
+        platform_ids=[],
+        metadata_sources=metadata_sources,
+        scan_type=ScanType[scan_type.upper()],
+        playmatch_enabled=False,
+        platform_fs_slugs=platforms,
+    )
+    seconds = time.perf_counter() - started
+
+    stages = {}
+    for stage, durations in metrics.stages.items():
+        durations.sort()
+        stages[stage] = {
+            "count": len(durations),
+            "p50_ms": round(percentile(durations, 50) * 1000, 2),
+            "p95_ms": round(percentile(durations, 95) * 1000, 2),
+            "p99_ms": round(percentile(durations, 99) * 1000, 2),
+            "max_ms": round(durations[-1] * 1000, 2),
+        }
+
+    return RunResult(
+        scan_type=scan_type.upper(),
+        seconds=seconds,
+        roms=stats.scanned_roms,
+        bytes_hashed=metrics.bytes_hashed,
+        db_round_trips=metrics.db_round_trips,
+        socket_messages=sum(metrics.socket_messages.values()),
+        provider_requests=sum(stub.requests.values()) - provider_requests,
+        stages=stages,
+    )
+
+
+def _format_bytes(value: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+
+def print_result(result: RunResult) -> None:
+    print(
+        f"\n{result.scan_type}: {result.roms:,} ROMs in {result.seconds:.1f}s\n"
+        f"  {result.roms_per_sec:,.1f} ROMs/s, "
+        f"{_format_bytes(result.bytes_per_sec)}/s hashed, "
+        f"{result.db_round_trips_per_rom:.1f} DB round trips/ROM, "
+        f"{result.socket_messages:,} socket messages, "
+        f"{result.provider_requests:,} provider requests"
+    )
+    print(
+        f"  {'stage':<22} {'count':>8} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'max ms':>9}"
+    )
+    for stage, s in result.stages.items():
+        print(
+            f"  {stage:<22} {s['count']:>8,} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} "
+            f"{s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}"
+        )
+
+
+def compare_to_baseline(
+    results: list[RunResult], baseline_path: str, max_regression: float
+) -> list[str]:
+    """Describe every metric that got worse than the baseline allows."""
+    with open(baseline_path) as f:
+        baseline = {run["scan_type"]: run for run in json.load(f)["runs"]}
+
+    regressions = []
+    for result in results:
+        before = baseline.get(result.scan_type)
+        if before is None:
+            continue
+
+        if result.roms_per_sec < before["roms_per_sec"] * (1 - max_regression):
+            regressions.append(
+                f"{result.scan_type}: {result.roms_per_sec:.1f} ROMs/s, "
+                f"was {before['roms_per_sec']:.1f}"
+            )
+        if result.db_round_trips_per_rom > before["db_round_trips_per_rom"] * (
+            1 + max_regression
+        ):
+            regressions.append(
+                f"{result.scan_type}: {result.db_round_trips_per_rom:.1f} DB round "
+                f"trips/ROM, was {before['db_round_trips_per_rom']:.1f}"
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace, library: Library) -> list[RunResult]:
+    from handler.redis_handler import async_cache
+
+    stub = StubProviders(
+        cassettes=[*CASSETTES, *args.cassette],
+        latency=args.provider_latency_ms / 1000,
+        provider_limits=args.provider_limits,
+    )
+    await stub.start()
+    install_stub(stub, args.provider_limits)
+    metrics = Metrics()
+    instrument(metrics)
+    # A token cached by an earlier run would skip the stubbed token request.
+    await async_cache.delete("romm:twitch_token")
+
+    results = []
+    try:
+        for scan_type in args.scan_types:
+            result = await run_scan(
+                scan_type, library.platforms, args.metadata_sources, metrics, stub
+            )
+            print_result(result)
+            results.append(result)
+    finally:
+        await stub.stop()
+
+    if stub.unrecorded:
+        print("\nRequests with no recording (answered 404):")
+        for endpoint, count in stub.unrecorded.most_common():
+            print(f"  {count:>8,}  {endpoint}")
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--roms",
+        type=int,
+        default=2000,
+        help="Number of ROMs in the synthetic library (default: 2000)",
+    )
+    parser.add_argument(
+        "--platforms",
+        type=lambda value: value.split(","),
+        default=list(DEFAULT_PLATFORMS),
+        help=f"Comma-separated platform slugs (default: {','.join(DEFAULT_PLATFORMS)})",
+    )
+    parser.add_argument(
+        "--rom-size-kb",
+        type=int,
+        default=256,
+        help="Average size of each ROM file in KiB (default: 256)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=1337, help="RNG seed for reproducible output"
+    )
+    parser.add_argument(
+        "--scan-types",
+        type=lambda value: value.upper().split(","),
+        default=["QUICK", "HASHES", "COMPLETE"],
+        help="Comma-separated scan types, run in order (default: QUICK,HASHES,COMPLETE)",
+    )
+    parser.add_argument(
+        "--metadata-sources",
+        type=lambda value: value.split(","),
+        default=["igdb", "ss", "hasheous"],
+        help="Comma-separated metadata sources (default: igdb,ss,hasheous)",
+    )
+    parser.add_argument(
+        "--cassette",
+        action="append",
+        default=[],
+        help="Extra VCR cassette to replay, relative to backend/ (repeatable)",
+    )
+    parser.add_argument(
+        "--provider-latency-ms",
+        type=float,
+        default=0,
+        help="Delay added to every stubbed provider response (default: 0)",
+    )
+    parser.add_argument(
+        "--provider-limits",
+        action="store_true",
+        help="Keep the providers' client-side rate limits and recorded allowances",
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--baseline", help="Compare against a JSON file written by --json"
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown against --baseline, as a fraction (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    library = prepare_library(args)
+    results = asyncio.run(run(args, library))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "options": {
+                        "roms": args.roms,
+                        "platforms": args.platforms,
+                        "rom_size_kb": args.rom_size_kb,
+                        "seed": args.seed,
+                        "metadata_sources": args.metadata_sources,
+                        "provider_latency_ms": args.provider_latency_ms,
+                    },
+                    "runs": [result.to_dict() for result in results],
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nResults written to {args.json}.")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\nRegressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
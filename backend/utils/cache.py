@@ -1,18 +1,27 @@
 import hashlib
 import json
+from collections.abc import Callable
 from itertools import batched
 from pathlib import Path
+from typing import Any
 
 from anyio import open_file
 from redis.asyncio import Redis as AsyncRedis
 
+from handler.redis_handler import sync_cache
 from logger.logger import log
 
 
-async def conditionally_set_cache(cache: AsyncRedis, key: str, file_path: Path) -> None:
+async def conditionally_set_cache(
+    cache: AsyncRedis,
+    key: str,
+    file_path: Path,
+    transform: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+) -> None:
     """Set the content of a JSON file to the cache, if it does not already exist or is outdated.
 
     The MD5 hash of the file is stored alongside the data to determine if the content has changed.
+    `transform`, if given, reshapes the loaded JSON object before it is stored.
     """
 
     hash_key = f"{key}:file_hash"
@@ -34,6 +43,8 @@ async def conditionally_set_cache(cache: AsyncRedis, key: str, file_path: Path)
 
         # Set the content of the file to the cache, and update the hash.
         index_data = json.loads(file_content)
+        if transform:
+            index_data = transform(index_data)
         async with cache.pipeline() as pipe:
             # Clear existing data to avoid stale entries.
             if data_exists:
@@ -49,3 +60,19 @@ async def conditionally_set_cache(cache: AsyncRedis, key: str, file_path: Path)
     except Exception as e:
         # Log the error but don't fail - this allows migrations to run even if Redis is not available
         log.warning(f"Failed to initialize cache for {key}: {e}")
+
+
+# The assembled `GET /api/heartbeat` payload. Clients call it on every load, and
+# building it lists the platform directories, which is slow on network storage.
+# Writers that change what it reports drop it; the TTL catches anything else,
+# like a hand-edited config.yml.
+HEARTBEAT_CACHE_KEY = "heartbeat:payload"
+HEARTBEAT_CACHE_TTL = 60  # 1 minute
+
+
+def invalidate_heartbeat_cache() -> None:
+    """Drop the cached heartbeat payload so the next request rebuilds it."""
+    try:
+        sync_cache.delete(HEARTBEAT_CACHE_KEY)
+    except Exception as e:
+        log.warning(f"Failed to invalidate heartbeat cache: {e}")
@@ -1,6 +1,8 @@
+import time
 from collections.abc import AsyncGenerator, Awaitable, Callable
 from contextlib import asynccontextmanager
 from contextvars import ContextVar, Token
+from types import SimpleNamespace
 from typing import TypeVar
 
 import aiohttp
@@ -8,6 +10,7 @@ import httpx
 from fastapi import Request, Response
 
 from config import has_proxy_env
+from utils.metrics import HTTP_CLIENT_REQUEST_SECONDS
 from utils.ssrf import (
     install_async_ssrf_protection,
     install_sync_ssrf_protection,
@@ -28,14 +31,82 @@ async def _validate_request_url_async(request: httpx.Request) -> None:
     validate_url_for_http_request(str(request.url))
 
 
+def _stamp_request_sync(request: httpx.Request) -> None:
+    request.extensions["romm_started_at"] = time.perf_counter()
+
+
+async def _stamp_request_async(request: httpx.Request) -> None:
+    _stamp_request_sync(request)
+
+
+def _observe_response_sync(response: httpx.Response) -> None:
+    started_at = response.request.extensions.get("romm_started_at")
+    if started_at is not None:
+        HTTP_CLIENT_REQUEST_SECONDS.observe(
+            time.perf_counter() - started_at,
+            host=response.request.url.host,
+            status=response.status_code,
+        )
+
+
+async def _observe_response_async(response: httpx.Response) -> None:
+    _observe_response_sync(response)
+
+
+async def _on_aiohttp_request_start(
+    _session: aiohttp.ClientSession,
+    trace_ctx: SimpleNamespace,
+    _params: aiohttp.TraceRequestStartParams,
+) -> None:
+    trace_ctx.started_at = time.perf_counter()
+
+
+async def _on_aiohttp_request_end(
+    _session: aiohttp.ClientSession,
+    trace_ctx: SimpleNamespace,
+    params: aiohttp.TraceRequestEndParams,
+) -> None:
+    HTTP_CLIENT_REQUEST_SECONDS.observe(
+        time.perf_counter() - trace_ctx.started_at,
+        host=params.url.host or "",
+        status=params.response.status,
+    )
+
+
+async def _on_aiohttp_request_exception(
+    _session: aiohttp.ClientSession,
+    trace_ctx: SimpleNamespace,
+    params: aiohttp.TraceRequestExceptionParams,
+) -> None:
+    HTTP_CLIENT_REQUEST_SECONDS.observe(
+        time.perf_counter() - trace_ctx.started_at,
+        host=params.url.host or "",
+        status="error",
+    )
+
+
+def _aiohttp_metrics_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_aiohttp_request_start)
+    trace_config.on_request_end.append(_on_aiohttp_request_end)
+    trace_config.on_request_exception.append(_on_aiohttp_request_exception)
+    return trace_config
+
+
 def create_aiohttp_session() -> aiohttp.ClientSession:
-    return aiohttp.ClientSession(trust_env=has_proxy_env())
+    return aiohttp.ClientSession(
+        trust_env=has_proxy_env(),
+        trace_configs=[_aiohttp_metrics_trace_config()],
+    )
 
 
 def create_httpx_async_client() -> httpx.AsyncClient:
     client = httpx.AsyncClient(
         trust_env=has_proxy_env(),
-        event_hooks={"request": [_validate_request_url_async]},
+        event_hooks={
+            "request": [_validate_request_url_async, _stamp_request_async],
+            "response": [_observe_response_async],
+        },
     )
     install_async_ssrf_protection(client)
     return client
@@ -44,7 +115,10 @@ def create_httpx_async_client() -> httpx.AsyncClient:
 def create_httpx_client() -> httpx.Client:
     client = httpx.Client(
         trust_env=has_proxy_env(),
-        event_hooks={"request": [_validate_request_url_sync]},
+        event_hooks={
+            "request": [_validate_request_url_sync, _stamp_request_sync],
+            "response": [_observe_response_sync],
+        },
     )
     install_sync_ssrf_protection(client)
     return client
@@ -0,0 +1,71 @@
+"""Layout of the content-addressed responsive cover derivatives.
+
+Covers are hashed from the bytes of the stored large cover, and each hash owns
+a directory of resized renditions under `covers/` in the resources tree:
+
+    covers/ab/abcdef.../128.webp, 256.webp, 512.webp, original.webp (+ .avif)
+
+Artwork shared by regional variants or siblings hashes the same, so it is
+encoded and stored once. The URLs never change for a given hash, which lets
+nginx cache them immutably without a `?ts=` cache-buster. Widths at or above
+the source's are not written; `original` stands in for them.
+
+The per-ROM `small`/`big` covers stay where they are: `path_cover_s`/`_l`,
+collection mosaics, gamelist and Pegasus exports, and clients that don't read
+`srcset` all use them, and the derivatives are opt-in. They are hardlinked to
+one copy under the hash's `rom/` directory instead, so ROMs with the same
+artwork don't each store it again.
+"""
+
+from typing import Final
+
+from PIL import features
+
+from config import FRONTEND_RESOURCES_PATH
+
+COVER_DERIVATIVES_DIR: Final = "covers"
+
+# Widths of the resized renditions, smallest first. An `original` rendition is
+# stored alongside at the source resolution.
+COVER_DERIVATIVE_WIDTHS: Final = (128, 256, 512)
+COVER_DERIVATIVE_ORIGINAL: Final = "original"
+
+# Per-ROM cover files shared by the ROMs with this artwork. Not named `cover`,
+# so the WebP conversion doesn't take it for a ROM's cover directory.
+COVER_DERIVATIVE_SHARED_DIR: Final = "rom"
+
+# Preferred format first, so clients can list `<source>` elements in order.
+COVER_DERIVATIVE_FORMATS: Final = tuple(
+    fmt for fmt in ("avif", "webp") if features.check(fmt)
+)
+
+
+def cover_derivatives_path(cover_hash: str) -> str:
+    """Directory holding a hash's renditions, relative to the resources root."""
+    return f"{COVER_DERIVATIVES_DIR}/{cover_hash[:2]}/{cover_hash}"
+
+
+def cover_rendition_widths(source_width: int) -> tuple[int, ...]:
+    """The resized widths stored for a source this wide; never upscaled."""
+    return tuple(width for width in COVER_DERIVATIVE_WIDTHS if width < source_width)
+
+
+def cover_srcset(cover_hash: str | None, cover_width: int | None) -> dict[str, str]:
+    """Build `srcset` attribute values for a cover hash, keyed by format.
+
+    Only the renditions narrower than the source are listed, then `original`
+    at the source's own width.
+    """
+    if not cover_hash or not cover_width:
+        return {}
+
+    base_url = f"{FRONTEND_RESOURCES_PATH}/{cover_derivatives_path(cover_hash)}"
+    candidates = [(str(width), width) for width in cover_rendition_widths(cover_width)]
+    candidates.append((COVER_DERIVATIVE_ORIGINAL, cover_width))
+
+    return {
+        fmt: ", ".join(
+            f"{base_url}/{name}.{fmt} {width}w" for name, width in candidates
+        )
+        for fmt in COVER_DERIVATIVE_FORMATS
+    }
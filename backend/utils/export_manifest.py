@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from starlette.datastructures import URLPath
+
+from config import EXPORT_MANIFEST_PATH
+from logger.logger import log
+
+# ROMs loaded, rendered and written per round trip during a file export
+EXPORT_BATCH_SIZE = 500
+# Asset hardlinks/copies in flight at once during a local export
+ASSET_PLACEMENT_WORKERS = 8
+
+
+def build_rom_content_url(rom_id: int, fs_name: str, base_url: str) -> str:
+    """Absolute URL of the `get_rom_content` route, for exports running
+    outside a request (background tasks) where `url_for` is unavailable."""
+    return str(
+        URLPath(f"/api/roms/{rom_id}/content/{fs_name}").make_absolute_url(base_url)
+    )
+
+
+async def place_assets(
+    place: Callable[[Path, Path], bool],
+    pairs: Sequence[tuple[Path, Path]],
+) -> list[bool]:
+    """Run ``place(source, dest)`` for every pair on worker threads, at most
+    ASSET_PLACEMENT_WORKERS at a time. Results keep the order of ``pairs``."""
+    semaphore = asyncio.Semaphore(ASSET_PLACEMENT_WORKERS)
+
+    async def _place(source: Path, dest: Path) -> bool:
+        async with semaphore:
+            return await asyncio.to_thread(place, source, dest)
+
+    return list(await asyncio.gather(*(_place(src, dest) for src, dest in pairs)))
+
+
+def assets_to_record(
+    pairs: Sequence[tuple[Path, Path]], placed: Sequence[bool]
+) -> list[bool]:
+    """Which placements a manifest entry should record: every placed asset, plus
+    failed ones whose source still exists, so the missing file sends the ROM
+    back through placement on the next export. Placements whose source is gone
+    are left out, as retrying them cannot succeed."""
+    return [
+        ok or source.is_file() for (source, _), ok in zip(pairs, placed, strict=True)
+    ]
+
+
+class ExportManifest:
+    """Rendered entries of a platform's last file export, keyed by ROM id.
+
+    Every ROM write bumps `updated_at`, so an entry whose recorded stamp still
+    matches renders identically and is written back without loading the ROM.
+    Entries are only reused under the same export options (local paths, base
+    URL, media choices); any change discards the whole manifest. Local exports
+    also record the asset files an entry references, so entries whose files
+    went missing are re-rendered and their assets placed again.
+    """
+
+    VERSION = 2
+
+    def __init__(self, name: str, options: dict[str, Any]):
+        self.path = Path(EXPORT_MANIFEST_PATH) / f"{name}.json"
+        self.options = options
+        # JSON object keys are strings, so ROM ids are stored stringified
+        self.entries: dict[str, tuple[str, str, list[str]]] = {}
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r") as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            log.warning(f"Ignoring unreadable export manifest {self.path}: {str(exc)}")
+            return
+
+        if (
+            isinstance(data, dict)
+            and data.get("version") == self.VERSION
+            and data.get("options") == self.options
+        ):
+            self.entries = {
+                rom_id: (stamp, entry, assets)
+                for rom_id, (stamp, entry, assets) in (
+                    data.get("entries") or {}
+                ).items()
+            }
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as fp:
+                json.dump(
+                    {
+                        "version": self.VERSION,
+                        "options": self.options,
+                        "entries": self.entries,
+                    },
+                    fp,
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            log.error(f"Failed to write export manifest {self.path}: {str(exc)}")
+
+    def get(self, rom_id: int, updated_at: datetime) -> str | None:
+        """The recorded entry for a ROM, or None if it changed since."""
+        recorded = self.entries.get(str(rom_id))
+        if recorded is None or recorded[0] != updated_at.isoformat():
+            return None
+        return recorded[1]
+
+    def mark(
+        self,
+        rom_id: int,
+        updated_at: datetime,
+        entry: str,
+        assets: Sequence[str] = (),
+    ) -> None:
+        """Record a ROM's rendered entry and the asset paths, relative to the
+        platform directory, that it expects to find on disk."""
+        self.entries[str(rom_id)] = (updated_at.isoformat(), entry, list(assets))
+
+    def missing_assets(self, rom_ids: Iterable[int], root: Path) -> set[int]:
+        """ROMs with a recorded asset that is no longer present under ``root``."""
+        return {
+            rom_id
+            for rom_id in rom_ids
+            if (recorded := self.entries.get(str(rom_id))) is not None
+            and any(not (root / rel_path).is_file() for rel_path in recorded[2])
+        }
+
+    def prune(self, rom_ids: set[int]) -> None:
+        """Forget ROMs that are no longer part of the export."""
+        keep = {str(rom_id) for rom_id in rom_ids}
+        self.entries = {k: v for k, v in self.entries.items() if k in keep}
@@ -2,7 +2,8 @@ import errno
 import os
 import re
 import shutil
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 # Container file extensions treated as compressed archives across modules
@@ -87,6 +88,81 @@ def link_or_copy_file(source: Path, dest: Path) -> None:
         raise
 
 
+@contextmanager
+def replace_on_write(dest: Path) -> Iterator[Path]:
+    """Yield a tempfile path next to ``dest`` to write, then rename it onto
+    ``dest``.
+
+    Rewriting a file this way gives it a new inode instead of truncating the
+    old one, so other hardlinks to ``dest`` (e.g. covers shared between ROMs
+    with the same artwork) keep their content. The tempfile keeps ``dest``'s
+    suffix, for writers that pick a format from it, and is removed on failure.
+    """
+    tmp_path = dest.parent / f".romm_tmp_{os.urandom(8).hex()}{dest.suffix}"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, dest)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# errno values that mean "copy_file_range can't do this pair of files, copy in
+# userspace instead". EXDEV: cross-filesystem on kernels older than 5.3 (and
+# some filesystems since). ENOSYS/EOPNOTSUPP: syscall or filesystem support
+# missing. EINVAL: unsupported file type (e.g. some FUSE or network mounts).
+_COPY_RANGE_FALLBACK_ERRNOS: frozenset[int] = frozenset(
+    e
+    for e in (
+        getattr(errno, "EXDEV", None),
+        getattr(errno, "ENOSYS", None),
+        getattr(errno, "EOPNOTSUPP", None),
+        getattr(errno, "ENOTSUP", None),
+        getattr(errno, "EINVAL", None),
+    )
+    if e is not None
+)
+
+
+def concatenate_files(sources: Iterable[Path], dest: Path) -> int:
+    """Write ``sources`` back to back into ``dest`` and return the bytes written.
+
+    Uses ``os.copy_file_range`` where available so the kernel moves the data
+    without it passing through userspace; filesystems with reflinks (btrfs,
+    XFS) share the extents instead of copying them at all. Falls back to a
+    buffered copy when the call isn't supported for a pair of files.
+    """
+    written = 0
+    use_copy_range = hasattr(os, "copy_file_range")
+    # Unbuffered so the file objects and the raw descriptors share one offset
+    with open(dest, "wb", buffering=0) as dst:
+        for source in sources:
+            with open(source, "rb", buffering=0) as src:
+                remaining = os.fstat(src.fileno()).st_size
+                while use_copy_range and remaining > 0:
+                    try:
+                        copied = os.copy_file_range(
+                            src.fileno(), dst.fileno(), remaining
+                        )
+                    except OSError as exc:
+                        if exc.errno not in _COPY_RANGE_FALLBACK_ERRNOS:
+                            raise
+                        use_copy_range = False
+                        break
+                    if copied == 0:
+                        break
+                    written += copied
+                    remaining -= copied
+
+                while buf := src.read(1024 * 1024):
+                    written += dst.write(buf) or 0
+
+    return written
+
+
 INVALID_CHARS_HYPHENS = re.compile(r"[\\/:|]")
 INVALID_CHARS_EMPTY = re.compile(r'[*?"<>+]')
 
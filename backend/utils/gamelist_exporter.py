@@ -1,4 +1,7 @@
+import asyncio
+from collections.abc import Callable
 from datetime import UTC, datetime
+from itertools import batched
 from pathlib import Path
 from xml.etree.ElementTree import (  # trunk-ignore(bandit/B405)
     Element,
@@ -16,6 +19,13 @@ from handler.database import db_platform_handler, db_rom_handler
 from handler.filesystem import fs_platform_handler, fs_resource_handler
 from logger.logger import log
 from models.rom import Rom
+from utils.export_manifest import (
+    EXPORT_BATCH_SIZE,
+    ExportManifest,
+    assets_to_record,
+    build_rom_content_url,
+    place_assets,
+)
 from utils.filesystem import link_or_copy_file
 
 # Map gamelist asset keys to subdirectory names inside assets/
@@ -35,6 +45,9 @@ ASSET_DIRS: dict[str, str] = {
     "manual": "manuals",
 }
 
+GAMELIST_HEADER = "<?xml version='1.0' encoding='utf-8'?>\n<gameList>\n"
+GAMELIST_FOOTER = "</gameList>\n"
+
 
 def get_media_options_for_export() -> tuple[str, str]:
     """Get media options for export from config"""
@@ -46,8 +59,39 @@ def get_media_options_for_export() -> tuple[str, str]:
 class GamelistExporter:
     """Export RomM collections to ES-DE gamelist.xml format"""
 
-    def __init__(self, local_export: bool = False):
+    def __init__(self, local_export: bool = False, base_url: str | None = None):
         self.local_export = local_export
+        # Used to build URLs when exporting outside a request (background tasks)
+        self.base_url = base_url
+
+    def _resolve_base_url(self, request: Request | None) -> str:
+        if request is not None:
+            return str(request.base_url)
+        if self.base_url:
+            return self.base_url
+        raise ValueError(
+            "Request object or base URL must be provided for non-local exports"
+        )
+
+    def _rom_content_url(self, rom: Rom, request: Request | None) -> str:
+        if request is not None:
+            return str(
+                request.url_for("get_rom_content", id=rom.id, file_name=rom.fs_name)
+            )
+        return build_rom_content_url(
+            rom.id, rom.fs_name, self._resolve_base_url(request)
+        )
+
+    def _is_exportable(self, rom: Rom | None) -> bool:
+        return (
+            rom is not None
+            and not rom.missing_from_fs
+            and rom.fs_name != "gamelist.xml"
+        )
+
+    def _local_asset_path(self, rom: Rom, asset_key: str, source_path: Path) -> str:
+        subdir = ASSET_DIRS.get(asset_key, asset_key)
+        return f"./assets/{subdir}/{rom.fs_name_no_ext}{source_path.suffix}"
 
     def _format_release_date(self, timestamp: int) -> str:
         """Format release date to YYYYMMDDTHHMMSS format"""
@@ -122,15 +166,14 @@ class GamelistExporter:
         For local exports, returns relative paths like ``assets/covers/<rom>.jpg``
         and, if ``platform_dir`` is provided, copies the source files into place.
 
-        For non-local exports, returns absolute URLs built from ``request.base_url``.
+        For non-local exports, returns absolute URLs built from ``request.base_url``
+        (or the exporter's ``base_url`` when there is no request).
         """
         refs: dict[str, str] = {}
 
         if self.local_export:
             for asset_key, source_path in assets.items():
-                subdir = ASSET_DIRS.get(asset_key, asset_key)
-                dest_name = f"{rom.fs_name_no_ext}{source_path.suffix}"
-                rel_path = f"./assets/{subdir}/{dest_name}"
+                rel_path = self._local_asset_path(rom, asset_key, source_path)
 
                 if platform_dir is not None:
                     dest_path = platform_dir / rel_path
@@ -140,9 +183,7 @@ class GamelistExporter:
                 refs[asset_key] = rel_path
             return refs
 
-        if request is None:
-            raise ValueError("Request object must be provided for non-local exports")
-
+        base_url = self._resolve_base_url(request)
         for asset_key, source_path in assets.items():
             resource_part = source_path.relative_to(
                 Path(fs_resource_handler.base_path).resolve()
@@ -150,7 +191,7 @@ class GamelistExporter:
             refs[asset_key] = str(
                 URLPath(
                     f"{FRONTEND_RESOURCES_PATH}/{resource_part.as_posix()}"
-                ).make_absolute_url(request.base_url)
+                ).make_absolute_url(base_url)
             )
 
         return refs
@@ -172,6 +213,9 @@ class GamelistExporter:
         try:
             link_or_copy_file(source, dest)
             return True
+        except FileExistsError:
+            # Placed concurrently for another ROM sharing the same base name
+            return True
         except OSError as e:
             log.warning(f"Failed to copy {source} -> {dest}: {e}")
             return False
@@ -191,17 +235,7 @@ class GamelistExporter:
         if self.local_export:
             SubElement(game, "path").text = f"./{rom.fs_name}"
         else:
-            if request is None:
-                raise ValueError(
-                    "Request object must be provided for non-local exports"
-                )
-            SubElement(game, "path").text = str(
-                request.url_for(
-                    "get_rom_content",
-                    id=rom.id,
-                    file_name=rom.fs_name,
-                )
-            )
+            SubElement(game, "path").text = self._rom_content_url(rom, request)
 
         SubElement(game, "name").text = rom.name or rom.fs_name
 
@@ -290,6 +324,73 @@ class GamelistExporter:
 
         return game
 
+    def _render_game(
+        self,
+        rom: Rom,
+        request: Request | None,
+        asset_refs: dict[str, str],
+        media_image: str,
+        media_thumbnail: str,
+    ) -> str:
+        """Serialize a ROM's <game> element, indented as a child of <gameList>."""
+        game = self._create_game_element(
+            rom,
+            request=request,
+            asset_refs=asset_refs,
+            media_image=media_image,
+            media_thumbnail=media_thumbnail,
+        )
+        indent(game, space="  ", level=1)
+        return f"  {tostring(game, encoding='unicode')}\n"
+
+    async def _render_batch(
+        self,
+        roms: list[Rom],
+        request: Request | None,
+        platform_dir: Path | None,
+        media_image: str,
+        media_thumbnail: str,
+    ) -> tuple[dict[int, str], dict[int, list[str]]]:
+        """Render a batch of ROMs keyed by id, first placing all of the batch's
+        assets into ``platform_dir/assets/`` concurrently for local exports.
+
+        Also returns, per ROM, the asset paths to record in the export manifest.
+        """
+        assets_by_rom = {rom.id: self._collect_assets(rom) for rom in roms}
+        recorded_assets: dict[int, list[str]] = {rom.id: [] for rom in roms}
+
+        if platform_dir is not None:
+            placements = [
+                (rom.id, asset_key, source_path, rel_path)
+                for rom in roms
+                for asset_key, source_path in assets_by_rom[rom.id].items()
+                for rel_path in [self._local_asset_path(rom, asset_key, source_path)]
+            ]
+            pairs = [(source, platform_dir / rel) for _, _, source, rel in placements]
+            placed = await place_assets(self._copy_asset, pairs)
+            record = await asyncio.to_thread(assets_to_record, pairs, placed)
+            for (rom_id, asset_key, _, rel_path), ok, keep in zip(
+                placements, placed, record, strict=True
+            ):
+                if keep:
+                    recorded_assets[rom_id].append(rel_path)
+                if not ok:
+                    del assets_by_rom[rom_id][asset_key]
+
+        games = {
+            rom.id: self._render_game(
+                rom,
+                request=request,
+                asset_refs=self._build_asset_refs(
+                    rom, request=request, assets=assets_by_rom[rom.id]
+                ),
+                media_image=media_image,
+                media_thumbnail=media_thumbnail,
+            )
+            for rom in roms
+        }
+        return games, recorded_assets
+
     def _build_gamelist_xml(
         self,
         platform_id: int,
@@ -302,34 +403,29 @@ class GamelistExporter:
             raise ValueError(f"Platform with ID {platform_id} not found")
 
         roms = db_rom_handler.get_roms_scalar(platform_ids=[platform_id])
-
-        root = Element("gameList")
         media_image, media_thumbnail = get_media_options_for_export()
 
-        count = 0
+        games: list[str] = []
         for rom in roms:
-            if not rom or rom.missing_from_fs or rom.fs_name == "gamelist.xml":
+            if not self._is_exportable(rom):
                 continue
 
             assets = self._collect_assets(rom)
             asset_refs = self._build_asset_refs(
                 rom, request=request, assets=assets, platform_dir=platform_dir
             )
-
-            game_element = self._create_game_element(
-                rom,
-                request=request,
-                asset_refs=asset_refs,
-                media_image=media_image,
-                media_thumbnail=media_thumbnail,
+            games.append(
+                self._render_game(
+                    rom,
+                    request=request,
+                    asset_refs=asset_refs,
+                    media_image=media_image,
+                    media_thumbnail=media_thumbnail,
+                )
             )
-            root.append(game_element)
-            count += 1
 
-        indent(root, space="  ", level=0)
-        xml_str = tostring(root, encoding="unicode", xml_declaration=True)
-        log.info(f"Exported {count} ROMs for platform {platform.name}")
-        return xml_str, count
+        log.info(f"Exported {len(games)} ROMs for platform {platform.name}")
+        return GAMELIST_HEADER + "".join(games) + GAMELIST_FOOTER, len(games)
 
     def export_platform_to_xml(self, platform_id: int, request: Request | None) -> str:
         """Export a platform's ROMs to gamelist.xml format (no asset files copied)."""
@@ -342,10 +438,18 @@ class GamelistExporter:
         self,
         platform_id: int,
         request: Request | None,
+        *,
+        full: bool = False,
+        on_progress: Callable[[int, int], None] | None = None,
     ) -> bool:
         """Export platform ROMs to gamelist.xml in the platform's directory,
         copying media assets into a local assets/ folder when local_export=True.
 
+        The document is streamed to disk batch by batch. Only ROMs changed since
+        the previous export are loaded and rendered; the rest are replayed from
+        the export manifest, unless ``full`` is set. ``on_progress`` is called
+        with (ROMs processed, total ROMs) after each batch.
+
         Returns:
             True if successful, False otherwise
         """
@@ -363,15 +467,87 @@ class GamelistExporter:
                 if self.local_export
                 else None
             )
-
-            xml_content, _ = self._build_gamelist_xml(
-                platform_id, request=request, platform_dir=platform_dir
+            media_image, media_thumbnail = get_media_options_for_export()
+
+            manifest = ExportManifest(
+                f"gamelist_{platform_id}",
+                options={
+                    "local_export": self.local_export,
+                    "base_url": (
+                        None if self.local_export else self._resolve_base_url(request)
+                    ),
+                    "media": [media_image, media_thumbnail],
+                },
             )
-            await fs_platform_handler.write_file(
-                xml_content.encode("utf-8"), platform_fs_structure, "gamelist.xml"
+            if not full:
+                await asyncio.to_thread(manifest.load)
+
+            stamps = db_rom_handler.get_rom_export_stamps(platform_id)
+            processed = rendered = count = 0
+
+            async with fs_platform_handler.write_file_streamed(
+                platform_fs_structure, "gamelist.xml"
+            ) as f:
+                await f.write(GAMELIST_HEADER.encode("utf-8"))
+
+                for batch in batched(stamps, EXPORT_BATCH_SIZE, strict=False):
+                    stale = {
+                        rom_id: updated_at
+                        for rom_id, updated_at in batch
+                        if manifest.get(rom_id, updated_at) is None
+                    }
+                    if platform_dir is not None:
+                        # Replayed entries reference assets placed by an earlier
+                        # export; re-render those whose files have gone missing
+                        unplaced = await asyncio.to_thread(
+                            manifest.missing_assets,
+                            [rom_id for rom_id, _ in batch if rom_id not in stale],
+                            platform_dir,
+                        )
+                        stale.update(
+                            (rom_id, updated_at)
+                            for rom_id, updated_at in batch
+                            if rom_id in unplaced
+                        )
+                    if stale:
+                        roms = [
+                            rom
+                            for rom in db_rom_handler.get_roms_for_export(list(stale))
+                            if self._is_exportable(rom)
+                        ]
+                        games, recorded_assets = await self._render_batch(
+                            roms, request, platform_dir, media_image, media_thumbnail
+                        )
+                        # Non-exportable ROMs are recorded as empty entries
+                        for rom_id, updated_at in stale.items():
+                            manifest.mark(
+                                rom_id,
+                                updated_at,
+                                games.get(rom_id, ""),
+                                recorded_assets.get(rom_id, ()),
+                            )
+                        rendered += len(games)
+
+                    entries = [
+                        manifest.get(rom_id, updated_at) or ""
+                        for rom_id, updated_at in batch
+                    ]
+                    await f.write("".join(entries).encode("utf-8"))
+
+                    count += sum(1 for entry in entries if entry)
+                    processed += len(batch)
+                    if on_progress:
+                        on_progress(processed, len(stamps))
+
+                await f.write(GAMELIST_FOOTER.encode("utf-8"))
+
+            manifest.prune({rom_id for rom_id, _ in stamps})
+            await asyncio.to_thread(manifest.save)
+
+            log.info(
+                f"Exported gamelist.xml with {count} ROMs ({rendered} re-rendered) "
+                f"to {platform_fs_structure}/gamelist.xml"
             )
-
-            log.info(f"Exported gamelist.xml to {platform_fs_structure}/gamelist.xml")
             return True
         except Exception as e:
             log.error(f"Failed to export gamelist.xml for platform {platform_id}: {e}")
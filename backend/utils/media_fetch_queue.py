@@ -0,0 +1,65 @@
+import asyncio
+import functools
+from collections.abc import Coroutine
+from typing import Any
+
+from logger.logger import log
+
+
+class MediaFetchQueue:
+    """Runs media downloads for identified ROMs in the background of a scan.
+
+    Identifying a ROM only needs its metadata, so artwork, manuals and badges are
+    handed off here and the scan moves on to the next ROM. At most
+    ``max_pending`` jobs run at once; `submit` waits for a free slot, so a scan
+    that identifies faster than it can download slows down instead of queueing
+    an unbounded backlog.
+
+    Failures are logged rather than raised, as one ROM's missing artwork must
+    not fail the scan.
+    """
+
+    def __init__(self, max_pending: int) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self._slots = asyncio.Semaphore(max_pending)
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    async def submit(self, coro: Coroutine[Any, Any, None], name: str) -> None:
+        """Schedule ``coro`` once a slot is free."""
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            coro.close()
+            raise
+
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(functools.partial(self._finish, name=name))
+
+    def _finish(self, task: asyncio.Task[None], name: str) -> None:
+        # A done callback rather than a `finally` in the job, so a job
+        # cancelled before it ever ran still frees its slot.
+        self._tasks.discard(task)
+        self._slots.release()
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            log.error(f"Error fetching media for {name}: {exc}")
+
+    async def drain(self) -> None:
+        """Wait for every submitted job to finish."""
+        while self._tasks:
+            tasks = list(self._tasks)
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Gathering finished tasks doesn't yield to the loop, so the done
+            # callbacks haven't run yet; drop them here instead.
+            self._tasks.difference_update(tasks)
+
+    async def cancel(self) -> None:
+        """Cancel outstanding jobs, e.g. when the scan is stopped."""
+        for task in self._tasks:
+            task.cancel()
+        await self.drain()
@@ -0,0 +1,373 @@
+"""Counters and histograms for the scan pipeline and the API.
+
+Every process (web workers, RQ work horses, the scheduler, the watcher)
+records into its own in-memory deltas, so recording never waits on the
+network. A background thread adds the deltas to Redis every
+``METRICS_FLUSH_INTERVAL``, which is how ``/api/metrics`` reports numbers
+recorded in the RQ worker that runs the scans. RQ forks a work horse per job
+that exits without running ``atexit`` hooks, so ``RomMWorker`` flushes once
+more when a job ends.
+
+Output follows the Prometheus text exposition format. Scan stages are also
+traced as OpenTelemetry spans, which the ``opentelemetry-instrument`` wrapper
+exports when OTEL is configured.
+"""
+
+import abc
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Awaitable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Final, TypeVar
+
+from opentelemetry import trace
+
+from logger.logger import log
+
+METRICS_KEY_PREFIX: Final = "romm:metrics:"
+METRICS_FLUSH_INTERVAL: Final = 5.0  # seconds
+
+LATENCY_BUCKETS: Final = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+COUNT_BUCKETS: Final = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+tracer = trace.get_tracer(__name__)
+
+_T = TypeVar("_T")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric(abc.ABC):
+    kind: str
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+    ) -> None:
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _label_values(self, labels: Mapping[str, Any]) -> tuple[str, ...]:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _field(self, part: str, values: tuple[str, ...]) -> str:
+        return json.dumps([part, *values])
+
+    @abc.abstractmethod
+    def samples(self, stored: Mapping[str, float]) -> list[str]: ...
+
+    def render(self, stored: Mapping[str, float]) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(stored),
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        self._registry.add(
+            self.name, self._field("", self._label_values(labels)), amount
+        )
+
+    def samples(self, stored: Mapping[str, float]) -> list[str]:
+        lines = []
+        for field, value in sorted(stored.items()):
+            _, *values = json.loads(field)
+            labels = _format_labels(self.labelnames, tuple(values))
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        values = self._label_values(labels)
+        # Buckets are stored per bound and only made cumulative when rendered,
+        # so an observation is one increment rather than one per bound.
+        index = bisect_left(self.buckets, value)
+        bound = (
+            _format_value(self.buckets[index]) if index < len(self.buckets) else "+Inf"
+        )
+        self._registry.add(self.name, self._field(f"bucket:{bound}", values), 1)
+        self._registry.add(self.name, self._field("sum", values), value)
+        self._registry.add(self.name, self._field("count", values), 1)
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self, stored: Mapping[str, float]) -> list[str]:
+        series: dict[tuple[str, ...], dict[str, float]] = defaultdict(dict)
+        for field, value in stored.items():
+            part, *values = json.loads(field)
+            series[tuple(values)][part] = value
+
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        lines = []
+        for values, parts in sorted(series.items()):
+            cumulative = 0.0
+            for bound in bounds:
+                cumulative += parts.get(f"bucket:{bound}", 0)
+                labels = _format_labels((*self.labelnames, "le"), (*values, bound))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(
+                f"{self.name}_sum{labels} {_format_value(parts.get('sum', 0))}"
+            )
+            lines.append(
+                f"{self.name}_count{labels} {_format_value(parts.get('count', 0))}"
+            )
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self, flush_interval: float = METRICS_FLUSH_INTERVAL) -> None:
+        self.flush_interval = flush_interval
+        self._metrics: dict[str, _Metric] = {}
+        self._pending: defaultdict[tuple[str, str], float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._thread: threading.Thread | None = None
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        metric = Counter(self, name, documentation, labelnames)
+        self._metrics[name] = metric
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(self, name, documentation, labelnames, buckets)
+        self._metrics[name] = metric
+        return metric
+
+    def add(self, name: str, field: str, amount: float) -> None:
+        self._ensure_started()
+        with self._lock:
+            self._pending[(name, field)] += amount
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Forked: the parent's thread didn't come along, and whatever
+                # it had pending is the parent's to flush.
+                self._pending = defaultdict(float)
+            self._thread = threading.Thread(
+                target=self._run, name="romm-metrics", daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self) -> None:
+        """Add everything recorded in this process since the last flush to Redis."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(float)
+        if not pending:
+            return
+
+        try:
+            from handler.redis_handler import sync_cache
+
+            pipe = sync_cache.pipeline(transaction=False)
+            for (name, field), amount in pending.items():
+                pipe.hincrbyfloat(f"{METRICS_KEY_PREFIX}{name}", field, amount)
+            pipe.execute()
+        except Exception as e:
+            # Keep the deltas for the next flush rather than losing them.
+            with self._lock:
+                for key, amount in pending.items():
+                    self._pending[key] += amount
+            log.debug(f"Couldn't flush metrics: {e}")
+
+    def render(self) -> str:
+        """Every registered metric, summed over all processes, as Prometheus text."""
+        from handler.redis_handler import sync_cache
+
+        self.flush()
+        metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        pipe = sync_cache.pipeline(transaction=False)
+        for metric in metrics:
+            pipe.hgetall(f"{METRICS_KEY_PREFIX}{metric.name}")
+
+        lines = []
+        for metric, stored in zip(metrics, pipe.execute(), strict=True):
+            lines.extend(
+                metric.render(
+                    {
+                        (k.decode() if isinstance(k, bytes) else k): float(v)
+                        for k, v in stored.items()
+                    }
+                )
+            )
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# Scan pipeline
+SCAN_STAGE_SECONDS: Final = metrics.histogram(
+    "romm_scan_stage_seconds",
+    "Time spent in each stage of a library scan.",
+    ("stage",),
+)
+SCAN_HASHED_BYTES: Final = metrics.counter(
+    "romm_scan_hashed_bytes_total", "Bytes read to hash ROM files."
+)
+SCAN_HASH_SECONDS: Final = metrics.histogram(
+    "romm_scan_hash_seconds", "Time spent hashing a single ROM file."
+)
+SCAN_MEDIA_BYTES: Final = metrics.counter(
+    "romm_scan_media_bytes_total",
+    "Bytes of covers, screenshots, manuals and other media downloaded.",
+)
+
+# Outbound HTTP, mostly metadata providers and their media hosts
+HTTP_CLIENT_REQUEST_SECONDS: Final = metrics.histogram(
+    "romm_http_client_request_seconds",
+    "Latency of outbound HTTP requests, until the response headers arrive.",
+    ("host", "status"),
+)
+HTTP_CLIENT_RETRIES: Final = metrics.counter(
+    "romm_http_client_retries_total",
+    "Metadata provider requests retried, by reason.",
+    ("provider", "reason"),
+)
+
+# API
+HTTP_REQUEST_SECONDS: Final = metrics.histogram(
+    "romm_http_request_seconds",
+    "Latency of API requests.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_SQL_STATEMENTS: Final = metrics.histogram(
+    "romm_http_request_sql_statements",
+    "SQL statements executed per API request.",
+    ("route",),
+    buckets=COUNT_BUCKETS,
+)
+HTTP_REQUEST_REDIS_COMMANDS: Final = metrics.histogram(
+    "romm_http_request_redis_commands",
+    "Redis commands sent per API request.",
+    ("route",),
+    buckets=COUNT_BUCKETS,
+)
+
+
+@contextmanager
+def scan_stage(stage: str) -> Iterator[None]:
+    """Trace one scan stage as a span and time it into `romm_scan_stage_seconds`."""
+    with (
+        tracer.start_as_current_span(f"scan.{stage}"),
+        SCAN_STAGE_SECONDS.time(stage=stage),
+    ):
+        yield
+
+
+async def timed_scan_stage(stage: str, awaitable: Awaitable[_T]) -> _T:
+    """Await ``awaitable`` inside `scan_stage`, for coroutines gathered together."""
+    with scan_stage(stage):
+        return await awaitable
+
+
+@dataclass
+class RequestCounts:
+    sql_statements: int = 0
+    redis_commands: int = 0
+
+
+# Set for the duration of an API request by `MetricsMiddleware`. The counts
+# object is shared, not copied, into the threadpool that runs sync endpoints.
+ctx_request_counts: ContextVar[RequestCounts | None] = ContextVar(
+    "request_counts", default=None
+)
+
+
+def count_sql_statement(*_: Any) -> None:
+    counts = ctx_request_counts.get()
+    if counts is not None:
+        counts.sql_statements += 1
+
+
+def count_redis_command() -> None:
+    counts = ctx_request_counts.get()
+    if counts is not None:
+        counts.redis_commands += 1
@@ -1,4 +1,7 @@
+import asyncio
+from collections.abc import Callable
 from datetime import UTC, datetime
+from itertools import batched
 from pathlib import Path
 
 from fastapi import Request
@@ -9,6 +12,13 @@ from handler.metadata.base_handler import UniversalPlatformSlug as UPS
 from logger.logger import log
 from models.platform import Platform
 from models.rom import Rom
+from utils.export_manifest import (
+    EXPORT_BATCH_SIZE,
+    ExportManifest,
+    assets_to_record,
+    build_rom_content_url,
+    place_assets,
+)
 from utils.filesystem import link_or_copy_file
 
 # Map RomM platform slugs to canonical Pegasus (collection name, shortname) pairs.
@@ -133,8 +143,28 @@ ASSET_DIRS: dict[str, str] = {
 class PegasusExporter:
     """Export RomM collections to Pegasus Frontend metadata.pegasus.txt format"""
 
-    def __init__(self, local_export: bool = False):
+    def __init__(self, local_export: bool = False, base_url: str | None = None):
         self.local_export = local_export
+        # Used to build URLs when exporting outside a request (background tasks)
+        self.base_url = base_url
+
+    def _resolve_base_url(self, request: Request | None) -> str:
+        if request is not None:
+            return str(request.base_url)
+        if self.base_url:
+            return self.base_url
+        raise ValueError(
+            "Request object or base URL must be provided for non-local exports"
+        )
+
+    def _rom_content_url(self, rom: Rom, request: Request | None) -> str:
+        if request is not None:
+            return str(
+                request.url_for("get_rom_content", id=rom.id, file_name=rom.fs_name)
+            )
+        return build_rom_content_url(
+            rom.id, rom.fs_name, self._resolve_base_url(request)
+        )
 
     @staticmethod
     def _resolve_collection(platform: Platform) -> tuple[str, str]:
@@ -144,6 +174,10 @@ class PegasusExporter:
 
         return (platform.custom_name or platform.name, platform.slug)
 
+    def _collection_header(self, platform: Platform) -> str:
+        collection_name, shortname = self._resolve_collection(platform)
+        return f"collection: {collection_name}\nshortname: {shortname}\n"
+
     def _format_release_date(self, timestamp: int) -> str:
         """Format release date to YYYY-MM-DD format"""
         return datetime.fromtimestamp(timestamp / 1000, tz=UTC).strftime("%Y-%m-%d")
@@ -226,13 +260,7 @@ class PegasusExporter:
         if self.local_export:
             lines.append(f"file: {rom.fs_name}")
         else:
-            if request is None:
-                raise ValueError(
-                    "Request object must be provided for non-local exports"
-                )
-            lines.append(
-                f"file: {request.url_for('get_rom_content', id=rom.id, file_name=rom.fs_name)}"
-            )
+            lines.append(f"file: {self._rom_content_url(rom, request)}")
 
         # Sort title (use fs_name_no_tags if different from name)
         if rom.name and rom.fs_name_no_tags and rom.name != rom.fs_name_no_tags:
@@ -306,10 +334,56 @@ class PegasusExporter:
         try:
             link_or_copy_file(source, dest)
             return True
+        except FileExistsError:
+            # Placed concurrently for another ROM sharing the same base name
+            return True
         except OSError as e:
             log.warning(f"Failed to copy {source} -> {dest}: {e}")
             return False
 
+    async def _render_batch(
+        self,
+        roms: list[Rom],
+        request: Request | None,
+        platform_dir: Path,
+    ) -> tuple[dict[int, str], dict[int, list[str]]]:
+        """Render a batch of ROMs keyed by id, first placing all of the batch's
+        assets into ``platform_dir/assets/`` concurrently for local exports.
+
+        Also returns, per ROM, the asset paths to record in the export manifest.
+        """
+        exported_assets: dict[int, dict[str, str]] = {rom.id: {} for rom in roms}
+        recorded_assets: dict[int, list[str]] = {rom.id: [] for rom in roms}
+
+        if self.local_export:
+            placements = [
+                (rom.id, asset_key, source_path, f"assets/{subdir}/{dest_name}")
+                for rom in roms
+                for asset_key, source_path in self._collect_assets(rom).items()
+                for subdir in [ASSET_DIRS.get(asset_key, asset_key)]
+                for dest_name in [f"{rom.fs_name_no_ext}{source_path.suffix}"]
+            ]
+            pairs = [(source, platform_dir / rel) for _, _, source, rel in placements]
+            placed = await place_assets(self._copy_asset, pairs)
+            record = await asyncio.to_thread(assets_to_record, pairs, placed)
+            for (rom_id, asset_key, _, rel_path), ok, keep in zip(
+                placements, placed, record, strict=True
+            ):
+                if keep:
+                    recorded_assets[rom_id].append(rel_path)
+                if ok:
+                    exported_assets[rom_id][asset_key] = rel_path
+
+        games = {
+            rom.id: self._create_game_entry(
+                rom,
+                request=request,
+                exported_assets=exported_assets[rom.id] or None,
+            )
+            for rom in roms
+        }
+        return games, recorded_assets
+
     def export_platform_to_pegasus(
         self, platform_id: int, request: Request | None
     ) -> str:
@@ -328,37 +402,35 @@ class PegasusExporter:
 
         roms = db_rom_handler.get_roms_scalar(platform_ids=[platform_id])
 
-        lines: list[str] = []
+        entries = [
+            f"\n{self._create_game_entry(rom, request=request)}\n"
+            for rom in roms
+            if not rom.missing_from_fs
+        ]
 
-        # Collection header
-        collection_name, shortname = self._resolve_collection(platform)
-        lines.append(f"collection: {collection_name}")
-        lines.append(f"shortname: {shortname}")
-        lines.append("")
-
-        # Game entries
-        game_count = 0
-        for rom in roms:
-            if not rom.missing_from_fs:
-                if game_count > 0:
-                    lines.append("")
-                lines.append(self._create_game_entry(rom, request=request))
-                game_count += 1
-
-        log.info(f"Exported {game_count} ROMs for platform {platform.name}")
-        return "\n".join(lines) + "\n"
+        log.info(f"Exported {len(entries)} ROMs for platform {platform.name}")
+        return self._collection_header(platform) + "".join(entries)
 
     async def export_platform_to_file(
         self,
         platform_id: int,
         request: Request | None,
+        *,
+        full: bool = False,
+        on_progress: Callable[[int, int], None] | None = None,
     ) -> bool:
         """Export platform ROMs to metadata.pegasus.txt file in the platform's directory,
         including media assets copied into a local assets/ folder.
 
+        The file is streamed to disk batch by batch. Only ROMs changed since the
+        previous export are loaded and rendered; the rest are replayed from the
+        export manifest, unless ``full`` is set.
+
         Args:
             platform_id: Platform ID to export
             request: FastAPI request object for URL generation
+            full: Re-render every ROM instead of only the changed ones
+            on_progress: Called with (ROMs processed, total ROMs) after each batch
 
         Returns:
             True if successful, False otherwise
@@ -374,55 +446,77 @@ class PegasusExporter:
             )
             platform_dir = fs_platform_handler.base_path / platform_fs_structure
 
-            roms = db_rom_handler.get_roms_scalar(platform_ids=[platform_id])
-
-            lines: list[str] = []
-
-            # Collection header
-            collection_name, shortname = self._resolve_collection(platform)
-            lines.append(f"collection: {collection_name}")
-            lines.append(f"shortname: {shortname}")
-            lines.append("")
-
-            game_count = 0
-            for rom in roms:
-                if rom.missing_from_fs:
-                    continue
-
-                exported_assets: dict[str, str] = {}
-
-                if self.local_export:
-                    assets = self._collect_assets(rom)
-
-                    for asset_key, source_path in assets.items():
-                        subdir = ASSET_DIRS.get(asset_key, asset_key)
-                        dest_name = f"{rom.fs_name_no_ext}{source_path.suffix}"
-                        dest_path = platform_dir / "assets" / subdir / dest_name
-
-                        if self._copy_asset(source_path, dest_path):
-                            exported_assets[asset_key] = f"assets/{subdir}/{dest_name}"
-
-                if game_count > 0:
-                    lines.append("")
-
-                lines.append(
-                    self._create_game_entry(
-                        rom,
-                        request=request,
-                        exported_assets=exported_assets if exported_assets else None,
-                    )
-                )
-                game_count += 1
-
-            content = "\n".join(lines) + "\n"
-            await fs_platform_handler.write_file(
-                content.encode("utf-8"),
-                platform_fs_structure,
-                "metadata.pegasus.txt",
+            manifest = ExportManifest(
+                f"pegasus_{platform_id}",
+                options={
+                    "local_export": self.local_export,
+                    "base_url": (
+                        None if self.local_export else self._resolve_base_url(request)
+                    ),
+                },
             )
+            if not full:
+                await asyncio.to_thread(manifest.load)
+
+            stamps = db_rom_handler.get_rom_export_stamps(platform_id)
+            processed = rendered = count = 0
+
+            async with fs_platform_handler.write_file_streamed(
+                platform_fs_structure, "metadata.pegasus.txt"
+            ) as f:
+                await f.write(self._collection_header(platform).encode("utf-8"))
+
+                for batch in batched(stamps, EXPORT_BATCH_SIZE, strict=False):
+                    stale = {
+                        rom_id: updated_at
+                        for rom_id, updated_at in batch
+                        if manifest.get(rom_id, updated_at) is None
+                    }
+                    if self.local_export:
+                        # Replayed entries reference assets placed by an earlier
+                        # export; re-render those whose files have gone missing
+                        unplaced = await asyncio.to_thread(
+                            manifest.missing_assets,
+                            [rom_id for rom_id, _ in batch if rom_id not in stale],
+                            platform_dir,
+                        )
+                        stale.update(
+                            (rom_id, updated_at)
+                            for rom_id, updated_at in batch
+                            if rom_id in unplaced
+                        )
+                    if stale:
+                        roms = list(db_rom_handler.get_roms_for_export(list(stale)))
+                        games, recorded_assets = await self._render_batch(
+                            roms, request, platform_dir
+                        )
+                        for rom_id, updated_at in stale.items():
+                            game = games.get(rom_id)
+                            manifest.mark(
+                                rom_id,
+                                updated_at,
+                                f"\n{game}\n" if game else "",
+                                recorded_assets.get(rom_id, ()),
+                            )
+                        rendered += len(games)
+
+                    entries = [
+                        manifest.get(rom_id, updated_at) or ""
+                        for rom_id, updated_at in batch
+                    ]
+                    await f.write("".join(entries).encode("utf-8"))
+
+                    count += sum(1 for entry in entries if entry)
+                    processed += len(batch)
+                    if on_progress:
+                        on_progress(processed, len(stamps))
+
+            manifest.prune({rom_id for rom_id, _ in stamps})
+            await asyncio.to_thread(manifest.save)
 
             log.info(
-                f"Exported metadata.pegasus.txt with {game_count} ROMs for platform {platform.name}"
+                f"Exported metadata.pegasus.txt with {count} ROMs "
+                f"({rendered} re-rendered) for platform {platform.name}"
             )
             return True
         except Exception as e:
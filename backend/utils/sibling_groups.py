@@ -0,0 +1,44 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+
+def assign_sibling_groups(rows: Iterable[Sequence[Any]]) -> dict[int, int]:
+    """Partition ROMs into sibling groups by the provider ids they share.
+
+    Each row is ``(rom_id, platform_id, *provider_ids)``, with the provider ids
+    in the same column order on every row. Two ROMs on the same platform that
+    share a non-null id in the same column are siblings, and so is anything
+    linked to them through another shared id, so a group is a connected
+    component rather than a set of direct matches.
+
+    Returns ``{rom_id: group_id}`` where the group id is the smallest ROM id in
+    the group. ROMs without any provider id belong to no group and are left
+    out.
+    """
+    parent: dict[int, int] = {}
+    # (platform, column, value) -> a ROM already holding that id
+    holders: dict[tuple[int, int, Any], int] = {}
+
+    def find(rom_id: int) -> int:
+        while parent[rom_id] != rom_id:
+            # Path halving: point every other node on the way at its grandparent
+            parent[rom_id] = parent[parent[rom_id]]
+            rom_id = parent[rom_id]
+        return rom_id
+
+    for rom_id, platform_id, *provider_ids in rows:
+        for column, value in enumerate(provider_ids):
+            if value is None:
+                continue
+
+            parent.setdefault(rom_id, rom_id)
+            holder = holders.setdefault((platform_id, column, value), rom_id)
+            if holder == rom_id:
+                continue
+
+            root, other = find(rom_id), find(holder)
+            if root != other:
+                # Hang the larger root under the smaller, so roots stay minimal
+                parent[max(root, other)] = min(root, other)
+
+    return {rom_id: find(rom_id) for rom_id in parent}
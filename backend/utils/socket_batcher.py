@@ -0,0 +1,77 @@
+import asyncio
+from collections.abc import Collection
+from typing import Any
+
+import socketio  # type: ignore
+
+from logger.logger import log
+
+
+class SocketEventBatcher:
+    """Bounds the rate of high-volume events sent through a Socket.IO manager.
+
+    A drop-in for the manager's ``emit``. Events in ``batched`` are held and
+    sent as a single array under their mapped name, with repeats for the same
+    ``id`` collapsed to the latest payload. Events in ``coalesced`` only ever
+    send their latest payload. Both go out at most once per ``interval``.
+
+    Any other event first flushes whatever is held, then goes straight through,
+    so clients still see per-ROM updates before the platform or done event that
+    follows them.
+    """
+
+    def __init__(
+        self,
+        socket_manager: socketio.AsyncRedisManager,
+        *,
+        batched: dict[str, str],
+        coalesced: Collection[str] = (),
+        interval: float,
+    ) -> None:
+        self._socket_manager = socket_manager
+        self._batched = batched
+        self._coalesced = frozenset(coalesced)
+        self._interval = interval
+        self._pending_batches: dict[str, dict[Any, Any]] = {}
+        self._pending_latest: dict[str, Any] = {}
+        self._flusher: asyncio.Task[None] | None = None
+
+    async def emit(self, event: str, data: Any = None, **kwargs: Any) -> None:
+        if not kwargs and event in self._batched:
+            key = data.get("id") if isinstance(data, dict) else None
+            bucket = self._pending_batches.setdefault(event, {})
+            # Re-inserting moves nothing: a repeat keeps its first position.
+            bucket[object() if key is None else key] = data
+            self._schedule_flush()
+            return
+
+        if not kwargs and event in self._coalesced:
+            self._pending_latest[event] = data
+            self._schedule_flush()
+            return
+
+        await self.flush()
+        await self._socket_manager.emit(event, data, **kwargs)
+
+    async def flush(self) -> None:
+        """Send everything held right away."""
+        batches, self._pending_batches = self._pending_batches, {}
+        latest, self._pending_latest = self._pending_latest, {}
+        for event, items in batches.items():
+            await self._socket_manager.emit(self._batched[event], list(items.values()))
+        for event, data in latest.items():
+            await self._socket_manager.emit(event, data)
+
+    def _schedule_flush(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        # Runs only while something is held, so an idle batcher leaves no task
+        # behind for the caller to clean up.
+        while self._pending_batches or self._pending_latest:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error(f"Error flushing socket events: {e}")
@@ -43,6 +43,7 @@ from logger.formatter import highlight as hl
 from logger.logger import log
 from tasks.tasks import TaskType, tasks_scheduler
 from utils import get_version
+from utils.cache import invalidate_heartbeat_cache
 
 sentry_sdk.init(
     dsn=SENTRY_DSN,
@@ -170,6 +171,10 @@ def process_changes(changes: Sequence[Change]) -> None:
             log.info(f"Filesystem event: {event_type} {event_src}")
             fs_slugs.add(event_src_parts[structure_level])
 
+        if changes_platform_directory:
+            # The heartbeat lists platform directories.
+            invalidate_heartbeat_cache()
+
         if not fs_slugs:
             log.info("No valid filesystem slugs found in changes, exiting...")
             return
@@ -75,6 +75,9 @@ export type { EjsControls } from './models/EjsControls';
 export type { EjsControlsButton } from './models/EjsControlsButton';
 export type { EmulationDict } from './models/EmulationDict';
 export type { ExclusionPayload } from './models/ExclusionPayload';
+export type { ExportStats } from './models/ExportStats';
+export type { ExportTaskMeta } from './models/ExportTaskMeta';
+export type { ExportTaskStatusResponse } from './models/ExportTaskStatusResponse';
 export type { FacetValueSchema } from './models/FacetValueSchema';
 export type { FilesystemDict } from './models/FilesystemDict';
 export type { FirmwareSchema } from './models/FirmwareSchema';
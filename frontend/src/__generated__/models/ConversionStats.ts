@@ -6,5 +6,7 @@ export type ConversionStats = {
     processed: number;
     errors: number;
     total: number;
+    skipped_dirs: number;
+    images_per_second: number;
 };
 
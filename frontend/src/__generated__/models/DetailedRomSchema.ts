@@ -67,6 +67,7 @@ export type DetailedRomSchema = {
     manual_metadata: (ManualMetadata | null);
     path_cover_small: (string | null);
     path_cover_large: (string | null);
+    path_cover_srcset: Record<string, string>;
     url_cover: (string | null);
     has_manual: boolean;
     has_soundtrack: boolean;
@@ -0,0 +1,12 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+export type ExportStats = {
+    total_platforms: number;
+    exported_platforms: number;
+    failed_platforms: number;
+    processed_roms: number;
+    total_roms: number;
+};
+
@@ -0,0 +1,9 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+import type { ExportStats } from './ExportStats';
+export type ExportTaskMeta = {
+    export_stats: (ExportStats | null);
+};
+
@@ -9,5 +9,7 @@ export type OrphanedResourcesCleanupStats = {
     roms_in_fs: number;
     removed_fs_platforms: number;
     removed_fs_roms: number;
+    removed_cover_derivatives: number;
+    removed_asset_blobs: number;
 };
 
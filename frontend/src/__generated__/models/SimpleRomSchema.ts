@@ -59,6 +59,7 @@ export type SimpleRomSchema = {
     manual_metadata: (ManualMetadata | null);
     path_cover_small: (string | null);
     path_cover_large: (string | null);
+    path_cover_srcset: Record<string, string>;
     url_cover: (string | null);
     has_manual: boolean;
     has_soundtrack: boolean;
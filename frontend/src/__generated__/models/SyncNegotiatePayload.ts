@@ -12,5 +12,9 @@ export type SyncNegotiatePayload = {
      * Current save state on the client.
      */
     saves: Array<ClientSaveState>;
+    /**
+     * Only consider server saves changed since the device's last cleanly completed sync session, plus the (rom_id, slot) pairs sent in 'saves'. Server saves outside that set are left out of the response instead of being offered again. Falls back to a full negotiation when the device has no completed sync yet; the response's 'delta' flag reports which one ran.
+     */
+    delta?: boolean;
 };
 
@@ -10,5 +10,9 @@ export type SyncNegotiateResponse = {
     total_download: number;
     total_conflict: number;
     total_no_op: number;
+    /**
+     * True when only saves changed since the device's last completed sync were considered; false for a full negotiation.
+     */
+    delta?: boolean;
 };
 
@@ -1,3 +1,4 @@
+import type { TaskExecutionResponse } from "@/__generated__";
 import api from "@/services/api";
 
 export const exportApi = api;
@@ -5,13 +6,17 @@ export const exportApi = api;
 async function exportGamelistXml({ platformIds }: { platformIds: number[] }) {
   const params = new URLSearchParams();
   platformIds.forEach((id) => params.append("platform_ids", id.toString()));
-  await api.post(`/export/gamelist-xml?${params.toString()}`);
+  return api.post<TaskExecutionResponse>(
+    `/export/gamelist-xml?${params.toString()}`,
+  );
 }
 
 async function exportPegasus({ platformIds }: { platformIds: number[] }) {
   const params = new URLSearchParams();
   platformIds.forEach((id) => params.append("platform_ids", id.toString()));
-  await api.post(`/export/pegasus?${params.toString()}`);
+  return api.post<TaskExecutionResponse>(
+    `/export/pegasus?${params.toString()}`,
+  );
 }
 
 export default {
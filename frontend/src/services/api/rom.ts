@@ -469,6 +469,66 @@ async function searchRom({
   });
 }
 
+// Streams `/search/roms/stream`: `onResults` gets the full merged list every
+// time a provider or cover lookup adds to it. Resolves with the final list.
+async function searchRomStream({
+  romId,
+  searchTerm,
+  searchBy,
+  onResults,
+  signal,
+}: {
+  romId: number;
+  searchTerm: string;
+  searchBy: string;
+  onResults: (roms: SearchRom[]) => void;
+  signal?: AbortSignal;
+}): Promise<SearchRom[]> {
+  const params = new URLSearchParams({
+    rom_id: String(romId),
+    search_term: searchTerm,
+    search_by: searchBy,
+  });
+  const response = await fetch(`/api/search/roms/stream?${params}`, {
+    credentials: "same-origin",
+    headers: { Accept: "text/event-stream" },
+    signal,
+  });
+  if (!response.ok || !response.body) {
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.detail ?? response.statusText);
+  }
+
+  const reader = response.body
+    .pipeThrough(new TextDecoderStream())
+    .getReader();
+  let buffer = "";
+  let results: SearchRom[] = [];
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return results;
+    buffer += value;
+
+    // Events are separated by a blank line
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const lines = buffer.slice(0, boundary).split("\n");
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      const event = lines
+        .find((line) => line.startsWith("event: "))
+        ?.slice(7);
+      const data = lines.find((line) => line.startsWith("data: "))?.slice(6);
+      if (!data) continue;
+
+      results = JSON.parse(data);
+      onResults(results);
+      if (event === "done") return results;
+    }
+  }
+}
+
 function triggerFileDownload(href: string) {
   return new Promise<void>((resolve) => {
     const a = document.createElement("a");
@@ -953,6 +1013,7 @@ export default {
   downloadRom,
   bulkDownloadRoms,
   searchRom,
+  searchRomStream,
   updateRom,
   uploadManuals,
   removeManual,
@@ -13,6 +13,7 @@ export interface StreamingContainer {
   host: string; // "http://192.168.1.50:3000"
   label: string; // "PCSX2"
   capabilities: PlatformCapabilities;
+  available: boolean; // whether the broker answered its last health probe
 }
 
 export interface StreamingConfig {
@@ -3,6 +3,7 @@ import type {
   ConversionTaskStatusResponse,
   CleanupTaskStatusResponse,
   UpdateTaskStatusResponse,
+  ExportTaskStatusResponse,
   GenericTaskStatusResponse,
   WatcherTaskStatusResponse,
   JobStatus,
@@ -17,6 +18,7 @@ export type TaskStatusResponse =
   | ConversionTaskStatusResponse
   | CleanupTaskStatusResponse
   | UpdateTaskStatusResponse
+  | ExportTaskStatusResponse
   | GenericTaskStatusResponse
   | WatcherTaskStatusResponse;
 
@@ -86,6 +88,7 @@ export const TaskTypeItem: Record<TaskType, { title: string; icon: string }> = {
   cleanup: { title: "Cleanup", icon: "mdi-broom" },
   update: { title: "Update", icon: "mdi-update" },
   watcher: { title: "Watcher", icon: "mdi-eye" },
+  export: { title: "Export", icon: "mdi-file-export" },
   generic: { title: "Task", icon: "mdi-help-circle" },
   sync: { title: "Sync", icon: "mdi-sync" },
 };
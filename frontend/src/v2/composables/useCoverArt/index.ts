@@ -71,7 +71,8 @@ export type CoverArtRom = Pick<
   | "url_cover"
   | "path_video"
   | "platform_slug"
->;
+> &
+  Partial<Pick<SimpleRom, "path_cover_srcset">>;
 
 /** Canonical width/height ratio per style — mirrors v1's
  *  `galleryView.getAspectRatio`. The ratio is purely style-driven (a
@@ -150,6 +151,10 @@ export interface CoverArtDescriptor {
   /** Primary image src — alt artwork, explicit override, or the local
    *  cover chain. Null when the rom has no usable image (→ placeholder). */
   coverUrl: string | null;
+  /** `srcset` of the responsive renditions behind the local cover, so a
+   *  small card fetches a small file. Null for alt art, overrides, and
+   *  roms without renditions. */
+  coverSrcset: string | null;
   /** Secondary src tried on `coverUrl` load error (external provider). */
   fallbackUrl: string | null;
   /** Any real image is available (so the card paints art, not a
@@ -207,6 +212,13 @@ export function computeCoverArt(
       local && opts.supportsWebp ? local.replace(RASTER_EXT, ".webp") : local;
   }
 
+  // Renditions are WebP (plus AVIF, which `<img srcset>` can't negotiate),
+  // so they're only offered where the server's webp covers are.
+  const coverSrcset =
+    override == null && altPath == null && opts.supportsWebp
+      ? (rom.path_cover_srcset?.webp ?? null)
+      : null;
+
   const fallbackUrl = override != null ? null : (rom.url_cover ?? null);
   const hasArtwork = Boolean(coverUrl || fallbackUrl);
 
@@ -222,6 +234,7 @@ export function computeCoverArt(
 
   return {
     coverUrl,
+    coverSrcset,
     fallbackUrl,
     hasArtwork,
     isAltArt,
@@ -255,6 +268,7 @@ export interface UseCoverArtOptions {
 export interface UseCoverArt {
   style: ComputedRef<BoxartStyle>;
   coverUrl: ComputedRef<string | null>;
+  coverSrcset: ComputedRef<string | null>;
   fallbackUrl: ComputedRef<string | null>;
   hasArtwork: ComputedRef<boolean>;
   isAltArt: ComputedRef<boolean>;
@@ -307,6 +321,7 @@ export function useCoverArt(
       const src = coverSrc.value ?? null;
       return {
         coverUrl: src,
+        coverSrcset: null,
         fallbackUrl: null,
         hasArtwork: !!src,
         isAltArt: false,
@@ -327,6 +342,7 @@ export function useCoverArt(
   return {
     style,
     coverUrl: computed(() => descriptor.value.coverUrl),
+    coverSrcset: computed(() => descriptor.value.coverSrcset),
     fallbackUrl: computed(() => descriptor.value.fallbackUrl),
     hasArtwork: computed(() => descriptor.value.hasArtwork),
     isAltArt: computed(() => descriptor.value.isAltArt),
@@ -144,6 +144,24 @@ describe("computeCoverArt — cover_path", () => {
     );
     expect(d.coverUrl).toBe("covers/large.webp");
   });
+  it("offers the webp renditions as a srcset when supported", () => {
+    const r = rom({
+      path_cover_large: "covers/large.png",
+      path_cover_srcset: { webp: "c/128.webp 128w, c/original.webp 300w" },
+    });
+    expect(
+      computeCoverArt(r, "cover_path", {
+        resourcesPath: RES,
+        supportsWebp: true,
+      }).coverSrcset,
+    ).toBe("c/128.webp 128w, c/original.webp 300w");
+    expect(
+      computeCoverArt(r, "cover_path", {
+        resourcesPath: RES,
+        supportsWebp: false,
+      }).coverSrcset,
+    ).toBeNull();
+  });
   it("exposes url_cover as the fallback and flags no artwork when empty", () => {
     expect(
       computeCoverArt(rom({ url_cover: "https://x/c.png" }), "cover_path", {
@@ -18,7 +18,9 @@ const confirmFn = vi.fn();
 const confirmProtectedLaunch = { value: true };
 const canPlayEJS = { value: true };
 const canPlayRuffle = { value: false };
-const streamContainer = { value: null as object | null };
+const streamContainer = {
+  value: null as { available?: boolean } | null,
+};
 let originalLocation: Location;
 // Granted action keys — `null` means "everything" (the default).
 const grantedActions: { value: Set<ActionKey> | null } = { value: null };
@@ -175,6 +177,16 @@ describe("useGameActions.play — launch confirmation", () => {
     expect(locationAssign).not.toHaveBeenCalled();
   });
 
+  it("falls back to EmulatorJS when the streaming broker is down", async () => {
+    streamContainer.value = { available: false };
+    const actions = useGameActions(() => makeRom());
+
+    await actions.play();
+
+    expect(locationAssign).toHaveBeenCalledWith("/rom/1/ejs");
+    expect(push).not.toHaveBeenCalled();
+  });
+
   it("keeps SPA navigation for Ruffle", async () => {
     canPlayEJS.value = false;
     canPlayRuffle.value = true;
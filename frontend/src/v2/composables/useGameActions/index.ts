@@ -83,10 +83,14 @@ export function useGameActions(
   // Streaming is the preferred way to play where a container is
   // configured for the platform — the native emulator runs in a
   // separate container and RomM streams it back. Wins over in-browser
-  // EJS/Ruffle when both are available.
-  const canPlayStream = computed(() =>
-    Boolean(streamingStore.containerForPlatform(getRom()?.platform_slug)),
-  );
+  // EJS/Ruffle when both are available, unless the backend reports the
+  // container's broker as down.
+  const canPlayStream = computed(() => {
+    const container = streamingStore.containerForPlatform(
+      getRom()?.platform_slug,
+    );
+    return Boolean(container) && container?.available !== false;
+  });
   const canPlay = computed(
     () => canPlayStream.value || canPlayEJS.value || canPlayRuffle.value,
   );
@@ -8,10 +8,12 @@
 //   * `scan:scanning_platform` — backend announces the platform it's about
 //                                to process; push it onto the live log so
 //                                the /scan view can render a panel for it.
-//   * `scan:scanning_rom`      — per-ROM update during a scan. Batched on
-//                                a 100ms debounce window so a thousand
-//                                rapid-fire updates don't tank rendering.
-//   * `scan:update_stats`      — periodic progress; keep `scanStats` fresh.
+//   * `scan:scanning_roms`     — per-ROM updates during a scan, sent by the
+//                                backend as one array per interval. Still
+//                                queued on a 100ms debounce window so a
+//                                burst of batches renders once.
+//   * `scan:update_stats`      — periodic progress (latest only, rate-bound
+//                                by the backend); keep `scanStats` fresh.
 //   * `scan:done`              — scan finished; persist the final stats,
 //                                flip `scanning` off so the indicator hides,
 //                                then refetch platforms to reconcile counts.
@@ -165,14 +167,14 @@ export function installScanLifecycle() {
     });
   }, 100);
 
-  useSocketEvent<SimpleRom>("scan:scanning_rom", (rom) => {
+  useSocketEvent<SimpleRom[]>("scan:scanning_roms", (roms) => {
     scanningStore.setScanning(true);
-    romUpdateQueue.push(rom);
+    romUpdateQueue.push(...roms);
     processRomUpdates();
   });
 
   // Stats are the only event a scan emits continuously: `scanning_platform`
-  // fires once per platform, and `scanning_rom` only for ROMs the scan
+  // fires once per platform, and `scanning_roms` only for ROMs the scan
   // actually adds, so an update scan over a settled library can go a long
   // while emitting nothing else. Flipping `scanning` here is what lets a tab
   // that missed the start of the scan catch up on the next tick.